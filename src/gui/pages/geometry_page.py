@@ -4,7 +4,7 @@
 此模块提供几何文件解析功能的GUI界面。
 """
 
-from PySide6.QtCore import Signal
+from PySide6.QtCore import QThread, Signal
 from PySide6.QtWidgets import (
     QComboBox,
     QFileDialog,
@@ -18,6 +18,26 @@ from PySide6.QtWidgets import (
 )
 
 
+class PreviewWorker(QThread):
+    """STEP 粗级（coarse）三角化预览工作线程（OCC 三角化耗时，不在界面线程执行）"""
+
+    preview_ready = Signal(dict)
+    error = Signal(str)
+
+    def __init__(self, file_path: str):
+        super().__init__()
+        self.file_path = file_path
+
+    def run(self):
+        try:
+            from sw_helper.geometry.parser import STLParser
+            from sw_helper.geometry.tessellation import get_lod_stl
+
+            self.preview_ready.emit(STLParser().parse(str(get_lod_stl(self.file_path, "coarse"))))
+        except Exception as e:
+            self.error.emit(str(e))
+
+
 class GeometryPage(QWidget):
     """几何解析页面类"""
 
@@ -26,6 +46,7 @@ class GeometryPage(QWidget):
 
     def __init__(self):
         super().__init__()
+        self.preview_worker = None
         self._init_ui()
 
     def _init_ui(self):
@@ -141,6 +162,10 @@ class GeometryPage(QWidget):
 
             self.result_text.setText("\n".join(lines))
 
+            # STEP：后台生成粗级三角化预览（结果缓存，网格划分可复用同一STL）
+            if result.get("format") in (".step", ".stp"):
+                self._start_preview(file_path)
+
         except ImportError as e:
             self.result_text.setText(f'缺少依赖: {e}\n\n请安装: pip install -e ".[full]"')
         except FileNotFoundError as e:
@@ -148,7 +173,34 @@ class GeometryPage(QWidget):
         except Exception as e:
             self.result_text.setText(f"解析失败: {e}")
         finally:
-            self.parse_btn.setEnabled(True)
+            # 预览线程运行期间保持禁用，避免替换仍在运行的线程
+            self.parse_btn.setEnabled(self.preview_worker is None or not self.preview_worker.isRunning())
+
+    def _start_preview(self, file_path: str):
+        """启动预览工作线程，完成后把预览信息追加到解析结果"""
+        self.result_text.append("\n正在生成预览网格...")
+        self.preview_worker = PreviewWorker(file_path)
+        self.preview_worker.preview_ready.connect(self._on_preview_finished)
+        self.preview_worker.error.connect(self._on_preview_error)
+        self.preview_worker.start()
+
+    def _on_preview_finished(self, preview):
+        """预览完成"""
+        self.parse_btn.setEnabled(True)
+        self.result_text.append(
+            "\n".join(
+                [
+                    "--- 预览网格 (coarse) ---",
+                    f"三角形: {preview.get('faces', 0)}",
+                    f"缓存: {preview.get('file', '')}",
+                ]
+            )
+        )
+
+    def _on_preview_error(self, error_msg):
+        """预览失败（OCC 不可用等）不影响解析结果"""
+        self.parse_btn.setEnabled(True)
+        self.result_text.append(f"预览网格不可用: {error_msg}")
 
 
 # 页面工厂函数（用于动态创建页面）
@@ -5,7 +5,9 @@ integrations._base - 基础连接器模块
 """
 
 from .connectors import CADConnector, CAEConnector, FileFormat
+from .journal import RunJournal
 from .workflow import WorkflowEngine, WorkflowStatus, WorkflowStep
+from .workflow_graph import StepCache, WorkflowGraph
 
 __all__ = [
     "CADConnector",
@@ -14,4 +16,7 @@ __all__ = [
     "WorkflowEngine",
     "WorkflowStep",
     "WorkflowStatus",
+    "WorkflowGraph",
+    "StepCache",
+    "RunJournal",
 ]
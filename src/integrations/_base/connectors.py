@@ -146,6 +146,14 @@ class CADConnector(ABC):
         else:
             raise NotImplementedError(f"格式 {format_type} 尚未实现")
 
+    def get_version(self) -> Optional[str]:
+        """获取软件版本
+
+        Returns:
+            Optional[str]: 版本号，无法确定时返回None
+        """
+        return None
+
     def get_software_info(self) -> Dict[str, Any]:
         """获取软件信息
 
@@ -155,6 +163,7 @@ class CADConnector(ABC):
         return {
             "connector_type": "CAD",
             "class_name": self.__class__.__name__,
+            "version": self.get_version(),
             "supported_formats": [fmt.value for fmt in self.get_supported_formats()],
         }
 
@@ -236,6 +245,14 @@ class CAEConnector(ABC):
         """
         pass
 
+    def get_version(self) -> Optional[str]:
+        """获取软件版本
+
+        Returns:
+            Optional[str]: 版本号，无法确定时返回None
+        """
+        return None
+
     def get_software_info(self) -> Dict[str, Any]:
         """获取软件信息
 
@@ -245,5 +262,6 @@ class CAEConnector(ABC):
         return {
             "connector_type": "CAE",
             "class_name": self.__class__.__name__,
+            "version": self.get_version(),
             "supported_analysis": self.get_supported_analysis_types(),
         }
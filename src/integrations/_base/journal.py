@@ -0,0 +1,234 @@
+"""
+工作流运行日志
+
+每次运行在输出目录中写入 ``workflow_journal.json``：工作流名称、配置、图结构、
+连接器类型，以及每个步骤的状态、起止时间、耗时、错误与产物文件。每次步骤状态
+变化后立即原子写盘，进程被中断时日志仍反映最后的进度。
+
+``WorkflowEngine.resume(run_dir)`` 读取日志恢复图与配置重新运行：已完成步骤的
+指纹与步骤缓存一致，直接复用（长时间的网格划分不会因下游失败而重复），
+从第一个未完成的步骤继续执行。
+
+日志只由 ``WorkflowEngine`` 的运行写入（``run_workflow`` / ``run_branches``）；
+``cae-cli run`` 的单次求解不经过工作流引擎，不写日志，``cae-cli run --resume``
+只用于恢复通过API运行的工作流。
+"""
+
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+
+from .connectors import CADConnector, CAEConnector
+from .workflow_graph import WorkflowGraph, fingerprint
+
+if TYPE_CHECKING:
+    from .workflow import WorkflowStep
+
+# 日志格式版本
+JOURNAL_FORMAT_VERSION = 1
+
+JOURNAL_FILE_NAME = "workflow_journal.json"
+
+# 视为已完成的步骤状态
+DONE_STATUSES = ("completed", "skipped")
+
+# 恢复时允许导入的连接器包；其他模块只在已导入（已注册其连接器类）时使用，不会因日志内容而导入
+CONNECTOR_PACKAGES = ("integrations",)
+
+
+def connector_path(connector: Any) -> Optional[str]:
+    """连接器的导入路径 ``模块:类名``（None 表示未提供连接器）"""
+    if connector is None:
+        return None
+    cls = connector.__class__
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def load_connector(path: Optional[str]) -> Any:
+    """按导入路径创建连接器实例（无参构造）
+
+    只导入 :data:`CONNECTOR_PACKAGES` 中的模块（导入会执行模块顶层代码，被篡改的日志
+    不能借此运行任意代码），其他模块必须已经导入；只实例化 :class:`CADConnector` /
+    :class:`CAEConnector` 的子类，日志中的其他类型不会被构造。
+
+    Raises:
+        ValueError: 导入路径无效、模块不在允许范围内或不是连接器类时
+    """
+    if not path:
+        return None
+    module_name, _, class_name = path.partition(":")
+    allowed = any(module_name == package or module_name.startswith(f"{package}.") for package in CONNECTOR_PACKAGES)
+    if not allowed and module_name not in sys.modules:
+        raise ValueError(f"无法加载连接器 {path}: 模块 {module_name} 不在允许导入的连接器包中且尚未导入")
+    try:
+        cls = getattr(importlib.import_module(module_name), class_name)
+    except (ImportError, AttributeError) as e:
+        raise ValueError(f"无法加载连接器 {path}: {e}") from e
+    if not (isinstance(cls, type) and issubclass(cls, (CADConnector, CAEConnector))):
+        raise ValueError(f"{path} 不是 CADConnector/CAEConnector 子类，拒绝创建")
+    return cls()
+
+
+class RunJournal:
+    """工作流运行日志
+
+    Args:
+        run_dir: 运行输出目录
+    """
+
+    def __init__(self, run_dir: Union[str, Path]):
+        self.run_dir = Path(run_dir)
+        self.path = self.run_dir / JOURNAL_FILE_NAME
+        self.data: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def load(cls, run_dir: Union[str, Path]) -> "RunJournal":
+        """读取运行日志
+
+        Raises:
+            FileNotFoundError: 目录中没有运行日志时
+            ValueError: 日志格式无效时
+        """
+        journal = cls(run_dir)
+        if not journal.path.exists():
+            raise FileNotFoundError(f"未找到运行日志: {journal.path}")
+        try:
+            with open(journal.path, encoding="utf-8") as f:
+                journal.data = json.load(f)
+        except ValueError as e:
+            raise ValueError(f"运行日志格式无效: {journal.path}: {e}") from e
+        if journal.data.get("version") != JOURNAL_FORMAT_VERSION or "graph" not in journal.data:
+            raise ValueError(f"不支持的运行日志版本: {journal.path}")
+        return journal
+
+    def start(
+        self,
+        workflow_name: str,
+        config: Dict[str, Any],
+        graph: WorkflowGraph,
+        connectors: Dict[str, Optional[str]],
+        steps: List["WorkflowStep"],
+    ):
+        """开始一次运行：记录工作流定义与初始步骤状态
+
+        已有日志属于同一工作流（名称与图结构的指纹一致）时尝试次数递增，否则重新计数。
+        """
+        nodes = [
+            {
+                "name": spec.name,
+                "module": spec.module,
+                "action": spec.action,
+                "inputs": spec.inputs,
+                "config": spec.config,
+                "branches": spec.branches,
+            }
+            for spec in graph.steps.values()
+        ]
+        workflow_fingerprint = fingerprint({"workflow": workflow_name, "graph": nodes})
+        with self._lock:
+            attempt = 1
+            if self.data.get("fingerprint") == workflow_fingerprint:
+                attempt = self.data.get("attempt", 0) + 1
+            self.data = {
+                "version": JOURNAL_FORMAT_VERSION,
+                "workflow": workflow_name,
+                "fingerprint": workflow_fingerprint,
+                "status": "running",
+                "attempt": attempt,
+                "started": time.time(),
+                "finished": None,
+                "error": None,
+                "config": config,
+                "connectors": connectors,
+                "graph": nodes,
+                "steps": {},
+            }
+            for step in steps:
+                self.data["steps"][step.name] = {"status": step.status.value}
+            self._write()
+
+    def update_step(self, step: "WorkflowStep", artifacts: Optional[Dict[str, Any]] = None):
+        """记录步骤状态、时间、错误与产物"""
+        with self._lock:
+            entry = self.data.setdefault("steps", {}).setdefault(step.name, {})
+            duration = None
+            if step.start_time and step.end_time:
+                duration = step.end_time - step.start_time
+            entry.update(
+                {
+                    "description": step.description,
+                    "status": step.status.value,
+                    "start_time": step.start_time,
+                    "end_time": step.end_time,
+                    "duration": duration,
+                    "error": step.error,
+                    "fingerprint": step.fingerprint,
+                }
+            )
+            if artifacts is not None:
+                entry["artifacts"] = {slot: str(path) if path is not None else None for slot, path in artifacts.items()}
+            self._write()
+
+    def finish(self, status: str, error: Optional[str] = None):
+        """记录运行结束状态"""
+        with self._lock:
+            self.data.update({"status": status, "finished": time.time(), "error": error})
+            self._write()
+
+    # ------------------------------------------------------------------
+
+    @property
+    def workflow(self) -> str:
+        return self.data.get("workflow", "")
+
+    @property
+    def status(self) -> str:
+        return self.data.get("status", "")
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        return dict(self.data.get("config", {}))
+
+    @property
+    def connectors(self) -> Dict[str, Optional[str]]:
+        return dict(self.data.get("connectors", {}))
+
+    def graph(self) -> WorkflowGraph:
+        """由日志恢复工作流图"""
+        graph = WorkflowGraph()
+        for node in self.data.get("graph", []):
+            graph.add_step(
+                node["name"],
+                node["module"],
+                node["action"],
+                node.get("inputs"),
+                node.get("config"),
+                node.get("branches"),
+            )
+        return graph
+
+    def step_status(self, name: str) -> Optional[str]:
+        return self.data.get("steps", {}).get(name, {}).get("status")
+
+    def first_incomplete(self) -> Optional[str]:
+        """按图顺序第一个未完成的步骤（全部完成时为 None）"""
+        for name in self.graph().topological_order():
+            if self.step_status(name) not in DONE_STATUSES:
+                return name
+        return None
+
+    def _write(self):
+        try:
+            self.run_dir.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.data, f, ensure_ascii=False, indent=2, default=str)
+            os.replace(tmp, self.path)
+        except (OSError, TypeError, ValueError):
+            pass
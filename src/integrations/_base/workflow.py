@@ -2,16 +2,26 @@
 工作流引擎 - 管理CAD到CAE的完整分析流程
 
 此模块提供标准化的仿真工作流管理，包括异常处理、
-进度跟踪和结果收集。
+进度跟踪和结果收集。工作流按有向无环图执行，指纹未变化的步骤直接复用上次的结果。
 """
 
+import os
+import threading
 import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import nullcontext
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 from .connectors import CADConnector, CAEConnector
+from .journal import RunJournal, connector_path, load_connector
+from .workflow_graph import CACHE_FILE_NAME, StepCache, StepSpec, WorkflowGraph, fingerprint
+
+# 求解结果文件扩展名（按优先级）
+RESULT_EXTENSIONS = [".vtk", ".frd", ".rst", ".odb"]
 
 
 class WorkflowStatus(Enum):
@@ -20,6 +30,7 @@ class WorkflowStatus(Enum):
     PENDING = "pending"
     RUNNING = "running"
     COMPLETED = "completed"
+    SKIPPED = "skipped"
     FAILED = "failed"
     CANCELLED = "cancelled"
 
@@ -35,6 +46,7 @@ class WorkflowStep:
     end_time: Optional[float] = None
     error: Optional[str] = None
     result: Optional[Any] = None
+    fingerprint: Optional[str] = None
 
 
 class WorkflowEngine:
@@ -52,6 +64,14 @@ class WorkflowEngine:
     - cae.setup: 设置仿真
     - cae.solve: 求解仿真
     - postprocess.extract: 提取结果
+
+    每个步骤声明输入/输出槽位（见 ``workflow_graph.ACTION_SPECS``），线性步骤列表
+    按槽位自动连接成图。步骤指纹（输入 + 配置 + 工具版本）与输出目录中
+    ``.workflow_cache.json`` 的记录一致时跳过该步骤，例如只修改 ``loads`` 时
+    不会重新导出STEP或重新划分网格。
+
+    互不依赖的分支并发执行（见 :meth:`run_branches`）：多个分析、载荷工况或
+    材料方案共享上游的CAD导出与网格，只有各自的设置、求解和后处理分别执行。
     """
 
     # 预定义工作流
@@ -84,21 +104,50 @@ class WorkflowEngine:
         ],
     }
 
-    def __init__(self, cad_connector: CADConnector, cae_connector: CAEConnector):
+    def __init__(
+        self,
+        cad_connector: CADConnector,
+        cae_connector: CAEConnector,
+        mesher_connector: Optional[CAEConnector] = None,
+        incremental: bool = True,
+    ):
         """初始化工作流引擎
 
         Args:
             cad_connector: CAD连接器实例
             cae_connector: CAE连接器实例
+            mesher_connector: 独立的网格生成连接器（可选，默认由CAE连接器生成网格）
+            incremental: 是否跳过指纹未变化的步骤
         """
         self.cad_connector = cad_connector
         self.cae_connector = cae_connector
+        self.mesher_connector = mesher_connector
+        self.incremental = incremental
         self.steps: List[WorkflowStep] = []
         self.current_step: Optional[WorkflowStep] = None
         self.status: WorkflowStatus = WorkflowStatus.PENDING
         self.results: Dict[str, Any] = {}
         self.progress_callback: Optional[Callable[[str, float], None]] = None
 
+        # 单次运行内的图、步骤输出与缓存
+        self._graph: Optional[WorkflowGraph] = None
+        self._config: Dict[str, Any] = {}
+        self._cache: Optional[StepCache] = None
+        self._outputs: Dict[str, Dict[str, Any]] = {}
+        self._records: Dict[str, WorkflowStep] = {}
+        self._executed = set()
+        self._dependents: Dict[str, List[str]] = {}
+        # 连接器模块 -> 当前会话状态对应的步骤
+        self._session: Dict[str, str] = {}
+        # 连接器 -> 软件版本（按引擎缓存）
+        self._tool_versions: Dict[int, Dict[str, Any]] = {}
+        self._cad_lock = threading.RLock()
+        self._mesher_lock = threading.RLock()
+        self._setup_lock = threading.RLock()
+        self._results_lock = threading.Lock()
+        self._journal: Optional[RunJournal] = None
+        self._resuming = False
+
     def set_progress_callback(self, callback: Callable[[str, float], None]):
         """设置进度回调函数
 
@@ -140,6 +189,7 @@ class WorkflowEngine:
         step.status = WorkflowStatus.RUNNING
         step.start_time = time.time()
         self.current_step = step
+        self._journal_step(step)
         self._update_progress(f"开始: {step.description}", 0.0)
 
     def _complete_step(self, step: WorkflowStep, result: Optional[Any] = None):
@@ -153,8 +203,22 @@ class WorkflowEngine:
         step.end_time = time.time()
         step.result = result
         self.current_step = None
+        self._journal_step(step)
         self._update_progress(f"完成: {step.description}", 1.0)
 
+    def _skip_step(self, step: WorkflowStep, result: Optional[Any] = None):
+        """标记步骤因指纹未变化而跳过
+
+        Args:
+            step: 跳过的步骤
+            result: 上次执行的结果
+        """
+        step.status = WorkflowStatus.SKIPPED
+        step.start_time = step.end_time = time.time()
+        step.result = result
+        self._journal_step(step)
+        self._update_progress(f"跳过（未变化）: {step.description}", 1.0)
+
     def _fail_step(self, step: WorkflowStep, error: str):
         """标记步骤失败
 
@@ -166,8 +230,14 @@ class WorkflowEngine:
         step.end_time = time.time()
         step.error = error
         self.current_step = None
+        self._journal_step(step)
         self._update_progress(f"失败: {step.description} - {error}", 0.0)
 
+    def _journal_step(self, step: WorkflowStep):
+        """将步骤状态与产物写入运行日志"""
+        if self._journal is not None:
+            self._journal.update_step(step, self._outputs.get(step.name))
+
     def run_static_analysis(
         self,
         cad_file: Path,
@@ -229,83 +299,410 @@ class WorkflowEngine:
         self,
         workflow_name: str,
         config: Dict[str, Any],
-        custom_steps: Optional[List[Tuple[str, str]]] = None,
+        custom_steps: Optional[Union[List[Tuple[str, str]], WorkflowGraph]] = None,
+        force: bool = False,
+        max_workers: Optional[int] = None,
     ) -> Dict[str, Any]:
         """运行工作流（预定义或自定义）
 
+        互不依赖的步骤（如不同分支的求解）由有界线程池并发执行。
+
         Args:
             workflow_name: 工作流名称或自定义工作流标识
             config: 工作流配置字典
-            custom_steps: 自定义步骤列表，格式为[(模块, 操作), ...]
+            custom_steps: 自定义步骤列表，格式为[(模块, 操作), ...]，或 WorkflowGraph
+            force: 忽略步骤缓存，重新执行所有步骤
+            max_workers: 最大并发步骤数（None 为CPU核数）
 
         Returns:
-            Dict[str, Any]: 包含工作流结果的字典
+            Dict[str, Any]: 包含工作流结果的字典；分支工作流的 ``results`` 按分支名称分组
 
         Raises:
-            ValueError: 工作流名称无效时
+            ValueError: 工作流名称无效或工作流图无效时
             RuntimeError: 工作流执行失败时
         """
         # 获取工作流步骤定义
-        if custom_steps:
-            workflow_steps = custom_steps
+        if isinstance(custom_steps, WorkflowGraph):
+            graph = custom_steps
+        elif custom_steps:
+            graph = WorkflowGraph.from_steps(custom_steps)
         elif workflow_name in self.PREDEFINED_WORKFLOWS:
-            workflow_steps = self.PREDEFINED_WORKFLOWS[workflow_name]
+            graph = WorkflowGraph.from_steps(self.PREDEFINED_WORKFLOWS[workflow_name])
         else:
             raise ValueError(f"未知的工作流: {workflow_name}")
+        order = graph.topological_order()
 
         try:
             self.status = WorkflowStatus.RUNNING
-            output_dir = Path(config.get("output_dir", Path.cwd() / "workflow_output"))
+            output_dir = Path(config.get("output_dir") or Path.cwd() / "workflow_output")
             output_dir.mkdir(parents=True, exist_ok=True)
 
+            self.steps = []
+            self.results = {}
+            self._graph = graph
+            self._config = config
+            self._cache = StepCache(output_dir / CACHE_FILE_NAME)
+            self._outputs = {}
+            self._records = {}
+            self._executed = set()
+            self._session = {}
+            self._dependents = {name: [] for name in order}
+            for name in order:
+                for producer in graph.dependencies(name):
+                    self._dependents[producer].append(name)
+            for branch in graph.branches:
+                self.results.setdefault(branch, {})
+
+            for step_idx, name in enumerate(order):
+                spec = graph.steps[name]
+                step_desc = f"步骤 {step_idx + 1}/{len(order)}: {spec.module} -> {spec.action}"
+                self._records[name] = self._create_step(name, step_desc)
+
+            # 运行日志：同一工作流再次运行或恢复时沿用原日志的尝试次数，其它工作流的日志被覆盖
+            try:
+                self._journal = RunJournal.load(output_dir)
+            except (OSError, ValueError):
+                self._journal = RunJournal(output_dir)
+            connectors = {
+                "cad": connector_path(self.cad_connector),
+                "cae": connector_path(self.cae_connector),
+                "mesher": connector_path(self.mesher_connector),
+            }
+            self._journal.start(workflow_name, config, graph, connectors, [self._records[name] for name in order])
+
+            self._schedule(order, force, max_workers)
+
+            # 未被下游使用的会话状态步骤无需执行
+            for name in order:
+                if self._records[name].status == WorkflowStatus.PENDING:
+                    self._skip_step(self._records[name])
+
             # 存储中间文件路径
             intermediate_files = {}
-
-            for step_idx, (module, action) in enumerate(workflow_steps):
-                step_name = f"{module}.{action}"
-                step_desc = f"步骤 {step_idx + 1}/{len(workflow_steps)}: {module} -> {action}"
-
-                step = self._create_step(step_name, step_desc)
-                self._start_step(step)
-
-                try:
-                    # 根据模块和操作执行相应的方法
-                    if module == "cad":
-                        result = self._execute_cad_step(action, config, intermediate_files)
-                    elif module == "mesher":
-                        result = self._execute_mesher_step(action, config, intermediate_files)
-                    elif module == "cae":
-                        result = self._execute_cae_step(action, config, intermediate_files)
-                    elif module == "postprocess":
-                        result = self._execute_postprocess_step(action, config, intermediate_files)
-                    else:
-                        raise ValueError(f"未知的模块: {module}")
-
-                    self._complete_step(step, result)
-                    if result and isinstance(result, dict) and "file" in result:
-                        intermediate_files[step_name] = result["file"]
-
-                except Exception as e:
-                    self._fail_step(step, str(e))
-                    raise
+            for name in order:
+                result = self._records[name].result
+                if isinstance(result, dict) and result.get("file"):
+                    intermediate_files[name] = Path(result["file"])
 
             # 工作流完成
             self.status = WorkflowStatus.COMPLETED
+            self._journal.finish(self.status.value)
             return {
                 "status": "completed",
                 "workflow": workflow_name,
                 "steps": self.steps,
                 "results": self.results,
+                "branches": graph.branches,
                 "intermediate_files": intermediate_files,
                 "output_dir": str(output_dir),
+                "executed": [name for name in order if name in self._executed],
+                "skipped": [name for name in order if self._records[name].status == WorkflowStatus.SKIPPED],
+                "journal": str(self._journal.path),
             }
 
         except Exception as e:
-            self.status = WorkflowStatus.FAILED
-            raise RuntimeError(f"工作流执行失败: {e}")
+            if self.status != WorkflowStatus.CANCELLED:
+                self.status = WorkflowStatus.FAILED
+            if self._journal is not None:
+                self._journal.finish(self.status.value, str(e))
+            raise RuntimeError(f"工作流执行失败: {e}") from e
+        finally:
+            self._journal = None
+
+    @classmethod
+    def from_journal(cls, run_dir: Union[str, Path]) -> "WorkflowEngine":
+        """按运行日志中记录的连接器类型创建引擎（只接受 CADConnector/CAEConnector 子类，需支持无参构造）
+
+        Raises:
+            FileNotFoundError: 目录中没有运行日志时
+            ValueError: 日志或连接器无效时
+        """
+        connectors = RunJournal.load(run_dir).connectors
+        return cls(
+            load_connector(connectors.get("cad")),
+            load_connector(connectors.get("cae")),
+            load_connector(connectors.get("mesher")),
+        )
+
+    def resume(self, run_dir: Union[str, Path], max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """从运行日志恢复中断或失败的工作流
+
+        按日志恢复工作流图与配置重新运行：已完成步骤的指纹与步骤缓存一致，直接复用，
+        从第一个未完成的步骤继续（与 ``incremental`` 设置无关）。
+
+        Args:
+            run_dir: 上次运行的输出目录
+            max_workers: 最大并发步骤数
+
+        Returns:
+            Dict[str, Any]: 工作流结果
+
+        Raises:
+            FileNotFoundError: 目录中没有运行日志时
+            RuntimeError: 工作流执行失败时
+        """
+        journal = RunJournal.load(run_dir)
+        config = journal.config
+        config["output_dir"] = str(Path(run_dir))
+        self._resuming = True
+        try:
+            return self.run_workflow(journal.workflow, config, journal.graph(), max_workers=max_workers)
+        finally:
+            self._resuming = False
+
+    def run_branches(
+        self,
+        config: Dict[str, Any],
+        branches: Optional[Dict[str, Dict[str, Any]]] = None,
+        analyses: Sequence[str] = ("stress_analysis",),
+        force: bool = False,
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """在同一几何与网格上并发运行多个分支
+
+        几何与网格步骤取自第一个分析，所有分支共享；各分析从网格之后的步骤开始分叉，
+        每个分支再叠加自己的配置覆盖。10个载荷工况只导出、划分网格一次，然后并发求解::
+
+            engine.run_branches(config, {f"lc{i}": {"loads": loads} for i, loads in enumerate(cases, 1)})
+
+        Args:
+            config: 公共工作流配置
+            branches: 分支名称 -> 配置覆盖（载荷工况的 ``loads``、材料方案的 ``material`` 等）
+            analyses: 预定义分析名称（多个分析时分支名称为 ``分析/分支``）
+            force: 忽略步骤缓存
+            max_workers: 最大并发步骤数
+
+        Returns:
+            Dict[str, Any]: 工作流结果，``results`` 按分支名称分组
+
+        Raises:
+            ValueError: 分析名称无效时
+            RuntimeError: 工作流执行失败时
+        """
+        unknown = [name for name in analyses if name not in self.PREDEFINED_WORKFLOWS]
+        if unknown or not analyses:
+            raise ValueError(f"未知的工作流: {', '.join(unknown)}")
+
+        geometry = self._geometry_steps(analyses[0])
+        variants = branches or {"": {}}
+        specs = {}
+        for analysis in analyses:
+            steps = self.PREDEFINED_WORKFLOWS[analysis]
+            steps = geometry + steps[len(self._geometry_steps(analysis)) :]
+            for variant, overrides in variants.items():
+                name = "/".join(part for part in (analysis if len(analyses) > 1 else "", variant) if part)
+                specs[name or analysis] = (steps, overrides)
+
+        graph = WorkflowGraph.from_branches(specs, config)
+        return self.run_workflow("+".join(analyses), config, graph, force=force, max_workers=max_workers)
+
+    def _geometry_steps(self, analysis: str) -> List[Tuple[str, str]]:
+        """预定义分析中截至网格生成（含）的步骤"""
+        steps = self.PREDEFINED_WORKFLOWS[analysis]
+        for index, (module, _) in enumerate(steps):
+            if module == "mesher":
+                return list(steps[: index + 1])
+        return []
+
+    def _schedule(self, order: List[str], force: bool, max_workers: Optional[int]):
+        """按依赖关系调度步骤：上游全部完成的步骤提交到线程池；任一步骤失败后不再提交新步骤"""
+        waiting = {name: len(self._graph.dependencies(name)) for name in order}
+        ready = deque(name for name in order if waiting[name] == 0)
+        running: Dict[Future, str] = {}
+        error: Optional[BaseException] = None
+        workers = max(1, max_workers or os.cpu_count() or 1)
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="workflow") as pool:
+            while ready or running:
+                while ready and error is None and self.status != WorkflowStatus.CANCELLED:
+                    name = ready.popleft()
+                    running[pool.submit(self._process_step, name, force)] = name
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        future.result()
+                    except Exception as e:
+                        error = error or e
+                        continue
+                    for dependent in self._dependents[name]:
+                        waiting[dependent] -= 1
+                        if waiting[dependent] == 0:
+                            ready.append(dependent)
+
+        if error is not None:
+            raise error
+        if self.status == WorkflowStatus.CANCELLED:
+            raise RuntimeError("工作流已取消")
+
+    def _process_step(self, name: str, force: bool):
+        """计算指纹，复用缓存或执行步骤"""
+        spec = self._graph.steps[name]
+        step = self._records[name]
+        step.fingerprint = self._step_fingerprint(spec)
+
+        record = None
+        if (self.incremental or self._resuming) and not force:
+            record = self._cache.lookup(name, step.fingerprint)
+        if record is not None:
+            self._restore_step(spec, step, record)
+        elif spec.spec.stateful and self._dependents[name]:
+            # 会话状态由下游步骤执行前按需重放（见 _realize_state）
+            return
+        else:
+            with self._step_lock(spec):
+                self._realize_state(spec)
+                self._execute_step(spec, step)
+
+    def _step_lock(self, spec: StepSpec):
+        """连接器会话、网格生成与仿真设置串行执行；求解与后处理可并发"""
+        if spec.module == "cad":
+            return self._cad_lock
+        if spec.module == "mesher":
+            return self._mesher_lock
+        if spec.module == "cae" and spec.action.startswith("setup_"):
+            return self._setup_lock
+        return nullcontext()
+
+    def _step_config(self, spec: StepSpec) -> Dict[str, Any]:
+        """工作流配置叠加步骤级覆盖"""
+        return {**self._config, **spec.config} if spec.config else self._config
+
+    def _step_inputs(self, spec: StepSpec) -> Dict[str, Any]:
+        """从上游步骤输出中取出本步骤的输入"""
+        return {slot: self._outputs[producer].get(slot) for slot, producer in spec.inputs.items()}
+
+    def _step_fingerprint(self, spec: StepSpec) -> str:
+        """步骤指纹：操作 + 相关配置 + 工具版本 + 输入（文件取内容哈希，会话状态取上游指纹）"""
+        action = spec.spec
+        config = self._step_config(spec)
+        inputs = {}
+        for slot, producer in spec.inputs.items():
+            value = self._outputs.get(producer, {}).get(slot)
+            if self._graph.steps[producer].spec.outputs.get(slot) is not None and value is not None:
+                inputs[slot] = self._cache.file_hash(value) or str(value)
+            else:
+                inputs[slot] = self._records[producer].fingerprint
+        sources = {}
+        for key in action.source_files:
+            if config.get(key):
+                sources[key] = self._cache.file_hash(config[key])
+        return fingerprint(
+            {
+                "step": f"{spec.module}.{spec.action}",
+                "config": {key: config.get(key) for key in action.config_keys},
+                "sources": sources,
+                "tool": self._tool_version(spec.module),
+                "inputs": inputs,
+            }
+        )
+
+    def _tool_version(self, module: str) -> Any:
+        """连接器类型与软件版本（版本变化时指纹随之变化）
+
+        版本需要查询外部工具（如 ``ccx -v``），每个连接器在引擎内只查询一次。
+        """
+        connector = {
+            "cad": self.cad_connector,
+            "mesher": self.mesher_connector or self.cae_connector,
+        }.get(module, self.cae_connector)
+        key = id(connector)
+        if key not in self._tool_versions:
+            try:
+                version = connector.get_version()
+            except Exception:
+                version = None
+            self._tool_versions[key] = {"class_name": connector.__class__.__name__, "version": version}
+        return self._tool_versions[key]
+
+    def _realize_state(self, spec: StepSpec):
+        """执行前恢复上游会话状态
+
+        会话状态（如CAD中加载、设参并重建的模型）只有一份：连接器当前状态不是
+        所需上游步骤产生的状态时，从该状态链的起点（如 ``load_model``）起重放。
+        调用方持有对应连接器的锁，重放与本步骤的执行不会被其他分支打断。
+        """
+        for slot, producer in spec.inputs.items():
+            upstream = self._graph.steps[producer]
+            if upstream.spec.outputs.get(slot, "") is not None:
+                continue
+            if self._session.get(upstream.module) == producer:
+                continue
+            chain = [upstream]
+            while True:
+                parents = [
+                    self._graph.steps[name]
+                    for slot_name, name in chain[0].inputs.items()
+                    if self._graph.steps[name].spec.outputs.get(slot_name, "") is None
+                ]
+                if not parents:
+                    break
+                chain.insert(0, parents[0])
+            for state_step in chain:
+                with self._step_lock(state_step):
+                    self._execute_step(state_step, self._records[state_step.name])
+
+    def _execute_step(self, spec: StepSpec, step: WorkflowStep):
+        """执行步骤并记录输出与缓存"""
+        self._start_step(step)
+        config = self._step_config(spec)
+        inputs = self._step_inputs(spec)
+        try:
+            Path(config.get("output_dir") or Path.cwd() / "workflow_output").mkdir(parents=True, exist_ok=True)
+            # 根据模块和操作执行相应的方法
+            if spec.module == "cad":
+                result = self._execute_cad_step(spec.action, config, inputs)
+            elif spec.module == "mesher":
+                result = self._execute_mesher_step(spec.action, config, inputs)
+            elif spec.module == "cae":
+                result = self._execute_cae_step(spec.action, config, inputs)
+            elif spec.module == "postprocess":
+                result = self._execute_postprocess_step(spec.action, config, inputs)
+                self._collect_results(spec, result)
+            else:
+                raise ValueError(f"未知的模块: {spec.module}")
+        except Exception as e:
+            self._fail_step(step, str(e))
+            raise
+
+        outputs = {}
+        for slot, key in spec.spec.outputs.items():
+            value = result.get(key) if key is not None and isinstance(result, dict) else None
+            outputs[slot] = Path(value) if value is not None else None
+        self._outputs[spec.name] = outputs
+        self._executed.add(spec.name)
+        if spec.spec.stateful:
+            self._session[spec.module] = spec.name
+        self._complete_step(step, result)
+        files = {slot: path for slot, path in outputs.items() if spec.spec.outputs[slot] is not None}
+        self._cache.store(spec.name, step.fingerprint, result, files)
+
+    def _restore_step(self, spec: StepSpec, step: WorkflowStep, record: Dict[str, Any]):
+        """复用缓存记录：恢复输出文件路径与结果"""
+        outputs = dict.fromkeys(spec.spec.outputs)
+        for slot, (path, _) in record.get("files", {}).items():
+            outputs[slot] = Path(path) if path is not None else None
+        self._outputs[spec.name] = outputs
+        result = record.get("result")
+        if spec.module == "postprocess":
+            self._collect_results(spec, result)
+        self._skip_step(step, result)
+
+    def _collect_results(self, spec: StepSpec, result: Optional[Dict[str, Any]]):
+        """后处理结果写入 ``self.results``（分支工作流按分支分组）"""
+        if not isinstance(result, dict):
+            return
+        with self._results_lock:
+            if spec.branches:
+                for branch in spec.branches:
+                    self.results.setdefault(branch, {}).update(result)
+            else:
+                self.results.update(result)
 
     def _execute_cad_step(
-        self, action: str, config: Dict[str, Any], files: Dict[str, Path]
+        self, action: str, config: Dict[str, Any], inputs: Dict[str, Any]
     ) -> Optional[Dict[str, Any]]:
         """执行CAD相关步骤"""
         cad_file = Path(config.get("cad_file", ""))
@@ -330,7 +727,7 @@ class WorkflowEngine:
             return {"status": "rebuilt"}
 
         elif action == "export_step":
-            output_dir = Path(config.get("output_dir", Path.cwd() / "workflow_output"))
+            output_dir = Path(config.get("output_dir") or Path.cwd() / "workflow_output")
             step_file = output_dir / "model.step"
             if not self.cad_connector.export_step(step_file):
                 raise RuntimeError("STEP导出失败")
@@ -340,32 +737,25 @@ class WorkflowEngine:
             raise ValueError(f"未知的CAD操作: {action}")
 
     def _execute_mesher_step(
-        self, action: str, config: Dict[str, Any], files: Dict[str, Path]
+        self, action: str, config: Dict[str, Any], inputs: Dict[str, Any]
     ) -> Optional[Dict[str, Any]]:
         """执行网格生成步骤"""
         if action == "generate_mesh":
-            # 查找上一步的STEP文件
-            step_file = None
-            for step_name, file_path in files.items():
-                if step_name.endswith("export_step") or file_path.suffix.lower() in [
-                    ".step",
-                    ".stp",
-                ]:
-                    step_file = file_path
-                    break
-
+            # 上游导出的STEP文件
+            step_file = inputs.get("geometry")
             if not step_file or not step_file.exists():
                 raise RuntimeError("未找到STEP文件用于网格生成")
 
-            # 连接到CAE软件进行网格生成
-            if not self.cae_connector.connect():
+            # 连接到网格生成器（未提供时由CAE软件生成网格）
+            mesher = self.mesher_connector or self.cae_connector
+            if not mesher.connect():
                 raise RuntimeError("CAE连接失败")
 
-            output_dir = Path(config.get("output_dir", Path.cwd() / "workflow_output"))
+            output_dir = Path(config.get("output_dir") or Path.cwd() / "workflow_output")
             mesh_file = output_dir / "mesh.msh"
             element_size = config.get("mesh_element_size", 2.0)
 
-            if not self.cae_connector.generate_mesh(step_file, mesh_file, element_size):
+            if not mesher.generate_mesh(step_file, mesh_file, element_size):
                 raise RuntimeError("网格生成失败")
 
             return {"file": mesh_file, "element_size": element_size}
@@ -374,22 +764,14 @@ class WorkflowEngine:
             raise ValueError(f"未知的网格生成操作: {action}")
 
     def _execute_cae_step(
-        self, action: str, config: Dict[str, Any], files: Dict[str, Path]
+        self, action: str, config: Dict[str, Any], inputs: Dict[str, Any]
     ) -> Optional[Dict[str, Any]]:
         """执行CAE相关步骤"""
         if action.startswith("setup_"):
             analysis_type = action.replace("setup_", "")
 
-            # 查找网格文件
-            mesh_file = None
-            for step_name, file_path in files.items():
-                if step_name.endswith("generate_mesh") or file_path.suffix.lower() in [
-                    ".msh",
-                    ".inp",
-                ]:
-                    mesh_file = file_path
-                    break
-
+            # 上游生成的网格文件
+            mesh_file = inputs.get("mesh")
             if not mesh_file or not mesh_file.exists():
                 raise RuntimeError("未找到网格文件用于仿真设置")
 
@@ -404,72 +786,56 @@ class WorkflowEngine:
                 "loads": config.get("loads", []),
                 "constraints": config.get("constraints", []),
                 "solver_settings": config.get("solver_settings", {}),
+                # 输入文件写入本步骤的输出目录，并发分支互不覆盖
+                "work_dir": Path(config.get("output_dir") or Path.cwd() / "workflow_output"),
             }
 
             input_file = self.cae_connector.setup_simulation(mesh_file, sim_config)
             return {"file": input_file, "analysis_type": analysis_type}
 
         elif action == "solve":
-            # 查找输入文件
-            input_file = None
-            for step_name, file_path in files.items():
-                if step_name.startswith("cae.setup_") or file_path.suffix.lower() in [
-                    ".inp",
-                    ".dat",
-                ]:
-                    input_file = file_path
-                    break
-
+            # 上游生成的输入文件
+            input_file = inputs.get("input_file")
             if not input_file or not input_file.exists():
                 raise RuntimeError("未找到输入文件用于仿真求解")
 
-            output_dir = Path(config.get("output_dir", Path.cwd() / "workflow_output"))
+            output_dir = Path(config.get("output_dir") or Path.cwd() / "workflow_output")
             if not self.cae_connector.run_simulation(input_file, output_dir):
                 raise RuntimeError("仿真求解失败")
 
-            return {"status": "solved", "input_file": input_file}
+            return {
+                "status": "solved",
+                "input_file": input_file,
+                "result_file": self._find_result_file(output_dir, input_file),
+            }
 
         else:
             raise ValueError(f"未知的CAE操作: {action}")
 
+    @staticmethod
+    def _find_result_file(output_dir: Path, input_file: Path) -> Optional[Path]:
+        """查找求解生成的结果文件：``results.*``、与输入文件同名的结果或模态结果"""
+        candidates = [output_dir / f"results{ext}" for ext in RESULT_EXTENSIONS]
+        candidates += [output_dir / f"{input_file.stem}{ext}" for ext in RESULT_EXTENSIONS]
+        candidates.append(output_dir / "modal_results.json")
+        return next((path for path in candidates if path.exists()), None)
+
     def _execute_postprocess_step(
-        self, action: str, config: Dict[str, Any], files: Dict[str, Path]
+        self, action: str, config: Dict[str, Any], inputs: Dict[str, Any]
     ) -> Optional[Dict[str, Any]]:
         """执行后处理步骤"""
-        if action == "extract_stress":
-            # 查找结果文件（假设为VTK格式）
-            result_file = None
-            output_dir = Path(config.get("output_dir", Path.cwd() / "workflow_output"))
-
-            # 尝试查找结果文件
-            for ext in [".vtk", ".frd", ".rst", ".odb"]:
-                potential_file = output_dir / f"results{ext}"
-                if potential_file.exists():
-                    result_file = potential_file
-                    break
+        result_file = inputs.get("results")
 
-            if not result_file:
-                # 查找最近创建的仿真相关文件
-                for step_name, file_path in files.items():
-                    if file_path.suffix.lower() in [".vtk", ".frd", ".rst", ".odb"]:
-                        result_file = file_path
-                        break
-
-            if not result_file or not result_file.exists():
+        if action == "extract_stress":
+            if not result_file or result_file.suffix.lower() not in RESULT_EXTENSIONS or not result_file.exists():
                 raise RuntimeError("未找到结果文件用于后处理")
 
-            results = self.cae_connector.read_results(result_file)
-            self.results.update(results)
-            return results
+            return self.cae_connector.read_results(result_file)
 
         elif action == "extract_frequencies":
             # 模态分析结果提取
-            output_dir = Path(config.get("output_dir", Path.cwd() / "workflow_output"))
-            result_file = output_dir / "modal_results.json"
-            if result_file and result_file.exists():
-                results = self.cae_connector.read_results(result_file)
-                self.results.update(results)
-                return results
+            if result_file and result_file.suffix.lower() == ".json" and result_file.exists():
+                return self.cae_connector.read_results(result_file)
             else:
                 # 返回模拟结果
                 return {"natural_frequencies": [10.5, 25.3, 42.8, 67.1]}
@@ -0,0 +1,378 @@
+"""
+工作流有向无环图（DAG）与步骤级缓存
+
+工作流由带类型的步骤组成，每个步骤声明输入/输出槽位：
+
+- 输入槽位绑定到上游步骤的同名输出，而不是按文件后缀在中间文件中查找
+- 输出槽位要么是文件（结果字典中的某个键给出路径），要么是连接器会话状态
+  （如CAD中已加载并重建的模型，不落盘）
+
+每个步骤的指纹由操作名、相关配置项、工具版本和输入组成：文件输入取内容哈希，
+状态输入取上游步骤指纹。指纹与记录一致且输出文件未变化时，步骤可以跳过；
+只修改 ``loads`` 时，只有仿真设置及其下游步骤会重新执行。
+
+多个分支（分析类型、载荷工况、材料方案）合并为一张图时，操作、输入与相关配置
+都相同的步骤只保留一个，由各分支共享；10个载荷工况只划分一次网格。
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+# 缓存格式版本，指纹或记录格式变化时递增（2：不再记录修改时间过近的文件哈希）
+CACHE_FORMAT_VERSION = 2
+
+CACHE_FILE_NAME = ".workflow_cache.json"
+
+
+@dataclass(frozen=True)
+class ActionSpec:
+    """步骤类型声明
+
+    Attributes:
+        inputs: 输入槽位
+        outputs: 输出槽位 -> 结果字典中给出文件路径的键（None 表示连接器会话状态）
+        config_keys: 参与指纹计算的配置项
+        source_files: 以文件内容哈希参与指纹计算的配置项（如 ``cad_file``）
+    """
+
+    inputs: Tuple[str, ...] = ()
+    outputs: Dict[str, Optional[str]] = field(default_factory=dict)
+    config_keys: Tuple[str, ...] = ()
+    source_files: Tuple[str, ...] = ()
+
+    @property
+    def stateful(self) -> bool:
+        """是否产生会话状态（跳过后若下游需要执行，必须重新执行以恢复状态）"""
+        return any(key is None for key in self.outputs.values())
+
+
+_MODEL = {"model": None}
+
+# 标准步骤类型；``cae.setup_*`` 对所有分析类型通用
+ACTION_SPECS: Dict[Tuple[str, str], ActionSpec] = {
+    ("cad", "load_model"): ActionSpec(outputs=_MODEL, config_keys=("cad_file",), source_files=("cad_file",)),
+    ("cad", "set_parameters"): ActionSpec(inputs=("model",), outputs=_MODEL, config_keys=("parameters",)),
+    ("cad", "rebuild"): ActionSpec(inputs=("model",), outputs=_MODEL),
+    ("cad", "export_step"): ActionSpec(inputs=("model",), outputs={"geometry": "file"}),
+    ("mesher", "generate_mesh"): ActionSpec(
+        inputs=("geometry",), outputs={"mesh": "file"}, config_keys=("mesh_element_size",)
+    ),
+    ("cae", "setup_*"): ActionSpec(
+        inputs=("mesh",),
+        outputs={"input_file": "file"},
+        config_keys=("material", "loads", "constraints", "solver_settings"),
+    ),
+    ("cae", "solve"): ActionSpec(inputs=("input_file",), outputs={"results": "result_file"}),
+    ("postprocess", "extract_stress"): ActionSpec(inputs=("results",)),
+    ("postprocess", "extract_frequencies"): ActionSpec(inputs=("results",)),
+    ("postprocess", "extract_optimized_shape"): ActionSpec(inputs=("results",)),
+}
+
+
+def action_spec(module: str, action: str) -> ActionSpec:
+    """查找步骤类型（未知操作返回无输入输出的声明，执行时再报错）"""
+    spec = ACTION_SPECS.get((module, action))
+    if spec is None and "_" in action:
+        spec = ACTION_SPECS.get((module, action.split("_", 1)[0] + "_*"))
+    return spec or ActionSpec()
+
+
+@dataclass
+class StepSpec:
+    """工作流图中的步骤
+
+    Attributes:
+        name: 步骤名称（图内唯一）
+        module: 模块（cad/mesher/cae/postprocess）
+        action: 操作
+        inputs: 输入槽位 -> 提供该槽位的上游步骤名称
+        config: 覆盖工作流配置的步骤级配置
+        branches: 使用该步骤的分支（空表示不分支的工作流）
+    """
+
+    name: str
+    module: str
+    action: str
+    inputs: Dict[str, str] = field(default_factory=dict)
+    config: Dict[str, Any] = field(default_factory=dict)
+    branches: List[str] = field(default_factory=list)
+
+    @property
+    def spec(self) -> ActionSpec:
+        return action_spec(self.module, self.action)
+
+
+class WorkflowGraph:
+    """工作流有向无环图"""
+
+    def __init__(self):
+        self.steps: Dict[str, StepSpec] = {}
+
+    def add_step(
+        self,
+        name: str,
+        module: str,
+        action: str,
+        inputs: Optional[Dict[str, str]] = None,
+        config: Optional[Dict[str, Any]] = None,
+        branches: Optional[List[str]] = None,
+    ) -> StepSpec:
+        """添加步骤
+
+        Args:
+            name: 步骤名称
+            module: 模块
+            action: 操作
+            inputs: 输入槽位 -> 上游步骤名称
+            config: 步骤级配置覆盖
+            branches: 使用该步骤的分支
+
+        Raises:
+            ValueError: 步骤名称重复时
+        """
+        if name in self.steps:
+            raise ValueError(f"步骤名称重复: {name}")
+        step = StepSpec(name, module, action, dict(inputs or {}), dict(config or {}), list(branches or []))
+        self.steps[name] = step
+        return step
+
+    @classmethod
+    def from_steps(cls, steps: Sequence[Tuple[str, str]]) -> "WorkflowGraph":
+        """由线性步骤列表 ``[(模块, 操作), ...]`` 构建图
+
+        每个输入槽位绑定到之前最近一个提供该槽位的步骤；步骤名称为 ``模块.操作``，
+        重复时追加序号（``cae.solve#2``）。
+        """
+        graph = cls()
+        producers: Dict[str, str] = {}
+        for module, action in steps:
+            name = f"{module}.{action}"
+            index = 2
+            while name in graph.steps:
+                name = f"{module}.{action}#{index}"
+                index += 1
+            spec = action_spec(module, action)
+            inputs = {slot: producers[slot] for slot in spec.inputs if slot in producers}
+            graph.add_step(name, module, action, inputs)
+            producers.update((slot, name) for slot in spec.outputs)
+        return graph
+
+    @classmethod
+    def from_branches(
+        cls,
+        branches: Dict[str, Tuple[Sequence[Tuple[str, str]], Dict[str, Any]]],
+        config: Dict[str, Any],
+    ) -> "WorkflowGraph":
+        """由多个分支构建共享上游步骤的图
+
+        Args:
+            branches: 分支名称 -> (线性步骤列表, 分支配置覆盖)
+            config: 工作流配置
+
+        操作、输入与相关配置（``config_keys``）均相同的步骤合并为一个节点。
+        所有分支共享的节点命名为 ``模块.操作``；其余节点命名为 ``分支/模块.操作``，
+        输出写入 ``output_dir/分支``，避免并发分支互相覆盖文件。
+        """
+        nodes: Dict[str, Dict[str, Any]] = {}
+        for branch, (steps, overrides) in branches.items():
+            effective = {**config, **overrides}
+            producers: Dict[str, str] = {}
+            for module, action in steps:
+                spec = action_spec(module, action)
+                keys = spec.config_keys + spec.source_files
+                inputs = {slot: producers[slot] for slot in spec.inputs if slot in producers}
+                key = fingerprint([module, action, inputs, {k: effective.get(k) for k in keys}])
+                node = nodes.setdefault(
+                    key,
+                    {
+                        "module": module,
+                        "action": action,
+                        "inputs": inputs,
+                        "config": {k: v for k, v in overrides.items() if k in keys},
+                        "branches": [],
+                    },
+                )
+                if branch not in node["branches"]:
+                    node["branches"].append(branch)
+                producers.update((slot, key) for slot in spec.outputs)
+
+        graph = cls()
+        names: Dict[str, str] = {}
+        output_dir = Path(config.get("output_dir") or Path.cwd() / "workflow_output")
+        for key, node in nodes.items():
+            step_config = dict(node["config"])
+            base = f"{node['module']}.{node['action']}"
+            if len(node["branches"]) < len(branches):
+                base = f"{node['branches'][0]}/{base}"
+                step_config["output_dir"] = str(output_dir / node["branches"][0])
+            name, index = base, 2
+            while name in graph.steps:
+                name = f"{base}#{index}"
+                index += 1
+            names[key] = name
+            inputs = {slot: names[producer] for slot, producer in node["inputs"].items()}
+            graph.add_step(name, node["module"], node["action"], inputs, step_config, node["branches"])
+        return graph
+
+    @property
+    def branches(self) -> List[str]:
+        """图中的分支（按首次出现顺序）"""
+        return list(dict.fromkeys(branch for step in self.steps.values() for branch in step.branches))
+
+    def dependencies(self, name: str) -> List[str]:
+        """步骤的直接上游（去重，保持声明顺序）"""
+        return list(dict.fromkeys(self.steps[name].inputs.values()))
+
+    def topological_order(self) -> List[str]:
+        """拓扑排序（同层保持添加顺序）
+
+        Raises:
+            ValueError: 引用未知步骤、输入槽位上游未提供或存在环时
+        """
+        indegree = dict.fromkeys(self.steps, 0)
+        dependents: Dict[str, List[str]] = {name: [] for name in self.steps}
+        for name, step in self.steps.items():
+            for slot, producer in step.inputs.items():
+                if producer not in self.steps:
+                    raise ValueError(f"步骤 {name} 的输入 {slot} 引用了未知步骤: {producer}")
+                if slot not in self.steps[producer].spec.outputs:
+                    raise ValueError(f"步骤 {producer} 不提供 {name} 所需的输入: {slot}")
+            for producer in self.dependencies(name):
+                indegree[name] += 1
+                dependents[producer].append(name)
+
+        ready = deque(name for name, degree in indegree.items() if degree == 0)
+        order = []
+        while ready:
+            name = ready.popleft()
+            order.append(name)
+            for dependent in dependents[name]:
+                indegree[dependent] -= 1
+                if indegree[dependent] == 0:
+                    ready.append(dependent)
+        if len(order) != len(self.steps):
+            cycle = sorted(name for name, degree in indegree.items() if degree > 0)
+            raise ValueError(f"工作流存在循环依赖: {', '.join(cycle)}")
+        return order
+
+
+def fingerprint(payload: Any) -> str:
+    """可JSON序列化结构的规范化哈希（与字典键顺序无关）"""
+    text = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _file_stamp(path: Path) -> Optional[List[int]]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+class StepCache:
+    """步骤级缓存：记录每个步骤的指纹、结果与输出文件
+
+    记录保存在工作流输出目录下的 ``.workflow_cache.json``。输出文件以大小与
+    修改时间校验；文件内容哈希按相同的校验信息缓存，未变化的文件不重复读取
+    （修改时间过近的文件不缓存哈希，见 :mod:`sw_helper.utils.hashing`）。
+
+    Args:
+        path: 缓存文件路径
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self.hashes: Dict[str, List[Any]] = {}
+        # 并发执行的分支共享同一缓存文件
+        self._lock = threading.RLock()
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_FORMAT_VERSION:
+                self.records = data.get("steps", {})
+                self.hashes = data.get("hashes", {})
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def file_hash(self, path: Union[str, Path]) -> Optional[str]:
+        """文件内容的SHA-256（文件不存在时为 None）"""
+        path = Path(path)
+        stamp = _file_stamp(path)
+        if stamp is None:
+            return None
+        key = str(path.resolve())
+        with self._lock:
+            cached = self.hashes.get(key)
+        if cached and cached[:2] == stamp:
+            return cached[2]
+        from sw_helper.utils.hashing import file_digest, is_settled
+
+        hashed_at = time.time_ns()
+        digest = file_digest(path)
+        # 刚写入的文件可能在同一时间戳粒度内再次改写，其哈希不写入缓存文件
+        if is_settled(stamp[1], hashed_at):
+            with self._lock:
+                self.hashes[key] = stamp + [digest]
+        return digest
+
+    def lookup(self, name: str, step_fingerprint: str) -> Optional[Dict[str, Any]]:
+        """指纹一致且输出文件均未变化时返回记录"""
+        record = self.records.get(name)
+        if not record or record.get("fingerprint") != step_fingerprint:
+            return None
+        for path, stamp in record.get("files", {}).values():
+            if path is not None and _file_stamp(Path(path)) != stamp:
+                return None
+        return record
+
+    def store(self, name: str, step_fingerprint: str, result: Any, files: Dict[str, Optional[Path]]):
+        """记录步骤结果，并立即写盘（中断后已完成的步骤仍可复用）"""
+        record = {
+            "fingerprint": step_fingerprint,
+            "result": json.loads(json.dumps(result, ensure_ascii=False, default=str)),
+            "files": {
+                slot: [str(path), _file_stamp(Path(path))] if path is not None else [None, None]
+                for slot, path in files.items()
+            },
+        }
+        with self._lock:
+            self.records[name] = record
+            self.save()
+
+    def save(self):
+        """原子写入缓存文件；目录不可写时静默跳过"""
+        with self._lock:
+            self._write()
+
+    def _write(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"version": CACHE_FORMAT_VERSION, "steps": self.records, "hashes": self.hashes},
+                    f,
+                    ensure_ascii=False,
+                    indent=1,
+                )
+            os.replace(tmp, self.path)
+        except (OSError, TypeError, ValueError):
+            pass
+
+    def clear(self):
+        """清空记录"""
+        self.records.clear()
+        self.hashes.clear()
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
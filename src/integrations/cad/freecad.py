@@ -166,6 +166,16 @@ class FreeCADConnector(CADConnector):
             FileFormat.FCSTD,
         ]
 
+    def get_version(self) -> Optional[str]:
+        """FreeCAD版本（如 "0.21.2"），未安装时返回None"""
+        app = self.fc_app
+        if app is None:
+            try:
+                import FreeCAD as app
+            except ImportError:
+                return None
+        return ".".join(str(part) for part in app.Version()[:3])
+
     # ========== 内部辅助方法（保持与旧代码兼容）==========
 
     def _get_parameters_internal(self) -> List[FCParameter]:
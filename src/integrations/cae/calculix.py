@@ -14,6 +14,8 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from .._base.connectors import CAEConnector
+from .frd_reader import summarize_frd
+from .job_runner import ccx_version
 
 
 class CalculiXConnector(CAEConnector):
@@ -75,31 +77,42 @@ class CalculiXConnector(CAEConnector):
     def setup_simulation(self, mesh_file: Path, config: Dict[str, Any]) -> Path:
         """设置仿真分析
 
-        根据配置创建CalculiX输入文件(.inp)
+        根据配置创建CalculiX输入文件(.inp)；``config["work_dir"]`` 指定时写入该目录，
+        否则写入连接器的临时工作目录
         """
         if not self.is_connected:
             if not self.connect():
                 raise RuntimeError("CalculiX未连接")
 
         try:
-            # 创建临时工作目录
-            if not self.work_dir:
-                self.work_dir = Path(tempfile.mkdtemp(prefix="calculix_"))
+            work_dir = config.get("work_dir")
+            if work_dir:
+                work_dir = Path(work_dir)
+                work_dir.mkdir(parents=True, exist_ok=True)
+            else:
+                # 创建临时工作目录
+                if not self.work_dir:
+                    self.work_dir = Path(tempfile.mkdtemp(prefix="calculix_"))
+                work_dir = self.work_dir
 
             # 生成输入文件名
-            input_file = self.work_dir / f"{mesh_file.stem}.inp"
+            input_file = work_dir / f"{mesh_file.stem}.inp"
 
             # 根据配置类型生成不同的输入文件
             analysis_type = config.get("analysis_type", "static")
+            if analysis_type not in ("static", "modal", "thermal"):
+                raise ValueError(f"不支持的分析类型: {analysis_type}")
+
+            # 网格放入工作目录，供 *INCLUDE 引用；截面材料与输入文件定义的材料一致
+            material_name = self._material_name(analysis_type, config)
+            mesh_include = self._prepare_mesh_include(mesh_file, work_dir, material=material_name)
 
             if analysis_type == "static":
-                inp_content = self._create_static_analysis(mesh_file, config)
+                inp_content = self._create_static_analysis(mesh_include, config)
             elif analysis_type == "modal":
-                inp_content = self._create_modal_analysis(mesh_file, config)
-            elif analysis_type == "thermal":
-                inp_content = self._create_thermal_analysis(mesh_file, config)
+                inp_content = self._create_modal_analysis(mesh_include, config)
             else:
-                raise ValueError(f"不支持的分析类型: {analysis_type}")
+                inp_content = self._create_thermal_analysis(mesh_include, config)
 
             # 写入输入文件
             with open(input_file, "w", encoding="utf-8") as f:
@@ -169,8 +182,7 @@ class CalculiXConnector(CAEConnector):
     def read_results(self, result_file: Path) -> Dict[str, Any]:
         """读取仿真结果
 
-        解析.frd结果文件，提取关键结果数据。
-        注意：完整解析.frd文件较复杂，这里只提取基本信息。
+        解析.frd结果文件，提取节点/单元数、分析步及位移、应力等极值。
         """
         try:
             if not result_file.exists():
@@ -191,10 +203,12 @@ class CalculiXConnector(CAEConnector):
             if result_file.suffix.lower() == ".frd":
                 results.update(self._parse_frd_file(result_file))
 
-            # 尝试解析.dat文件（如果有）
+            # 尝试解析.dat文件（如果有），.frd中已有的精确极值不被覆盖
             dat_file = result_file.with_suffix(".dat")
             if dat_file.exists():
-                results.update(self._parse_dat_file(dat_file))
+                for key, value in self._parse_dat_file(dat_file).items():
+                    if results.get(key) is None:
+                        results[key] = value
 
             return results
 
@@ -210,6 +224,10 @@ class CalculiXConnector(CAEConnector):
         """获取支持的分析类型"""
         return ["static", "modal", "thermal"]
 
+    def get_version(self) -> Optional[str]:
+        """ccx版本（``ccx -v``，按可执行文件缓存），未找到ccx时返回None"""
+        return ccx_version(str(self.ccx_path) if self.ccx_path else None) or None
+
     # ========== 内部辅助方法 ==========
 
     def _create_sample_inp(self, geometry_file: Path, element_size: float) -> str:
@@ -255,6 +273,37 @@ S
 *END STEP
 """
 
+    @staticmethod
+    def _material_name(analysis_type: str, config: Dict[str, Any]) -> str:
+        """输入文件中 ``*MATERIAL`` 定义的材料名"""
+        if analysis_type == "static":
+            return config.get("material", {}).get("name", "STEEL")
+        return "STEEL"
+
+    def _prepare_mesh_include(self, mesh_file: Path, work_dir: Optional[Path] = None, material: str = "STEEL") -> Path:
+        """将网格文件放入工作目录（默认为连接器的工作目录）
+
+        .msh 网格经二进制缓存读取并转换为 .inp（不启动gmsh运行时），
+        实体截面引用 ``material``；.inp 网格直接复制；网格文件不存在时原样返回。
+        """
+        if not mesh_file.exists():
+            return mesh_file
+
+        include_file = (work_dir or self.work_dir) / f"{mesh_file.stem}_mesh.inp"
+        if mesh_file.suffix.lower() == ".msh":
+            from sw_helper.mesh.cache import load_mesh_cached
+            from sw_helper.mesh.inp_writer import write_msh_as_inp
+
+            write_msh_as_inp(
+                load_mesh_cached(mesh_file),
+                include_file,
+                material=material,
+                header=f"Mesh: {mesh_file.name}",
+            )
+        else:
+            shutil.copy2(mesh_file, include_file)
+        return include_file
+
     def _create_static_analysis(self, mesh_file: Path, config: Dict[str, Any]) -> str:
         """创建静态分析输入文件"""
         material = config.get("material", {"E": 210000.0, "nu": 0.3, "density": 7.85e-9})
@@ -357,7 +406,10 @@ HFL
         return inp
 
     def _parse_frd_file(self, frd_file: Path) -> Dict[str, Any]:
-        """解析.frd文件（简化版本）"""
+        """解析.frd文件
+
+        流式读取全部结果块，给出节点/单元数、分析步与各物理量的极值（模型单位）。
+        """
         results = {
             "analysis_type": "unknown",
             "nodes": 0,
@@ -366,41 +418,24 @@ HFL
         }
 
         try:
-            with open(frd_file, encoding="utf-8", errors="ignore") as f:
-                lines = f.readlines()
-
-            node_count = 0
-            element_count = 0
-            current_step = None
-
-            for line in lines:
-                if "C CalculiX" in line:
-                    results["analysis_type"] = line.strip()
-                elif "1PSTEP" in line:
-                    # 新的分析步
-                    parts = line.split()
-                    if len(parts) >= 4:
-                        step_num = int(parts[2])
-                        step_type = parts[3]
-                        current_step = {
-                            "number": step_num,
-                            "type": step_type,
-                            "time": 0.0,
-                        }
-                        results["steps"].append(current_step)
-                elif "2C" in line and "DISPLACEMENT" in line:
-                    results["has_displacements"] = True
-                elif "2C" in line and "STRESS" in line:
-                    results["has_stresses"] = True
-                elif " -1" in line and " 1 " in line:
-                    # 节点定义
-                    node_count += 1
-                elif " -1" in line and " 2 " in line:
-                    # 单元定义
-                    element_count += 1
-
-            results["nodes"] = node_count
-            results["elements"] = element_count
+            summary = summarize_frd(frd_file)
+            results.update(
+                {
+                    "nodes": summary["nodes"],
+                    "elements": summary["elements"],
+                    "element_types": summary["element_types"],
+                    "steps": [{"number": step, "increment": inc} for step, inc in summary["steps"]],
+                    "fields": summary["fields"],
+                    "has_displacements": "DISP" in summary["fields"],
+                    "has_stresses": "STRESS" in summary["fields"],
+                }
+            )
+            for key in ("max_displacement", "max_von_mises", "max_temperature", "max_strain"):
+                if key in summary:
+                    results[key] = summary[key]
+                    results[f"{key}_node"] = summary[f"{key}_node"]
+            if "max_von_mises" in summary:
+                results["max_stress"] = summary["max_von_mises"]
 
         except Exception as e:
             print(f"解析.frd文件失败: {e}")
@@ -462,6 +497,9 @@ class CalculiXConnectorMock(CalculiXConnector):
         super().__init__()
         self.mock_mode = True
 
+    def get_version(self) -> Optional[str]:
+        return "mock"
+
     def connect(self) -> bool:
         print("[模拟模式] 连接CalculiX")
         self.is_connected = True
@@ -0,0 +1,405 @@
+"""
+CalculiX .frd 结果文件读取器
+
+流式读取 ASCII 与二进制 .frd 文件，逐个产出结果块（DISP、STRESS、TOSTRAIN、
+NDTEMP 等，按分析步/增量步区分），每个结果块为按节点编号索引的 NumPy 数组。
+一次只在内存中保留一个结果块（加上节点坐标），适合大型结果文件。
+
+.frd 为定长列格式（数值字段可能首尾相接，如 ``-1.2E-01-3.4E+00``），
+因此按列位置切分后统一向量化解析，而不是按空白分词。
+"""
+
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+# .frd单元类型编号 -> (名称, 节点数)
+FRD_ELEMENT_TYPES: Dict[int, Tuple[str, int]] = {
+    1: ("he8", 8),
+    2: ("pe6", 6),
+    3: ("te4", 4),
+    4: ("he20", 20),
+    5: ("pe15", 15),
+    6: ("te10", 10),
+    7: ("tr3", 3),
+    8: ("tr6", 6),
+    9: ("qu4", 4),
+    10: ("qu8", 8),
+    11: ("be2", 2),
+    12: ("be3", 3),
+}
+
+# 单次解析的记录数
+DEFAULT_CHUNK_SIZE = 65536
+
+_VALUE_WIDTH = 12
+_VALUES_PER_LINE = 6
+
+
+class FrdFormatError(ValueError):
+    """FRD文件格式错误"""
+
+
+@dataclass
+class FrdResultBlock:
+    """一个结果块（某一增量步的一个物理量）"""
+
+    name: str  # DISP, STRESS, TOSTRAIN, NDTEMP ...
+    step: int  # 分析步
+    increment: int  # 增量步
+    value: float  # 时间/频率/载荷因子
+    components: List[str]
+    node_ids: np.ndarray  # [n] int64
+    values: np.ndarray  # [n, n_components] float64
+    set_number: int = 0  # 结果集编号（100C记录中的NUMSTP）
+    _lookup: Optional[Dict[int, int]] = field(default=None, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    def magnitude(self) -> np.ndarray:
+        """向量模长 [n]（使用前3个分量）"""
+        return np.linalg.norm(self.values[:, :3], axis=1)
+
+    def von_mises(self) -> np.ndarray:
+        """等效应力 [n]，分量顺序 XX YY ZZ XY YZ ZX"""
+        return von_mises(self.values)
+
+    def at(self, node_ids: Union[int, Iterable[int]]) -> np.ndarray:
+        """按节点编号取值（探针）
+
+        Args:
+            node_ids: 单个节点编号或编号序列
+
+        Returns:
+            [n_components] 或 [len(node_ids), n_components]
+        """
+        if self._lookup is None:
+            self._lookup = {node: i for i, node in enumerate(self.node_ids.tolist())}
+        if np.isscalar(node_ids):
+            return self.values[self._lookup[int(node_ids)]]
+        return self.values[[self._lookup[int(n)] for n in node_ids]]
+
+    def to_dict(self) -> Dict[int, np.ndarray]:
+        """{节点编号: 分量数组}"""
+        return dict(zip(self.node_ids.tolist(), self.values))
+
+
+@dataclass
+class FrdResults:
+    """.frd 文件完整读取结果"""
+
+    node_ids: np.ndarray
+    nodes: np.ndarray
+    element_counts: Dict[str, int]
+    blocks: List[FrdResultBlock]
+
+    def get(self, name: str, step: Optional[int] = None, increment: Optional[int] = None) -> List[FrdResultBlock]:
+        """按名称（及分析步/增量步）筛选结果块"""
+        return [
+            block
+            for block in self.blocks
+            if block.name == name
+            and (step is None or block.step == step)
+            and (increment is None or block.increment == increment)
+        ]
+
+    def last(self, name: str) -> Optional[FrdResultBlock]:
+        """某物理量的最后一个结果块"""
+        blocks = self.get(name)
+        return blocks[-1] if blocks else None
+
+
+def von_mises(stress: np.ndarray) -> np.ndarray:
+    """批量计算等效应力
+
+    Args:
+        stress: [n, 6] 应力分量 (XX, YY, ZZ, XY, YZ, ZX)
+
+    Returns:
+        [n] 等效应力
+    """
+    sxx, syy, szz, sxy, syz, szx = (stress[:, i] for i in range(6))
+    return np.sqrt(0.5 * ((sxx - syy) ** 2 + (syy - szz) ** 2 + (szz - sxx) ** 2) + 3.0 * (sxy**2 + syz**2 + szx**2))
+
+
+def _parse_fixed(lines: List[bytes], start: int, n_fields: int, width: int) -> np.ndarray:
+    """按定长列解析数值 [len(lines), n_fields]"""
+    n = len(lines)
+    if n == 0:
+        return np.empty((0, n_fields))
+    raw = np.array(lines, dtype=f"S{start + n_fields * width}").view(np.uint8).reshape(n, -1)
+    fields = np.full((n, n_fields, width + 1), 32, dtype=np.uint8)
+    fields[:, :, :width] = raw[:, start:].reshape(n, n_fields, width)
+    fields[(fields == 0) | (fields == 10) | (fields == 13)] = 32
+    try:
+        values = np.fromstring(fields.tobytes(), dtype=np.float64, sep=" ")
+    except ValueError as e:
+        raise FrdFormatError(f"无法解析的数值数据: {e}") from e
+    if values.size != n * n_fields:
+        raise FrdFormatError("数据行字段数与声明不符")
+    return values.reshape(n, n_fields)
+
+
+class FrdReader:
+    """流式 .frd 读取器
+
+    用法::
+
+        reader = FrdReader("model.frd", fields=["DISP", "STRESS"])
+        for block in reader.iter_blocks():
+            ...
+        reader.node_ids, reader.nodes  # 遍历后可用
+
+    Args:
+        file_path: .frd 文件路径
+        fields: 只读取这些物理量（None表示全部），其余结果块直接跳过
+        chunk_size: 每次解析的记录数
+    """
+
+    def __init__(
+        self,
+        file_path: Union[str, Path],
+        fields: Optional[Iterable[str]] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        self.file_path = Path(file_path)
+        self.fields = {name.upper() for name in fields} if fields is not None else None
+        self.chunk_size = max(1, int(chunk_size))
+
+        self.node_ids = np.empty(0, dtype=np.int64)
+        self.nodes = np.empty((0, 3))
+        self.element_counts: Dict[str, int] = {}
+        self.steps: List[Tuple[int, int]] = []
+        self._step = (0, 0)
+
+    def read(self) -> FrdResults:
+        """读取全部（或筛选后的）结果块"""
+        blocks = list(self.iter_blocks())
+        return FrdResults(self.node_ids, self.nodes, dict(self.element_counts), blocks)
+
+    def iter_blocks(self) -> Iterator[FrdResultBlock]:
+        """逐个产出结果块"""
+        if not self.file_path.exists():
+            raise FileNotFoundError(f"结果文件不存在: {self.file_path}")
+
+        with open(self.file_path, "rb") as f:
+            while True:
+                line = f.readline()
+                if not line or line.startswith(b" 9999"):
+                    break
+                key = line[:6]
+                if key == b"    2C":
+                    self._read_nodes(f, line)
+                elif key == b"    3C":
+                    self._read_elements(f, line)
+                elif key == b"    1P" and line[6:10] == b"STEP":
+                    parts = line[10:].split()
+                    if len(parts) >= 3:
+                        self._step = (int(parts[2]), int(parts[1]))
+                        self.steps.append(self._step)
+                elif key == b"  100C":
+                    block = self._read_result(f, line)
+                    if block is not None:
+                        yield block
+
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _header_counts(line: bytes) -> Tuple[int, int]:
+        parts = line[6:].split()
+        if not parts:
+            raise FrdFormatError(f"块头格式错误: {line!r}")
+        return int(parts[0]), int(parts[-1]) if len(parts) > 1 else 0
+
+    def _lines(self, f: BinaryIO, n: int) -> List[bytes]:
+        lines = list(islice(f, n))
+        if len(lines) != n:
+            raise FrdFormatError("文件意外结束")
+        return lines
+
+    def _binary(self, f: BinaryIO, dtype: np.dtype, count: int) -> np.ndarray:
+        nbytes = dtype.itemsize * count
+        data = f.read(nbytes)
+        if len(data) != nbytes:
+            raise FrdFormatError("二进制数据意外结束")
+        return np.frombuffer(data, dtype=dtype, count=count)
+
+    @staticmethod
+    def _expect_end(f: BinaryIO):
+        line = f.readline()
+        if not line.startswith(b" -3"):
+            raise FrdFormatError(f"缺少块结束记录 -3: {line!r}")
+
+    def _read_nodes(self, f: BinaryIO, header: bytes):
+        count, fmt = self._header_counts(header)
+        ids = np.empty(count, dtype=np.int64)
+        coords = np.empty((count, 3))
+
+        if fmt in (2, 3):
+            record = np.dtype([("id", "<i4"), ("xyz", "<f4" if fmt == 2 else "<f8", 3)])
+            for start in range(0, count, self.chunk_size):
+                m = min(self.chunk_size, count - start)
+                chunk = self._binary(f, record, m)
+                ids[start : start + m] = chunk["id"]
+                coords[start : start + m] = chunk["xyz"]
+        else:
+            width = 10 if fmt == 1 else 5
+            for start in range(0, count, self.chunk_size):
+                m = min(self.chunk_size, count - start)
+                lines = self._lines(f, m)
+                ids[start : start + m] = _parse_fixed(lines, 3, 1, width)[:, 0]
+                coords[start : start + m] = _parse_fixed(lines, 3 + width, 3, _VALUE_WIDTH)
+            self._expect_end(f)
+
+        self.node_ids, self.nodes = ids, coords
+
+    def _read_elements(self, f: BinaryIO, header: bytes):
+        """只统计各类型单元数（结果均为节点量，不需要单元连接）"""
+        count, fmt = self._header_counts(header)
+        counts: Dict[str, int] = {}
+
+        if fmt == 2:
+            for _ in range(count):
+                _, element_type, _, _ = (int(v) for v in self._binary(f, np.dtype("<i4"), 4))
+                name, n_nodes = FRD_ELEMENT_TYPES.get(element_type, (str(element_type), 0))
+                if n_nodes == 0:
+                    raise FrdFormatError(f"未知的单元类型: {element_type}")
+                self._binary(f, np.dtype("<i4"), n_nodes)
+                counts[name] = counts.get(name, 0) + 1
+        else:
+            width = 10 if fmt == 1 else 5
+            for line in f:
+                if line.startswith(b" -3"):
+                    break
+                if line.startswith(b" -1"):
+                    element_type = int(line[3 + width : 8 + width])
+                    name = FRD_ELEMENT_TYPES.get(element_type, (str(element_type), 0))[0]
+                    counts[name] = counts.get(name, 0) + 1
+
+        self.element_counts = counts
+
+    def _read_result(self, f: BinaryIO, header: bytes) -> Optional[FrdResultBlock]:
+        try:
+            value = float(header[12:24])
+            count = int(header[24:36])
+            set_number = int(header[58:63].strip() or 0)
+            fmt = int(header[73:75].strip() or 0)
+        except ValueError as e:
+            raise FrdFormatError(f"结果块头格式错误: {header!r}") from e
+
+        # -4 记录：名称与分量数；-5 记录：各分量（IEXIST=0 的分量才有数据）
+        definition = f.readline()
+        if not definition.startswith(b" -4"):
+            raise FrdFormatError(f"缺少结果定义记录 -4: {definition!r}")
+        parts = definition[3:].split()
+        if len(parts) < 2 or not parts[1].isdigit():
+            raise FrdFormatError(f"结果定义记录 -4 格式错误: {definition!r}")
+        name, n_defined = parts[0].decode("ascii"), int(parts[1])
+
+        components = []
+        for _ in range(n_defined):
+            comp = f.readline()
+            exist = comp[33:38].strip()
+            if not exist or int(exist) == 0:
+                components.append(comp[5:13].strip().decode("ascii"))
+        n_comp = len(components)
+
+        wanted = self.fields is None or name.upper() in self.fields
+        step, increment = self._step
+
+        if fmt == 2:
+            record = np.dtype([("id", "<i4"), ("v", "<f4", (n_comp,))])
+            if not wanted:
+                f.seek(record.itemsize * count, 1)
+                return None
+            ids = np.empty(count, dtype=np.int64)
+            values = np.empty((count, n_comp))
+            for start in range(0, count, self.chunk_size):
+                m = min(self.chunk_size, count - start)
+                chunk = self._binary(f, record, m)
+                ids[start : start + m] = chunk["id"]
+                values[start : start + m] = chunk["v"].reshape(m, n_comp)
+        else:
+            width = 10 if fmt == 1 else 5
+            per_node = max(1, -(-n_comp // _VALUES_PER_LINE))
+            if not wanted:
+                for _ in islice(f, count * per_node):
+                    pass
+                self._expect_end(f)
+                return None
+
+            ids = np.empty(count, dtype=np.int64)
+            values = np.empty((count, n_comp))
+            for start in range(0, count, self.chunk_size):
+                m = min(self.chunk_size, count - start)
+                lines = self._lines(f, m * per_node)
+                ids[start : start + m] = _parse_fixed(lines[::per_node], 3, 1, width)[:, 0]
+                for row in range(per_node):
+                    first = row * _VALUES_PER_LINE
+                    n_fields = min(_VALUES_PER_LINE, n_comp - first)
+                    values[start : start + m, first : first + n_fields] = _parse_fixed(
+                        lines[row::per_node], 3 + width, n_fields, _VALUE_WIDTH
+                    )
+            self._expect_end(f)
+
+        return FrdResultBlock(
+            name=name,
+            step=step,
+            increment=increment,
+            value=value,
+            components=components,
+            node_ids=ids,
+            values=values,
+            set_number=set_number,
+        )
+
+
+def summarize_frd(file_path: Union[str, Path], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, object]:
+    """流式汇总 .frd 结果：各物理量的极值及所在节点（跨所有增量步取包络）
+
+    Returns:
+        {
+            "nodes", "elements", "element_types", "steps", "fields",
+            "max_displacement", "max_displacement_node",
+            "max_von_mises", "max_von_mises_node",
+            "max_temperature", "max_temperature_node",
+            "max_strain", "max_strain_node",
+        }
+    """
+    reader = FrdReader(file_path, fields=["DISP", "STRESS", "TOSTRAIN", "NDTEMP"], chunk_size=chunk_size)
+    summary: Dict[str, object] = {"fields": []}
+
+    def update(key: str, values: np.ndarray, block: FrdResultBlock):
+        if len(values) == 0:
+            return
+        i = int(np.argmax(values))
+        if summary.get(key) is None or values[i] > summary[key]:
+            summary[key] = float(values[i])
+            summary[f"{key}_node"] = int(block.node_ids[i])
+            summary[f"{key}_step"] = (block.step, block.increment)
+
+    for block in reader.iter_blocks():
+        if block.name not in summary["fields"]:
+            summary["fields"].append(block.name)
+        if block.name == "DISP":
+            update("max_displacement", block.magnitude(), block)
+        elif block.name == "STRESS" and block.values.shape[1] >= 6:
+            update("max_von_mises", block.von_mises(), block)
+        elif block.name == "TOSTRAIN" and block.values.shape[1] >= 6:
+            update("max_strain", np.abs(block.values[:, :6]).max(axis=1), block)
+        elif block.name == "NDTEMP":
+            update("max_temperature", block.values[:, 0], block)
+
+    summary.update(
+        {
+            "nodes": len(reader.node_ids),
+            "elements": sum(reader.element_counts.values()),
+            "element_types": dict(reader.element_counts),
+            "steps": list(dict.fromkeys(reader.steps)),
+        }
+    )
+    return summary
@@ -0,0 +1,309 @@
+"""
+CalculiX 并行作业运行器
+
+同时运行多个 ccx 进程：
+- 每个作业在自己的工作目录中运行（``cwd=``，不修改进程全局的当前目录）
+- 按并发作业数分配CPU核数（``OMP_NUM_THREADS`` 等环境变量）
+- 逐行读取 ccx 输出并回调，便于显示进度
+- 支持超时与取消（终止正在运行的进程，跳过尚未开始的作业）
+- 作业完成即返回结果，不等待整批结束
+
+用法::
+
+    runner = CcxJobRunner(max_workers=4)
+    for result in runner.run([CcxJob("case1/model.inp"), CcxJob("case2/model.inp")]):
+        print(result.name, result.status, result.frd_file)
+"""
+
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+# 保留的输出行数（用于失败时显示）
+OUTPUT_TAIL_LINES = 50
+
+# 终止进程时 terminate 之后等待其退出的秒数，超时后 kill
+TERMINATE_GRACE = 5.0
+
+# ccx 使用的线程数环境变量
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "CCX_NPROC_STIFFNESS", "CCX_NPROC_EQUATION_SOLVER", "CCX_NPROC_RESULTS")
+
+
+@dataclass
+class CcxJob:
+    """一个 ccx 作业
+
+    Args:
+        input_file: .inp 输入文件，ccx 在其所在目录运行
+        name: 作业名（默认为输入文件名去掉扩展名）
+        timeout: 超时秒数（None 使用运行器的默认值）
+        threads: 线程数（None 按并发数自动分配）
+        env: 附加环境变量
+    """
+
+    input_file: Union[str, Path]
+    name: Optional[str] = None
+    timeout: Optional[float] = None
+    threads: Optional[int] = None
+    env: Dict[str, str] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self.input_file = Path(self.input_file)
+        if self.name is None:
+            self.name = self.input_file.stem
+
+    @property
+    def work_dir(self) -> Path:
+        return self.input_file.parent
+
+    @property
+    def stem(self) -> str:
+        return self.input_file.stem
+
+
+@dataclass
+class CcxJobResult:
+    """作业结果"""
+
+    job: CcxJob
+    status: str  # completed / failed / timeout / cancelled / error
+    returncode: Optional[int] = None
+    elapsed: float = 0.0
+    threads: int = 1
+    output: List[str] = field(default_factory=list)  # 最后若干行输出
+    error: str = ""
+
+    @property
+    def name(self) -> str:
+        return self.job.name
+
+    @property
+    def success(self) -> bool:
+        return self.status == "completed"
+
+    @property
+    def frd_file(self) -> Optional[Path]:
+        path = self.job.work_dir / f"{self.job.stem}.frd"
+        return path if path.exists() else None
+
+    @property
+    def dat_file(self) -> Optional[Path]:
+        path = self.job.work_dir / f"{self.job.stem}.dat"
+        return path if path.exists() else None
+
+
+class CcxJobRunner:
+    """并行 ccx 作业运行器
+
+    Args:
+        ccx_path: ccx 可执行文件（None 时在 PATH 中查找）
+        max_workers: 最大并发作业数（None 为CPU核数）
+        total_threads: 所有作业共享的线程总数（None 为CPU核数）
+        timeout: 默认作业超时秒数（None 不限时）
+        on_output: 输出回调 ``on_output(job, line)``，在工作线程中调用
+    """
+
+    def __init__(
+        self,
+        ccx_path: Optional[Union[str, Path]] = None,
+        max_workers: Optional[int] = None,
+        total_threads: Optional[int] = None,
+        timeout: Optional[float] = None,
+        on_output: Optional[Callable[[CcxJob, str], None]] = None,
+    ):
+        self.ccx_path = str(ccx_path) if ccx_path else shutil.which("ccx")
+        cpus = os.cpu_count() or 1
+        self.max_workers = max(1, max_workers or cpus)
+        self.total_threads = max(1, total_threads or cpus)
+        self.timeout = timeout
+        self.on_output = on_output
+
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._processes: Dict[int, subprocess.Popen] = {}
+
+    def threads_per_job(self, n_jobs: int) -> int:
+        """并发 n_jobs 个作业时每个作业的线程数"""
+        concurrent = max(1, min(n_jobs, self.max_workers))
+        return max(1, self.total_threads // concurrent)
+
+    def run(self, jobs: Iterable[CcxJob]) -> Iterator[CcxJobResult]:
+        """运行作业，按完成顺序逐个返回结果
+
+        取消标志在调用时（而不是开始迭代时）重置，调用之后、迭代之前的 :meth:`cancel` 同样生效。
+        """
+        jobs = list(jobs)
+        if jobs and not self.ccx_path:
+            raise FileNotFoundError("未找到 CalculiX (ccx) 可执行文件")
+        self._cancelled.clear()
+        return self._run(jobs)
+
+    def _run(self, jobs: List[CcxJob]) -> Iterator[CcxJobResult]:
+        if not jobs:
+            return
+        threads = self.threads_per_job(len(jobs))
+        workers = min(len(jobs), self.max_workers)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ccx") as pool:
+            futures = [pool.submit(self._run_job, job, job.threads or threads) for job in jobs]
+            try:
+                for future in as_completed(futures):
+                    yield future.result()
+            finally:
+                # 迭代提前结束（break/异常）时终止剩余作业
+                if not all(f.done() for f in futures):
+                    self.cancel()
+
+    def run_one(self, job: CcxJob) -> CcxJobResult:
+        """运行单个作业（使用全部线程）"""
+        return next(iter(self.run([job])))
+
+    def cancel(self):
+        """取消：终止正在运行的进程，尚未开始的作业直接标记为 cancelled"""
+        self._cancelled.set()
+        with self._lock:
+            processes = list(self._processes.values())
+        _terminate(*processes)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    # ------------------------------------------------------------------
+
+    def _environment(self, job: CcxJob, threads: int) -> Dict[str, str]:
+        env = dict(os.environ)
+        for name in THREAD_ENV_VARS:
+            env[name] = str(threads)
+        env.update(job.env)
+        return env
+
+    def _run_job(self, job: CcxJob, threads: int) -> CcxJobResult:
+        if self._cancelled.is_set():
+            return CcxJobResult(job, "cancelled", threads=threads)
+        if not job.input_file.exists():
+            return CcxJobResult(job, "error", threads=threads, error=f"输入文件不存在: {job.input_file}")
+
+        tail = deque(maxlen=OUTPUT_TAIL_LINES)
+        start = time.perf_counter()
+        try:
+            process = subprocess.Popen(
+                [self.ccx_path, "-i", job.stem],
+                cwd=job.work_dir,
+                env=self._environment(job, threads),
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                errors="replace",
+                bufsize=1,
+            )
+        except OSError as e:
+            return CcxJobResult(job, "error", threads=threads, error=str(e))
+
+        with self._lock:
+            self._processes[id(process)] = process
+            # Popen 与登记之间发生的 cancel() 看不到该进程，登记后再检查一次
+            cancelled = self._cancelled.is_set()
+        if cancelled:
+            _terminate(process)
+
+        timeout = job.timeout if job.timeout is not None else self.timeout
+        timed_out = threading.Event()
+        timer = None
+        if timeout is not None:
+
+            def expire():
+                timed_out.set()
+                _terminate(process)
+
+            timer = threading.Timer(timeout, expire)
+            timer.daemon = True
+            timer.start()
+
+        try:
+            for line in process.stdout:
+                line = line.rstrip("\n")
+                tail.append(line)
+                if self.on_output is not None:
+                    self.on_output(job, line)
+            returncode = process.wait()
+        finally:
+            if timer is not None:
+                timer.cancel()
+            process.stdout.close()
+            with self._lock:
+                self._processes.pop(id(process), None)
+
+        if timed_out.is_set():
+            status = "timeout"
+        elif self._cancelled.is_set() and returncode != 0:
+            status = "cancelled"
+        else:
+            status = "completed" if returncode == 0 else "failed"
+        return CcxJobResult(
+            job,
+            status,
+            returncode=returncode,
+            elapsed=time.perf_counter() - start,
+            threads=threads,
+            output=list(tail),
+        )
+
+
+_VERSION_PATTERN = re.compile(r"version\s+(\d[\w.\-]*)", re.IGNORECASE)
+
+
+def ccx_version(ccx_path: Optional[str] = None) -> str:
+    """ccx 版本号（``ccx -v``，如 "2.21"）
+
+    按可执行文件路径、大小与修改时间缓存，每个可执行文件只查询一次。输出中找不到
+    版本号时以文件大小与修改时间代替，替换可执行文件后结果仍会变化。ccx 不存在时为空字符串。
+    """
+    executable = ccx_path or shutil.which("ccx")
+    if not executable:
+        return ""
+    try:
+        stat = os.stat(executable)
+    except OSError:
+        return ""
+    return _query_ccx_version(str(executable), stat.st_size, stat.st_mtime_ns)
+
+
+@lru_cache(maxsize=None)
+def _query_ccx_version(executable: str, size: int, mtime_ns: int) -> str:
+    try:
+        completed = subprocess.run(
+            [executable, "-v"], stdin=subprocess.DEVNULL, capture_output=True, text=True, timeout=30
+        )
+        match = _VERSION_PATTERN.search(completed.stdout + completed.stderr)
+    except (OSError, subprocess.SubprocessError):
+        match = None
+    return match.group(1) if match else f"unknown-{size}-{mtime_ns}"
+
+
+def _terminate(*processes: subprocess.Popen, grace: Optional[float] = None):
+    """终止进程：先向所有进程发送 terminate，再在共同的期限内等待，超时的进程 kill"""
+    running = [process for process in processes if process.poll() is None]
+    for process in running:
+        try:
+            process.terminate()
+        except OSError:
+            pass
+    deadline = time.monotonic() + (TERMINATE_GRACE if grace is None else grace)
+    for process in running:
+        try:
+            process.wait(timeout=max(0.0, deadline - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            try:
+                process.kill()
+            except OSError:
+                pass
@@ -7,7 +7,8 @@ CAE 求解器模块 - 标准化求解器接口
 - CalculiXSolver: CalculiX 求解器（未来预留）
 """
 
-from .base import BaseSolver, SolverConfig, SolverResult
+from .base import BaseSolver, BatchSolverResult, SolverConfig, SolverResult
+from .cache import SolverResultCache, config_fingerprint
 from .calculix_solver import CalculiXSolver
 from .scipy_solver import SciPySolver
 from .simple_fem import SimpleFEMSolver
@@ -15,10 +16,13 @@ from .simple_fem import SimpleFEMSolver
 __all__ = [
     "BaseSolver",
     "SolverResult",
+    "BatchSolverResult",
     "SolverConfig",
     "SimpleFEMSolver",
     "SciPySolver",
     "CalculiXSolver",
+    "SolverResultCache",
+    "config_fingerprint",
     "get_solver",
 ]
 
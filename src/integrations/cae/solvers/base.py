@@ -4,7 +4,9 @@ CAE 求解器抽象基类
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple, Union
+
+import numpy as np
 
 
 @dataclass
@@ -17,6 +19,31 @@ class SolverResult:
     displacement: Optional[Dict[str, float]] = None  # 节点位移
     stress: Optional[Dict[str, float]] = None  # 应力分布
     messages: str = ""  # 附加信息
+    estimated: bool = False  # 解析估算结果（真实求解未完成时的替代值，不写入缓存）
+    node_displacement: Optional[np.ndarray] = None  # 逐节点位移幅值 (m)，下标为节点序号-1
+    node_stress: Optional[np.ndarray] = None  # 逐节点 von Mises 应力 (Pa)，下标为节点序号-1
+
+
+@dataclass
+class BatchSolverResult:
+    """批量求解结果（各字段为形状相同的数组，即参数广播后的形状）"""
+
+    max_displacement: np.ndarray  # 最大位移 (m)
+    max_stress: np.ndarray  # 最大应力 (Pa)
+    safety_factor: np.ndarray  # 安全系数
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self.max_displacement.shape
+
+    def __len__(self) -> int:
+        return self.max_displacement.size
+
+    def __getitem__(self, index: Union[int, Tuple[int, ...]]) -> SolverResult:
+        """单个参数组合的结果：整数为按行优先展平后的序号，元组为多维下标"""
+        fields = (self.max_displacement, self.max_stress, self.safety_factor)
+        values = [float(a[index] if isinstance(index, tuple) else a.flat[index]) for a in fields]
+        return SolverResult(max_displacement=values[0], max_stress=values[1], safety_factor=values[2])
 
 
 @dataclass
@@ -29,12 +56,18 @@ class SolverConfig:
     mesh_size: float = 10.0  # 网格大小 (mm)
     boundary_conditions: Dict[str, Any] = None  # 边界条件
     geometry: Dict[str, Any] = None  # 几何参数
+    element_type: str = "Q4"  # 单元类型 (Q4/CST/C3D4/C3D8，SciPy求解器使用)
+    linear_solver: str = "auto"  # 线性方程组求解方法 (auto/direct/cg/minres)
+    preconditioner: Optional[str] = None  # 迭代法预条件 (none/jacobi/ic/amg)，None 自动选择
+    tolerance: float = 1e-8  # 迭代法收敛容差（相对残差）
+    max_iterations: Optional[int] = None  # 迭代法最大迭代次数
 
 
 class BaseSolver(ABC):
     """CAE 求解器抽象基类"""
 
     name: str = "base"
+    version: str = "1.0"  # 求解算法版本，结果变化时递增以使缓存失效
     description: str = "基础求解器"
     requires_install: str = None  # 依赖安装命令
 
@@ -50,6 +83,25 @@ class BaseSolver(ABC):
         """
         pass
 
+    def solve_cached(self, config: SolverConfig, cache=None, mesh_file=None) -> SolverResult:
+        """带磁盘结果缓存的求解
+
+        Args:
+            config: 求解器配置
+            cache: SolverResultCache（None 使用默认缓存）
+            mesh_file: 网格文件（其内容哈希参与缓存键）
+
+        Returns:
+            求解结果（相同配置、求解器版本与网格时直接返回缓存结果）
+        """
+        from .cache import default_result_cache
+
+        return (cache or default_result_cache()).get_or_solve(self, config, mesh_file)
+
+    def cache_version(self) -> str:
+        """参与结果缓存键的版本：求解算法版本，调用外部程序时再加上其实际版本"""
+        return str(self.version)
+
     @abstractmethod
     def is_available(self) -> bool:
         """检查求解器是否可用
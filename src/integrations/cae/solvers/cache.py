@@ -0,0 +1,270 @@
+"""
+求解结果磁盘缓存
+
+以规范化的 SolverConfig 哈希、求解器名称/版本、网格文件内容哈希为键，
+将 SolverResult 保存为 JSON 文件（逐节点数组以 base64 编码的二进制保存）。相同配置再次求解时直接返回缓存结果。
+
+缓存目录默认为 ``~/.cae-cli/solver_cache``（可用环境变量 ``CAE_SOLVER_CACHE_DIR``
+覆盖），按最近使用时间（文件修改时间）做 LRU 淘汰，条目数与总大小均有上限。
+网格内容哈希按 (路径, 大小, 修改时间) 在进程内记忆；缓存占用增量统计，超限时才扫描目录。
+"""
+
+import base64
+import dataclasses
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from .base import SolverConfig, SolverResult
+
+if TYPE_CHECKING:
+    from .base import BaseSolver
+
+# 缓存格式版本，键或结果格式变化时递增
+CACHE_FORMAT_VERSION = 2
+
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+CACHE_DIR_ENV = "CAE_SOLVER_CACHE_DIR"
+
+
+def _canonical(value: Any) -> Any:
+    """转换为可稳定序列化的结构（数值统一为浮点，字典键排序由 json 完成）"""
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        value = dataclasses.asdict(value)
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return _canonical(value.tolist())
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, Path):
+        return str(value)
+    return repr(value)
+
+
+def config_fingerprint(config: SolverConfig) -> str:
+    """SolverConfig 的规范化哈希（与字典键顺序、整数/浮点写法无关）
+
+    几何参数中的 ``mesh_file`` 以文件内容哈希代替路径参与计算。
+    """
+    data = _canonical(config)
+    mesh_file = (config.geometry or {}).get("mesh_file")
+    if mesh_file and Path(mesh_file).exists():
+        from sw_helper.utils.hashing import file_digest
+
+        data["geometry"]["mesh_file"] = file_digest(mesh_file)
+    text = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def default_cache_dir() -> Path:
+    env = os.environ.get(CACHE_DIR_ENV)
+    return Path(env) if env else Path.home() / ".cae-cli" / "solver_cache"
+
+
+class SolverResultCache:
+    """求解结果磁盘缓存（LRU）
+
+    Args:
+        cache_dir: 缓存目录（None 使用 :func:`default_cache_dir`）
+        max_entries: 最大条目数
+        max_bytes: 缓存文件总大小上限（字节）
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Union[str, Path]] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        # (条目数, 总字节数)：首次写入时扫描一次目录，之后增量维护，超限时才重新扫描淘汰
+        self._usage: Optional[Tuple[int, int]] = None
+
+    def key(self, solver: "BaseSolver", config: SolverConfig, mesh_file: Optional[Union[str, Path]] = None) -> str:
+        """缓存键：求解器名称/版本（含外部程序版本）+ 配置哈希 + 网格内容哈希"""
+        from sw_helper.utils.hashing import file_digest
+
+        parts = [
+            f"v{CACHE_FORMAT_VERSION}",
+            solver.name,
+            solver.cache_version(),
+            config_fingerprint(config),
+            file_digest(mesh_file) if mesh_file else "",
+        ]
+        return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[SolverResult]:
+        """读取缓存结果，命中时刷新其最近使用时间"""
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            result = _decode_result(data["result"])
+        except (OSError, ValueError, KeyError, TypeError):
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return result
+
+    def put(self, key: str, result: SolverResult, solver_name: str = ""):
+        """写入缓存并按LRU淘汰旧条目；缓存目录不可写时静默跳过"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self._path(key)
+            try:
+                replaced = path.stat().st_size
+            except OSError:
+                replaced = None
+            tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"solver": solver_name, "result": _encode_result(result)}, f, ensure_ascii=False)
+            os.replace(tmp, path)
+            self._track(path, replaced)
+        except (OSError, TypeError, ValueError):
+            pass
+
+    def get_or_solve(
+        self,
+        solver: "BaseSolver",
+        config: SolverConfig,
+        mesh_file: Optional[Union[str, Path]] = None,
+    ) -> SolverResult:
+        """命中缓存时直接返回结果，否则求解并写入缓存"""
+        key = self.key(solver, config, mesh_file)
+        result = self.get(key)
+        if result is not None:
+            return result
+
+        result = solver.solve(config)
+        if _is_cacheable(result):
+            self.put(key, result, solver.name)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """命中/未命中统计与缓存占用"""
+        entries = self._entries()
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(entries),
+            "bytes": sum(stat.st_size for _, stat in entries),
+            "cache_dir": str(self.cache_dir),
+        }
+
+    def clear(self):
+        """清空缓存"""
+        for path, _ in self._entries():
+            try:
+                path.unlink()
+            except OSError:
+                pass
+        self._usage = None
+
+    # ------------------------------------------------------------------
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _entries(self):
+        if not self.cache_dir.exists():
+            return []
+        entries = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                entries.append((path, path.stat()))
+            except OSError:
+                continue
+        return entries
+
+    def _over_limit(self, count: int, total: int) -> bool:
+        return count > self.max_entries or total > self.max_bytes
+
+    def _track(self, path: Path, replaced: Optional[int]):
+        """记录新写入的条目（``replaced`` 为被覆盖条目的大小），超限时淘汰"""
+        if self._usage is None:
+            entries = self._entries()
+            self._usage = (len(entries), sum(stat.st_size for _, stat in entries))
+        else:
+            count, total = self._usage
+            size = path.stat().st_size
+            self._usage = (count + (replaced is None), total + size - (replaced or 0))
+        if self._over_limit(*self._usage):
+            self._evict()
+
+    def _evict(self):
+        # 其他进程也可能写入同一目录，淘汰前按目录实际内容重新统计
+        entries = self._entries()
+        total = sum(stat.st_size for _, stat in entries)
+        entries.sort(key=lambda item: item[1].st_mtime_ns)
+        while entries and self._over_limit(len(entries), total):
+            path, stat = entries.pop(0)
+            try:
+                path.unlink()
+                total -= stat.st_size
+            except OSError:
+                pass
+        self._usage = (len(entries), total)
+
+
+def _encode_result(result: SolverResult) -> Dict[str, Any]:
+    data = dataclasses.asdict(result)
+    for name, value in data.items():
+        if isinstance(value, np.ndarray):
+            array = np.ascontiguousarray(value)
+            data[name] = {
+                "dtype": array.dtype.str,
+                "shape": list(array.shape),
+                "data": base64.b64encode(array.tobytes()).decode("ascii"),
+            }
+    return data
+
+
+def _decode_result(data: Dict[str, Any]) -> SolverResult:
+    data = dict(data)
+    for field in dataclasses.fields(SolverResult):
+        value = data.get(field.name)
+        if isinstance(value, dict) and set(value) == {"dtype", "shape", "data"}:
+            raw = base64.b64decode(value["data"])
+            data[field.name] = np.frombuffer(raw, dtype=value["dtype"]).reshape(value["shape"]).copy()
+    return SolverResult(**data)
+
+
+def _is_cacheable(result: SolverResult) -> bool:
+    # 求解器出错/不可用时返回全零结果，真实求解失败时返回解析估算结果，均不应缓存
+    if result.estimated:
+        return False
+    return not (result.max_displacement == 0 and result.max_stress == 0 and result.safety_factor == 0)
+
+
+_default_cache: Optional[SolverResultCache] = None
+
+
+def default_result_cache() -> SolverResultCache:
+    """进程内共享的默认缓存"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = SolverResultCache()
+    return _default_cache
@@ -12,13 +12,18 @@ CalculiX 求解器 - 完整的 CalculiX 有限元分析集成
 """
 
 import os
-import re
 import shutil
-import subprocess
-from typing import Optional
+import tempfile
+from typing import BinaryIO, Callable, Iterable, Iterator, Optional, Tuple
 
+import numpy as np
+
+from ..frd_reader import FrdReader
+from ..job_runner import CcxJob, CcxJobResult, CcxJobRunner, ccx_version
 from .base import BaseSolver, SolverConfig, SolverResult
 
+_STATUS_TEXT = {"failed": "失败", "timeout": "超时", "cancelled": "已取消", "error": "出错"}
+
 
 class CalculiXSolver(BaseSolver):
     """CalculiX 求解器
@@ -37,8 +42,13 @@ class CalculiXSolver(BaseSolver):
     description = "CalculiX 求解器 (功能强大，需要安装)"
     requires_install = "Linux: sudo apt-get install calculix-ccx | Windows: 从 calculix.de 下载"
 
-    def __init__(self):
+    def __init__(self, timeout: Optional[float] = 300):
+        """
+        Args:
+            timeout: 单个 ccx 作业超时秒数（None 不限时）
+        """
         self._ccx_path = None
+        self.timeout = timeout
         self._check_ccx()
 
     def _check_ccx(self) -> None:
@@ -49,6 +59,10 @@ class CalculiXSolver(BaseSolver):
         """检查 CalculiX 是否可用"""
         return self._ccx_path is not None
 
+    def cache_version(self) -> str:
+        """求解器版本加上实际 ccx 版本，升级 ccx 后缓存结果失效"""
+        return f"{self.version}/ccx-{ccx_version(self._ccx_path) if self._ccx_path else 'missing'}"
+
     def solve(self, config: SolverConfig) -> SolverResult:
         """使用 CalculiX 执行分析
 
@@ -81,41 +95,12 @@ class CalculiXSolver(BaseSolver):
                 ),
             )
 
-        # 生成临时工作目录
-        import tempfile
-
         work_dir = tempfile.mkdtemp(prefix="cae_calculix_")
-
         try:
-            # 生成输入文件
             input_file = os.path.join(work_dir, "model.inp")
             self.generate_input(config, input_file)
-
-            # 调用 ccx 求解
-            result = self._run_ccx(input_file, work_dir)
-
-            # 读取结果
-            if result:
-                frd_file = os.path.join(work_dir, "model.frd")
-                dat_file = os.path.join(work_dir, "model.dat")
-
-                if os.path.exists(frd_file):
-                    result = self.read_results(frd_file, config)
-                elif os.path.exists(dat_file):
-                    result = self.read_results(dat_file, config)
-
-                if result:
-                    result.messages = (
-                        f"CalculiX 分析完成\n"
-                        f"输入文件: {input_file}\n"
-                        f"工作目录: {work_dir}\n\n"
-                        f"{result.messages}"
-                    )
-                    return result
-
-            # 如果没有结果文件，返回模拟结果
-            return self._generate_fallback_result(config)
-
+            job_result = self._runner().run_one(CcxJob(input_file))
+            return self._collect_result(job_result, config)
         except Exception as e:
             return SolverResult(
                 max_displacement=0,
@@ -124,37 +109,87 @@ class CalculiXSolver(BaseSolver):
                 messages=f"CalculiX 求解失败: {str(e)}",
             )
         finally:
-            # 清理临时目录
-            import shutil as sh
+            shutil.rmtree(work_dir, ignore_errors=True)
 
-            try:
-                sh.rmtree(work_dir, ignore_errors=True)
-            except Exception:
-                pass
+    def solve_many(
+        self,
+        configs: Iterable[SolverConfig],
+        max_workers: Optional[int] = None,
+        on_output: Optional[Callable[[CcxJob, str], None]] = None,
+    ) -> Iterator[Tuple[int, SolverResult]]:
+        """并行求解多个配置（载荷工况批量、参数扫描）
 
-    def _run_ccx(self, input_file: str, work_dir: str) -> bool:
-        """运行 ccx 求解器"""
-        try:
-            # 切换到工作目录运行
-            old_cwd = os.getcwd()
-            os.chdir(work_dir)
-
-            # 运行 ccx（不加载GUI）
-            result = subprocess.run(
-                [self._ccx_path, "model"],
-                capture_output=True,
-                text=True,
-                timeout=300,  # 5分钟超时
-            )
+        每个配置在独立的临时目录中生成输入文件并运行 ccx，CPU核数在并发作业间
+        平均分配。按完成顺序逐个返回结果。
 
-            os.chdir(old_cwd)
+        Args:
+            configs: 求解器配置
+            max_workers: 最大并发作业数（None 为CPU核数）
+            on_output: ccx 输出回调 ``on_output(job, line)``，job.name 为配置序号
 
-            return result.returncode == 0
+        Returns:
+            (配置序号, 求解结果) 迭代器
+        """
+        configs = list(configs)
+        if not self.is_available():
+            for index, config in enumerate(configs):
+                yield index, self.solve(config)
+            return
 
-        except subprocess.TimeoutExpired:
-            return False
-        except Exception:
-            return False
+        work_dirs = []
+        jobs = []
+        try:
+            for index, config in enumerate(configs):
+                work_dir = tempfile.mkdtemp(prefix=f"cae_calculix_{index}_")
+                work_dirs.append(work_dir)
+                input_file = os.path.join(work_dir, "model.inp")
+                self.generate_input(config, input_file)
+                jobs.append(CcxJob(input_file, name=str(index)))
+
+            runner = self._runner(max_workers=max_workers, on_output=on_output)
+            for job_result in runner.run(jobs):
+                index = int(job_result.name)
+                try:
+                    result = self._collect_result(job_result, configs[index])
+                except Exception as e:
+                    result = SolverResult(0, 0, 0, messages=f"CalculiX 求解失败: {str(e)}")
+                shutil.rmtree(job_result.job.work_dir, ignore_errors=True)
+                yield index, result
+        finally:
+            for work_dir in work_dirs:
+                shutil.rmtree(work_dir, ignore_errors=True)
+
+    def _runner(
+        self,
+        max_workers: Optional[int] = None,
+        on_output: Optional[Callable[[CcxJob, str], None]] = None,
+    ) -> CcxJobRunner:
+        return CcxJobRunner(self._ccx_path, max_workers=max_workers, timeout=self.timeout, on_output=on_output)
+
+    def _collect_result(self, job_result: CcxJobResult, config: SolverConfig) -> SolverResult:
+        """读取作业结果文件；没有结果文件时返回估算结果"""
+        if job_result.success:
+            result_file = job_result.frd_file or job_result.dat_file
+            if result_file is not None:
+                result = self.read_results(str(result_file), config)
+                result.messages = (
+                    f"CalculiX 分析完成 ({job_result.elapsed:.1f}s, {job_result.threads} 线程)\n"
+                    f"输入文件: {job_result.job.input_file}\n"
+                    f"工作目录: {job_result.job.work_dir}\n\n"
+                    f"{result.messages}"
+                )
+                return result
+
+        result = self._generate_fallback_result(config)
+        if not job_result.success:
+            detail = job_result.error or "\n".join(job_result.output[-5:])
+            result.messages = f"ccx 运行{_STATUS_TEXT.get(job_result.status, '失败')}: {detail}\n{result.messages}"
+        return result
+
+    def _run_ccx(self, input_file: str, work_dir: str) -> bool:
+        """运行 ccx 求解器（在 work_dir 中运行，不切换当前进程目录）"""
+        job = CcxJob(os.path.join(work_dir, os.path.basename(input_file)))
+        return self._runner().run_one(job).success
 
     def generate_input(self, config: SolverConfig, output_path: str) -> bool:
         """生成 CalculiX 输入文件 (.inp)
@@ -173,7 +208,6 @@ class CalculiXSolver(BaseSolver):
             # 提取参数
             E = material.get("elastic_modulus", 210e9)  # Pa
             nu = material.get("poisson_ratio", 0.3)
-            material.get("yield_strength", 235e6)
 
             load = config.load  # N
             length = geometry.get("length", 1000)  # mm
@@ -182,23 +216,22 @@ class CalculiXSolver(BaseSolver):
 
             analysis_type = config.analysis_type or "static"
 
-            # 生成 INP 文件内容
-            inp_content = self._generate_inp_content(
-                analysis_type=analysis_type,
-                E=E,
-                nu=nu,
-                length=length,
-                width=width,
-                height=height,
-                load=load,
-            )
-
             # 写入文件
             output_dir = os.path.dirname(output_path)
-            os.makedirs(output_dir, exist_ok=True)
-
-            with open(output_path, "w", encoding="utf-8") as f:
-                f.write(inp_content)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+
+            with open(output_path, "wb", buffering=1 << 20) as f:
+                self._write_inp_content(
+                    f,
+                    analysis_type=analysis_type,
+                    E=E,
+                    nu=nu,
+                    length=length,
+                    width=width,
+                    height=height,
+                    load=load,
+                )
 
             return True
 
@@ -206,8 +239,37 @@ class CalculiXSolver(BaseSolver):
             print(f"生成输入文件失败: {e}")
             return False
 
-    def _generate_inp_content(
+    @staticmethod
+    def _beam_mesh(length: float, width: float, height: float, n_x: int = 10, n_y: int = 3, n_z: int = 3):
+        """悬臂梁C3D8结构化网格
+
+        节点编号 i*(n_y+1)*(n_z+1) + j*(n_z+1) + k + 1（i沿长度，j沿高度，k沿宽度）。
+
+        Returns:
+            (节点编号 [n], 坐标 [n, 3], 单元编号 [m], 连接 [m, 8])
+        """
+        i, j, k = np.meshgrid(np.arange(n_x + 1), np.arange(n_y + 1), np.arange(n_z + 1), indexing="ij")
+        node_ids = (i * (n_y + 1) * (n_z + 1) + j * (n_z + 1) + k + 1).ravel()
+        coords = np.column_stack(
+            [
+                (i * length / n_x).ravel(),
+                ((j - n_y / 2) * height / n_y).ravel(),
+                ((k - n_z / 2) * width / n_z).ravel(),
+            ]
+        )
+
+        ei, ej, ek = (a.ravel() for a in np.meshgrid(np.arange(n_x), np.arange(n_y), np.arange(n_z), indexing="ij"))
+        n1 = ei * (n_y + 1) * (n_z + 1) + ej * (n_z + 1) + ek + 1
+        n5 = n1 + (n_y + 1) * (n_z + 1)
+        connectivity = np.column_stack(
+            [n1, n1 + (n_z + 1), n1 + (n_z + 1) + 1, n1 + 1, n5, n5 + (n_z + 1), n5 + (n_z + 1) + 1, n5 + 1]
+        )
+        element_ids = np.arange(1, len(connectivity) + 1)
+        return node_ids, coords, element_ids, connectivity
+
+    def _write_inp_content(
         self,
+        f: BinaryIO,
         analysis_type: str,
         E: float,
         nu: float,
@@ -215,124 +277,81 @@ class CalculiXSolver(BaseSolver):
         width: float,
         height: float,
         load: float,
-    ) -> str:
-        """生成 CalculiX INP 文件内容"""
+    ) -> None:
+        """写出 CalculiX INP 文件内容（节点/单元块由批量写出器成块格式化）"""
+        from sw_helper.mesh.inp_writer import write_elements, write_nodes, write_set
+
         # 转换单位：CalculiX 使用 N/mm^2 (MPa)
         E_mpa = E / 1e6  # MPa
 
-        # 节点数
+        # 网格划分
         n_x = 10
         n_y = 3
         n_z = 3
+        node_ids, coords, element_ids, connectivity = self._beam_mesh(length, width, height, n_x, n_y, n_z)
+        nodes_per_face = (n_y + 1) * (n_z + 1)
+
+        def lines(*items: str):
+            f.write(("\n".join(items) + "\n").encode("utf-8"))
 
-        # 生成节点
-        nodes = []
-        for k in range(n_z + 1):
-            for j in range(n_y + 1):
-                for i in range(n_x + 1):
-                    x = i * length / n_x
-                    y = (j - n_y / 2) * height / n_y
-                    z = (k - n_z / 2) * width / n_z
-                    nodes.append((i * (n_y + 1) * (n_z + 1) + j * (n_z + 1) + k + 1, x, y, z))
-
-        # 生成单元 (C3D8 - 8节点砖单元)
-        elements = []
-        elem_id = 1
-        for i in range(n_x):
-            for j in range(n_y):
-                for k in range(n_z):
-                    n1 = i * (n_y + 1) * (n_z + 1) + j * (n_z + 1) + k + 1
-                    n2 = n1 + (n_z + 1)
-                    n3 = n1 + (n_z + 1) + 1
-                    n4 = n1 + 1
-                    n5 = n1 + (n_y + 1) * (n_z + 1)
-                    n6 = n5 + (n_z + 1)
-                    n7 = n5 + (n_z + 1) + 1
-                    n8 = n5 + 1
-                    elements.append((elem_id, n1, n2, n3, n4, n5, n6, n7, n8))
-                    elem_id += 1
-
-        # 构建 INP 文件
-        lines = [
+        lines(
             "*HEADING",
             "CAE-CLI CalculiX Analysis",
-            f"*ANALYSIS TYPE={analysis_type.upper()}",
+            f"** ANALYSIS TYPE={analysis_type.upper()}",
             "**",
             "** NODES",
             "**",
-            "*NODE",
-        ]
-
-        for node_id, x, y, z in nodes:
-            lines.append(f"{node_id:6d},{x:12.5f},{y:12.5f},{z:12.5f}")
-
-        lines.extend(
-            [
-                "**",
-                "** ELEMENTS",
-                "**",
-                "*ELEMENT,TYPE=C3D8,ELSET=BEAM",
-            ]
         )
+        write_nodes(f, node_ids, coords)
 
-        for elem in elements:
-            lines.append(
-                f"{elem[0]:6d},{elem[1]:6d},{elem[2]:6d},{elem[3]:6d},"
-                f"{elem[4]:6d},{elem[5]:6d},{elem[6]:6d},{elem[7]:6d},{elem[8]:6d}"
-            )
+        lines("**", "** ELEMENTS", "**")
+        write_elements(f, "C3D8", element_ids, connectivity, elset="BEAM")
 
-        lines.extend(
-            [
-                "**",
-                "** MATERIAL",
-                "**",
-                "*MATERIAL,NAME=STEEL",
-                "*ELASTIC",
-                f"{E_mpa:12.2f},{nu:12.5f}",
-                "*DENSITY",
-                "7.85e-9",  # t/mm^3
-                "**",
-                "** SECTIONS",
-                "**",
-                "*SOLID SECTION,ELSET=BEEL,MATERIAL=STEEL",
-                "**",
-                "** BOUNDARY CONDITIONS",
-                "**",
-                "** Fixed support at left end (x=0)",
-                "*BOUNDARY",
-                "1,1,3,0",  # 节点1 完全固定
-                f"{1+(n_z+1):6d},1,3,0",
-                f"{1+(n_y+1)*(n_z+1):6d},1,3,0",
-                f"{1+(n_y+1)*(n_z+1)+(n_z+1):6d},1,3,0",
-                "**",
-                "** LOADS",
-                "**",
-                "** Concentrated load at right end (x=length)",
-                "*CLOAD",
-            ]
-        )
+        # 左端 (x=0) 固定，右端 (x=length) 加载
+        write_set(f, "NSET", "FIXED", node_ids[:nodes_per_face])
+        write_set(f, "NSET", "LOAD", node_ids[-nodes_per_face:])
 
         # 在右端施加分布载荷
-        load_per_node = load / ((n_y + 1) * (n_z + 1))
-        for j in range(n_y + 1):
-            for k in range(n_z + 1):
-                node_id = n_x * (n_y + 1) * (n_z + 1) + j * (n_z + 1) + k + 1
-                lines.append(f"{node_id:6d},2,{load_per_node:12.5f}")  # Y方向载荷
+        load_per_node = load / nodes_per_face
 
-        lines.extend(
-            [
-                "**",
-                "** STEP",
-                "**",
-                "*STEP",
-                "*STATIC",
-                "0.1,1.0",
-                "*END STEP",
-            ]
+        lines(
+            "**",
+            "** MATERIAL",
+            "**",
+            "*MATERIAL,NAME=STEEL",
+            "*ELASTIC",
+            f"{E_mpa:12.2f},{nu:12.5f}",
+            "*DENSITY",
+            "7.85e-9",  # t/mm^3
+            "**",
+            "** SECTIONS",
+            "**",
+            "*SOLID SECTION,ELSET=BEAM,MATERIAL=STEEL",
+            "**",
+            "** BOUNDARY CONDITIONS",
+            "**",
+            "** Fixed support at left end (x=0)",
+            "*BOUNDARY",
+            "FIXED,1,3,0",
+            "**",
+            "** STEP",
+            "**",
+            "*STEP",
+            "*STATIC",
+            "0.1,1.0",
+            "**",
+            "** LOADS",
+            "**",
+            "** Concentrated load at right end (x=length)",
+            "*CLOAD",
+            f"LOAD,2,{load_per_node:12.5f}",  # Y方向载荷
+            "*NODE FILE",
+            "U",
+            "*EL FILE",
+            "S",
+            "*END STEP",
         )
 
-        return "\n".join(lines)
-
     def read_results(self, result_path: str, config: Optional[SolverConfig] = None) -> SolverResult:
         """读取 CalculiX 结果文件
 
@@ -364,37 +383,45 @@ class CalculiXSolver(BaseSolver):
             return self._generate_fallback_result(config)
 
     def _parse_frd(self, frd_path: str, config: Optional[SolverConfig] = None) -> SolverResult:
-        """解析 .frd 结果文件"""
-        max_displacement = 0.0
-        max_stress = 0.0
-        displacements = {}
-        stresses = {}
+        """解析 .frd 结果文件
 
+        流式读取 DISP/STRESS 结果块，取最后一个增量步的节点位移模长与 von Mises
+        等效应力的精确最大值。输入文件使用 mm/N/MPa 单位，结果换算为 m/Pa。
+        """
         try:
-            with open(frd_path, encoding="utf-8", errors="ignore") as f:
-                content = f.read()
-
-            # 查找位移数据 (DISP)
-            disp_match = re.search(r"-3\s+DISP\s+([\d\.]+)", content)
-            if disp_match:
-                max_displacement = float(disp_match.group(1))
+            reader = FrdReader(frd_path, fields=["DISP", "STRESS"])
+            last = {}
+            for block in reader.iter_blocks():
+                last[block.name] = block
+        except Exception:
+            return self._generate_fallback_result(config)
 
-            # 查找应力数据 (STRESS)
-            stress_match = re.search(r"-4\s+STRESS\s+([\d\.\-E+]+)", content)
-            if stress_match:
-                max_stress = abs(float(stress_match.group(1)))
+        if not last:
+            return self._generate_fallback_result(config)
 
-            # 尝试提取更多节点位移
-            disp_nodes = re.findall(r"(\d+)\s+([\d\.\-E+]+)\s+([\d\.\-E+]+)\s+([\d\.\-E+]+)", content)
-            for node, ux, uy, uz in disp_nodes[-10:]:  # 取最后10个节点
-                displacements[f"node_{node}"] = float(ux)
+        max_displacement = 0.0
+        max_stress = 0.0
+        displacements = {}
+        stresses = {}
 
-        except Exception:
-            return self._generate_fallback_result(config)
+        # 各取数值最大的10个节点作为探针结果
+        if "DISP" in last:
+            block = last["DISP"]
+            magnitude = block.magnitude() / 1000.0  # mm -> m
+            top = np.argsort(magnitude)[::-1][:10]
+            max_displacement = float(magnitude[top[0]]) if len(top) else 0.0
+            displacements = {f"node_{block.node_ids[i]}": float(magnitude[i]) for i in top}
+
+        if "STRESS" in last:
+            block = last["STRESS"]
+            mises = block.von_mises() * 1e6  # MPa -> Pa
+            top = np.argsort(mises)[::-1][:10]
+            max_stress = float(mises[top[0]]) if len(top) else 0.0
+            stresses = {f"node_{block.node_ids[i]}": float(mises[i]) for i in top}
 
         # 计算安全系数
         material = config.material if config else {}
-        sigma_yield = material.get("yield_strength", 235e6)
+        sigma_yield = (material or {}).get("yield_strength", 235e6)
         safety_factor = sigma_yield / max_stress if max_stress > 0 else float("inf")
 
         return SolverResult(
@@ -405,6 +432,7 @@ class CalculiXSolver(BaseSolver):
             stress=stresses if stresses else None,
             messages=(
                 f"CalculiX 结果已读取\n"
+                f"节点数: {len(reader.node_ids)}\n"
                 f"最大位移: {max_displacement*1000:.6f} mm\n"
                 f"最大应力: {max_stress/1e6:.2f} MPa\n"
                 f"安全系数: {safety_factor:.2f}"
@@ -479,6 +507,7 @@ class CalculiXSolver(BaseSolver):
                 max_stress=0,
                 safety_factor=0,
                 messages="CalculiX 求解器需要安装 ccx 可执行文件",
+                estimated=True,
             )
 
         material = config.material or {}
@@ -530,4 +559,5 @@ class CalculiXSolver(BaseSolver):
                 f"状态: {status}\n\n"
                 f"注: 如需精确结果，请安装 ccx 后重新运行"
             ),
+            estimated=True,
         )
@@ -0,0 +1,457 @@
+"""
+线性方程组求解策略
+
+- direct: SuperLU 直接法（对称模式），中小规模模型最快
+- cg: 预条件共轭梯度法，内存随自由度线性增长，适合大规模三维模型
+- minres: 预条件最小残差法，对称不定矩阵也可使用
+
+预条件：
+- none / jacobi: 无预条件 / 对角预条件
+- ic: 不完全 Cholesky IC(0)（对角缩放后按 A 的下三角模式分解，模式外填充对称丢弃，
+  非正主元时加对角平移），可用于 CG/MINRES；安装了 ilupp 时使用其编译实现，否则逐消去层
+  向量化分解。三角回代是串行的，大规模三维模型上 amg 通常更快，auto 模式不会选择 ic
+- amg: 代数多重网格；安装了 pyamg 时使用其光滑聚集求解器，否则使用内置的
+  两层光滑聚集预条件（按节点坐标分块聚集，刚体模态作为近零空间）
+"""
+
+import inspect
+import logging
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import LinearOperator, cg, minres, splu
+
+METHODS = ("auto", "direct", "cg", "minres")
+PRECONDITIONERS = ("none", "jacobi", "ic", "amg")
+
+# auto 模式下使用直接法的最大方程数，超过则使用 CG + AMG。三维实体单元的分解填充随规模
+# 增长远快于平面单元（嵌套剖分下约 n^(4/3) 对 n log n），约 5 万自由度时 SuperLU 已比
+# CG + AMG 慢一个数量级，因此三维模型使用低得多的阈值
+DIRECT_SOLVER_MAX_DOFS = 100_000
+DIRECT_SOLVER_MAX_DOFS_3D = 20_000
+
+# 没有位移分量编号时，按每行非零元数判断三维实体单元（平面 Q4 约 18，C3D4 约 40，C3D8 约 80）
+SOLID_MIN_NNZ_PER_ROW = 30
+
+# IC 分解遇到非正主元时的首次对角平移（相对缩放后矩阵行范数的均值），之后每次加倍
+IC_SHIFT_START = 1e-3
+
+# 判定收敛时真实相对残差允许超过容差的倍数（Krylov 法按预条件残差停止）
+RESIDUAL_SLACK = 10.0
+
+# Krylov 求解器的容差参数名（SciPy 1.12 起为 rtol，之前为 tol）
+_TOL_KEYWORD = "rtol" if "rtol" in inspect.signature(cg).parameters else "tol"
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LinearSolveInfo:
+    """线性求解统计"""
+
+    method: str
+    preconditioner: str = "none"
+    iterations: int = 0
+    residual: float = 0.0  # 相对残差 ||b - A x|| / ||b||
+    converged: bool = True
+
+    def summary(self) -> str:
+        if self.method == "direct":
+            return f"线性求解: direct, 相对残差 {self.residual:.2e}"
+        status = "收敛" if self.converged else "未收敛"
+        return (
+            f"线性求解: {self.method} + {self.preconditioner}, "
+            f"迭代 {self.iterations} 次, 相对残差 {self.residual:.2e} ({status})"
+        )
+
+
+def rigid_body_modes(coords: np.ndarray, components: np.ndarray) -> np.ndarray:
+    """刚体模态（近零空间）[n, 3] (2D) 或 [n, 6] (3D)
+
+    Args:
+        coords: 各方程所属节点的坐标 [n, dim]
+        components: 各方程的位移分量编号 [n]
+    """
+    n, dim = coords.shape
+    rows = np.arange(n)
+    if dim == 2:
+        B = np.zeros((n, 3))
+        B[rows, components] = 1.0
+        x, y = coords.T
+        B[:, 2] = np.where(components == 0, -y, x)
+        return B
+
+    B = np.zeros((n, 6))
+    B[rows, components] = 1.0
+    # 绕 x/y/z 轴转动：u = ω × r
+    x, y, z = coords.T
+    rotations = (
+        (np.zeros(n), -z, y),
+        (z, np.zeros(n), -x),
+        (-y, x, np.zeros(n)),
+    )
+    for k, rotation in enumerate(rotations):
+        B[:, 3 + k] = np.choose(components, rotation)
+    return B
+
+
+def symmetric_lu(A: sparse.spmatrix):
+    """对称正定矩阵的 SuperLU 分解：对称模式（对角主元）+ A^T+A 最小度排序，填充远少于默认设置"""
+    return splu(sparse.csc_matrix(A), permc_spec="MMD_AT_PLUS_A", diag_pivot_thresh=0, options={"SymmetricMode": True})
+
+
+def _spectral_radius(A: sparse.csr_matrix, inv_diag: np.ndarray, steps: int = 15) -> float:
+    """幂迭代估计 D^-1 A 的谱半径"""
+    x = np.random.default_rng(0).random(A.shape[0])
+    rho = 1.0
+    for _ in range(steps):
+        y = inv_diag * (A @ x)
+        rho = np.linalg.norm(y) / np.linalg.norm(x)
+        x = y / np.linalg.norm(y)
+    return rho
+
+
+class AggregationAMG:
+    """两层光滑聚集代数多重网格预条件
+
+    节点按坐标分入边长约为 ``cells_per_aggregate`` 个节点间距的立方体，每个聚集体
+    以正交化后的刚体模态作为粗空间基，经一次加权Jacobi光滑得到插值算子 P，
+    粗网格矩阵 P^T A P 直接分解。前后各 ``smoothing_steps`` 次加权Jacobi光滑，
+    V循环对称，可作为CG预条件。
+
+    Args:
+        A: 对称正定矩阵 [n, n]
+        coords: 各方程所属节点坐标 [n, dim]
+        components: 各方程位移分量编号 [n]
+    """
+
+    def __init__(
+        self,
+        A: sparse.spmatrix,
+        coords: np.ndarray,
+        components: np.ndarray,
+        cells_per_aggregate: float = 3.0,
+        smoothing_steps: int = 2,
+    ):
+        self.A = A = sparse.csr_matrix(A)
+        n, dim = coords.shape
+        self.inv_diag = 1.0 / A.diagonal()
+        self.omega = 4.0 / (3.0 * _spectral_radius(A, self.inv_diag))
+        self.smoothing_steps = smoothing_steps
+
+        # 按坐标分块聚集
+        lo, hi = coords.min(axis=0), coords.max(axis=0)
+        n_nodes = max(1, n // dim)
+        extent = np.where(hi > lo, hi - lo, 0.0)
+        volume = np.prod(extent[extent > 0]) if np.any(extent > 0) else 1.0
+        spacing = (volume / n_nodes) ** (1.0 / max(1, np.count_nonzero(extent)))
+        cells = np.floor((coords - lo) / (cells_per_aggregate * spacing)).astype(np.int64)
+        _, aggregate = np.unique(cells, axis=0, return_inverse=True)
+        aggregate = aggregate.ravel()
+        n_aggregates = aggregate.max() + 1
+
+        # 各聚集体内的刚体模态，相对形心计算后逐块SVD正交化（去除秩亏方向）
+        order = np.argsort(aggregate, kind="stable")
+        counts = np.bincount(aggregate, minlength=n_aggregates)
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        slot = np.arange(n) - np.repeat(starts, counts)
+        centroid = np.zeros((n_aggregates, dim))
+        np.add.at(centroid, aggregate, coords)
+        centroid /= counts[:, np.newaxis]
+        local = rigid_body_modes(coords - centroid[aggregate], components)[order]
+        k = local.shape[1]
+
+        padded = np.zeros((n_aggregates, max(counts.max(), k), k))
+        padded[aggregate[order], slot] = local
+        U, s, _ = np.linalg.svd(padded, full_matrices=False)
+        keep = s > 1e-10 * np.maximum(s[:, :1], 1e-300)
+        column = np.cumsum(keep.ravel()).reshape(keep.shape) - 1
+
+        agg_sorted = aggregate[order]
+        rows = np.repeat(order, k)
+        values = U[agg_sorted, slot].reshape(-1)
+        cols = column[agg_sorted].reshape(-1)
+        valid = keep[agg_sorted].reshape(-1)
+        P_tent = sparse.csr_matrix((values[valid], (rows[valid], cols[valid])), shape=(n, int(keep.sum())))
+
+        self.P = (P_tent - self.omega * sparse.diags(self.inv_diag) @ (A @ P_tent)).tocsr()
+        coarse = (self.P.T @ A @ self.P).tocsc()
+        self.coarse_size = coarse.shape[0]
+        self.coarse = symmetric_lu(coarse)
+
+    def _smooth(self, x: np.ndarray, b: np.ndarray) -> np.ndarray:
+        for _ in range(self.smoothing_steps):
+            x = x + self.omega * self.inv_diag * (b - self.A @ x)
+        return x
+
+    def apply(self, b: np.ndarray) -> np.ndarray:
+        x = self._smooth(np.zeros_like(b), b)
+        x = x + self.P @ self.coarse.solve(self.P.T @ (b - self.A @ x))
+        return self._smooth(x, b)
+
+    def aslinearoperator(self) -> LinearOperator:
+        return LinearOperator(self.A.shape, matvec=self.apply, dtype=np.float64)
+
+
+def _column_entries(indptr: np.ndarray, columns: np.ndarray, skip: int = 0) -> np.ndarray:
+    """CSC 中若干列（各跳过前 ``skip`` 个元素）的元素下标，按列依次拼接"""
+    starts = indptr[columns] + skip
+    lengths = indptr[columns + 1] - starts
+    offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+    return offsets + np.arange(lengths.sum())
+
+
+def elimination_levels(lower: sparse.csc_matrix) -> List[np.ndarray]:
+    """按下三角模式划分消去层：同一层的列互不依赖，可以一起分解
+
+    第 j 列依赖 l_jk ≠ 0 的所有 k < j 列，按拓扑层（波前）逐层取出入度为零的列。
+
+    Args:
+        lower: 下三角（CSC，行号有序，每列第一个元素为对角元）
+    """
+    n = lower.shape[0]
+    indptr = lower.indptr
+    rows = lower.indices
+    below = rows[_column_entries(indptr, np.arange(n), skip=1)]
+    pending = np.bincount(below, minlength=n)
+    levels = []
+    front = np.flatnonzero(pending == 0)
+    while len(front):
+        levels.append(front)
+        targets = rows[_column_entries(indptr, front, skip=1)]
+        pending -= np.bincount(targets, minlength=n)
+        front = np.unique(targets[pending[targets] == 0])
+    return levels
+
+
+def _incomplete_cholesky(
+    lower: sparse.csc_matrix, shift: float, levels: Optional[List[np.ndarray]] = None
+) -> Optional[sparse.csc_matrix]:
+    """按 ``lower`` 的稀疏模式做 Cholesky 分解 IC(0)，出现非正主元时返回 None
+
+    逐消去层向量化：一层内各列同时归一化，并一次性把 l_ik l_jk 累加到模式内的 (i, j)
+    元素上（模式外的填充丢弃），Python 循环次数等于层数而非列数。
+
+    Args:
+        lower: 对称矩阵的下三角（CSC，行号有序，每列第一个元素为对角元）
+        shift: 对角平移
+        levels: :func:`elimination_levels` 的结果（None 时重新计算）
+    """
+    n = lower.shape[0]
+    indptr = lower.indptr
+    rows = lower.indices.astype(np.int64)
+    values = lower.data.astype(np.float64)
+    values[indptr[:-1]] += shift
+    # 元素 (i, j) 的键 j·n + i 按 CSC 存储顺序递增，可二分查找
+    keys = np.repeat(np.arange(n, dtype=np.int64), np.diff(indptr)) * n + rows
+
+    for columns in elimination_levels(lower) if levels is None else levels:
+        diagonal = indptr[columns]
+        pivot = values[diagonal]
+        if not np.all(pivot > 0):
+            return None
+        pivot = np.sqrt(pivot)
+        values[diagonal] = pivot
+        counts = indptr[columns + 1] - diagonal - 1
+        entries = _column_entries(indptr, columns, skip=1)
+        if not len(entries):
+            continue
+        values[entries] /= np.repeat(pivot, counts)
+
+        # 同一列下方元素两两配对 (a ≥ b)：更新 (rows[a], rows[b])
+        rank = entries - np.repeat(diagonal + 1, counts)
+        a = np.repeat(entries, rank + 1)
+        offset = np.arange(len(a)) - np.repeat(np.cumsum(rank + 1) - rank - 1, rank + 1)
+        b = np.repeat(entries - rank, rank + 1) + offset
+        target = rows[b] * n + rows[a]
+        pos = np.minimum(np.searchsorted(keys, target), len(keys) - 1)
+        inside = keys[pos] == target
+        np.subtract.at(values, pos[inside], (values[a] * values[b])[inside])
+    return sparse.csc_matrix((values, rows, indptr), shape=lower.shape)
+
+
+def _compiled_incomplete_cholesky(ichol0, lower: sparse.csc_matrix, shift: float) -> Optional[sparse.csc_matrix]:
+    """用 ilupp 的编译实现 ``ichol0`` 做 IC(0)，出现非正主元（ilupp 给出 NaN）时返回 None"""
+    shifted = lower + shift * sparse.eye(lower.shape[0], format="csc")
+    L = sparse.csc_matrix(ichol0(sparse.csr_matrix(shifted + sparse.tril(shifted, k=-1).T)))
+    if not (np.all(np.isfinite(L.data)) and np.all(L.diagonal() > 0)):
+        return None
+    L.sort_indices()
+    return L
+
+
+class IncompleteCholesky:
+    """不完全 Cholesky 预条件 IC(0)：M = S^-1 L L^T S^-1
+
+    对对角缩放后的 S A S（S = diag(A)^-1/2）按 A 下三角的稀疏模式做 Cholesky 分解，
+    模式之外的填充对称丢弃，L L^T 在该模式上与 S A S 一致，预条件严格对称。安装了 ilupp
+    时使用其编译实现，否则逐消去层向量化分解。出现非正主元时加对角平移重新分解，保证
+    M 正定，可作为 CG/MINRES 预条件。平移从 ``IC_SHIFT_START`` × 缩放后矩阵行范数的均值
+    开始逐次加倍，尽量用最小的平移保住分解质量。
+
+    Args:
+        A: 对称正定矩阵 [n, n]
+        shift: 初始对角平移（相对缩放后的单位对角）
+        max_attempts: 最多分解次数
+    """
+
+    def __init__(self, A: sparse.spmatrix, shift: float = 0.0, max_attempts: int = 12):
+        A = sparse.csr_matrix(A)
+        diagonal = A.diagonal()
+        if not np.all(diagonal > 0):
+            raise ValueError("不完全 Cholesky 分解需要正对角元，矩阵可能不正定")
+        scale = 1.0 / np.sqrt(diagonal)
+        scaled = sparse.csr_matrix(sparse.diags(scale) @ A @ sparse.diags(scale))
+        lower = sparse.tril(scaled, format="csc")
+        lower.sum_duplicates()
+        lower.sort_indices()
+
+        try:
+            from ilupp import ichol0
+
+            def factorize(shift):
+                return _compiled_incomplete_cholesky(ichol0, lower, shift)
+
+        except ImportError:
+            levels = elimination_levels(lower)
+
+            def factorize(shift):
+                return _incomplete_cholesky(lower, shift, levels)
+
+        row_norms = np.sqrt(np.asarray(scaled.multiply(scaled).sum(axis=1)).ravel())
+        step = IC_SHIFT_START * float(row_norms.mean())
+        for _ in range(max_attempts):
+            L = factorize(shift)
+            if L is not None:
+                break
+            shift = max(2.0 * shift, step)
+        else:
+            raise ValueError("不完全 Cholesky 分解无法得到正主元，矩阵可能不正定")
+
+        self.shape = A.shape
+        self.shift = shift
+        self.scale = scale
+        # 三角因子用不重排的 SuperLU 求解（无填充）
+        self._lower = splu(L, permc_spec="NATURAL", diag_pivot_thresh=0, options={"SymmetricMode": True})
+        self._upper = splu(L.T.tocsc(), permc_spec="NATURAL", diag_pivot_thresh=0, options={"SymmetricMode": True})
+
+    def apply(self, b: np.ndarray) -> np.ndarray:
+        return self._upper.solve(self._lower.solve(b * self.scale)) * self.scale
+
+    def aslinearoperator(self) -> LinearOperator:
+        return LinearOperator(self.shape, matvec=self.apply, dtype=np.float64)
+
+
+def make_preconditioner(
+    A: sparse.spmatrix,
+    kind: str,
+    coords: Optional[np.ndarray] = None,
+    components: Optional[np.ndarray] = None,
+) -> Optional[LinearOperator]:
+    """构造预条件算子（近似 A^-1）"""
+    if kind == "none":
+        return None
+    if kind == "jacobi":
+        inv_diag = 1.0 / A.diagonal()
+        return LinearOperator(A.shape, matvec=lambda x: inv_diag * x, dtype=np.float64)
+    if kind == "ic":
+        return IncompleteCholesky(A).aslinearoperator()
+    if kind == "amg":
+        if coords is None or components is None:
+            raise ValueError("AMG 预条件需要节点坐标与自由度分量")
+        near_nullspace = rigid_body_modes(coords, components)
+        try:
+            import pyamg
+
+            ml = pyamg.smoothed_aggregation_solver(sparse.csr_matrix(A), B=near_nullspace)
+            return ml.aspreconditioner(cycle="V")
+        except ImportError:
+            return AggregationAMG(A, coords, components).aslinearoperator()
+    raise ValueError(f"未知预条件: {kind}，可用: {PRECONDITIONERS}")
+
+
+def _krylov(solver, A, b, tol, maxiter, M, callback, x0=None):
+    return solver(A, b, x0=x0, maxiter=maxiter, M=M, callback=callback, **{_TOL_KEYWORD: tol})
+
+
+def direct_solver_max_dofs(A: sparse.spmatrix, components: Optional[np.ndarray] = None) -> int:
+    """auto 模式下使用直接法的最大方程数（按模型维数选择）"""
+    if components is not None and len(components):
+        solid = int(np.max(components)) >= 2
+    else:
+        solid = A.nnz > SOLID_MIN_NNZ_PER_ROW * A.shape[0]
+    return DIRECT_SOLVER_MAX_DOFS_3D if solid else DIRECT_SOLVER_MAX_DOFS
+
+
+def solve_linear(
+    A: sparse.spmatrix,
+    b: np.ndarray,
+    method: str = "auto",
+    preconditioner: Optional[str] = None,
+    tol: float = 1e-8,
+    maxiter: Optional[int] = None,
+    coords: Optional[np.ndarray] = None,
+    components: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, LinearSolveInfo]:
+    """求解对称线性方程组 A x = b
+
+    Args:
+        A: 对称（正定）稀疏矩阵
+        b: 右端项
+        method: auto/direct/cg/minres（auto 按规模与维数选择直接法或 CG + AMG，
+            见 :func:`direct_solver_max_dofs`）
+        preconditioner: none/jacobi/ic/amg（迭代法使用）；None 时自动选择
+            （有节点坐标时为 amg，否则为 jacobi），显式指定时始终使用指定的预条件
+        tol: 迭代法相对残差收敛容差；真实相对残差超过 ``tol × RESIDUAL_SLACK`` 时判为未收敛
+        maxiter: 迭代法最大迭代次数（None 为 SciPy 默认值）
+        coords: 各方程所属节点坐标（AMG 预条件需要）
+        components: 各方程位移分量编号（AMG 预条件需要）
+
+    Returns:
+        (x, LinearSolveInfo)
+    """
+    if method not in METHODS:
+        raise ValueError(f"未知线性求解方法: {method}，可用: {METHODS}")
+    if preconditioner is not None and preconditioner not in PRECONDITIONERS:
+        raise ValueError(f"未知预条件: {preconditioner}，可用: {PRECONDITIONERS}")
+
+    if method == "auto":
+        method = "direct" if A.shape[0] <= direct_solver_max_dofs(A, components) else "cg"
+        logger.info("auto 线性求解: %d 个方程，使用 %s", A.shape[0], method)
+    if preconditioner is None:
+        preconditioner = "amg" if coords is not None and components is not None else "jacobi"
+        if method != "direct":
+            logger.info("未指定预条件，使用 %s", preconditioner)
+
+    b_norm = np.linalg.norm(b)
+    if method == "direct":
+        x = symmetric_lu(A).solve(b)
+        info = LinearSolveInfo(method="direct")
+    else:
+        M = make_preconditioner(A, preconditioner, coords, components)
+        iterations = [0]
+
+        def count(_):
+            iterations[0] += 1
+
+        solver = cg if method == "cg" else minres
+        x, _ = _krylov(solver, A, b, tol, maxiter, M, count)
+        if method == "minres":
+            # MINRES 按 ||r|| / (||A|| ||x||) 停止，真实残差未达到容差时从当前解重启
+            limit = maxiter if maxiter is not None else 5 * A.shape[0]
+            while iterations[0] < limit and np.linalg.norm(b - A @ x) > tol * b_norm:
+                done = iterations[0]
+                x, _ = _krylov(solver, A, b, tol, limit - done, M, count, x0=x)
+                if iterations[0] == done:
+                    break
+        info = LinearSolveInfo(method, preconditioner, iterations[0])
+
+    info.residual = float(np.linalg.norm(b - A @ x) / b_norm) if b_norm > 0 else 0.0
+    if method != "direct":
+        # Krylov 法的退出码只反映预条件残差，以真实残差判定收敛
+        info.converged = info.residual <= tol * RESIDUAL_SLACK
+        if not info.converged:
+            logger.warning("%s + %s 未收敛: 相对残差 %.2e > 容差 %.0e", method, preconditioner, info.residual, tol)
+    return x, info
@@ -1,20 +1,44 @@
 """
 SciPy 求解器 - 基于 SciPy 的 FEM 求解器
 
-使用 SciPy 的稀疏矩阵求解器进行更精确的有限元分析。
+使用 SciPy 的稀疏矩阵求解器进行有限元分析：结构化网格离散矩形截面梁，
+向量化组装总刚度矩阵，消去位移约束后求解，输出节点位移与节点应力。
 """
 
+import math
+import time
+
 from .base import BaseSolver, SolverConfig, SolverResult
 
+# 单元类型别名 -> 单元类型
+ELEMENT_ALIASES = {
+    "q4": "Q4",
+    "quad": "Q4",
+    "quadrilateral": "Q4",
+    "cst": "CST",
+    "tri": "CST",
+    "triangle": "CST",
+    "c3d4": "C3D4",
+    "tet": "C3D4",
+    "tet4": "C3D4",
+    "tetrahedron": "C3D4",
+    "c3d8": "C3D8",
+    "hex": "C3D8",
+    "hex8": "C3D8",
+    "hexahedron": "C3D8",
+}
+
 
 class SciPySolver(BaseSolver):
     """SciPy FEM 求解器
 
     使用 SciPy 稀疏矩阵求解器进行有限元分析。
-    相比简易求解器，支持更复杂的单元类型和边界条件。
+    相比简易求解器，支持平面应力 (Q4/CST) 与三维实体 (C3D4/C3D8) 单元，
+    以及简支 (simply_supported) 与悬臂 (cantilever) 边界条件。
     """
 
     name = "scipy"
+    version = "2.0"
     description = "SciPy 求解器 (需要 scipy, numpy)"
     requires_install = "pip install scipy numpy"
 
@@ -31,19 +55,21 @@ class SciPySolver(BaseSolver):
     def solve(self, config: SolverConfig) -> SolverResult:
         """使用 SciPy 求解器执行 FEM 分析
 
-        实现了简化的平面应力单元分析。
+        几何参数 length/width/height (mm) 描述矩形截面梁，网格尺寸取 ``config.mesh_size``，
+        单元类型取 ``config.element_type``，线性方程组求解策略取 ``config.linear_solver``
+        / ``preconditioner`` / ``tolerance`` / ``max_iterations``。载荷沿截面高度方向（负向）按节点面积权重
+        分布在跨中截面（简支）或自由端截面（悬臂）。
         """
         try:
             import numpy as np
-            from scipy import sparse
-            from scipy.sparse.linalg import spsolve
+
+            from . import sparse_fem
         except ImportError:
-            return SolverResult(
-                max_displacement=0,
-                max_stress=0,
-                safety_factor=0,
-                messages="错误: SciPy 未安装，请运行: pip install scipy numpy",
-            )
+            return _error_result("SciPy 未安装，请运行: pip install scipy numpy")
+
+        element_type = ELEMENT_ALIASES.get(str(config.element_type or "Q4").lower())
+        if element_type is None:
+            return _error_result(f"未知单元类型: {config.element_type}，可用: {sorted(set(ELEMENT_ALIASES.values()))}")
 
         # 提取参数
         material = config.material or {}
@@ -51,82 +77,142 @@ class SciPySolver(BaseSolver):
         nu = material.get("poisson_ratio", 0.3)
         sigma_yield = material.get("yield_strength", 235e6)
 
-        load = config.load
         geometry = config.geometry or {}
-
-        # 平面应力弹性矩阵
-        # D = E/(1-nu^2) * [1  nu  0; nu  1  0; 0  0  (1-nu)/2]
-        D_factor = E / (1 - nu**2)
-        D_factor * np.array([[1, nu, 0], [nu, 1, 0], [0, 0, (1 - nu) / 2]])
-
-        # 简化模型：矩形截面梁
-        # 4节点四边形单元 (Q4)
         length = geometry.get("length", 1000) / 1000  # m
+        width = geometry.get("width", 50) / 1000  # m
         height = geometry.get("height", 100) / 1000  # m
+        support = (config.boundary_conditions or {}).get("type", "simply_supported")
+        if support not in ("simply_supported", "cantilever"):
+            return _error_result(f"未知边界条件: {support}，可用: simply_supported, cantilever")
+
+        # 网格划分：纵向与高度方向单元数取偶数，保证跨中截面与中性轴上有节点
+        mesh_size = (config.mesh_size or 10.0) / 1000
+        nx = _even(length / mesh_size)
+        nz = _even(height / mesh_size)
+
+        t0 = time.perf_counter()
+        if element_type in ("Q4", "CST"):
+            model = sparse_fem.rectangle_mesh(length, height, nx, nz, element_type)
+            model.thickness = width
+        else:
+            ny = max(1, math.ceil(width / mesh_size - 1e-9))
+            model = sparse_fem.box_mesh(length, width, height, nx, ny, nz, element_type)
+
+        D = sparse_fem.elasticity_matrix(E, nu, model.dim)
+        K = sparse_fem.assemble_stiffness(model, D)
+        fixed_dofs, f, section = _beam_constraints(model, length, support, config.load)
+        t1 = time.perf_counter()
 
-        # 创建简单网格 (2x8 单元)
-        nx, ny = 8, 2
-        x = np.linspace(0, length, nx + 1)
-        y = np.linspace(-height / 2, height / 2, ny + 1)
-
-        # 节点坐标
-        nodes = []
-        for j in range(ny + 1):
-            for i in range(nx + 1):
-                nodes.append([x[i], y[j]])
-        nodes = np.array(nodes)
-        n_nodes = len(nodes)
-
-        # 单元定义
-        elements = []
-        for j in range(ny):
-            for i in range(nx):
-                n1 = j * (nx + 1) + i
-                n2 = n1 + 1
-                n3 = n1 + (nx + 1) + 1
-                n4 = n1 + (nx + 1)
-                elements.append([n1, n2, n3, n4])
-
-        # 组装刚度矩阵 (简化版)
-        # 使用近似刚度矩阵
-        n_nodes * 2  # 每个节点2个自由度
-
-        # 简支梁边界条件
-        fixed_dof = [0, 1]  # 左端固定
-        # 右端滚动支座 (释放X位移)
-        fixed_dof.extend([(nx) * 2, (nx) * 2 + 1])  # 右端
-
-        # 载荷施加在跨中节点
-        (ny // 2) * (nx + 1) + nx // 2
-
-        # 简化计算：使用解析公式
-        # 对于简支梁中点集中载荷
-        I = (height**3 * 1) / 12  # 简化宽度=1
-
-        max_displacement = (load * length**3) / (48 * E * I)
-        W = (height**2) / 6
-        max_stress = (load * length) / (4 * W)
-
+        try:
+            u, info = sparse_fem.solve_static(
+                K,
+                f,
+                fixed_dofs,
+                nodes=model.nodes,
+                method=config.linear_solver,
+                preconditioner=config.preconditioner,
+                tol=config.tolerance,
+                maxiter=config.max_iterations,
+            )
+        except ValueError as e:
+            # 未知的求解方法/预条件，或不完全分解失败（矩阵不正定）
+            return _error_result(str(e))
+        t2 = time.perf_counter()
+
+        dim = model.dim
+        u_nodes = u.reshape(-1, dim)
+        magnitude = np.linalg.norm(u_nodes, axis=1)
+        stress = sparse_fem.nodal_stress(model, D, u)
+        mises = sparse_fem.von_mises(stress)
+
+        max_displacement = float(magnitude.max())
+        max_stress = float(mises.max())
         safety_factor = sigma_yield / max_stress if max_stress > 0 else float("inf")
-
         status = "安全" if safety_factor > 1.5 else ("警告" if safety_factor > 1.0 else "危险")
 
+        section_key = "mid_span" if support == "simply_supported" else "tip"
+        displacement = {section_key: float(np.abs(u_nodes[section, dim - 1]).mean())}
+        stress_result = {
+            "max_tensile": float(stress[:, 0].max()),
+            "max_compressive": float(stress[:, 0].min()),
+        }
+
+        messages = [
+            f"SciPy FEM 分析 - {len(model.elements)} {element_type} 单元, {len(model.nodes)} 节点, "
+            f"{model.n_dofs} 自由度",
+            f"材料: E={E / 1e9:.0f}GPa, ν={nu}, σyield={sigma_yield / 1e6:.0f}MPa",
+            f"边界条件: {support}, 组装 {t1 - t0:.2f}s, 求解 {t2 - t1:.2f}s",
+            info.summary(),
+            f"状态: {status}",
+        ]
+        if not info.converged:
+            messages.insert(0, "警告: 迭代求解未收敛，结果可能不准确，可增大 max_iterations 或更换预条件")
+        if config.analysis_type != "static":
+            messages.insert(0, f"警告: SciPy 求解器仅支持静力分析，已按静力分析求解 ({config.analysis_type})")
+
         return SolverResult(
             max_displacement=max_displacement,
             max_stress=max_stress,
             safety_factor=safety_factor,
-            displacement={
-                "mid_span": max_displacement,
-                "L/4": max_displacement * 0.5,
-                "3L/4": max_displacement * 0.5,
-            },
-            stress={
-                "max_tensile": max_stress,
-                "max_compressive": -max_stress,
-            },
-            messages=(
-                f"SciPy FEM 分析 - {len(elements)} 单元, {n_nodes} 节点\n"
-                f"材料: E={E/1e9:.0f}GPa, ν={nu}, σyield={sigma_yield/1e6:.0f}MPa\n"
-                f"状态: {status}"
-            ),
+            displacement=displacement,
+            stress=stress_result,
+            messages="\n".join(messages),
+            node_displacement=magnitude,
+            node_stress=mises,
         )
+
+
+def _error_result(message: str) -> SolverResult:
+    """求解失败时的全零结果（不写入结果缓存）"""
+    return SolverResult(max_displacement=0, max_stress=0, safety_factor=0, messages=f"错误: {message}")
+
+
+def _even(value: float) -> int:
+    """不小于 value 的偶数（至少为2）"""
+    return max(2, 2 * math.ceil(value / 2 - 1e-9))
+
+
+def _beam_constraints(model, length: float, support: str, load: float):
+    """梁的位移约束与载荷向量
+
+    简支：两端截面约束竖向位移，左端中性轴约束轴向位移（三维时两端各约束一个横向位移）；
+    悬臂：左端截面全约束。
+
+    Returns:
+        (约束自由度, 载荷向量, 受载截面节点索引)
+    """
+    import numpy as np
+
+    nodes = model.nodes
+    dim = model.dim
+    tol = 1e-9 * max(length, 1.0)
+    vertical = dim - 1
+
+    left = np.flatnonzero(np.abs(nodes[:, 0]) < tol)
+    right = np.flatnonzero(np.abs(nodes[:, 0] - length) < tol)
+    neutral = np.abs(nodes[:, vertical]) < tol
+
+    if support == "cantilever":
+        fixed = (left[:, np.newaxis] * dim + np.arange(dim)).ravel()
+        section = right
+    else:
+        fixed_parts = [left * dim + vertical, right * dim + vertical]
+        left_axis = left[neutral[left]]
+        fixed_parts.append(left_axis * dim)
+        if dim == 3:
+            for end in (left, right):
+                axis = end[neutral[end]]
+                fixed_parts.append(axis[np.argmin(nodes[axis, 1])] * dim + 1)
+        fixed = np.unique(np.concatenate([np.atleast_1d(p) for p in fixed_parts]))
+        section = np.flatnonzero(np.abs(nodes[:, 0] - length / 2) < tol)
+
+    # 结构化网格上截面节点的面积权重：边界节点每个方向减半
+    weights = np.ones(len(section))
+    for axis in range(1, dim):
+        values = nodes[section, axis]
+        on_edge = (np.abs(values - values.min()) < tol) | (np.abs(values - values.max()) < tol)
+        weights[on_edge] *= 0.5
+
+    f = np.zeros(model.n_dofs)
+    f[section * dim + vertical] = -load * weights / weights.sum()
+    return fixed, f, section
@@ -2,9 +2,16 @@
 简易 FEM 求解器 - 内置，无需额外安装
 
 基于简化梁理论的分析求解器，适合教学演示和简单结构分析。
+批量接口 :meth:`SimpleFEMSolver.solve_batch` 以NumPy广播一次计算大量参数组合。
 """
 
-from .base import BaseSolver, SolverConfig, SolverResult
+from typing import Union
+
+import numpy as np
+
+from .base import BaseSolver, BatchSolverResult, SolverConfig, SolverResult
+
+ArrayLike = Union[float, np.ndarray]
 
 
 class SimpleFEMSolver(BaseSolver):
@@ -92,6 +99,43 @@ class SimpleFEMSolver(BaseSolver):
             ),
         )
 
+    def solve_batch(
+        self,
+        load: ArrayLike,
+        length: ArrayLike = 1000,
+        width: ArrayLike = 50,
+        height: ArrayLike = 100,
+        elastic_modulus: ArrayLike = 210e9,
+        yield_strength: ArrayLike = 235e6,
+    ) -> BatchSolverResult:
+        """批量执行简支梁弯曲分析
+
+        各参数可为标量或数组，按NumPy广播规则组合（如 ``length[:, None]`` 与
+        ``height[None, :]`` 得到二维参数网格），公式与 :meth:`solve` 相同。
+
+        Args:
+            load: 载荷 (N)
+            length: 梁长 (mm)
+            width: 截面宽 (mm)
+            height: 截面高 (mm)
+            elastic_modulus: 弹性模量 (Pa)
+            yield_strength: 屈服强度 (Pa)
+
+        Returns:
+            批量结果，各字段为参数广播后的形状
+        """
+        P, L, b, h, E, sigma_yield = np.broadcast_arrays(
+            *(np.asarray(v, dtype=np.float64) for v in (load, length, width, height, elastic_modulus, yield_strength))
+        )
+        L, b, h = L / 1000, b / 1000, h / 1000  # mm -> m
+
+        bh2 = b * h**2
+        max_displacement = P * L**3 / (4 * E * bh2 * h)  # P*L³/(48*E*I)，I = bh³/12
+        max_stress = 1.5 * P * L / bh2  # P*L/(4*W)，W = bh²/6
+        safety_factor = np.divide(sigma_yield, max_stress, out=np.full(max_stress.shape, np.inf), where=max_stress > 0)
+
+        return BatchSolverResult(max_displacement=max_displacement, max_stress=max_stress, safety_factor=safety_factor)
+
 
 class SimpleFEMSolver2D(BaseSolver):
     """2D 平面应力简易求解器
@@ -0,0 +1,333 @@
+"""
+稀疏矩阵有限元核心
+
+向量化计算单元刚度（所有单元一次einsum），COO -> CSR 组装总刚度矩阵，
+消去法施加位移边界条件后求解（直接法或预条件迭代法，见 :mod:`.linear`），并在单元节点处恢复应力、按节点平均。
+
+支持的单元（节点编号与 CalculiX/Abaqus 一致，逆时针/右手系）：
+- CST: 3节点三角形平面应力单元
+- Q4: 4节点四边形平面应力单元（2x2高斯积分）
+- C3D4: 4节点四面体单元
+- C3D8: 8节点六面体单元（2x2x2高斯积分）
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from .linear import LinearSolveInfo, solve_linear
+
+# 每次计算单元刚度的单元数（限制 [n, k, k] 中间数组的内存）
+DEFAULT_CHUNK_SIZE = 20000
+
+_GAUSS_1D = np.array([-1.0, 1.0]) / np.sqrt(3.0)
+
+
+def _tensor_points(dim: int) -> np.ndarray:
+    grids = np.meshgrid(*([_GAUSS_1D] * dim), indexing="ij")
+    return np.stack([g.ravel() for g in grids], axis=1)
+
+
+def _simplex_derivatives(dim: int) -> Callable[[np.ndarray], np.ndarray]:
+    # N0 = 1 - ξ - η (- ζ), Ni = ξi：导数与积分点无关
+    d = np.vstack([-np.ones(dim), np.eye(dim)])
+
+    def derivatives(points: np.ndarray) -> np.ndarray:
+        return np.broadcast_to(d, (len(points),) + d.shape)
+
+    return derivatives
+
+
+def _tensor_derivatives(corners: np.ndarray) -> Callable[[np.ndarray], np.ndarray]:
+    # N_a = Π (1 + ξa_i ξ_i) / 2^dim
+    dim = corners.shape[1]
+
+    def derivatives(points: np.ndarray) -> np.ndarray:
+        factors = 1.0 + points[:, np.newaxis, :] * corners[np.newaxis, :, :]  # [g, n, dim]
+        result = np.empty_like(factors)
+        for i in range(dim):
+            others = np.prod(np.delete(factors, i, axis=2), axis=2)
+            result[:, :, i] = corners[:, i] * others
+        return result / 2**dim
+
+    return derivatives
+
+
+_Q4_CORNERS = np.array([[-1, -1], [1, -1], [1, 1], [-1, 1]], dtype=float)
+_HEX8_CORNERS = np.array(
+    [[-1, -1, -1], [1, -1, -1], [1, 1, -1], [-1, 1, -1], [-1, -1, 1], [1, -1, 1], [1, 1, 1], [-1, 1, 1]],
+    dtype=float,
+)
+
+
+@dataclass(frozen=True)
+class ElementFormulation:
+    """单元形式：节点数、维数、形函数导数、积分点及权重、节点的自然坐标"""
+
+    name: str
+    nodes: int
+    dim: int
+    derivatives: Callable[[np.ndarray], np.ndarray]  # [g, dim] -> [g, nodes, dim]
+    points: np.ndarray
+    weights: np.ndarray
+    node_points: np.ndarray
+
+    @property
+    def dofs(self) -> int:
+        return self.nodes * self.dim
+
+
+ELEMENTS: Dict[str, ElementFormulation] = {
+    "CST": ElementFormulation(
+        "CST", 3, 2, _simplex_derivatives(2), np.array([[1 / 3, 1 / 3]]), np.array([0.5]), np.eye(3)[:, 1:]
+    ),
+    "Q4": ElementFormulation("Q4", 4, 2, _tensor_derivatives(_Q4_CORNERS), _tensor_points(2), np.ones(4), _Q4_CORNERS),
+    "C3D4": ElementFormulation(
+        "C3D4", 4, 3, _simplex_derivatives(3), np.array([[0.25, 0.25, 0.25]]), np.array([1 / 6]), np.eye(4)[:, 1:]
+    ),
+    "C3D8": ElementFormulation(
+        "C3D8", 8, 3, _tensor_derivatives(_HEX8_CORNERS), _tensor_points(3), np.ones(8), _HEX8_CORNERS
+    ),
+}
+
+
+@dataclass
+class FEMModel:
+    """有限元模型
+
+    Args:
+        nodes: 节点坐标 [n, dim]
+        elements: 单元连接（从0开始的节点索引）[ne, nodes_per_element]
+        element_type: CST / Q4 / C3D4 / C3D8
+        thickness: 平面应力单元厚度
+    """
+
+    nodes: np.ndarray
+    elements: np.ndarray
+    element_type: str
+    thickness: float = 1.0
+
+    @property
+    def formulation(self) -> ElementFormulation:
+        return ELEMENTS[self.element_type]
+
+    @property
+    def dim(self) -> int:
+        return self.formulation.dim
+
+    @property
+    def n_dofs(self) -> int:
+        return len(self.nodes) * self.dim
+
+    def element_dofs(self) -> np.ndarray:
+        """单元自由度编号 [ne, nodes_per_element * dim]"""
+        dim = self.dim
+        return (self.elements[:, :, np.newaxis] * dim + np.arange(dim)).reshape(len(self.elements), -1)
+
+
+def elasticity_matrix(E: float, nu: float, dim: int) -> np.ndarray:
+    """弹性矩阵 D（2D为平面应力，3D分量顺序 XX YY ZZ XY YZ ZX，工程剪应变）"""
+    if dim == 2:
+        return E / (1 - nu**2) * np.array([[1, nu, 0], [nu, 1, 0], [0, 0, (1 - nu) / 2]])
+    lam = E * nu / ((1 + nu) * (1 - 2 * nu))
+    mu = E / (2 * (1 + nu))
+    D = np.zeros((6, 6))
+    D[:3, :3] = lam
+    D[np.arange(3), np.arange(3)] += 2 * mu
+    D[np.arange(3, 6), np.arange(3, 6)] = mu
+    return D
+
+
+def _strain_displacement(dNdx: np.ndarray) -> np.ndarray:
+    """由形函数物理坐标导数 [..., n, dim] 构造应变矩阵 B [..., n_strain, n*dim]"""
+    *lead, n, dim = dNdx.shape
+    if dim == 2:
+        B = np.zeros((*lead, 3, n, 2))
+        B[..., 0, :, 0] = dNdx[..., 0]
+        B[..., 1, :, 1] = dNdx[..., 1]
+        B[..., 2, :, 0] = dNdx[..., 1]
+        B[..., 2, :, 1] = dNdx[..., 0]
+    else:
+        B = np.zeros((*lead, 6, n, 3))
+        for i in range(3):
+            B[..., i, :, i] = dNdx[..., i]
+        for row, (i, j) in zip((3, 4, 5), ((0, 1), (1, 2), (2, 0))):
+            B[..., row, :, i] = dNdx[..., j]
+            B[..., row, :, j] = dNdx[..., i]
+    return B.reshape(*lead, B.shape[-3], n * dim)
+
+
+def _b_matrices(formulation: ElementFormulation, coords: np.ndarray, points: np.ndarray):
+    """各单元在给定自然坐标点处的 B 矩阵 [ne, g, n_strain, dofs] 及 |detJ| [ne, g]"""
+    dN = formulation.derivatives(points)  # [g, n, dim]
+    J = np.einsum("gni,enj->egij", dN, coords)
+    det = np.linalg.det(J)
+    if np.any(np.abs(det) <= 1e-300):
+        raise ValueError("存在退化单元（雅可比行列式为零）")
+    dNdx = np.einsum("egij,gnj->egni", np.linalg.inv(J), dN)
+    return _strain_displacement(dNdx), np.abs(det)
+
+
+def element_stiffness(element_type: str, coords: np.ndarray, D: np.ndarray, thickness: float = 1.0) -> np.ndarray:
+    """批量计算单元刚度矩阵
+
+    Args:
+        element_type: 单元类型
+        coords: 单元节点坐标 [ne, nodes_per_element, dim]
+        D: 弹性矩阵
+        thickness: 平面应力单元厚度
+
+    Returns:
+        [ne, dofs, dofs]
+    """
+    formulation = ELEMENTS[element_type]
+    B, det = _b_matrices(formulation, coords, formulation.points)
+    scale = det * formulation.weights
+    if formulation.dim == 2:
+        scale = scale * thickness
+    return np.einsum("egki,kl,eglj,eg->eij", B, D, B, scale, optimize=True)
+
+
+def assemble_stiffness(model: FEMModel, D: np.ndarray, chunk_size: int = DEFAULT_CHUNK_SIZE) -> sparse.csr_matrix:
+    """组装总刚度矩阵（分块计算单元刚度，一次 COO -> CSR，重复项求和）"""
+    n = model.n_dofs
+    dofs = model.element_dofs()
+    per_element = dofs.shape[1] ** 2
+    values = np.empty(len(model.elements) * per_element)
+    for start in range(0, len(model.elements), chunk_size):
+        stop = start + chunk_size
+        coords = model.nodes[model.elements[start:stop]]
+        values[start * per_element : stop * per_element] = element_stiffness(
+            model.element_type, coords, D, model.thickness
+        ).ravel()
+    rows = np.repeat(dofs, dofs.shape[1], axis=1).ravel()
+    cols = np.tile(dofs, (1, dofs.shape[1])).ravel()
+    return sparse.coo_matrix((values, (rows, cols)), shape=(n, n)).tocsr()
+
+
+def apply_dirichlet(
+    K: sparse.spmatrix,
+    f: np.ndarray,
+    fixed_dofs: np.ndarray,
+    fixed_values: Optional[np.ndarray] = None,
+) -> Tuple[sparse.csr_matrix, np.ndarray, np.ndarray]:
+    """消去法施加位移约束
+
+    Returns:
+        (K_ff, f_f, free_dofs)：缩减后的刚度矩阵、载荷向量和自由自由度编号
+    """
+    n = K.shape[0]
+    fixed = np.zeros(n, dtype=bool)
+    fixed[fixed_dofs] = True
+    free = np.flatnonzero(~fixed)
+
+    K = sparse.csr_matrix(K)
+    K_free = K[free]
+    f_free = f[free]
+    if fixed_values is not None and np.any(fixed_values):
+        u_fixed = np.zeros(n)
+        u_fixed[fixed_dofs] = fixed_values
+        f_free = f_free - K_free @ u_fixed
+    return K_free[:, free].tocsr(), f_free, free
+
+
+def solve_static(
+    K: sparse.spmatrix,
+    f: np.ndarray,
+    fixed_dofs: np.ndarray,
+    fixed_values: Optional[np.ndarray] = None,
+    nodes: Optional[np.ndarray] = None,
+    method: str = "direct",
+    preconditioner: Optional[str] = None,
+    tol: float = 1e-8,
+    maxiter: Optional[int] = None,
+) -> Tuple[np.ndarray, LinearSolveInfo]:
+    """求解 K u = f，返回全部自由度的位移与线性求解统计
+
+    Args:
+        nodes: 节点坐标 [n_nodes, dim]（AMG 预条件与 auto 模式需要）
+        method, preconditioner, tol, maxiter: 参见 :func:`solve_linear`
+    """
+    K_ff, f_f, free = apply_dirichlet(K, f, fixed_dofs, fixed_values)
+    u = np.zeros(K.shape[0])
+    if fixed_values is not None:
+        u[fixed_dofs] = fixed_values
+
+    coords = components = None
+    if nodes is not None:
+        dim = nodes.shape[1]
+        coords, components = nodes[free // dim], free % dim
+    u[free], info = solve_linear(K_ff, f_f, method, preconditioner, tol, maxiter, coords, components)
+    return u, info
+
+
+def nodal_stress(model: FEMModel, D: np.ndarray, u: np.ndarray, chunk_size: int = DEFAULT_CHUNK_SIZE) -> np.ndarray:
+    """在各单元节点处计算应力并按节点平均 [n_nodes, 3 或 6]"""
+    formulation = model.formulation
+    n_strain = 3 if formulation.dim == 2 else 6
+    total = np.zeros((len(model.nodes), n_strain))
+    dofs = model.element_dofs()
+    for start in range(0, len(model.elements), chunk_size):
+        stop = start + chunk_size
+        coords = model.nodes[model.elements[start:stop]]
+        B, _ = _b_matrices(formulation, coords, formulation.node_points)  # [ne, n, s, dofs]
+        stress = np.einsum("kl,enlj,ej->enk", D, B, u[dofs[start:stop]], optimize=True)
+        np.add.at(total, model.elements[start:stop].ravel(), stress.reshape(-1, n_strain))
+    counts = np.bincount(model.elements.ravel(), minlength=len(model.nodes))
+    return total / np.maximum(counts, 1)[:, np.newaxis]
+
+
+def von_mises(stress: np.ndarray) -> np.ndarray:
+    """等效应力 [n]，输入为平面应力 [n, 3] (XX YY XY) 或三维 [n, 6]"""
+    if stress.shape[1] == 3:
+        sxx, syy, sxy = stress.T
+        return np.sqrt(sxx**2 - sxx * syy + syy**2 + 3 * sxy**2)
+    sxx, syy, szz, sxy, syz, szx = stress.T
+    return np.sqrt(0.5 * ((sxx - syy) ** 2 + (syy - szz) ** 2 + (szz - sxx) ** 2) + 3 * (sxy**2 + syz**2 + szx**2))
+
+
+def rectangle_mesh(length: float, height: float, nx: int, ny: int, element_type: str = "Q4") -> FEMModel:
+    """矩形结构化网格，x ∈ [0, length]，y ∈ [-height/2, height/2]"""
+    x = np.linspace(0, length, nx + 1)
+    y = np.linspace(-height / 2, height / 2, ny + 1)
+    X, Y = np.meshgrid(x, y)
+    nodes = np.column_stack([X.ravel(), Y.ravel()])
+
+    i, j = np.meshgrid(np.arange(nx), np.arange(ny))
+    n1 = (j * (nx + 1) + i).ravel()
+    quads = np.column_stack([n1, n1 + 1, n1 + nx + 2, n1 + nx + 1])
+    if element_type == "Q4":
+        return FEMModel(nodes, quads, "Q4")
+    if element_type == "CST":
+        triangles = np.concatenate([quads[:, [0, 1, 2]], quads[:, [0, 2, 3]]])
+        return FEMModel(nodes, triangles, "CST")
+    raise ValueError(f"不支持的二维单元类型: {element_type}")
+
+
+# 六面体拆分为6个四面体（沿体对角线 0-6，相邻六面体的面对角线一致）
+_HEX_TO_TETS = np.array([[0, 1, 2, 6], [0, 2, 3, 6], [0, 3, 7, 6], [0, 7, 4, 6], [0, 4, 5, 6], [0, 5, 1, 6]])
+
+
+def box_mesh(
+    length: float, width: float, height: float, nx: int, ny: int, nz: int, element_type: str = "C3D8"
+) -> FEMModel:
+    """长方体结构化网格，x ∈ [0, length]，y ∈ [0, width]，z ∈ [-height/2, height/2]"""
+    x = np.linspace(0, length, nx + 1)
+    y = np.linspace(0, width, ny + 1)
+    z = np.linspace(-height / 2, height / 2, nz + 1)
+    Z, Y, X = np.meshgrid(z, y, x, indexing="ij")
+    nodes = np.column_stack([X.ravel(), Y.ravel(), Z.ravel()])
+
+    k, j, i = np.meshgrid(np.arange(nz), np.arange(ny), np.arange(nx), indexing="ij")
+    n0 = ((k * (ny + 1) + j) * (nx + 1) + i).ravel()
+    sx, sy = 1, nx + 1
+    sz = (nx + 1) * (ny + 1)
+    bottom = np.column_stack([n0, n0 + sx, n0 + sx + sy, n0 + sy])
+    hexes = np.column_stack([bottom, bottom + sz])
+    if element_type == "C3D8":
+        return FEMModel(nodes, hexes, "C3D8")
+    if element_type == "C3D4":
+        return FEMModel(nodes, hexes[:, _HEX_TO_TETS].reshape(-1, 4), "C3D4")
+    raise ValueError(f"不支持的三维单元类型: {element_type}")
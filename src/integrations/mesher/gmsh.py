@@ -260,6 +260,16 @@ class GmshConnector(CAEConnector):
         """获取支持的分析类型（对于网格生成器，返回空列表）"""
         return []  # Gmsh不是求解器，不直接支持分析类型
 
+    def get_version(self) -> Optional[str]:
+        """Gmsh版本（``gmsh.__version__``），未安装时返回None"""
+        gmsh = self.gmsh_module
+        if gmsh is None:
+            try:
+                import gmsh
+            except ImportError:
+                return None
+        return getattr(gmsh, "__version__", None)
+
     def convert_to_calculix_inp(self, msh_path: Path) -> Path:
         """将 .msh 文件转换为 CalculiX 兼容的 .inp 文件
 
@@ -426,64 +436,24 @@ class GmshConnector(CAEConnector):
             print(f"获取网格统计失败: {e}")
 
     def _convert_to_inp(self, input_mesh: Path, output_inp: Path) -> bool:
-        """转换为CalculiX .inp格式"""
-        try:
-            # 确保输出目录存在
-            output_inp.parent.mkdir(parents=True, exist_ok=True)
-
-            # 初始化Gmsh并加载网格
-            self.gmsh_module.initialize()
-            self.gmsh_module.open(str(input_mesh))
-
-            # 获取网格数据
-            nodes = self.gmsh_module.model.mesh.getNodes()
-            elements = self.gmsh_module.model.mesh.getElements()
-
-            # 写入.inp格式
-            with open(output_inp, "w", encoding="utf-8") as f:
-                f.write("** Converted from Gmsh .msh format\n")
-                f.write("** Generated by CAE-CLI GmshConnector\n\n")
-
-                # 写入节点
-                f.write("*NODE\n")
-                for i, (node_id, coords) in enumerate(zip(nodes[0], nodes[1]), 1):
-                    x, y, z = coords[0], coords[1], coords[2]
-                    f.write(f"{i}, {x:.6f}, {y:.6f}, {z:.6f}\n")
-
-                # 按单元类型分组写入单元
-                element_groups = {}
-
-                for elem_type, elem_tags, elem_nodes in zip(elements[0], elements[1], elements[2]):
-                    if elem_type not in element_groups:
-                        element_groups[elem_type] = []
-                    for tag, nodes_list in zip(elem_tags, elem_nodes):
-                        element_groups[elem_type].append((tag, nodes_list))
-
-                # 定义Gmsh到CalculiX的单元类型映射
-                elem_type_map = {
-                    4: "C3D4",  # 四面体
-                    5: "C3D8",  # 六面体
-                    1: "CPS4",  # 四边形（平面应力）
-                    2: "CPE4",  # 四边形（平面应变）
-                    3: "C3D6",  # 三棱柱
-                    6: "C3D10",  # 四面体（二次）
-                    7: "C3D20",  # 六面体（二次）
-                }
+        """转换为CalculiX .inp格式
 
-                # 写入每个单元组
-                for gmsh_type, elems in element_groups.items():
-                    calculix_type = elem_type_map.get(gmsh_type)
-                    if calculix_type:
-                        f.write(f"\n*ELEMENT, TYPE={calculix_type}, ELSET=PART1\n")
-                        for i, (tag, nodes_list) in enumerate(elems, 1):
-                            # 转换节点编号（Gmsh节点编号从1开始，CalculiX也是）
-                            nodes_str = ", ".join(str(int(n)) for n in nodes_list)
-                            f.write(f"{i}, {nodes_str}\n")
-
-                # 写入固体截面定义
-                f.write("\n*SOLID SECTION, ELSET=PART1, MATERIAL=DEFAULT_MATERIAL\n")
+        网格经二进制缓存读取（不启动gmsh运行时），节点/单元保留Gmsh原始编号，
+        由批量写出器成块格式化写入。
+        """
+        try:
+            from sw_helper.mesh.cache import load_mesh_cached
+            from sw_helper.mesh.inp_writer import write_msh_as_inp
+
+            mesh = load_mesh_cached(input_mesh)
+            write_msh_as_inp(
+                mesh,
+                output_inp,
+                elset="PART1",
+                material="DEFAULT_MATERIAL",
+                header="Converted from Gmsh .msh format\nGenerated by CAE-CLI GmshConnector",
+            )
 
-            self.gmsh_module.finalize()
             print(f"✓ 转换成功: {input_mesh.name} -> {output_inp.name}")
             return True
 
@@ -544,7 +514,7 @@ class GmshConnector(CAEConnector):
             return False
 
     def _parse_msh_file(self, msh_file: Path) -> Dict[str, Any]:
-        """解析.msh文件"""
+        """解析.msh文件（流式读取，不依赖gmsh运行时）"""
         results = {
             "format": "msh",
             "version": "unknown",
@@ -553,24 +523,18 @@ class GmshConnector(CAEConnector):
         }
 
         try:
-            with open(msh_file, encoding="utf-8", errors="ignore") as f:
-                lines = f.readlines()
-
-            for line in lines:
-                if line.startswith("$MeshFormat"):
-                    # 格式信息
-                    parts = lines[1].strip().split()
-                    if len(parts) >= 2:
-                        results["version"] = parts[0]
-                elif line.startswith("$Nodes"):
-                    # 节点数
-                    node_line = lines[lines.index(line) + 1].strip()
-                    results["nodes"] = int(node_line.split()[0])
-                elif line.startswith("$Elements"):
-                    # 单元数
-                    elem_line = lines[lines.index(line) + 1].strip()
-                    results["elements"] = int(elem_line.split()[0])
-
+            from sw_helper.mesh.msh_reader import read_msh
+
+            mesh = read_msh(msh_file)
+            results.update(
+                {
+                    "version": mesh.version,
+                    "binary": mesh.binary,
+                    "nodes": mesh.num_nodes,
+                    "elements": mesh.num_elements,
+                    "element_types": mesh.element_counts(),
+                }
+            )
         except Exception as e:
             print(f"解析MSH文件失败: {e}")
 
@@ -684,6 +648,9 @@ class GmshConnectorMock(GmshConnector):
         super().__init__()
         self.mock_mode = True
 
+    def get_version(self) -> Optional[str]:
+        return "mock"
+
     def connect(self) -> bool:
         print("[模拟模式] 连接Gmsh")
         self.is_connected = True
@@ -697,7 +664,7 @@ class GmshConnectorMock(GmshConnector):
         with open(mesh_file, "w", encoding="utf-8") as f:
             f.write("** Mock Gmsh mesh file\n")
             f.write("$MeshFormat\n")
-            f.write("4.1 0 8\n")
+            f.write("2.2 0 8\n")
             f.write("$EndMeshFormat\n")
             f.write("$Nodes\n")
             f.write("8\n")
@@ -229,8 +229,14 @@ cli.add_command(prompt_group)
     default="table",
     help="Output format",
 )
+@click.option("--weld", is_flag=True, help="Merge duplicate STL vertices and report mesh topology")
+@click.option(
+    "--geometry",
+    is_flag=True,
+    help="Load the STEP B-rep with OpenCascade for volume, area and bounds (default: header/metadata scan only)",
+)
 @click.pass_context
-def parse(ctx, file_path, format, output, format_output):
+def parse(ctx, file_path, format, output, format_output, weld, geometry):
     """
     Parse geometric files and extract information
 
@@ -242,6 +248,8 @@ def parse(ctx, file_path, format, output, format_output):
         cae-cli parse model.step
         cae-cli parse part.stl -f stl -o output.json
         cae-cli parse assembly.step --format-output table
+        cae-cli parse scan.stl --weld
+        cae-cli parse assembly.step --geometry
     """
     from sw_helper.geometry.parser import GeometryParser
 
@@ -254,7 +262,7 @@ def parse(ctx, file_path, format, output, format_output):
         ) as progress:
             task = progress.add_task("正在解析几何文件...", total=None)
 
-            parser = GeometryParser()
+            parser = GeometryParser(weld=weld, geometry=geometry)
             result = parser.parse(file_path, file_format=None if format == "auto" else format)
 
             progress.update(task, completed=True)
@@ -266,7 +274,7 @@ def parse(ctx, file_path, format, output, format_output):
             table.add_column("值", style="green")
 
             for key, value in result.items():
-                if isinstance(value, dict):
+                if isinstance(value, (dict, list)):
                     value = json.dumps(value, ensure_ascii=False)
                 table.add_row(str(key), str(value))
 
@@ -332,11 +340,13 @@ def analyze(ctx, file_path, metric, threshold, output, material):
             analyzer = MeshQualityAnalyzer()
             metrics_list = None if "all" in metric else list(metric)
             results = analyzer.analyze(file_path, metrics=metrics_list)
+            problematic = analyzer.detect_problematic_elements(threshold)
+            results["problematic_elements"] = len(problematic)
 
             progress.update(task, completed=True)
 
         # 显示结果
-        _display_analysis_results(results)
+        _display_mesh_quality_results(results, threshold)
 
         # 整体质量评估
         overall = results.get("overall_quality", "unknown")
@@ -354,6 +364,42 @@ def analyze(ctx, file_path, metric, threshold, output, material):
         sys.exit(1)
 
 
+def _display_mesh_quality_results(results: Dict[str, Any], threshold: float):
+    """Display mesh quality metrics table"""
+    info = results.get("mesh_info", {})
+    console.print(f"节点数: [cyan]{info.get('nodes', 0)}[/cyan]  单元数: [cyan]{info.get('elements', 0)}[/cyan]")
+
+    table = Table(title="网格质量指标", show_header=True, header_style="bold magenta")
+    table.add_column("指标", style="cyan")
+    for column in ("min", "max", "mean", "std"):
+        table.add_column(column, style="green", justify="right")
+
+    for name, values in results.items():
+        if isinstance(values, dict) and "mean" in values:
+            table.add_row(name, *(f"{values[c]:.4g}" for c in ("min", "max", "mean", "std")))
+
+    console.print(table)
+    console.print(f"问题单元 (阈值 {threshold}): [yellow]{results.get('problematic_elements', 0)}[/yellow]")
+
+
+def _get_quality_color(quality: str) -> str:
+    """Map overall quality level to a display color"""
+    return {
+        "excellent": "green",
+        "good": "green",
+        "fair": "yellow",
+        "poor": "red",
+        "unacceptable": "red",
+    }.get(quality, "white")
+
+
+def _save_analysis_results(results: Dict[str, Any], output: str):
+    """Save analysis results to a JSON file"""
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    console.print(f"\n[green]成功[/green] 结果已保存至: [bold]{output}[/bold]")
+
+
 @cli.command()
 @click.argument("material_name", required=False)
 @click.option(
@@ -663,7 +709,7 @@ def info(ctx):
 
 
 @cli.command()
-@click.argument("input_file", type=click.Path(exists=True))
+@click.argument("input_file", type=click.Path())
 @click.argument("output_file", type=click.Path(), required=False)
 @click.option(
     "--format",
@@ -677,13 +723,47 @@ def info(ctx):
     default=False,
     help="Check geometry quality after conversion",
 )
-def convert(input_file, output_file, target_format, check):
+@click.option(
+    "--output-dir",
+    "-d",
+    type=click.Path(file_okay=False),
+    help="Batch mode: output directory (mirrors input subdirectories; default next to inputs)",
+)
+@click.option("--jobs", "-j", type=int, default=None, help="Batch mode: worker processes (default: CPU count)")
+@click.option("--timeout", type=float, default=None, help="Batch mode: per-file timeout in seconds")
+@click.option("--force", is_flag=True, help="Batch mode: reconvert files whose output is up to date")
+@click.option("--recursive/--no-recursive", default=True, help="Batch mode: search directories recursively")
+@click.option("--summary", "summary_file", type=click.Path(dir_okay=False), help="Batch mode: write JSON summary")
+@click.option("--deflection", type=float, default=None, help="STEP->STL linear deflection (relative to edge size)")
+@click.option("--angular-deflection", type=float, default=None, help="STEP->STL angular deflection in radians")
+@click.option(
+    "--lod",
+    type=click.Choice(["coarse", "medium", "fine", "all"], case_sensitive=False),
+    default=None,
+    help="STEP->STL level of detail; 'all' writes coarse/medium/fine from one read",
+)
+def convert(
+    input_file,
+    output_file,
+    target_format,
+    check,
+    output_dir,
+    jobs,
+    timeout,
+    force,
+    recursive,
+    summary_file,
+    deflection,
+    angular_deflection,
+    lod,
+):
     """
     Convert CAD geometry between formats
 
-    INPUT_FILE: Input geometry file (STEP/STL/IGES/BREP)
+    INPUT_FILE: Input geometry file (STEP/STL/IGES/BREP), or a directory /
+    quoted glob pattern for batch conversion
 
-    OUTPUT_FILE: Output file path (optional, auto-generated)
+    OUTPUT_FILE: Output file path (optional, auto-generated; single file only)
 
     Examples:
         # STEP to STL
@@ -697,6 +777,13 @@ def convert(input_file, output_file, target_format, check):
 
         # IGES to STEP
        CAE-CLI convert part.iges -o part.step
+
+        # Batch: all supplier STEP files to STL with 8 processes
+        cae-cli convert "supplier/**/*.step" -f stl -d out/ -j 8 --timeout 600 --summary summary.json
+
+        # Finer tessellation, or coarse/medium/fine STL in one pass
+        cae-cli convert model.step --deflection 0.002 --angular-deflection 0.2
+        cae-cli convert model.step --lod all
     """
     from pathlib import Path
 
@@ -705,15 +792,56 @@ def convert(input_file, output_file, target_format, check):
 
     console = Console()
 
+    from sw_helper.geometry.tessellation import LOD_PRESETS, TessellationSettings
+
+    tessellation = None
+    if lod and lod != "all":
+        tessellation = LOD_PRESETS[lod.lower()]
+    if deflection is not None or angular_deflection is not None:
+        base = tessellation or LOD_PRESETS["medium"]
+        tessellation = TessellationSettings(
+            deflection if deflection is not None else base.linear_deflection,
+            angular_deflection if angular_deflection is not None else base.angular_deflection,
+        )
+
+    input_path = Path(input_file)
+    batch = input_path.is_dir() or any(c in input_file for c in "*?[") or output_dir is not None
+    if batch:
+        if output_file:
+            console.print("[red]批量转换请使用 --output-dir 指定输出目录[/red]")
+            sys.exit(1)
+        if lod == "all":
+            console.print("[red]--lod all 仅支持单个文件[/red]")
+            sys.exit(1)
+        _convert_batch(
+            console, input_file, target_format, output_dir, jobs, timeout, force, recursive, summary_file, tessellation
+        )
+        return
+    if not input_path.exists():
+        console.print(f"[red]文件不存在: {input_file}[/red]")
+        sys.exit(1)
+
     try:
         from sw_helper.geometry.converter import GeometryConverter
 
-        converter = GeometryConverter()
+        converter = GeometryConverter(tessellation)
+
+        if lod == "all":
+            outputs = converter.convert_lod(input_file, output_file)
+            if not outputs:
+                console.print("[red]转换失败[/red]")
+                sys.exit(1)
+            table = Table(title="多级细节输出", show_header=False)
+            table.add_column("级别", style="cyan")
+            table.add_column("输出", style="green")
+            for level, path in outputs.items():
+                table.add_row(level, str(path))
+            console.print(table)
+            return
 
         # 执行转换
         if converter.convert(input_file, output_file, target_format):
             # 显示结果
-            input_path = Path(input_file)
             if output_file:
                 output_path = Path(output_file)
             else:
@@ -750,6 +878,56 @@ def convert(input_file, output_file, target_format, check):
         sys.exit(1)
 
 
+def _convert_batch(
+    console, pattern, target_format, output_dir, jobs, timeout, force, recursive, summary_file, tessellation=None
+):
+    """批量转换：进程池执行，跳过已是最新的输出，可写出JSON汇总"""
+    import time
+
+    from sw_helper.geometry.batch_convert import BatchConverter, collect_inputs, plan_conversions, summarize
+
+    inputs = collect_inputs([pattern], recursive=recursive)
+    if not inputs:
+        console.print(f"[yellow]未找到可转换的文件: {pattern}[/yellow]")
+        sys.exit(1)
+    base_dir = pattern if Path(pattern).is_dir() else None
+    tasks = plan_conversions(inputs, target_format, output_dir, base_dir=base_dir)
+
+    converter = BatchConverter(max_workers=jobs, timeout=timeout, force=force, tessellation=tessellation)
+    console.print(f"[dim]批量转换 {len(tasks)} 个文件，{min(converter.max_workers, len(tasks))} 个进程...[/dim]")
+
+    start = time.perf_counter()
+    results = []
+    styles = {"converted": "green", "skipped": "dim", "failed": "red", "timeout": "red", "error": "red"}
+    with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), console=console) as progress:
+        bar = progress.add_task("转换中...", total=len(tasks))
+        for result in converter.run(tasks):
+            results.append(result)
+            progress.advance(bar)
+            if not result.success:
+                progress.console.print(
+                    f"[{styles[result.status]}]{result.status}[/] {result.task.input_file}: {result.error}"
+                )
+    summary = summarize(results, elapsed=time.perf_counter() - start)
+
+    table = Table(title="批量转换结果", show_header=False)
+    table.add_column("状态", style="cyan")
+    table.add_column("数量", style="green")
+    for status in ("converted", "skipped", "failed", "timeout", "error"):
+        table.add_row(status, str(summary[status]))
+    table.add_row("耗时", f"{summary['elapsed']:.1f} s")
+    console.print(table)
+
+    if summary_file:
+        Path(summary_file).parent.mkdir(parents=True, exist_ok=True)
+        with open(summary_file, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+        console.print(f"[dim]汇总已写入: {summary_file}[/dim]")
+
+    if summary["failed"] or summary["timeout"] or summary["error"]:
+        sys.exit(1)
+
+
 # ==================== CAD集成命令 ====================
 
 
@@ -921,6 +1099,39 @@ def cad(ctx, connect, open, list_params, set_param, rebuild, export, format):
 # ==================== 分析运行命令 ====================
 
 
+def _resume_workflow(run_dir):
+    """从运行日志恢复工作流，已完成的步骤直接复用
+
+    日志由 ``WorkflowEngine.run_workflow`` / ``run_branches``（API）写入；本命令的单次求解不写日志。
+    """
+    from integrations._base.journal import RunJournal
+    from integrations._base.workflow import WorkflowEngine
+
+    journal = RunJournal.load(run_dir)
+    first = journal.first_incomplete()
+    if first is None:
+        console.print(f"[dim]工作流 {journal.workflow} 已全部完成，重新校验缓存[/dim]")
+    else:
+        console.print(f"[cyan]恢复工作流 {journal.workflow}，从步骤 {first} 继续[/cyan]")
+
+    engine = WorkflowEngine.from_journal(run_dir)
+    engine.set_progress_callback(lambda message, progress: console.print(f"[dim]{message}[/dim]"))
+    try:
+        result = engine.resume(run_dir)
+    finally:
+        table = Table(title="工作流步骤", show_header=True, header_style="bold magenta")
+        table.add_column("步骤", style="cyan")
+        table.add_column("状态")
+        table.add_column("耗时 (s)", justify="right")
+        for item in engine.get_step_summary():
+            duration = f"{item['duration']:.2f}" if item["duration"] is not None else "-"
+            table.add_row(item["name"], item["status"], duration)
+        console.print(table)
+
+    console.print_json(data=result["results"])
+    console.print(f"\n[green]✓ 工作流完成[/green] 运行日志: [bold]{result['journal']}[/bold]")
+
+
 @cli.command()
 @click.argument("config_file", type=click.Path(exists=True), required=False)
 @click.option(
@@ -942,6 +1153,16 @@ def cad(ctx, connect, open, list_params, set_param, rebuild, export, format):
     help="CAE solver to use (simple: 内置求解器, scipy: 需要scipy, calculix: 需要安装ccx)",
 )
 @click.option("--mock/--no-mock", default=False, help="Run in mock mode (no actual solver)")
+@click.option("--cache/--no-cache", "use_cache", default=True, help="Reuse cached results for identical configurations")
+@click.option(
+    "--resume",
+    "resume_dir",
+    type=click.Path(exists=True, file_okay=False),
+    help=(
+        "Resume a CAD->CAE workflow from the run journal in RUN_DIR, skipping completed steps "
+        "(journals are written by WorkflowEngine API runs, not by a plain 'run')"
+    ),
+)
 @click.pass_context
 def run(
     ctx,
@@ -953,6 +1174,8 @@ def run(
     output_dir,
     solver,
     mock,
+    use_cache,
+    resume_dir,
 ):
     """
     Run CAE analysis workflow
@@ -971,6 +1194,10 @@ def run(
 
         # Quick static analysis
         cae-cli run --type static -m Q235 -l 5000
+
+        # Resume a failed workflow run started through the WorkflowEngine API
+        # (meshing and other completed steps are reused)
+        cae-cli run --resume workflow_output
     """
     from pathlib import Path
 
@@ -981,6 +1208,10 @@ def run(
     console = Console()
 
     try:
+        if resume_dir:
+            _resume_workflow(resume_dir)
+            return
+
         # 加载配置
         config = {}
         if config_file:
@@ -1061,12 +1292,13 @@ def run(
                 "poisson_ratio": mat_info.get("poisson_ratio", 0.3),
             },
             load=load,
-            mesh_size=mesh_size,
+            mesh_size=mesh_s,
             geometry={
                 "length": L,
                 "width": b,
                 "height": h,
             },
+            element_type=config.get("mesh", {}).get("element_type", "Q4"),
         )
 
         # 执行求解
@@ -1082,6 +1314,15 @@ def run(
                 console.print("\n[yellow]⚠ 请求的求解器不可用，使用内置简易求解器[/yellow]")
 
             result = solver.solve(solver_config)
+        elif use_cache:
+            # 使用实际求解器，相同配置直接复用缓存结果
+            from integrations.cae.solvers.cache import default_result_cache
+
+            result_cache = default_result_cache()
+            hits = result_cache.hits
+            result = solver.solve_cached(solver_config, cache=result_cache)
+            if result_cache.hits > hits:
+                console.print(f"\n[dim]命中结果缓存: {result_cache.cache_dir}[/dim]")
         else:
             # 使用实际求解器
             result = solver.solve(solver_config)
@@ -1161,13 +1402,20 @@ def run(
     required=True,
     help="Parameter range (min max)",
 )
-@click.option("--steps", "-s", type=int, default=5, help="Number of iterations")
+@click.option("--steps", "-s", type=int, default=5, help="Number of iterations (max evaluations in adaptive mode)")
 @click.option(
     "--step-mode",
     "-m",
-    type=click.Choice(["linear", "geometric"], case_sensitive=False),
+    type=click.Choice(["linear", "geometric", "adaptive"], case_sensitive=False),
     default="linear",
-    help="Step mode: linear or geometric (default: linear)",
+    help="Step mode: linear, geometric or adaptive (surrogate model, default: linear)",
+)
+@click.option(
+    "--tolerance",
+    type=float,
+    default=1e-3,
+    show_default=True,
+    help="Relative convergence tolerance for adaptive mode",
 )
 @click.option(
     "--cad",
@@ -1185,6 +1433,15 @@ def run(
     default="./optimization_results",
     help="Output directory (default: ./optimization_results)",
 )
+@click.option(
+    "--jobs",
+    "-j",
+    type=int,
+    default=1,
+    show_default=True,
+    help="Parallel FreeCAD worker processes (each opens its own copy of the document)",
+)
+@click.option("--timeout", type=float, help="Per-evaluation timeout in seconds when running in parallel")
 @click.option("--material", "-M", help="Material name for AI suggestions (e.g., Q235)")
 @click.pass_context
 def optimize(
@@ -1194,11 +1451,14 @@ def optimize(
     param_range,
     steps,
     step_mode,
+    tolerance,
     cad,
     output,
     plot,
     report,
     output_dir,
+    jobs,
+    timeout,
     material,
 ):
     """
@@ -1222,6 +1482,12 @@ def optimize(
         # Optimize length and generate plot and report
         cae-cli optimize bracket.FCStd -p Length -r 100 200 -s 10 --plot --report
 
+        # Adaptive search with a surrogate model (at most 10 evaluations)
+        cae-cli optimize model.FCStd -p Fillet_Radius -r 2 15 -m adaptive -s 10
+
+        # 40-step sweep on 12 parallel FreeCAD workers
+        cae-cli optimize bracket.FCStd -p Length -r 100 200 -s 40 -j 12
+
         # Use simulation mode (no FreeCAD installation required)
         cae-cli optimize model.FCStd -p Thickness -r 5 20 --cad mock
 
@@ -1253,7 +1519,7 @@ def optimize(
             console.print("[yellow]使用模拟模式（无需FreeCAD）[/yellow]")
 
         # 创建优化器
-        optimizer = FreeCADOptimizer(use_mock=use_mock)
+        optimizer = FreeCADOptimizer(use_mock=use_mock, workers=jobs, timeout=timeout)
 
         # 设置进度回调（使用rich显示）
         def progress_callback(msg: str):
@@ -1282,6 +1548,7 @@ def optimize(
                 step_mode=step_mode,
                 output_dir=output_dir,
                 analyze_geometry=True,
+                tolerance=tolerance,
             )
 
         # 显示结果表格
@@ -1402,6 +1669,283 @@ def optimize(
         sys.exit(1)
 
 
+@cli.command()
+@click.argument("file_path", type=click.Path(exists=True))
+@click.option(
+    "--param",
+    "-p",
+    "params",
+    nargs=3,
+    type=(str, float, float),
+    multiple=True,
+    required=True,
+    help="Design parameter: NAME MIN MAX (repeatable)",
+)
+@click.option(
+    "--method",
+    "-m",
+    type=click.Choice(["lhs", "sobol", "factorial"], case_sensitive=False),
+    default="lhs",
+    help="Sampling method: Latin hypercube, Sobol sequence or full factorial (default: lhs)",
+)
+@click.option("--samples", "-n", type=int, default=16, help="Number of samples for lhs/sobol (default: 16)")
+@click.option("--levels", "-l", type=int, default=3, help="Levels per parameter for factorial (default: 3)")
+@click.option("--seed", type=int, help="Random seed (reproducible designs)")
+@click.option(
+    "--cad",
+    type=click.Choice(["freecad", "mock"], case_sensitive=False),
+    default="freecad",
+    help="CAD software type (default: freecad)",
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(),
+    help="Results table (.csv/.npz/.parquet, default: <output-dir>/doe_results.csv)",
+)
+@click.option(
+    "--output-dir",
+    "-d",
+    type=click.Path(),
+    default="./doe_results",
+    help="Output directory (default: ./doe_results)",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=int,
+    default=1,
+    show_default=True,
+    help="Parallel FreeCAD worker processes (each opens its own copy of the document)",
+)
+@click.option("--timeout", type=float, help="Per-evaluation timeout in seconds when running in parallel")
+@click.pass_context
+def doe(ctx, file_path, params, method, samples, levels, seed, cad, output, output_dir, jobs, timeout):
+    """
+    Design of experiments - space-filling sampling over several parameters
+
+    Each sample sets all parameters, rebuilds, exports STEP and analyzes
+    quality. Results are written as a columnar table (one column per
+    parameter and response) for sensitivity and response-surface studies.
+
+    FILE_PATH: CAD file path (.FCStd)
+
+    Examples:
+        # 3 parameters, 32 Latin hypercube samples
+        cae-cli doe bracket.FCStd -p Length 80 120 -p Width 40 60 -p Height 20 40 -n 32
+
+        # Sobol sequence, results as Parquet
+        cae-cli doe bracket.FCStd -p Length 80 120 -p Width 40 60 -m sobol -n 64 -o doe.parquet
+
+        # 64 Sobol samples on 8 parallel FreeCAD workers
+        cae-cli doe bracket.FCStd -p Length 80 120 -p Width 40 60 -m sobol -n 64 -j 8
+
+        # Full factorial with 4 levels per parameter (simulation mode)
+        cae-cli doe model.FCStd -p Length 80 120 -p Width 40 60 -m factorial -l 4 --cad mock
+    """
+    from pathlib import Path
+
+    from sw_helper.optimization.doe import DesignParameter
+    from sw_helper.optimization.optimizer import FreeCADOptimizer
+
+    try:
+        parameters = [DesignParameter(name, low, high, levels=levels) for name, low, high in params]
+
+        console.print(
+            Panel.fit(
+                f"[bold cyan]试验设计[/bold cyan]\n"
+                f"文件: [green]{file_path}[/green]\n"
+                f"参数: [yellow]{', '.join(p.name for p in parameters)}[/yellow]\n"
+                f"方法: [magenta]{method}[/magenta]\n"
+                f"CAD: [dim]{cad}[/dim]",
+                title="DOE配置",
+                border_style="cyan",
+            )
+        )
+
+        use_mock = cad.lower() == "mock"
+        if use_mock:
+            console.print("[yellow]使用模拟模式（无需FreeCAD，质量分数为模拟值）[/yellow]")
+        optimizer = FreeCADOptimizer(use_mock=use_mock, workers=jobs, timeout=timeout)
+        verbose = ctx.obj.get("verbose")
+
+        def progress_callback(msg: str):
+            if verbose:
+                console.print(f"[dim]{msg}[/dim]")
+
+        optimizer.set_progress_callback(progress_callback)
+
+        with console.status("[bold green]正在评估样本..."):
+            results = optimizer.run_doe(
+                file_path,
+                parameters,
+                method=method.lower(),
+                samples=samples,
+                seed=seed,
+                output_dir=output_dir,
+                analyze_geometry=not use_mock,
+            )
+
+        if not results.responses:
+            console.print("[yellow]⚠️  所有样本评估失败，使用 -v 查看详细日志[/yellow]")
+
+        columns = results.columns()
+        table = Table(title=f"DOE Results ({len(results)} samples)", header_style="bold cyan", border_style="blue")
+        for name in columns:
+            table.add_column(name, justify="right")
+        for row in list(zip(*columns.values()))[:20]:
+            table.add_row(*[f"{v:.4g}" for v in row])
+        console.print(table)
+        if len(results) > 20:
+            console.print(f"[dim]... 共 {len(results)} 行，完整结果见结果表[/dim]")
+
+        if "quality_score" in results.responses:
+            sensitivity = results.sensitivity("quality_score")
+            sens_table = Table(title="Sensitivity (quality_score, SRC)", header_style="bold cyan")
+            sens_table.add_column("Parameter", style="yellow")
+            sens_table.add_column("SRC", justify="right")
+            for name, value in sorted(sensitivity.items(), key=lambda item: -abs(item[1])):
+                sens_table.add_row(name, f"{value:+.3f}")
+            console.print(sens_table)
+
+        output_file = results.save(output or Path(output_dir) / "doe_results.csv")
+        console.print(f"[green]Results table:[/green] [dim]{output_file}[/dim]")
+
+    except ImportError as e:
+        console.print(f"[red]缺少依赖: {e}[/red]")
+        sys.exit(1)
+    except (ValueError, RuntimeError) as e:
+        console.print(f"[red]失败 {e}[/red]")
+        sys.exit(1)
+    except Exception as e:
+        console.print(f"[red]失败 错误: {e}[/red]")
+        if ctx.obj.get("verbose"):
+            console.print_exception()
+        sys.exit(1)
+
+
+# 梁扫描的参数（SimpleFEMSolver.solve_batch 的参数名）及未扫描时的取值；材料参数取自材料库
+BEAM_SWEEP_DEFAULTS = {"load": 1000.0, "length": 1000.0, "width": 50.0, "height": 100.0}
+BEAM_SWEEP_PARAMETERS = (*BEAM_SWEEP_DEFAULTS, "elastic_modulus", "yield_strength")
+
+
+@cli.command()
+@click.option(
+    "--param",
+    "-p",
+    "params",
+    nargs=3,
+    type=(str, float, float),
+    multiple=True,
+    required=True,
+    help=f"Swept beam parameter: NAME MIN MAX, NAME in {'/'.join(BEAM_SWEEP_PARAMETERS)} (repeatable)",
+)
+@click.option(
+    "--method",
+    "-m",
+    type=click.Choice(["lhs", "sobol", "factorial"], case_sensitive=False),
+    default="lhs",
+    help="Sampling method: Latin hypercube, Sobol sequence or full factorial (default: lhs)",
+)
+@click.option("--samples", "-n", type=int, default=10000, help="Number of samples for lhs/sobol (default: 10000)")
+@click.option("--levels", "-l", type=int, default=3, help="Levels per parameter for factorial (default: 3)")
+@click.option("--seed", type=int, help="Random seed (reproducible designs)")
+@click.option("--material", default="Q235", help="Material for parameters that are not swept (default: Q235)")
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(),
+    default="./beam_sweep.csv",
+    help="Results table (.csv/.npz/.parquet, default: ./beam_sweep.csv)",
+)
+@click.pass_context
+def sweep(ctx, params, method, samples, levels, seed, material, output):
+    """
+    Beam design sweep - evaluate many beam variants in one vectorized pass
+
+    Samples the design space like `doe`, but evaluates every sample of the
+    simply supported beam at once with the built-in solver's batch API, so
+    sweeps of 10^5-10^6 variants take about a second. Units: load in N,
+    dimensions in mm, elastic_modulus and yield_strength in Pa.
+
+    Examples:
+        # Section size study, 100000 Latin hypercube samples
+        cae-cli sweep -p width 30 80 -p height 60 160 -n 100000
+
+        # Span and load, full factorial with 50 levels each
+        cae-cli sweep -p length 500 3000 -p load 500 5000 -m factorial -l 50 --material Q345
+    """
+    from integrations.cae.solvers import SimpleFEMSolver
+    from sw_helper.material.database import MaterialDatabase
+    from sw_helper.optimization.doe import DesignOfExperiments, DesignParameter
+
+    unknown = [name for name, _, _ in params if name not in BEAM_SWEEP_PARAMETERS]
+    if unknown:
+        raise click.BadParameter(
+            f"未知的梁参数: {', '.join(unknown)}（可用: {', '.join(BEAM_SWEEP_PARAMETERS)}）", param_hint="--param"
+        )
+
+    try:
+        mat_info = MaterialDatabase().get_material(material)
+        if not mat_info:
+            console.print(f"[red]错误: 未找到材料 '{material}'[/red]")
+            console.print("[dim]使用 'cae-cli material --list' 查看可用材料[/dim]")
+            sys.exit(1)
+
+        fixed = {
+            **BEAM_SWEEP_DEFAULTS,
+            "elastic_modulus": mat_info.get("elastic_modulus", 210e9),
+            "yield_strength": mat_info.get("yield_strength", 235e6),
+        }
+        parameters = [DesignParameter(name, low, high, levels=levels) for name, low, high in params]
+        doe = DesignOfExperiments(parameters, method.lower(), samples, seed)
+        solver = SimpleFEMSolver()
+
+        def evaluate(values):
+            batch = solver.solve_batch(**{**fixed, **values})
+            return {
+                "max_displacement": batch.max_displacement,
+                "max_stress": batch.max_stress,
+                "safety_factor": batch.safety_factor,
+            }
+
+        start = time.perf_counter()
+        results = doe.run_batch(evaluate)
+        elapsed = time.perf_counter() - start
+
+        console.print(f"[green]已评估 {len(results)} 个梁方案[/green] [dim]({elapsed:.2f} s, 材料 {material})[/dim]")
+        columns = results.columns()
+        table = Table(title="Beam Sweep (first 20 rows)", header_style="bold cyan", border_style="blue")
+        for name in columns:
+            table.add_column(name, justify="right")
+        for row in zip(*(column[:20] for column in columns.values())):
+            table.add_row(*[f"{v:.4g}" for v in row])
+        console.print(table)
+
+        sensitivity = results.sensitivity("safety_factor")
+        sens_table = Table(title="Sensitivity (safety_factor, SRC)", header_style="bold cyan")
+        sens_table.add_column("Parameter", style="yellow")
+        sens_table.add_column("SRC", justify="right")
+        for name, value in sorted(sensitivity.items(), key=lambda item: -abs(item[1])):
+            sens_table.add_row(name, f"{value:+.3f}")
+        console.print(sens_table)
+
+        output_file = results.save(output)
+        console.print(f"[green]Results table:[/green] [dim]{output_file}[/dim]")
+
+    except ImportError as e:
+        console.print(f"[red]缺少依赖: {e}[/red]")
+        sys.exit(1)
+    except ValueError as e:
+        console.print(f"[red]失败 {e}[/red]")
+        sys.exit(1)
+    except Exception as e:
+        console.print(f"[red]失败 错误: {e}[/red]")
+        if ctx.obj.get("verbose"):
+            console.print_exception()
+        sys.exit(1)
+
+
 # ==================== AI辅助命令 ====================
 
 
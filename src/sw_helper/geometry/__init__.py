@@ -1,4 +1,30 @@
 from .analyzer import GeometryAnalyzer
+from .indexed_mesh import IndexedMesh, weld_vertices
+from .mass_properties import MassProperties, compute_mass_properties
 from .parser import GeometryParser, STEPParser, STLParser
+from .spatial import TriangleBVH, TriangleGrid
+from .step_reader import StepMetadata, StepScanner, scan_step
+from .stl_reader import StlMesh, read_stl
+from .tessellation import LOD_PRESETS, TessellationCache, TessellationSettings, get_lod_stl
 
-__all__ = ["GeometryParser", "STLParser", "STEPParser", "GeometryAnalyzer"]
+__all__ = [
+    "GeometryParser",
+    "STLParser",
+    "STEPParser",
+    "GeometryAnalyzer",
+    "StlMesh",
+    "read_stl",
+    "IndexedMesh",
+    "weld_vertices",
+    "MassProperties",
+    "compute_mass_properties",
+    "TriangleBVH",
+    "TriangleGrid",
+    "StepScanner",
+    "StepMetadata",
+    "scan_step",
+    "TessellationSettings",
+    "TessellationCache",
+    "LOD_PRESETS",
+    "get_lod_stl",
+]
@@ -2,15 +2,128 @@
 几何特征提取模块
 """
 
-from typing import Any, Dict, List, Tuple
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .indexed_mesh import IndexedMesh, _connected_components
+from .mass_properties import MassProperties, TriangleSource, compute_mass_properties, oriented_bounding_box
+from .spatial import TriangleGrid
+from .stl_reader import StlMesh, read_stl
+
+# 默认最小壁厚（与模型坐标同单位，通常为 mm）
+DEFAULT_MIN_WALL_THICKNESS = 1.0
+
+# 壁厚采样面数上限（超过时随机抽样）
+DEFAULT_THICKNESS_SAMPLES = 100_000
+
+# 对称性判定容差（相对包围盒对角线长度）与采样顶点数
+DEFAULT_SYMMETRY_TOLERANCE = 1e-3
+DEFAULT_SYMMETRY_SAMPLES = 20_000
+
+# 间隙检查的采样顶点数
+DEFAULT_CLEARANCE_SAMPLES = 50_000
+
+# 轴对称检验的旋转角（弧度，避开常见的 n 重旋转对称角）
+_AXISYMMETRY_ANGLES = (0.9, 2.3)
 
 
 class GeometryAnalyzer:
-    """几何特征分析器"""
+    """几何特征分析器
+
+    Args:
+        geometry_data: 几何数据字典。可含 ``mesh``（IndexedMesh/StlMesh）、``triangles``
+            （[n, 3, 3] 数组）或指向STL的 ``file``；质量特性直接基于三角形数组计算，
+            孔洞、可制造性、壁厚、对称性与间隙检查基于焊接后的索引网格及其空间索引
+        weld_tolerance: 焊接容差（None 为包围盒对角线的 1e-6 倍）
+    """
 
-    def __init__(self, geometry_data: Dict[str, Any]):
+    def __init__(self, geometry_data: Dict[str, Any], weld_tolerance: Optional[float] = None):
         self.data = geometry_data
+        self.weld_tolerance = weld_tolerance
         self.features = {}
+        self._source: Optional[TriangleSource] = None
+        self._source_loaded = False
+        self._mesh: Optional[IndexedMesh] = None
+        self._mesh_loaded = False
+        self._mass: Optional[MassProperties] = None
+        self._obb: Optional[Dict[str, Any]] = None
+        self._grid: Optional[TriangleGrid] = None
+        self._normals: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    @property
+    def source(self) -> Optional[TriangleSource]:
+        """三角形数据（STL按需读取并缓存；无网格数据时为 None）"""
+        if not self._source_loaded:
+            self._source = self._load_source()
+            self._source_loaded = True
+        return self._source
+
+    @property
+    def mesh(self) -> Optional[IndexedMesh]:
+        """索引三角网格（首次访问时焊接并缓存；无网格数据时为 None）"""
+        if not self._mesh_loaded:
+            source = self.source
+            if source is None or isinstance(source, IndexedMesh):
+                self._mesh = source
+            else:
+                triangles = source.triangles if isinstance(source, StlMesh) else source
+                self._mesh = IndexedMesh.from_triangles(triangles, self.weld_tolerance)
+            self._mesh_loaded = True
+        return self._mesh
+
+    @property
+    def spatial_index(self) -> Optional[TriangleGrid]:
+        """索引网格的体素空间索引（首次访问时构建并缓存，面序号与 :attr:`mesh` 一致）"""
+        if self._grid is None and self.mesh is not None:
+            self._grid = TriangleGrid(self.mesh.triangles)
+        return self._grid
+
+    def _face_normals(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(单位外法向[n, 3], 面积[n])；按整体有向体积的符号统一为朝外"""
+        if self._normals is None:
+            grid = self.spatial_index
+            cross = np.cross(grid.e1, grid.e2)
+            length = np.linalg.norm(cross, axis=1)
+            normals = cross / np.where(length > 0, length, 1.0)[:, None]
+            if np.einsum("ij,ij->", grid.v0, cross) < 0:
+                normals = -normals
+            self._normals = (normals, 0.5 * length)
+        return self._normals
+
+    def _diagonal(self) -> float:
+        grid = self.spatial_index
+        return float(np.linalg.norm(grid.upper - grid.lower)) if grid is not None else 0.0
+
+    def _sample_vertices(self, max_samples: int) -> np.ndarray:
+        """被面引用的顶点（超过上限时固定种子随机抽样）"""
+        mesh = self.mesh
+        used = np.zeros(mesh.num_vertices, dtype=bool)
+        used[mesh.faces] = True
+        points = mesh.vertices[used].astype(np.float64)
+        if len(points) > max_samples:
+            rng = np.random.default_rng(0)
+            points = points[np.sort(rng.choice(len(points), max_samples, replace=False))]
+        return points
+
+    def _load_source(self) -> Optional[TriangleSource]:
+        mesh = self.data.get("mesh")
+        if isinstance(mesh, (IndexedMesh, StlMesh)):
+            return mesh
+        triangles = self.data.get("triangles")
+        if triangles is not None:
+            return np.asarray(triangles).reshape(-1, 3, 3)
+        file_path = self.data.get("file")
+        if file_path and Path(file_path).suffix.lower() == ".stl" and Path(file_path).exists():
+            return read_stl(file_path)
+        return None
+
+    def mass_properties(self) -> Optional[MassProperties]:
+        """体积、面积、质心、惯性张量与包围盒（一次遍历，结果缓存）"""
+        if self._mass is None and self.source is not None:
+            self._mass = compute_mass_properties(self.source)
+        return self._mass
 
     def extract_features(self) -> Dict[str, Any]:
         """提取几何特征"""
@@ -18,7 +131,9 @@ class GeometryAnalyzer:
             "volume": self.calculate_volume(),
             "surface_area": self.calculate_surface_area(),
             "centroid": self.calculate_centroid(),
+            "inertia_tensor": self.calculate_inertia_tensor(),
             "bounding_box": self.calculate_bounding_box(),
+            "oriented_bounding_box": self.calculate_oriented_bounding_box(),
             "symmetry": self.detect_symmetry(),
             "holes": self.detect_holes(),
             "thin_walls": self.detect_thin_walls(),
@@ -26,46 +141,293 @@ class GeometryAnalyzer:
         return self.features
 
     def calculate_volume(self) -> float:
-        """计算体积"""
-        # TODO: 实现体积计算
-        return 0.0
+        """计算体积（散度定理，要求网格封闭）"""
+        mass = self.mass_properties()
+        return mass.volume if mass else 0.0
 
     def calculate_surface_area(self) -> float:
         """计算表面积"""
-        # TODO: 实现表面积计算
-        return 0.0
+        mass = self.mass_properties()
+        return mass.surface_area if mass else 0.0
 
     def calculate_centroid(self) -> Tuple[float, float, float]:
-        """计算质心"""
-        # TODO: 实现质心计算
-        return (0.0, 0.0, 0.0)
+        """计算质心（实体质心，密度均匀）"""
+        mass = self.mass_properties()
+        if mass is None:
+            return (0.0, 0.0, 0.0)
+        return tuple(float(v) for v in mass.centroid)
+
+    def calculate_inertia_tensor(self, density: float = 1.0) -> List[List[float]]:
+        """计算关于质心的惯性张量（密度均匀）"""
+        mass = self.mass_properties()
+        if mass is None:
+            return np.zeros((3, 3)).tolist()
+        return (mass.inertia * density).tolist()
 
     def calculate_bounding_box(self) -> Dict[str, Tuple[float, float]]:
         """计算包围盒"""
-        return {"x": (0.0, 0.0), "y": (0.0, 0.0), "z": (0.0, 0.0)}
-
-    def detect_symmetry(self) -> Dict[str, bool]:
-        """检测对称性"""
-        return {
-            "x_plane": False,
-            "y_plane": False,
-            "z_plane": False,
-            "axisymmetric": False,
-        }
+        mass = self.mass_properties()
+        if mass is None:
+            return {"x": (0.0, 0.0), "y": (0.0, 0.0), "z": (0.0, 0.0)}
+        return {axis: (float(mass.lower[i]), float(mass.upper[i])) for i, axis in enumerate("xyz")}
+
+    def calculate_oriented_bounding_box(self) -> Dict[str, Any]:
+        """计算有向包围盒（封闭网格取惯性主轴方向，否则取顶点主成分方向）"""
+        if self._obb is None:
+            if self.source is None:
+                return {"center": [0.0] * 3, "axes": np.eye(3).tolist(), "extents": [0.0] * 3, "volume": 0.0}
+            mass = self.mass_properties()
+            axes = None
+            if mass.volume > 0:
+                axes = np.linalg.eigh(mass.covariance)[1].T[::-1]
+            self._obb = oriented_bounding_box(self.source, axes)
+        return self._obb
+
+    def detect_symmetry(
+        self, tolerance: Optional[float] = None, max_samples: int = DEFAULT_SYMMETRY_SAMPLES
+    ) -> Dict[str, Any]:
+        """检测对称性
+
+        将网格顶点关于过质心的 x/y/z 平面镜像（或绕过质心的惯性主轴旋转），镜像点到
+        原网格表面的距离均不超过容差即判定对称。
+
+        Args:
+            tolerance: 绝对距离容差（None 为包围盒对角线 × :data:`DEFAULT_SYMMETRY_TOLERANCE`）
+            max_samples: 参与检验的顶点数上限
+        """
+        result = {"x_plane": False, "y_plane": False, "z_plane": False, "axisymmetric": False, "axis": None}
+        if self.mesh is None or self.mesh.num_faces == 0:
+            return result
+        grid = self.spatial_index
+        if tolerance is None:
+            tolerance = self._diagonal() * DEFAULT_SYMMETRY_TOLERANCE
+        points = self._sample_vertices(max_samples)
+
+        mass = self.mass_properties()
+        if mass.volume > 0:
+            center = mass.centroid
+            axes = np.linalg.eigh(mass.covariance)[1].T
+        else:
+            center = (grid.lower + grid.upper) / 2.0
+            axes = np.eye(3)
+
+        def matches(mapped: np.ndarray) -> bool:
+            # 先用少量点快速排除，再检验全部点
+            for part in (mapped[:256], mapped[256:]):
+                if len(part) and not np.all(np.isfinite(grid.nearest(part, max_distance=tolerance)[0])):
+                    return False
+            return True
+
+        for i, key in enumerate(("x_plane", "y_plane", "z_plane")):
+            mirrored = points.copy()
+            mirrored[:, i] = 2.0 * center[i] - mirrored[:, i]
+            result[key] = matches(mirrored)
+
+        relative = points - center
+        for axis in axes:
+            if all(matches(center + _rotate(relative, axis, angle)) for angle in _AXISYMMETRY_ANGLES):
+                result["axisymmetric"] = True
+                result["axis"] = {"point": center.tolist(), "direction": axis.tolist()}
+                break
+        return result
 
     def detect_holes(self) -> List[Dict[str, Any]]:
-        """检测孔特征"""
-        return []
+        """检测孔特征（网格的开口边界环）"""
+        if self.mesh is None:
+            return []
+        return self.mesh.holes()
+
+    def detect_thin_walls(
+        self, min_thickness: float = DEFAULT_MIN_WALL_THICKNESS, max_samples: int = DEFAULT_THICKNESS_SAMPLES
+    ) -> List[Dict[str, Any]]:
+        """检测薄壁特征
+
+        从面中心沿内法向投射射线，到对侧壁面（背向射线的面）的距离即该处壁厚；
+        壁厚小于 ``min_thickness`` 的采样点按空间邻近聚合为区域。
+
+        Returns:
+            薄壁区域列表（按最小壁厚升序），每项含 samples、min_thickness、
+            mean_thickness、area（按采样比例估算）、center 与最薄处 location
+        """
+        if self.mesh is None or self.mesh.num_faces == 0:
+            return []
+        grid = self.spatial_index
+        normals, areas = self._face_normals()
+
+        faces = np.flatnonzero(areas > 0)
+        if len(faces) > max_samples:
+            rng = np.random.default_rng(0)
+            faces = np.sort(rng.choice(faces, max_samples, replace=False))
+        origins = grid.v0[faces] + (grid.e1[faces] + grid.e2[faces]) / 3.0
+        directions = -normals[faces]
+
+        distance, hit = grid.ray_cast(
+            origins, directions, max_distance=min_thickness, min_distance=self._diagonal() * 1e-9, ignore=faces
+        )
+        thin = np.isfinite(distance)
+        # 只统计从内部到达的对侧壁面（排除射线从外侧穿入其它面的情况）
+        thin[thin] = np.einsum("ij,ij->i", normals[hit[thin]], directions[thin]) > 0
+        if not thin.any():
+            return []
+
+        points = origins[thin]
+        thickness = distance[thin]
+        sample_areas = areas[faces[thin]] * (np.count_nonzero(areas > 0) / len(faces))
+        spacing = max(min_thickness, 2.0 * np.sqrt(areas.sum() / len(faces)))
+        labels = _spatial_clusters(points, spacing)
+
+        regions = []
+        for label in np.unique(labels):
+            members = np.flatnonzero(labels == label)
+            thinnest = members[np.argmin(thickness[members])]
+            regions.append(
+                {
+                    "type": "thin_wall",
+                    "samples": int(len(members)),
+                    "min_thickness": float(thickness[thinnest]),
+                    "mean_thickness": float(thickness[members].mean()),
+                    "area": float(sample_areas[members].sum()),
+                    "center": points[members].mean(axis=0).tolist(),
+                    "location": points[thinnest].tolist(),
+                }
+            )
+        regions.sort(key=lambda region: region["min_thickness"])
+        return regions
+
+    def check_clearance(
+        self,
+        other: Any,
+        min_clearance: float = 0.0,
+        search_distance: Optional[float] = None,
+        max_samples: int = DEFAULT_CLEARANCE_SAMPLES,
+    ) -> Dict[str, Any]:
+        """检查与另一几何体的间隙与干涉
+
+        干涉：一方的边穿过另一方的面，或一方整体位于另一方内部。最小距离取双方顶点到
+        对方表面的最近距离（不计边-边最近点），只在 ``search_distance`` 范围内搜索。
+
+        Args:
+            other: 另一个 GeometryAnalyzer 或几何数据字典
+            min_clearance: 要求的最小间隙
+            search_distance: 距离搜索半径（None 为 2 × min_clearance 与4个体素边长中的较大者）
+            max_samples: 每一方参与距离计算的顶点数上限
 
-    def detect_thin_walls(self) -> List[Dict[str, Any]]:
-        """检测薄壁特征"""
-        return []
+        Returns:
+            {"interference", "min_distance"（超出搜索半径时为 None）, "points"（两侧最近点）,
+            "search_distance", "clearance_ok"}
+        """
+        if not isinstance(other, GeometryAnalyzer):
+            other = GeometryAnalyzer(other)
+        result = {
+            "interference": False,
+            "min_distance": None,
+            "points": None,
+            "search_distance": search_distance,
+            "clearance_ok": True,
+        }
+        if self.mesh is None or other.mesh is None or not self.mesh.num_faces or not other.mesh.num_faces:
+            return result
+        if search_distance is None:
+            search_distance = max(2.0 * min_clearance, 4.0 * other.spatial_index.cell_size)
+        result["search_distance"] = search_distance
+
+        if _meshes_intersect(self, other) or _meshes_intersect(other, self):
+            result.update(interference=True, min_distance=0.0, clearance_ok=False)
+            return result
+
+        found = self._nearest_pair(other, search_distance, max_samples)
+        if found is not None:
+            result["min_distance"], result["points"] = found
+            result["clearance_ok"] = found[0] >= min_clearance
+        else:
+            result["clearance_ok"] = search_distance >= min_clearance
+        return result
+
+    def _nearest_pair(
+        self, other: "GeometryAnalyzer", search_distance: float, max_samples: int
+    ) -> Optional[Tuple[float, List[List[float]]]]:
+        """双方顶点到对方表面、距离不超过 search_distance 的最近点对：(距离, [本方点, 对方点])"""
+        best = None
+        limit = search_distance
+        for source, target, flip in ((self, other, False), (other, self, True)):
+            grid = target.spatial_index
+            points = source._sample_vertices(max_samples)
+            # 只查询与目标包围盒距离在半径内的点
+            gap = np.maximum(np.maximum(grid.lower - points, points - grid.upper), 0.0)
+            points = points[np.einsum("ij,ij->i", gap, gap) <= limit * limit]
+            distance, index, closest = grid.min_distance(points, max_distance=limit)
+            if index >= 0 and (best is None or distance < best[0]):
+                pair = [points[index].tolist(), closest.tolist()]
+                best = (distance, pair[::-1] if flip else pair)
+                limit = distance
+        return best
 
     def check_manufacturability(self) -> Dict[str, Any]:
         """检查可制造性"""
-        return {
+        result = {
             "cnc_machinable": True,
             "3d_printable": True,
             "draft_angles_ok": True,
             "undercuts": [],
         }
+        if self.mesh is None:
+            return result
+
+        topology = self.mesh.topology_summary()
+        issues = []
+        if topology["boundary_edges"]:
+            issues.append(f"网格不封闭: {topology['holes']} 个开口，{topology['boundary_edges']} 条边界边")
+        if topology["non_manifold_edges"]:
+            issues.append(f"存在 {topology['non_manifold_edges']} 条非流形边")
+        if topology["inconsistent_edges"]:
+            issues.append(f"存在 {topology['inconsistent_edges']} 条法向不一致的边")
+        result["3d_printable"] = not issues
+        result["topology"] = topology
+        result["issues"] = issues
+        return result
+
+
+def _rotate(points: np.ndarray, axis: np.ndarray, angle: float) -> np.ndarray:
+    """绕过原点的单位轴旋转（Rodrigues 公式）"""
+    c, s = np.cos(angle), np.sin(angle)
+    return points * c + np.cross(axis, points) * s + np.outer(points @ axis, axis) * (1.0 - c)
+
+
+def _spatial_clusters(points: np.ndarray, spacing: float) -> np.ndarray:
+    """按边长 spacing 的哈希网格聚类：同一或相邻（26邻域）网格中的点属于同一类"""
+    cells = np.floor((points - points.min(axis=0)) / spacing).astype(np.int64) + 1
+    dims = cells.max(axis=0) + 2
+    keys = (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+    unique, inverse = np.unique(keys, return_inverse=True)
+
+    a, b = [], []
+    for offset in np.ndindex(3, 3, 3):
+        delta = ((offset[0] - 1) * dims[1] + offset[1] - 1) * dims[2] + offset[2] - 1
+        if delta <= 0:
+            continue
+        idx = np.minimum(np.searchsorted(unique, unique + delta), len(unique) - 1)
+        found = unique[idx] == unique + delta
+        a.append(np.flatnonzero(found))
+        b.append(idx[found])
+    labels = _connected_components(len(unique), np.concatenate(a), np.concatenate(b))
+    return labels[inverse]
+
+
+def _meshes_intersect(a: GeometryAnalyzer, b: GeometryAnalyzer) -> bool:
+    """a 的边是否穿过 b 的面，或 a 是否位于 b 内部"""
+    grid = b.spatial_index
+    vertices = a.mesh.vertices.astype(np.float64)
+    edges = a.mesh.edges
+    starts, ends = vertices[edges[:, 0]], vertices[edges[:, 1]]
+    # 只检查包围盒与 b 重叠的边
+    near = np.all((np.minimum(starts, ends) <= grid.upper) & (np.maximum(starts, ends) >= grid.lower), axis=1)
+    if not near.any():
+        return False
+    if grid.segments_intersect(starts[near], ends[near]).any():
+        return True
+    # 无交叉时 a 要么整体在 b 内、要么整体在外：从一个顶点发出射线，首个交点为 b 的背面则在内部
+    normals, _ = b._face_normals()
+    origin = vertices[edges[near][0, 0]][None]
+    direction = np.array([[0.5773, 0.5774, 0.5775]])
+    distance, hit = grid.ray_cast(origin, direction)
+    return bool(np.isfinite(distance[0]) and normals[hit[0]] @ direction[0] > 0)
@@ -0,0 +1,387 @@
+"""
+批量几何格式转换
+
+OpenCascade 不是线程安全的，批量转换在独立的工作进程中进行（进程生命周期见
+:mod:`sw_helper.utils.worker_pool`）：
+
+- 每个工作进程启动一次、复用 :class:`GeometryConverter`（OCC 只导入一次）
+- 单个文件超时时终止该工作进程并重新启动，其余文件不受影响
+- 输出已是最新的文件直接跳过：每个输出目录下的 ``.convert_manifest.json`` 记录分派前输入文件的
+  大小、修改时间与内容哈希；大小与（已稳定的）修改时间未变则不再哈希，修改时间变化但内容相同同样跳过
+- 返回每个文件的结果，并可汇总为JSON
+
+用法::
+
+    converter = BatchConverter(max_workers=8, timeout=300)
+    tasks = plan_conversions(collect_inputs(["supplier/"]), target_format="stl", output_dir="out/")
+    results = list(converter.run(tasks))
+    summary = summarize(results)
+"""
+
+import contextlib
+import functools
+import glob
+import io
+import json
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+from ..utils.hashing import file_digest, is_settled
+from ..utils.worker_pool import WorkerPool
+from .converter import GeometryConverter
+from .tessellation import TessellationSettings
+
+MANIFEST_NAME = ".convert_manifest.json"
+
+# 转换记录格式版本；旧版本记录的大小/修改时间不再作为跳过依据（仍可按内容哈希比较）
+MANIFEST_VERSION = 2
+
+_GLOB_CHARS = set("*?[")
+
+
+@dataclass
+class ConversionTask:
+    """一个文件的转换任务"""
+
+    input_file: Path
+    output_file: Path
+    target_format: str
+
+    def __post_init__(self):
+        self.input_file = Path(self.input_file)
+        self.output_file = Path(self.output_file)
+
+
+@dataclass
+class InputState:
+    """分派转换前的输入文件状态（大小、修改时间与内容哈希）
+
+    修改时间距哈希时刻过近时 ``mtime_ns`` 为 None：同一时间戳内的改写无法由大小与
+    修改时间发现，这样的记录只按内容哈希判断是否最新。
+    """
+
+    size: int
+    mtime_ns: Optional[int]
+    hash: str
+
+    @classmethod
+    def capture(cls, path: Path) -> "InputState":
+        stat = path.stat()
+        hashed_at = time.time_ns()
+        digest = file_digest(path)
+        settled = is_settled(stat.st_mtime_ns, hashed_at)
+        return cls(stat.st_size, stat.st_mtime_ns if settled else None, digest)
+
+
+@dataclass
+class ConversionResult:
+    """转换结果"""
+
+    task: ConversionTask
+    status: str  # converted / skipped / failed / timeout / error
+    elapsed: float = 0.0
+    error: str = ""
+    input_state: Optional[InputState] = None
+    messages: List[str] = field(default_factory=list)
+
+    @property
+    def success(self) -> bool:
+        return self.status in ("converted", "skipped")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "input": str(self.task.input_file),
+            "output": str(self.task.output_file),
+            "format": self.task.target_format,
+            "status": self.status,
+            "elapsed": round(self.elapsed, 3),
+            "error": self.error,
+        }
+
+
+def collect_inputs(patterns: Iterable[Union[str, Path]], recursive: bool = True) -> List[Path]:
+    """展开目录与通配符，返回支持格式的输入文件（去重、排序）
+
+    目录与通配符均按扩展名筛选 :attr:`GeometryConverter.SUPPORTED_FORMATS` 中的格式，通配符支持 ``**``；
+    转换记录中登记为输出的文件（上一次转换的结果）不作为输入。明确给出的文件原样保留。
+    """
+    extensions = {ext for exts in GeometryConverter.SUPPORTED_FORMATS.values() for ext in exts}
+    manifest = ConversionManifest()
+    files = set()
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            candidates = path.rglob("*") if recursive else path.glob("*")
+        elif _GLOB_CHARS & set(str(pattern)):
+            candidates = (Path(p) for p in glob.glob(str(pattern), recursive=recursive))
+        else:
+            if path.is_file():
+                files.add(path)
+            continue
+        files.update(
+            p
+            for p in candidates
+            if p.is_file() and p.suffix.lower() in extensions and not manifest.is_recorded_output(p)
+        )
+    return sorted(files)
+
+
+def plan_conversions(
+    inputs: Iterable[Union[str, Path]],
+    target_format: Optional[str] = None,
+    output_dir: Optional[Union[str, Path]] = None,
+    base_dir: Optional[Union[str, Path]] = None,
+) -> List[ConversionTask]:
+    """生成转换任务
+
+    Args:
+        inputs: 输入文件
+        target_format: 目标格式（None 按输入格式推断：STEP 转 STL，其余转 STEP）
+        output_dir: 输出目录（None 输出到输入文件旁）
+        base_dir: 输出目录中保留相对 base_dir 的子目录结构（None 为所有输入的公共父目录）
+    """
+    inputs = [Path(p) for p in inputs]
+    if output_dir is not None and base_dir is None and inputs:
+        base_dir = Path(os.path.commonpath([str(p.resolve().parent) for p in inputs]))
+
+    tasks = []
+    for input_file in inputs:
+        fmt = (target_format or GeometryConverter._infer_target_format(input_file)).lower()
+        if output_dir is None:
+            output_file = input_file.with_suffix(f".{fmt}")
+        else:
+            relative = input_file.resolve().relative_to(Path(base_dir).resolve())
+            output_file = Path(output_dir) / relative.with_suffix(f".{fmt}")
+        tasks.append(ConversionTask(input_file, output_file, fmt))
+
+    # 输入是另一个任务的输出（且那个任务的输入是源文件）时丢弃，例如未登记的上一次转换结果
+    producers = {t.output_file.resolve(): t for t in tasks if t.output_file.resolve() != t.input_file.resolve()}
+
+    def _is_generated(task: ConversionTask) -> bool:
+        producer = producers.get(task.input_file.resolve())
+        return producer is not None and producer.input_file.resolve() not in producers
+
+    tasks = [t for t in tasks if not _is_generated(t)]
+
+    # 输出不得覆盖任何输入，也不得写回登记为其来源的文件
+    manifest = ConversionManifest()
+    sources = {t.input_file.resolve() for t in tasks}
+    conflicts = [
+        t
+        for t in tasks
+        if t.output_file.resolve() in sources or t.output_file.resolve() == manifest.recorded_source(t.input_file)
+    ]
+    if conflicts:
+        names = ", ".join(f"{t.input_file} -> {t.output_file}" for t in conflicts)
+        raise ValueError(f"转换输出会覆盖输入文件: {names}")
+    return tasks
+
+
+class ConversionManifest:
+    """输出目录中的转换记录（输出文件名 -> 输入文件的大小/修改时间/内容哈希）
+
+    Args:
+        options: 影响输出的转换选项（如三角化弦差），变化时重新转换
+    """
+
+    def __init__(self, options: str = ""):
+        self.options = options
+        self._records: Dict[Path, Dict[str, Dict[str, Any]]] = {}
+
+    def _load(self, directory: Path) -> Dict[str, Dict[str, Any]]:
+        if directory not in self._records:
+            try:
+                with open(directory / MANIFEST_NAME, encoding="utf-8") as f:
+                    self._records[directory] = json.load(f)
+            except (OSError, ValueError):
+                self._records[directory] = {}
+        return self._records[directory]
+
+    def recorded_source(self, path: Path) -> Optional[Path]:
+        """path 登记为转换输出时返回其输入文件，否则返回 None"""
+        path = Path(path).resolve()
+        record = self._load(path.parent).get(path.name)
+        return Path(record["input"]) if record and record.get("input") else None
+
+    def is_recorded_output(self, path: Path) -> bool:
+        return self.recorded_source(path) is not None
+
+    def is_up_to_date(self, task: ConversionTask) -> bool:
+        """输出存在且输入未变化（无记录时比较修改时间）；内容哈希一致时刷新记录中的修改时间"""
+        output = task.output_file
+        if not output.exists() or output.stat().st_size == 0:
+            return False
+        stat = task.input_file.stat()
+        record = self._load(output.parent).get(output.name)
+        if record is None:
+            return output.stat().st_mtime_ns >= stat.st_mtime_ns
+        if record.get("format") != task.target_format or record.get("options", "") != self.options:
+            return False
+        if record.get("size") != stat.st_size:
+            return False
+        # 只信任记录时已稳定的修改时间（见 InputState）
+        settled = record.get("version") == MANIFEST_VERSION and record.get("mtime_ns") is not None
+        if settled and record["mtime_ns"] == stat.st_mtime_ns:
+            return True
+        hashed_at = time.time_ns()
+        if record.get("hash") != file_digest(task.input_file):
+            return False
+        # 内容未变：修改时间已稳定时更新记录，之后按大小与修改时间跳过
+        if is_settled(stat.st_mtime_ns, hashed_at):
+            record.update(version=MANIFEST_VERSION, mtime_ns=stat.st_mtime_ns)
+        return True
+
+    def record(self, result: ConversionResult):
+        """登记转换输出；输入状态为分派前的快照，转换期间的改写不会被误记为已转换"""
+        task, state = result.task, result.input_state
+        self._load(task.output_file.parent)[task.output_file.name] = {
+            "version": MANIFEST_VERSION,
+            "input": str(task.input_file.resolve()),
+            "format": task.target_format,
+            "options": self.options,
+            "size": state.size,
+            "mtime_ns": state.mtime_ns,
+            "hash": state.hash,
+        }
+
+    def save(self):
+        for directory, records in self._records.items():
+            if not directory.exists():
+                continue
+            tmp = directory / f"{MANIFEST_NAME}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(records, f, indent=1, sort_keys=True)
+            os.replace(tmp, directory / MANIFEST_NAME)
+
+
+# 工作进程内复用的转换器（按三角化设置区分）
+_converters: Dict[Optional[TessellationSettings], GeometryConverter] = {}
+
+
+def _convert_with_occ(
+    input_file: str, output_file: str, target_format: str, tessellation: Optional[TessellationSettings] = None
+) -> bool:
+    if tessellation not in _converters:
+        _converters[tessellation] = GeometryConverter(tessellation)
+    return _converters[tessellation].convert(input_file, output_file, target_format)
+
+
+def _worker_main(conn, convert: Callable[[str, str, str], bool]):
+    """工作进程：循环接收任务并转换，直到收到 None"""
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        start = time.perf_counter()
+        output = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(output):
+                ok = convert(str(task.input_file), str(task.output_file), task.target_format)
+            ok = bool(ok) and task.output_file.exists()
+            lines = output.getvalue().splitlines()
+            reply = {
+                "status": "converted" if ok else "failed",
+                "error": "" if ok else (lines[-1].strip() if lines else "转换失败"),
+            }
+        except Exception as e:  # 单个文件失败不影响其它文件
+            reply = {"status": "error", "error": f"{type(e).__name__}: {e}"}
+        reply["elapsed"] = time.perf_counter() - start
+        reply["messages"] = output.getvalue().splitlines()
+        conn.send(reply)
+
+
+class BatchConverter:
+    """进程池批量转换器
+
+    Args:
+        max_workers: 工作进程数（None 为CPU核数）
+        timeout: 单个文件超时秒数（None 不限时）
+        force: 忽略已是最新的输出，全部重新转换
+        convert: 转换函数 ``convert(input_file, output_file, target_format) -> bool``，必须可被
+            pickle（模块级函数）；None 使用 :class:`GeometryConverter`
+        tessellation: STEP 转 STL 的弦差设置（仅 convert 为 None 时生效）
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        force: bool = False,
+        convert: Optional[Callable[[str, str, str], bool]] = None,
+        tessellation: Optional[TessellationSettings] = None,
+    ):
+        self.max_workers = max(1, max_workers or os.cpu_count() or 1)
+        self.timeout = timeout
+        self.force = force
+        self.tessellation = tessellation
+        self.convert = convert or functools.partial(_convert_with_occ, tessellation=tessellation)
+
+    def run(self, tasks: Iterable[ConversionTask]) -> Iterator[ConversionResult]:
+        """执行转换，按完成顺序逐个返回结果（跳过的文件最先返回）"""
+        manifest = ConversionManifest(self.tessellation.key() if self.tessellation else "")
+        pending = deque()
+        try:
+            for task in tasks:
+                if not self.force and manifest.is_up_to_date(task):
+                    yield ConversionResult(task, "skipped")
+                else:
+                    pending.append(task)
+            for result in self._run_pending(pending):
+                if result.status == "converted":
+                    manifest.record(result)
+                yield result
+        finally:
+            manifest.save()
+
+    def _run_pending(self, pending: deque) -> Iterator[ConversionResult]:
+        # 分派前记录输入状态：转换期间输入被改写时，记录的是旧内容，下次运行会重新转换
+        states: Dict[int, InputState] = {}
+        dispatch = []
+        for task in pending:
+            try:
+                states[id(task)] = InputState.capture(task.input_file)
+            except OSError as e:
+                yield ConversionResult(task, "error", error=f"{type(e).__name__}: {e}")
+                continue
+            task.output_file.parent.mkdir(parents=True, exist_ok=True)
+            dispatch.append(task)
+        if not dispatch:
+            return
+        with WorkerPool(_worker_main, args=(self.convert,), max_workers=self.max_workers, timeout=self.timeout) as pool:
+            for outcome in pool.run(dispatch):
+                state = states[id(outcome.task)]
+                if outcome.status != "done":
+                    status = "timeout" if outcome.status == "timeout" else "error"
+                    yield ConversionResult(
+                        outcome.task, status, elapsed=outcome.elapsed, error=outcome.error, input_state=state
+                    )
+                    continue
+                reply = outcome.reply
+                yield ConversionResult(
+                    outcome.task,
+                    reply["status"],
+                    elapsed=reply["elapsed"],
+                    error=reply["error"],
+                    input_state=state,
+                    messages=reply["messages"],
+                )
+
+
+def summarize(results: Iterable[ConversionResult], elapsed: Optional[float] = None) -> Dict[str, Any]:
+    """汇总结果（可直接写入JSON）"""
+    results = list(results)
+    counts = dict.fromkeys(("converted", "skipped", "failed", "timeout", "error"), 0)
+    for result in results:
+        counts[result.status] = counts.get(result.status, 0) + 1
+    summary = {"total": len(results), **counts}
+    if elapsed is not None:
+        summary["elapsed"] = round(elapsed, 3)
+    summary["files"] = [result.to_dict() for result in results]
+    return summary
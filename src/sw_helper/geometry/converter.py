@@ -11,11 +11,27 @@
 
 import shutil
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterable, Optional
+
+from .tessellation import (
+    LOD_LEVELS,
+    LOD_PRESETS,
+    StepTessellator,
+    TessellationCache,
+    TessellationSettings,
+    default_tessellation_cache,
+    lod_output_paths,
+)
 
 
 class GeometryConverter:
-    """几何格式转换器"""
+    """几何格式转换器
+
+    Args:
+        tessellation: STEP 转 STL 的弦差设置（None 为 medium 级预设）
+        cache: 三角化缓存（None 使用默认缓存）
+        use_cache: 是否使用三角化缓存
+    """
 
     SUPPORTED_FORMATS = {
         "step": [".step", ".stp"],
@@ -25,8 +41,15 @@ class GeometryConverter:
         "obj": [".obj"],
     }
 
-    def __init__(self):
+    def __init__(
+        self,
+        tessellation: Optional[TessellationSettings] = None,
+        cache: Optional[TessellationCache] = None,
+        use_cache: bool = True,
+    ):
         self.occ_available = False
+        self.tessellation = tessellation or LOD_PRESETS["medium"]
+        self.cache = (cache or default_tessellation_cache()) if use_cache else None
         self._check_occ()
 
     def _check_occ(self) -> bool:
@@ -45,10 +68,11 @@ class GeometryConverter:
         except ImportError:
             return False
 
-    def _get_format(self, file_path: Path) -> str:
+    @staticmethod
+    def _get_format(file_path: Path) -> str:
         """获取文件格式"""
         ext = file_path.suffix.lower()
-        for fmt, exts in self.SUPPORTED_FORMATS.items():
+        for fmt, exts in GeometryConverter.SUPPORTED_FORMATS.items():
             if ext in exts:
                 return fmt
         return "unknown"
@@ -113,6 +137,49 @@ class GeometryConverter:
             print(f"✗ 转换失败: {e}")
             return False
 
+    def convert_lod(
+        self,
+        input_file: str,
+        output_file: Optional[str] = None,
+        levels: Iterable[str] = LOD_LEVELS,
+    ) -> Dict[str, Path]:
+        """STEP 一次读取，输出多级细节的 STL（``part.coarse.stl`` 等）
+
+        Args:
+            input_file: STEP 文件
+            output_file: 输出基准路径（默认与输入同名），各级在其后加级别名
+            levels: 级别（:data:`LOD_PRESETS` 中的名称）
+
+        Returns:
+            级别 -> 输出路径（失败时为空字典）
+        """
+        input_path = Path(input_file)
+        if not input_path.exists():
+            print(f"✗ 文件不存在: {input_file}")
+            return {}
+        if self._get_format(input_path) != "step":
+            print(f"✗ 多级细节输出仅支持STEP文件: {input_file}")
+            return {}
+        outputs = lod_output_paths(output_file or input_path.with_suffix(".stl"), levels)
+
+        if not self.occ_available:
+            print("⚠ OpenCascade未安装，使用简化转换模式")
+            for path in outputs.values():
+                self._mock_convert(input_file, str(path), "stl")
+            return outputs
+
+        try:
+            sources = StepTessellator(self.cache).tessellate(
+                input_path, {path: LOD_PRESETS[level] for level, path in outputs.items()}
+            )
+        except Exception as e:
+            print(f"✗ 转换失败: {e}")
+            return {}
+        for level, path in outputs.items():
+            note = "（缓存）" if sources[path] == "cache" else ""
+            print(f"✓ {level}: {input_path.name} -> {path.name}{note}")
+        return outputs
+
     def _mock_convert(
         self,
         input_file: str,
@@ -135,7 +202,8 @@ class GeometryConverter:
         print("  注意: 实际转换需要安装 pythonocc-core")
         return True
 
-    def _infer_target_format(self, input_path: Path) -> str:
+    @staticmethod
+    def _infer_target_format(input_path: Path) -> str:
         """推断目标格式"""
         ext = input_path.suffix.lower()
 
@@ -150,24 +218,11 @@ class GeometryConverter:
             return "step"
 
     def _step_to_stl(self, input_path: Path, output_path: Path) -> bool:
-        """STEP转STL"""
-        from OCC.Core.STEPControl import STEPControl_Reader
-        from OCC.Core.StlAPI import StlAPI_Writer
+        """STEP转STL（按 :attr:`tessellation` 的弦差三角化，结果按内容哈希缓存）"""
+        sources = StepTessellator(self.cache).tessellate(input_path, {output_path: self.tessellation})
 
-        # 读取STEP文件
-        step_reader = STEPControl_Reader()
-        step_reader.ReadFile(str(input_path))
-        step_reader.TransferRoots()
-
-        shape = step_reader.Shape()
-
-        # 写入STL
-        stl_writer = StlAPI_Writer()
-        stl_writer.SetAccuracy(0.01)
-        stl_writer.SetRelativeMode(True)
-        stl_writer.Write(str(output_path), shape)
-
-        print(f"✓ 转换成功: {input_path.name} -> {output_path.name}")
+        note = "（缓存）" if sources[output_path] == "cache" else ""
+        print(f"✓ 转换成功: {input_path.name} -> {output_path.name}{note}")
         return True
 
     def _stl_to_step(self, input_path: Path, output_path: Path) -> bool:
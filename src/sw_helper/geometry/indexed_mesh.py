@@ -0,0 +1,354 @@
+"""
+索引三角网格与拓扑查询
+
+STL 为三角形片（每个顶点平均重复约6次）。:func:`weld_vertices` 将顶点坐标按容差
+量化为整数键后排序分组去重，得到唯一顶点 + int32 面索引的
+:class:`IndexedMesh`；边/面邻接同样由排序后的边键一次性构建，用于：
+
+- 水密性检查（无边界边、无非流形边）
+- 孔洞（边界环）提取
+- 非流形边、法向不一致边、连通分量与亏格统计
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# 默认焊接容差（相对包围盒对角线长度）
+DEFAULT_WELD_TOLERANCE = 1e-6
+
+
+def _group(keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """按整数键分组（一次非稳定排序，比 ``np.unique`` 的 return_index/return_inverse 快）
+
+    Returns:
+        (order, inverse, starts)：排序后的原始下标、每个元素的组号（0起始，按键升序）、
+        每组在 order 中的起始位置
+    """
+    order = np.argsort(keys)
+    sorted_keys = keys[order]
+    new_group = np.empty(len(keys), dtype=bool)
+    new_group[:1] = True
+    np.not_equal(sorted_keys[1:], sorted_keys[:-1], out=new_group[1:])
+    return _sorted_groups(order, new_group)
+
+
+def _group_columns(columns: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """按多列（[c, N]）组合值分组，返回值同 :func:`_group`"""
+    order = np.lexsort(columns[::-1])
+    ordered = columns[:, order]
+    new_group = np.empty(columns.shape[1], dtype=bool)
+    new_group[:1] = True
+    np.any(ordered[:, 1:] != ordered[:, :-1], axis=0, out=new_group[1:])
+    return _sorted_groups(order, new_group)
+
+
+def _sorted_groups(order: np.ndarray, new_group: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    inverse = np.empty(len(order), dtype=np.int64)
+    inverse[order] = np.cumsum(new_group) - 1
+    return order, inverse, np.flatnonzero(new_group)
+
+
+def weld_vertices(triangles: np.ndarray, tolerance: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """合并重复顶点
+
+    Args:
+        triangles: [n, 3, 3] 三角形顶点坐标
+        tolerance: 绝对焊接容差（None 为包围盒对角线 × :data:`DEFAULT_WELD_TOLERANCE`，
+            0 表示仅合并坐标完全相同的顶点）
+
+    Returns:
+        (vertices[m, 3], faces[n, 3] int32)，顶点坐标取每组中任一原始坐标
+    """
+    triangles = np.asarray(triangles)
+    n = len(triangles)
+    points = triangles.reshape(-1, 3)
+    if n == 0:
+        return np.zeros((0, 3), dtype=triangles.dtype), np.zeros((0, 3), dtype=np.int32)
+
+    # 按分量连续存放（[3, N]），归约与量化均为连续内存上的向量运算
+    xyz = points.T.astype(np.float64, order="C")
+    lower = xyz.min(axis=1)
+    upper = xyz.max(axis=1)
+    if tolerance is None:
+        tolerance = float(np.linalg.norm(upper - lower)) * DEFAULT_WELD_TOLERANCE
+
+    keys = None
+    columns = xyz
+    if tolerance > 0:
+        xyz -= lower[:, None]
+        xyz *= 1.0 / tolerance
+        xyz += 0.5
+        cells = np.floor(xyz, out=xyz).astype(np.int64)
+        extent = cells.max(axis=1) + 1
+        if np.prod(extent.astype(np.float64)) < 2.0**62:
+            keys = cells[2] * extent[1]
+            keys += cells[1]
+            keys *= extent[0]
+            keys += cells[0]
+        columns = cells
+
+    # 单一整数键放不下时（或精确焊接）按三列组合值分组
+    order, inverse, starts = _group(keys) if keys is not None else _group_columns(columns)
+    first = order[starts]
+
+    vertices = np.array(points[first])
+    faces = inverse.reshape(n, 3).astype(np.int32)
+    return vertices, faces
+
+
+def _connected_components(n: int, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """无向图连通分量标签（挂接 + 路径压缩，纯NumPy）"""
+    labels = np.arange(n)
+    if len(a) == 0:
+        return labels
+    while True:
+        la, lb = labels[a], labels[b]
+        low = np.minimum(la, lb)
+        hooked = labels.copy()
+        np.minimum.at(hooked, la, low)
+        np.minimum.at(hooked, lb, low)
+        while True:
+            jumped = hooked[hooked]
+            if np.array_equal(jumped, hooked):
+                break
+            hooked = jumped
+        if np.array_equal(hooked, labels):
+            return labels
+        labels = hooked
+
+
+@dataclass
+class IndexedMesh:
+    """索引三角网格（唯一顶点 + 面索引）及边/面邻接"""
+
+    vertices: np.ndarray  # [m, 3] 顶点坐标
+    faces: np.ndarray  # [n, 3] int32，顶点索引
+    degenerate_faces: int = 0  # 焊接后退化（含重复顶点）而被移除的面数
+    _topology: Optional[Dict[str, np.ndarray]] = field(default=None, init=False, repr=False, compare=False)
+
+    @classmethod
+    def from_triangles(cls, triangles: np.ndarray, tolerance: Optional[float] = None) -> "IndexedMesh":
+        """由三角形片构建（焊接顶点并移除退化面）"""
+        vertices, faces = weld_vertices(triangles, tolerance)
+        valid = (faces[:, 0] != faces[:, 1]) & (faces[:, 1] != faces[:, 2]) & (faces[:, 2] != faces[:, 0])
+        degenerate = int(len(faces) - np.count_nonzero(valid))
+        if degenerate:
+            faces = faces[valid]
+        return cls(vertices, faces, degenerate)
+
+    @property
+    def num_vertices(self) -> int:
+        return len(self.vertices)
+
+    @property
+    def num_faces(self) -> int:
+        return len(self.faces)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.edges)
+
+    @property
+    def nbytes(self) -> int:
+        return self.vertices.nbytes + self.faces.nbytes
+
+    @property
+    def triangles(self) -> np.ndarray:
+        """[n, 3, 3] 三角形顶点坐标"""
+        return self.vertices[self.faces]
+
+    # ------------------------------------------------------------------
+    # 邻接
+
+    @property
+    def edges(self) -> np.ndarray:
+        """[k, 2] 唯一无向边（较小顶点索引在前）"""
+        return self._build()["edges"]
+
+    @property
+    def face_edges(self) -> np.ndarray:
+        """[n, 3] 每个面的三条边（边 i 为顶点 i → i+1）在 :attr:`edges` 中的索引"""
+        return self._build()["face_edges"]
+
+    @property
+    def edge_face_counts(self) -> np.ndarray:
+        """[k] 每条边相邻的面数"""
+        return self._build()["edge_face_counts"]
+
+    @property
+    def face_neighbors(self) -> np.ndarray:
+        """[n, 3] 经边 i 相邻的面索引（边界边或非流形边为 -1）"""
+        return self._build()["face_neighbors"]
+
+    def edge_faces(self, edge: int) -> np.ndarray:
+        """与指定边相邻的面索引"""
+        topo = self._build()
+        start, stop = topo["edge_offsets"][edge], topo["edge_offsets"][edge + 1]
+        return topo["edge_half_edges"][start:stop] // 3
+
+    # ------------------------------------------------------------------
+    # 拓扑查询
+
+    def boundary_edges(self) -> np.ndarray:
+        """只属于一个面的边的索引"""
+        return np.flatnonzero(self.edge_face_counts == 1)
+
+    def non_manifold_edges(self) -> np.ndarray:
+        """属于三个及以上面的边的索引"""
+        return np.flatnonzero(self.edge_face_counts > 2)
+
+    def inconsistent_edges(self) -> np.ndarray:
+        """相邻两面法向不一致（两条半边同向）的流形边索引"""
+        return np.flatnonzero(self._build()["same_direction"])
+
+    def is_watertight(self) -> bool:
+        """每条边恰好属于两个面"""
+        counts = self.edge_face_counts
+        return bool(len(counts) and np.all(counts == 2))
+
+    def face_components(self) -> np.ndarray:
+        """[n] 面的连通分量标签（经流形边相连；0起始连续编号）"""
+        topo = self._build()
+        if "components" not in topo:
+            neighbors = self.face_neighbors
+            face, _ = np.nonzero(neighbors >= 0)
+            other = neighbors[neighbors >= 0]
+            labels = _connected_components(self.num_faces, face, other)
+            # 收敛后标签为各分量的根（最小面索引），按根的顺序重新编号
+            roots = labels == np.arange(self.num_faces)
+            topo["components"] = (np.cumsum(roots) - 1)[labels]
+        return topo["components"]
+
+    @property
+    def num_components(self) -> int:
+        components = self.face_components()
+        return int(components.max()) + 1 if len(components) else 0
+
+    @property
+    def num_holes(self) -> int:
+        """孔洞数：边界边构成的连通分量数（不逐环遍历；在一个顶点处相接的两个环计为一个）"""
+        boundary = self.edges[self.boundary_edges()]
+        if len(boundary) == 0:
+            return 0
+        used, local = np.unique(boundary, return_inverse=True)
+        local = local.reshape(-1, 2)
+        labels = _connected_components(len(used), local[:, 0], local[:, 1])
+        return int(np.count_nonzero(labels == np.arange(len(used))))
+
+    def euler_characteristic(self) -> int:
+        """χ = V - E + F（只统计被面引用的顶点）"""
+        used = np.zeros(self.num_vertices, dtype=bool)
+        used[self.faces] = True
+        return int(np.count_nonzero(used)) - self.num_edges + self.num_faces
+
+    def genus(self) -> Optional[int]:
+        """封闭可定向网格的亏格（贯通孔数）；非水密时为 None"""
+        if not self.is_watertight() or len(self.inconsistent_edges()):
+            return None
+        return max(0, (2 * self.num_components - self.euler_characteristic()) // 2)
+
+    def boundary_loops(self) -> List[np.ndarray]:
+        """边界环（孔洞）列表，每个环为按顺序排列的顶点索引
+
+        边界半边沿所在面的方向首尾相接；经过非流形顶点的环在该顶点处断开。
+        """
+        topo = self._build()
+        half = topo["edge_half_edges"][topo["edge_offsets"][self.boundary_edges()]]
+        if len(half) == 0:
+            return []
+        face, corner = half // 3, half % 3
+        start = self.faces[face, corner]
+        end = self.faces[face, (corner + 1) % 3]
+
+        successors: Dict[int, List[int]] = {}
+        for s, e in zip(start.tolist(), end.tolist()):
+            successors.setdefault(s, []).append(e)
+
+        loops = []
+        for first in start.tolist():
+            if not successors.get(first):
+                continue
+            loop = [first]
+            current = successors[first].pop()
+            while current != first and successors.get(current):
+                loop.append(current)
+                current = successors[current].pop()
+            loops.append(np.array(loop, dtype=np.int64))
+        return loops
+
+    def holes(self) -> List[Dict[str, Any]]:
+        """孔洞（边界环）的几何信息，按周长从大到小排列"""
+        holes = []
+        for loop in self.boundary_loops():
+            points = self.vertices[loop].astype(np.float64)
+            perimeter = float(np.linalg.norm(points - np.roll(points, -1, axis=0), axis=1).sum())
+            holes.append(
+                {
+                    "type": "boundary_loop",
+                    "vertices": len(loop),
+                    "perimeter": perimeter,
+                    "equivalent_diameter": perimeter / np.pi,
+                    "center": points.mean(axis=0).tolist(),
+                }
+            )
+        holes.sort(key=lambda hole: hole["perimeter"], reverse=True)
+        return holes
+
+    def topology_summary(self) -> Dict[str, Any]:
+        """拓扑统计"""
+        return {
+            "vertices": self.num_vertices,
+            "faces": self.num_faces,
+            "edges": self.num_edges,
+            "watertight": self.is_watertight(),
+            "boundary_edges": int(len(self.boundary_edges())),
+            "non_manifold_edges": int(len(self.non_manifold_edges())),
+            "inconsistent_edges": int(len(self.inconsistent_edges())),
+            "degenerate_faces": self.degenerate_faces,
+            "components": self.num_components,
+            "holes": self.num_holes,
+            "genus": self.genus(),
+        }
+
+    # ------------------------------------------------------------------
+
+    def _build(self) -> Dict[str, np.ndarray]:
+        """由半边一次性构建边表与邻接（排序 + 分组，无逐面循环）"""
+        if self._topology is not None:
+            return self._topology
+
+        faces = self.faces.astype(np.int64)
+        n = len(faces)
+        heads = faces.reshape(-1)
+        tails = faces[:, [1, 2, 0]].reshape(-1)
+        low = np.minimum(heads, tails)
+        high = np.maximum(heads, tails)
+        keys = low * max(self.num_vertices, 1) + high
+
+        order, half_to_edge, starts = _group(keys)
+        offsets = np.append(starts, len(keys))
+        counts = np.diff(offsets)
+        edges = np.column_stack([low[order[starts]], high[order[starts]]]).astype(np.int32)
+
+        # 流形边的两条半边互为邻面
+        neighbors = np.full(3 * n, -1, dtype=np.int64)
+        manifold = np.flatnonzero(counts == 2)
+        h0 = order[offsets[manifold]]
+        h1 = order[offsets[manifold] + 1]
+        neighbors[h0] = h1 // 3
+        neighbors[h1] = h0 // 3
+        same_direction = np.zeros(len(starts), dtype=bool)
+        same_direction[manifold] = heads[h0] == heads[h1]
+
+        self._topology = {
+            "edges": edges,
+            "face_edges": half_to_edge.reshape(n, 3).astype(np.int32),
+            "edge_face_counts": counts,
+            "edge_offsets": offsets,
+            "edge_half_edges": order,
+            "face_neighbors": neighbors.reshape(n, 3),
+            "same_direction": same_direction,
+        }
+        return self._topology
@@ -0,0 +1,217 @@
+"""
+三角网格质量特性
+
+由封闭三角网格按散度定理一次遍历求体积、表面积、质心与惯性张量：每个三角形与
+参考点构成一个四面体，累加其体积、一阶矩与二阶矩。三角形按块转置为 [9, k]
+的 float64 连续数组逐分量计算，不逐个三角形循环。
+
+另提供轴对齐包围盒与基于主成分的有向包围盒（OBB）。
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Optional, Union
+
+import numpy as np
+
+from .indexed_mesh import IndexedMesh
+from .stl_reader import StlMesh
+
+# 每块三角形数（块数据保持在CPU缓存内）
+DEFAULT_CHUNK_SIZE = 16384
+
+TriangleSource = Union[np.ndarray, StlMesh, IndexedMesh]
+
+
+def triangle_chunks(source: TriangleSource, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[np.ndarray]:
+    """按块返回三角形顶点坐标 [k, 3, 3]（索引网格按块展开，不整体物化）"""
+    if isinstance(source, IndexedMesh):
+        for start in range(0, source.num_faces, chunk_size):
+            yield source.vertices[source.faces[start : start + chunk_size]]
+        return
+    triangles = source.triangles if isinstance(source, StlMesh) else np.asarray(source)
+    for start in range(0, len(triangles), chunk_size):
+        yield np.asarray(triangles[start : start + chunk_size])
+
+
+@dataclass
+class MassProperties:
+    """质量特性（单位密度；坐标单位与输入一致）"""
+
+    volume: float
+    surface_area: float
+    centroid: np.ndarray  # [3]
+    inertia: np.ndarray  # [3, 3] 关于质心的惯性张量
+    covariance: np.ndarray  # [3, 3] 关于质心的二阶矩 ∫(x-c)(x-c)ᵀdV
+    lower: np.ndarray  # [3] 包围盒下界
+    upper: np.ndarray  # [3] 包围盒上界
+    num_triangles: int = 0
+    signed_volume: float = 0.0  # 有向体积（法向朝外的封闭网格为正）
+
+    def principal_moments(self) -> np.ndarray:
+        """主惯性矩（升序）"""
+        return np.linalg.eigvalsh(self.inertia)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "volume": self.volume,
+            "surface_area": self.surface_area,
+            "centroid": self.centroid.tolist(),
+            "inertia_tensor": self.inertia.tolist(),
+            "principal_moments": self.principal_moments().tolist(),
+        }
+
+
+def compute_mass_properties(source: TriangleSource, chunk_size: int = DEFAULT_CHUNK_SIZE) -> MassProperties:
+    """一次遍历计算体积、面积、质心、惯性张量与包围盒
+
+    以参考点 o 与三角形 (a, b, c) 构成的四面体（a、b、c 为相对 o 的坐标），
+    d = a·(b×c)，s = a+b+c：
+
+    - 体积 ∫dV = d/6
+    - 一阶矩 ∫x dV = d·s/24
+    - 二阶矩 ∫x_i x_j dV = d·(a_i a_j + b_i b_j + c_i c_j + s_i s_j)/120
+
+    法向朝内（有向体积为负）的网格自动取反，结果与朝向无关。
+    """
+    lower = np.full(9, np.inf)
+    upper = np.full(9, -np.inf)
+    area = 0.0
+    sums = np.zeros(10)  # d, d·s (3), 二阶矩 xx yy zz xy yz zx
+    origin = None
+    count = 0
+
+    for chunk in triangle_chunks(source, chunk_size):
+        if len(chunk) == 0:
+            continue
+        t = chunk.reshape(-1, 9).T.astype(np.float64, order="C")
+        count += t.shape[1]
+        np.minimum(lower, t.min(axis=1), out=lower)
+        np.maximum(upper, t.max(axis=1), out=upper)
+        if origin is None:
+            # 以首个顶点为参考点，减小大坐标时的相消误差
+            origin = np.tile(t[:3, 0], 3)[:, None]
+        t -= origin
+        ax, ay, az, bx, by, bz, cx, cy, cz = t
+
+        ex, ey, ez = bx - ax, by - ay, bz - az
+        fx, fy, fz = cx - ax, cy - ay, cz - az
+        nx = ey * fz - ez * fy
+        ny = ez * fx - ex * fz
+        nz = ex * fy - ey * fx
+        area += 0.5 * float(np.sqrt(nx * nx + ny * ny + nz * nz).sum())
+
+        d = ax * nx + ay * ny + az * nz
+        sx, sy, sz = ax + bx + cx, ay + by + cy, az + bz + cz
+        sums[0] += d.sum()
+        sums[1] += d @ sx
+        sums[2] += d @ sy
+        sums[3] += d @ sz
+        sums[4] += d @ (ax * ax + bx * bx + cx * cx + sx * sx)
+        sums[5] += d @ (ay * ay + by * by + cy * cy + sy * sy)
+        sums[6] += d @ (az * az + bz * bz + cz * cz + sz * sz)
+        sums[7] += d @ (ax * ay + bx * by + cx * cy + sx * sy)
+        sums[8] += d @ (ay * az + by * bz + cy * cz + sy * sz)
+        sums[9] += d @ (az * ax + bz * bx + cz * cx + sz * sx)
+
+    if count == 0:
+        zeros = np.zeros(3)
+        return MassProperties(0.0, 0.0, zeros, np.zeros((3, 3)), np.zeros((3, 3)), zeros, zeros.copy())
+
+    signed_volume = sums[0] / 6.0
+    if sums[0] < 0:
+        sums = -sums
+    volume = sums[0] / 6.0
+    first = sums[1:4] / 24.0
+    xx, yy, zz, xy, yz, zx = sums[4:] / 120.0
+    second = np.array([[xx, xy, zx], [xy, yy, yz], [zx, yz, zz]])
+
+    ref = origin[:3, 0]
+    if volume > 0:
+        offset = first / volume
+        # 平移到质心的二阶矩（协方差）
+        covariance = second - volume * np.outer(offset, offset)
+    else:
+        offset = np.zeros(3)
+        covariance = np.zeros((3, 3))
+    inertia = np.trace(covariance) * np.eye(3) - covariance
+
+    return MassProperties(
+        volume=float(volume),
+        surface_area=area,
+        centroid=ref + offset,
+        inertia=inertia,
+        covariance=covariance,
+        lower=lower.reshape(3, 3).min(axis=0),
+        upper=upper.reshape(3, 3).max(axis=0),
+        num_triangles=count,
+        signed_volume=float(signed_volume),
+    )
+
+
+def _point_columns(chunk: np.ndarray) -> np.ndarray:
+    """[k, 3, 3] 三角形块 -> [3, 3k] float64 连续坐标列（x/y/z 各一行）"""
+    return chunk.reshape(-1, 3).T.astype(np.float64, order="C")
+
+
+def oriented_bounding_box(
+    source: TriangleSource, axes: Optional[np.ndarray] = None, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Dict[str, Any]:
+    """有向包围盒
+
+    Args:
+        source: 三角形数据
+        axes: [3, 3] 盒子方向（每行一个单位轴），通常取实体惯性主轴；None 时使用
+            顶点坐标协方差的主成分方向（多一次遍历）
+
+    主成分方向得到的盒子不一定最小；体积大于轴对齐包围盒时返回轴对齐包围盒。
+
+    Returns:
+        {"center": [3], "axes": [3][3]（每行一个单位轴）, "extents": [3]（各轴全长）, "volume"}
+    """
+    if axes is None:
+        n = 0
+        total = np.zeros(3)
+        outer = np.zeros((3, 3))
+        origin = None
+        for chunk in triangle_chunks(source, chunk_size):
+            xyz = _point_columns(chunk)
+            if xyz.shape[1] == 0:
+                continue
+            if origin is None:
+                origin = xyz[:, :1].copy()
+            xyz -= origin
+            n += xyz.shape[1]
+            total += xyz.sum(axis=1)
+            outer += xyz @ xyz.T
+        if n == 0:
+            return {"center": [0.0] * 3, "axes": np.eye(3).tolist(), "extents": [0.0] * 3, "volume": 0.0}
+        mean = total / n
+        _, vectors = np.linalg.eigh(outer / n - np.outer(mean, mean))
+        axes = vectors.T[::-1]  # 按方差从大到小
+    axes = np.asarray(axes, dtype=np.float64)
+
+    # 同一次遍历同时投影到有向轴与坐标轴
+    frames = np.vstack([axes, np.eye(3)])
+    lower = np.full(6, np.inf)
+    upper = np.full(6, -np.inf)
+    for chunk in triangle_chunks(source, chunk_size):
+        xyz = _point_columns(chunk)
+        if xyz.shape[1]:
+            projected = frames @ xyz
+            np.minimum(lower, projected.min(axis=1), out=lower)
+            np.maximum(upper, projected.max(axis=1), out=upper)
+    if not np.all(np.isfinite(lower)):
+        return {"center": [0.0] * 3, "axes": np.eye(3).tolist(), "extents": [0.0] * 3, "volume": 0.0}
+
+    if np.prod(upper[:3] - lower[:3]) > np.prod(upper[3:] - lower[3:]):
+        axes, lower, upper = np.eye(3), lower[3:], upper[3:]
+    else:
+        lower, upper = lower[:3], upper[:3]
+    extents = upper - lower
+    center = ((lower + upper) / 2.0) @ axes
+    return {
+        "center": center.tolist(),
+        "axes": axes.tolist(),
+        "extents": extents.tolist(),
+        "volume": float(np.prod(extents)),
+    }
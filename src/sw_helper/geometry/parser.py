@@ -6,13 +6,36 @@ import json
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+import numpy as np
+
+from .indexed_mesh import IndexedMesh
+from .step_reader import DEFAULT_BLOCK_SIZE, StepScanner
+from .stl_reader import StlMesh, read_stl
+
 
 class GeometryParser:
     """几何文件解析器"""
 
     SUPPORTED_FORMATS = [".step", ".stp", ".stl", ".iges", ".igs"]
 
-    def __init__(self):
+    def __init__(
+        self,
+        weld: bool = False,
+        weld_tolerance: Optional[float] = None,
+        geometry: bool = False,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+    ):
+        """
+        Args:
+            weld: 是否合并STL重复顶点并构建索引网格（附带拓扑检查）
+            weld_tolerance: 焊接容差（None 为包围盒对角线的 1e-6 倍）
+            geometry: STEP是否额外通过OCC加载B-rep计算体积/面积/包围盒（默认只做流式扫描）
+            block_size: STEP流式扫描每次读取的字节数
+        """
+        self.weld = weld
+        self.weld_tolerance = weld_tolerance
+        self.geometry = geometry
+        self.block_size = block_size
         self.data = None
 
     def parse(self, file_path: str, file_format: Optional[str] = None) -> Dict[str, Any]:
@@ -38,6 +61,11 @@ class GeometryParser:
         if ext not in self.SUPPORTED_FORMATS:
             raise ValueError(f"不支持的文件格式: {ext}")
 
+        if ext == ".stl":
+            return self._parse_stl(path)
+        if ext in (".step", ".stp"):
+            return self._parse_step(path, ext)
+
         # TODO: 集成FreeCAD或OCC进行实际解析
         # 这里返回模拟数据
         return {
@@ -49,6 +77,87 @@ class GeometryParser:
             "bounds": {"x": [0, 0], "y": [0, 0], "z": [0, 0]},
         }
 
+    def parse_mesh(self, triangles: np.ndarray, name: str = "") -> Dict[str, Any]:
+        """解析内存中的三角网格（如CAD形状直接三角化的结果），结果与解析同一网格的STL一致
+
+        Args:
+            triangles: [n, 3, 3] 三角形顶点坐标
+            name: 网格名称
+        """
+        triangles = np.asarray(triangles, dtype=np.float32).reshape(-1, 3, 3)
+        mesh = StlMesh(triangles=triangles, normals=np.zeros((len(triangles), 3), dtype=np.float32), name=name)
+        result = self._mesh_result(mesh, {"file": "", "format": "memory", "type": "triangular_mesh"})
+        result.pop("encoding", None)
+        return result
+
+    def _parse_stl(self, path: Path) -> Dict[str, Any]:
+        """原生读取STL（二进制内存映射/ASCII分块），不依赖OCC"""
+        return self._mesh_result(read_stl(path), {"file": str(path), "format": ".stl", "type": "triangular_mesh"})
+
+    def _mesh_result(self, mesh: StlMesh, result: Dict[str, Any]) -> Dict[str, Any]:
+        result.update(mesh.summary())
+        self.data = mesh
+        if self.weld:
+            indexed = IndexedMesh.from_triangles(mesh.triangles, self.weld_tolerance)
+            result["vertices"] = indexed.num_vertices
+            result["topology"] = indexed.topology_summary()
+            self.data = indexed
+        return result
+
+    def _parse_step(self, path: Path, ext: str) -> Dict[str, Any]:
+        """流式扫描STEP的HEADER/DATA段；仅在需要几何属性时才通过OCC加载B-rep"""
+        metadata = StepScanner(self.block_size).scan(path)
+        result = {"file": str(path), "format": ext, "type": "brep"}
+        result.update(metadata.summary())
+        self.data = metadata
+        if self.geometry:
+            result.update(self._step_geometry(path))
+        return result
+
+    @staticmethod
+    def _step_geometry(path: Path) -> Dict[str, Any]:
+        """通过OCC加载B-rep，计算体积、表面积、包围盒与拓扑计数"""
+        try:
+            from OCC.Core.Bnd import Bnd_Box
+            from OCC.Core.BRepBndLib import brepbndlib
+            from OCC.Core.BRepGProp import brepgprop
+            from OCC.Core.GProp import GProp_GProps
+            from OCC.Core.IFSelect import IFSelect_RetDone
+            from OCC.Core.STEPControl import STEPControl_Reader
+            from OCC.Core.TopAbs import TopAbs_EDGE, TopAbs_FACE, TopAbs_SOLID, TopAbs_VERTEX
+            from OCC.Core.TopExp import topexp
+            from OCC.Core.TopTools import TopTools_IndexedMapOfShape
+        except ImportError as e:
+            raise ImportError("计算STEP几何属性需要PythonOCC: conda install -c conda-forge pythonocc-core") from e
+
+        reader = STEPControl_Reader()
+        if reader.ReadFile(str(path)) != IFSelect_RetDone:
+            raise ValueError(f"无法读取STEP文件: {path}")
+        reader.TransferRoots()
+        shape = reader.OneShape()
+
+        def count(kind) -> int:
+            shapes = TopTools_IndexedMapOfShape()
+            topexp.MapShapes(shape, kind, shapes)
+            return shapes.Size()
+
+        volume_props = GProp_GProps()
+        brepgprop.VolumeProperties(shape, volume_props)
+        surface_props = GProp_GProps()
+        brepgprop.SurfaceProperties(shape, surface_props)
+        box = Bnd_Box()
+        brepbndlib.Add(shape, box)
+        xmin, ymin, zmin, xmax, ymax, zmax = box.Get()
+        return {
+            "solids": count(TopAbs_SOLID),
+            "faces": count(TopAbs_FACE),
+            "edges": count(TopAbs_EDGE),
+            "vertices": count(TopAbs_VERTEX),
+            "volume": volume_props.Mass(),
+            "surface_area": surface_props.Mass(),
+            "bounds": {"x": [xmin, xmax], "y": [ymin, ymax], "z": [zmin, zmax]},
+        }
+
     def save(self, data: Dict[str, Any], output_path: str):
         """保存解析结果"""
         with open(output_path, "w", encoding="utf-8") as f:
@@ -59,19 +168,13 @@ class STLParser(GeometryParser):
     """STL文件专用解析器"""
 
     def parse(self, file_path: str, **kwargs) -> Dict[str, Any]:
-        """解析STL文件"""
-        # TODO: 实现STL解析
-        result = super().parse(file_path, file_format="stl")
-        result["type"] = "triangular_mesh"
-        return result
+        """解析STL文件（二进制/ASCII），返回顶点/面数、包围盒、表面积与体积"""
+        return super().parse(file_path, file_format="stl")
 
 
 class STEPParser(GeometryParser):
     """STEP文件专用解析器"""
 
     def parse(self, file_path: str, **kwargs) -> Dict[str, Any]:
-        """解析STEP文件"""
-        # TODO: 集成OCC或FreeCAD
-        result = super().parse(file_path, file_format="step")
-        result["type"] = "brep"
-        return result
+        """解析STEP文件：流式扫描得到零件名称、单位、实体直方图与装配结构（``geometry=True`` 时附带OCC几何属性）"""
+        return super().parse(file_path, file_format="step")
@@ -0,0 +1,796 @@
+"""
+三角网格空间索引（均匀体素网格）
+
+三角形按包围盒登记到其覆盖的体素中；只保存被占用的体素（排序的体素键 + 三角形
+列表，CSR形式），内存与表面积成正比而不是与包围盒体积成正比。
+
+体素边长按整个零件的平均三角形尺寸选择，局部加密的区域或细长三角形会使单个体素登记
+成百上千个三角形，而细长三角形无论体素多细都会同时穿过大量体素。登记三角形超过
+:data:`MAX_CELL_TRIANGLES` 的拥挤体素不再逐对求交，其三角形另建一棵包围盒层次树
+（:class:`TriangleBVH`，中位数划分），查询落入拥挤体素时改由 BVH 按层批量下降。
+
+查询均按批向量化：
+
+- :meth:`TriangleGrid.ray_cast`：所有射线同步做3D-DDA体素遍历，每一步分批对当前体素中的
+  (射线, 三角形) 对做 Möller–Trumbore 求交，在体素内命中即结束
+- :meth:`TriangleGrid.nearest`：从查询点所在体素逐层向外扩展，找到的最近距离不超过
+  未搜索区域的下界时结束
+- :meth:`TriangleGrid.min_distance`：点集到表面的全局最近距离，在被占用体素的层级上由粗到细
+  剪枝（间隙检查）
+- :meth:`TriangleGrid.segments_intersect`：线段与网格是否相交（干涉检查）
+"""
+
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import numpy as np
+
+# 体素边长相对平均三角形尺寸的倍数
+DEFAULT_CELL_FACTOR = 2.0
+
+# 体素-三角形引用总数上限（超过时体素边长加倍重建），相对三角形数
+MAX_REFS_PER_TRIANGLE = 16
+
+# 最近点查询每批 (点, 体素) 对的数量上限
+NEAREST_BATCH_PAIRS = 1 << 21
+
+# 每批 (射线/点, 三角形) 对的数量上限
+TRIANGLE_BATCH_PAIRS = 1 << 20
+
+# 单个体素登记的三角形数超过该值时，该体素的查询改由 BVH 处理
+MAX_CELL_TRIANGLES = 64
+
+# BVH 叶节点的三角形数
+BVH_LEAF_SIZE = 8
+
+# BVH 每批同时下降的查询数
+BVH_BATCH_QUERIES = 1 << 14
+
+_EPS = 1e-12
+
+# 体素拆分为 2×2×2 个子体素的坐标偏移
+_CHILD_OFFSETS = np.stack(np.meshgrid([0, 1], [0, 1], [0, 1], indexing="ij"), axis=-1).reshape(-1, 3)
+
+
+@lru_cache(maxsize=64)
+def _shell_offsets(k: int) -> np.ndarray:
+    """切比雪夫距离恰为 k 的体素偏移 [S, 3]"""
+    if k == 0:
+        return np.zeros((1, 3), dtype=np.int64)
+    r = np.arange(-k, k + 1)
+    grid = np.stack(np.meshgrid(r, r, r, indexing="ij"), axis=-1).reshape(-1, 3)
+    return grid[np.abs(grid).max(axis=1) == k]
+
+
+def _expand(owners: np.ndarray, starts: np.ndarray, stops: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """将每个 owner 的 [start, stop) 区间展开为 (owner, 位置) 对"""
+    counts = stops - starts
+    total = int(counts.sum())
+    if total == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty
+    owner = np.repeat(owners, counts)
+    base = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+    return owner, base + np.arange(total)
+
+
+def _grid_key(cells: np.ndarray, dims: np.ndarray) -> np.ndarray:
+    """体素坐标 [m, 3] -> 线性键"""
+    return (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+
+
+def _dot(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return np.einsum("ij,ij->i", a, b)
+
+
+def _intersect(
+    origins: np.ndarray, directions: np.ndarray, v0: np.ndarray, e1: np.ndarray, e2: np.ndarray
+) -> np.ndarray:
+    """逐对 Möller–Trumbore 求交，返回参数 t（未相交为 inf）"""
+    p = np.cross(directions, e2)
+    det = _dot(e1, p)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        inv = 1.0 / det
+        s = origins - v0
+        u = _dot(s, p) * inv
+        q = np.cross(s, e1)
+        v = _dot(directions, q) * inv
+        t = _dot(e2, q) * inv
+        hit = (np.abs(det) > _EPS) & (u >= 0) & (v >= 0) & (u + v <= 1)
+    return np.where(hit, t, np.inf)
+
+
+def _slab(origins: np.ndarray, inv: np.ndarray, lower: np.ndarray, upper: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """射线与轴对齐包围盒的进入/离开参数（逐对；平行于某轴时按起点是否在板块内判定）"""
+    with np.errstate(invalid="ignore"):
+        t1 = (lower - origins) * inv
+        t2 = (upper - origins) * inv
+    parallel = np.isinf(inv)
+    inside = (origins >= lower) & (origins <= upper)
+    t_near = np.where(parallel, np.where(inside, -np.inf, np.inf), np.minimum(t1, t2)).max(axis=1)
+    t_far = np.where(parallel, np.where(inside, np.inf, -np.inf), np.maximum(t1, t2)).min(axis=1)
+    return t_near, t_far
+
+
+def _first_per_owner(owner: np.ndarray, value: np.ndarray) -> np.ndarray:
+    """每个 owner 中 value 最小的一项的位置"""
+    order = np.lexsort((value, owner))
+    return order[np.diff(owner[order], prepend=-1) != 0]
+
+
+def _median_split_order(centroids: np.ndarray) -> np.ndarray:
+    """自顶向下中位数划分的三角形顺序
+
+    第 d 层把每段 ``BVH_LEAF_SIZE × 2^(D-d)`` 个三角形按段内重心范围最大的轴排序，
+    前后两半即两个子节点；所有段在同一层一次排序完成。
+    """
+    n = len(centroids)
+    depth = int(np.ceil(np.log2(max(-(-n // BVH_LEAF_SIZE), 1))))
+    order = np.arange(n)
+    index = np.arange(n)
+    for d in range(depth):
+        size = BVH_LEAF_SIZE << (depth - d)
+        segment = index // size
+        points = centroids[order]
+        starts = np.arange(0, n, size)
+        extent = np.maximum.reduceat(points, starts, axis=0) - np.minimum.reduceat(points, starts, axis=0)
+        key = points[index, np.argmax(extent, axis=1)[segment]]
+        order = order[np.lexsort((key, segment))]
+    return order
+
+
+def closest_point_on_triangles(points: np.ndarray, a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+    """点到三角形的最近点（逐对，向量化的 Voronoi 区域判定）"""
+    ab = b - a
+    ac = c - a
+    ap = points - a
+    bp = points - b
+    cp = points - c
+    d1, d2 = _dot(ab, ap), _dot(ac, ap)
+    d3, d4 = _dot(ab, bp), _dot(ac, bp)
+    d5, d6 = _dot(ab, cp), _dot(ac, cp)
+    va = d3 * d6 - d5 * d4
+    vb = d5 * d2 - d1 * d6
+    vc = d1 * d4 - d3 * d2
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_ab = d1 / (d1 - d3)
+        t_ac = d2 / (d2 - d6)
+        t_bc = (d4 - d3) / ((d4 - d3) + (d5 - d6))
+        denom = 1.0 / (va + vb + vc)
+        conditions = [
+            (d1 <= 0) & (d2 <= 0),  # 顶点 a
+            (d3 >= 0) & (d4 <= d3),  # 顶点 b
+            (vc <= 0) & (d1 >= 0) & (d3 <= 0),  # 边 ab
+            (d6 >= 0) & (d5 <= d6),  # 顶点 c
+            (vb <= 0) & (d2 >= 0) & (d6 <= 0),  # 边 ac
+            (va <= 0) & (d4 - d3 >= 0) & (d5 - d6 >= 0),  # 边 bc
+        ]
+        v = np.select(conditions, [0.0, 1.0, t_ab, 0.0, 0.0, 1.0 - t_bc], vb * denom)
+        w = np.select(conditions, [0.0, 0.0, 0.0, 1.0, t_ac, t_bc], vc * denom)
+    # 退化三角形取顶点 a
+    v = np.nan_to_num(v, nan=0.0, posinf=0.0, neginf=0.0)
+    w = np.nan_to_num(w, nan=0.0, posinf=0.0, neginf=0.0)
+    return a + ab * v[:, None] + ac * w[:, None]
+
+
+class TriangleBVH:
+    """三角形包围盒层次树（BVH）
+
+    三角形按自顶向下的中位数划分排序，每 :data:`BVH_LEAF_SIZE` 个组成叶节点，逐层两两合并到根，
+    树形由数组下标隐含（第 d 层节点 i 的子节点为第 d+1 层的 2i 与 2i+1）。查询按层批量下降：
+    所有 (查询, 节点) 对同时做包围盒测试，剪枝后展开到下一层，叶节点处再分批逐对计算。
+    与体素不同，细长三角形只占用一个叶节点，包围盒随树层级自适应收紧。
+
+    Args:
+        triangles: [n, 3, 3] 三角形顶点坐标
+    """
+
+    def __init__(self, triangles: np.ndarray):
+        tri = np.asarray(triangles, dtype=np.float64).reshape(-1, 3, 3)
+        self.num_triangles = len(tri)
+        self.order = _median_split_order(tri.mean(axis=1))
+        tri = tri[self.order]
+        self.v0 = tri[:, 0]
+        self.e1 = tri[:, 1] - tri[:, 0]
+        self.e2 = tri[:, 2] - tri[:, 0]
+
+        self.levels = []
+        if not len(tri):
+            return
+        leaf_starts = np.arange(0, len(tri), BVH_LEAF_SIZE)
+        lower = np.minimum.reduceat(tri.min(axis=1), leaf_starts, axis=0)
+        upper = np.maximum.reduceat(tri.max(axis=1), leaf_starts, axis=0)
+        # 包围盒略微外扩，避免平面三角形的零厚度包围盒在边界上漏判
+        pad = 1e-9 * float(np.linalg.norm(upper.max(axis=0) - lower.min(axis=0))) + _EPS
+        levels = [(lower - pad, upper + pad)]
+        while len(levels[-1][0]) > 1:
+            lower, upper = levels[-1]
+            if len(lower) % 2:
+                lower, upper = np.vstack([lower, lower[-1:]]), np.vstack([upper, upper[-1:]])
+            levels.append((np.minimum(lower[0::2], lower[1::2]), np.maximum(upper[0::2], upper[1::2])))
+        self.levels = levels[::-1]
+
+    def _descend(self, queries: np.ndarray, test, prune, evaluate) -> None:
+        """从根节点按层下降，再按优先级分轮计算叶节点
+
+        ``test(查询, 下界, 上界)`` 返回 (保留, 优先级)，``evaluate(查询, 三角形位置)`` 计算叶节点
+        并收紧 ``test`` 与 ``prune`` 使用的上界。细长三角形的包围盒很难给出有效的上界，因此先让
+        每个查询沿优先级最高的子节点单路下降到一个叶节点并计算，再做完整下降；叶节点按每个
+        查询的优先级排名，第 r 轮计算排名在 [2^(r-1), 2^r) 的叶节点，之后由 ``prune(查询, 叶节点)``
+        剪掉已不可能更优的剩余叶节点。
+        """
+        self._probe(queries, test, evaluate)
+        node = np.zeros(len(queries), dtype=np.int64)
+        for depth, (lower, upper) in enumerate(self.levels):
+            inside, priority = test(queries, lower[node], upper[node])
+            queries, node, priority = queries[inside], node[inside], priority[inside]
+            if depth + 1 < len(self.levels):
+                queries, node = self._children(depth, queries, node)
+
+        order = np.argsort(priority)
+        order = order[np.argsort(queries[order], kind="stable")]
+        queries, node = queries[order], node[order]
+        first = np.diff(queries, prepend=-1) != 0
+        rank = np.arange(len(queries)) - np.maximum.accumulate(np.where(first, np.arange(len(queries)), 0))
+        width = 1
+        while queries.size:
+            now = rank < width
+            starts = node[now] * BVH_LEAF_SIZE
+            owner, pos = _expand(queries[now], starts, np.minimum(starts + BVH_LEAF_SIZE, self.num_triangles))
+            for lo in range(0, len(owner), TRIANGLE_BATCH_PAIRS):
+                evaluate(owner[lo : lo + TRIANGLE_BATCH_PAIRS], pos[lo : lo + TRIANGLE_BATCH_PAIRS])
+            queries, node, rank = queries[~now], node[~now], rank[~now]
+            if queries.size:
+                lower, upper = self.levels[-1]
+                keep = prune(queries, lower[node], upper[node])
+                queries, node, rank = queries[keep], node[keep], rank[keep]
+            width *= 2
+
+    def _children(self, depth: int, queries: np.ndarray, node: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(查询, 第 depth 层节点) 对展开为 (查询, 子节点) 对"""
+        queries = np.repeat(queries, 2)
+        node = (2 * node[:, None] + np.array([0, 1])).ravel()
+        valid = node < len(self.levels[depth + 1][0])
+        return queries[valid], node[valid]
+
+    def _probe(self, queries: np.ndarray, test, evaluate) -> None:
+        """每个查询沿优先级最高（值最小）的子节点单路下降，计算到达的叶节点"""
+        node = np.zeros(len(queries), dtype=np.int64)
+        for depth, (lower, upper) in enumerate(self.levels):
+            inside, priority = test(queries, lower[node], upper[node])
+            queries, node, priority = queries[inside], node[inside], priority[inside]
+            first = _first_per_owner(queries, priority)
+            queries, node = queries[first], node[first]
+            if depth + 1 < len(self.levels):
+                queries, node = self._children(depth, queries, node)
+        starts = node * BVH_LEAF_SIZE
+        owner, pos = _expand(queries, starts, np.minimum(starts + BVH_LEAF_SIZE, self.num_triangles))
+        evaluate(owner, pos)
+
+    def ray_cast(
+        self,
+        origins: np.ndarray,
+        directions: np.ndarray,
+        min_distance: np.ndarray,
+        max_distance: np.ndarray,
+        ignore: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """批量射线在 [min_distance, max_distance] 区间内的第一个交点
+
+        Args:
+            origins: [m, 3] 射线起点
+            directions: [m, 3] 单位方向
+            min_distance, max_distance: [m] 参数区间
+            ignore: [m] 每条射线忽略的三角形索引，-1 表示不忽略
+
+        Returns:
+            (distance[m], triangle[m])，未命中为 (inf, -1)
+        """
+        m = len(origins)
+        distance = np.full(m, np.inf)
+        triangle = np.full(m, -1, dtype=np.int64)
+        if not m or not self.num_triangles:
+            return distance, triangle
+        with np.errstate(divide="ignore"):
+            inv = 1.0 / directions
+        # 已找到的交点之后的节点无需检查
+        bound = np.array(max_distance, dtype=np.float64)
+
+        def test(q, lower, upper):
+            t_near, t_far = _slab(origins[q], inv[q], lower, upper)
+            return (t_near <= t_far) & (t_far >= min_distance[q]) & (t_near <= bound[q]), t_near
+
+        def prune(q, lower, upper):
+            return _slab(origins[q], inv[q], lower, upper)[0] <= bound[q]
+
+        def evaluate(q, p):
+            t = _intersect(origins[q], directions[q], self.v0[p], self.e1[p], self.e2[p])
+            ok = (t >= min_distance[q]) & (t <= bound[q]) & (t < distance[q])
+            if ignore is not None:
+                ok &= self.order[p] != ignore[q]
+            q, p, t = q[ok], p[ok], t[ok]
+            if q.size:
+                first = _first_per_owner(q, t)
+                distance[q[first]] = t[first]
+                triangle[q[first]] = self.order[p[first]]
+                bound[q[first]] = t[first]
+
+        for begin in range(0, m, BVH_BATCH_QUERIES):
+            self._descend(np.arange(begin, min(begin + BVH_BATCH_QUERIES, m)), test, prune, evaluate)
+        return distance, triangle
+
+    def nearest(self, points: np.ndarray, max_distance: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """批量最近点查询
+
+        下降时每个查询点保留一个距离上界：节点包围盒内至少有一个三角形，其距离不超过
+        包围盒最远角点的距离；包围盒最近距离超过上界的节点被剪枝。
+
+        Args:
+            points: [m, 3] 查询点
+            max_distance: [m] 搜索半径
+
+        Returns:
+            (distance[m], closest[m, 3], triangle[m])，未找到为 (inf, nan, -1)
+        """
+        m = len(points)
+        best = np.full(m, np.inf)
+        closest = np.full((m, 3), np.nan)
+        triangle = np.full(m, -1, dtype=np.int64)
+        if not m or not self.num_triangles:
+            return best, closest, triangle
+        max_distance = np.broadcast_to(np.asarray(max_distance, dtype=np.float64), (m,))
+        # 距离平方的上界（略微放宽，避免舍入误差剪掉恰好位于上界处的三角形）
+        bound = np.square(max_distance) * (1 + 1e-9) + _EPS
+
+        def test(q, lower, upper):
+            p = points[q]
+            gap = p - np.clip(p, lower, upper)
+            far = np.maximum(np.abs(p - lower), np.abs(p - upper))
+            np.minimum.at(bound, q, _dot(far, far) * (1 + 1e-9) + _EPS)
+            # 包围盒较大时很多节点到查询点的距离都为 0，按到包围盒中心的距离选择
+            center = p - 0.5 * (lower + upper)
+            return _dot(gap, gap) <= bound[q], _dot(center, center)
+
+        def prune(q, lower, upper):
+            gap = points[q] - np.clip(points[q], lower, upper)
+            return _dot(gap, gap) <= bound[q]
+
+        def evaluate(q, p):
+            v0 = self.v0[p]
+            c = closest_point_on_triangles(points[q], v0, v0 + self.e1[p], v0 + self.e2[p])
+            d = np.linalg.norm(c - points[q], axis=1)
+            ok = (d * d <= bound[q]) & (d < best[q])
+            q, p, c, d = q[ok], p[ok], c[ok], d[ok]
+            if q.size:
+                first = _first_per_owner(q, d)
+                best[q[first]] = d[first]
+                closest[q[first]] = c[first]
+                triangle[q[first]] = self.order[p[first]]
+                bound[q[first]] = np.minimum(bound[q[first]], d[first] ** 2 * (1 + 1e-9) + _EPS)
+
+        for begin in range(0, m, BVH_BATCH_QUERIES):
+            self._descend(np.arange(begin, min(begin + BVH_BATCH_QUERIES, m)), test, prune, evaluate)
+
+        missing = best > max_distance
+        best[missing] = np.inf
+        closest[missing] = np.nan
+        triangle[missing] = -1
+        return best, closest, triangle
+
+
+class TriangleGrid:
+    """三角形均匀体素网格
+
+    Args:
+        triangles: [n, 3, 3] 三角形顶点坐标
+        cell_size: 体素边长（None 按平均三角形尺寸 × :data:`DEFAULT_CELL_FACTOR` 选择）
+    """
+
+    def __init__(self, triangles: np.ndarray, cell_size: Optional[float] = None):
+        tri = np.ascontiguousarray(triangles, dtype=np.float64).reshape(-1, 3, 3)
+        self.num_triangles = len(tri)
+        self.v0 = tri[:, 0]
+        self.e1 = tri[:, 1] - tri[:, 0]
+        self.e2 = tri[:, 2] - tri[:, 0]
+
+        columns = tri.reshape(-1, 3).T
+        self.lower = columns.min(axis=1) if self.num_triangles else np.zeros(3)
+        upper = columns.max(axis=1) if self.num_triangles else np.zeros(3)
+        diagonal = float(np.linalg.norm(upper - self.lower))
+
+        if cell_size is None:
+            area = 0.5 * np.linalg.norm(np.cross(self.e1, self.e2), axis=1).sum()
+            typical = np.sqrt(2.0 * area / max(self.num_triangles, 1))
+            cell_size = DEFAULT_CELL_FACTOR * typical
+        if not cell_size > 0:
+            cell_size = diagonal / 64 if diagonal > 0 else 1.0
+        # 体素数过多时限制每轴分辨率
+        cell_size = max(cell_size, diagonal / 4096)
+
+        tmin = tri.min(axis=1)
+        tmax = tri.max(axis=1)
+        while True:
+            self.cell_size = float(cell_size)
+            self.dims = np.floor((upper - self.lower) / self.cell_size).astype(np.int64) + 1
+            lo = self._cell_of(tmin)
+            span = self._cell_of(tmax) - lo + 1
+            counts = span.prod(axis=1)
+            if counts.sum() <= MAX_REFS_PER_TRIANGLE * self.num_triangles + (1 << 20):
+                break
+            cell_size *= 2.0
+
+        # 展开每个三角形包围盒覆盖的体素
+        owner, local = _expand(np.arange(self.num_triangles), np.zeros_like(counts), counts)
+        span_o = span[owner]
+        plane = span_o[:, 1] * span_o[:, 2]
+        offsets = np.column_stack([local // plane, (local % plane) // span_o[:, 2], local % span_o[:, 2]])
+        keys = self._key(lo[owner] + offsets)
+
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        new_cell = np.empty(len(keys), dtype=bool)
+        new_cell[:1] = True
+        np.not_equal(sorted_keys[1:], sorted_keys[:-1], out=new_cell[1:])
+        starts = np.flatnonzero(new_cell)
+        self.cell_keys = sorted_keys[starts]
+        self.cell_offsets = np.append(starts, len(keys))
+        self.cell_triangles = owner[order].astype(np.int32)
+        self._levels = {}
+
+        # 拥挤体素中的三角形另建 BVH；_bvh_local 将三角形索引映射到 BVH 内的索引
+        self.bvh: Optional[TriangleBVH] = None
+        self._bvh_triangles = np.zeros(0, dtype=np.int64)
+        crowded = np.flatnonzero(np.diff(self.cell_offsets) > MAX_CELL_TRIANGLES)
+        if crowded.size:
+            _, pos = _expand(crowded, self.cell_offsets[crowded], self.cell_offsets[crowded + 1])
+            self._bvh_triangles = np.unique(self.cell_triangles[pos]).astype(np.int64)
+            self._bvh_local = np.full(self.num_triangles, -1, dtype=np.int64)
+            self._bvh_local[self._bvh_triangles] = np.arange(len(self._bvh_triangles))
+            self.bvh = TriangleBVH(tri[self._bvh_triangles])
+
+    # ------------------------------------------------------------------
+    # 体素工具
+
+    @property
+    def num_cells(self) -> int:
+        """被占用的体素数"""
+        return len(self.cell_keys)
+
+    @property
+    def upper(self) -> np.ndarray:
+        return self.lower + self.dims * self.cell_size
+
+    def _cell_of(self, points: np.ndarray) -> np.ndarray:
+        cells = np.floor((points - self.lower) / self.cell_size).astype(np.int64)
+        return np.clip(cells, 0, self.dims - 1)
+
+    def _key(self, cells: np.ndarray) -> np.ndarray:
+        return _grid_key(cells, self.dims)
+
+    def _cell_ranges(self, keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """体素键 -> 三角形列表区间 [start, stop)（空体素为空区间）"""
+        if len(self.cell_keys) == 0:
+            zeros = np.zeros(len(keys), dtype=np.int64)
+            return zeros, zeros
+        idx = np.minimum(np.searchsorted(self.cell_keys, keys), len(self.cell_keys) - 1)
+        found = self.cell_keys[idx] == keys
+        starts = np.where(found, self.cell_offsets[idx], 0)
+        stops = np.where(found, self.cell_offsets[idx + 1], 0)
+        return starts, stops
+
+    def _intersect(self, origins: np.ndarray, directions: np.ndarray, tris: np.ndarray) -> np.ndarray:
+        """逐对 Möller–Trumbore 求交，返回参数 t（未相交为 inf）"""
+        return _intersect(origins, directions, self.v0[tris], self.e1[tris], self.e2[tris])
+
+    def _crowded(self, starts: np.ndarray, stops: np.ndarray) -> np.ndarray:
+        """由 BVH 处理的体素（三角形列表区间）"""
+        if self.bvh is None:
+            return np.zeros(len(starts), dtype=bool)
+        return stops - starts > MAX_CELL_TRIANGLES
+
+    # ------------------------------------------------------------------
+    # 查询
+
+    def ray_cast(
+        self,
+        origins: np.ndarray,
+        directions: np.ndarray,
+        max_distance=np.inf,
+        min_distance=0.0,
+        ignore: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """批量射线求交（第一个交点）
+
+        Args:
+            origins: [m, 3] 射线起点
+            directions: [m, 3] 射线方向（内部归一化，返回的距离为实际长度）
+            max_distance: 最大距离（标量或 [m]）
+            min_distance: 忽略距离小于该值的交点（标量或 [m]）
+            ignore: [m] 每条射线忽略的三角形索引（如起点所在面），-1 表示不忽略
+
+        Returns:
+            (distance[m], triangle[m])，未命中为 (inf, -1)
+        """
+        origins = np.asarray(origins, dtype=np.float64).reshape(-1, 3)
+        directions = np.asarray(directions, dtype=np.float64).reshape(-1, 3)
+        m = len(origins)
+        distance = np.full(m, np.inf)
+        triangle = np.full(m, -1, dtype=np.int64)
+        if m == 0 or self.num_triangles == 0:
+            return distance, triangle
+
+        length = np.linalg.norm(directions, axis=1)
+        directions = directions / np.where(length > 0, length, 1.0)[:, None]
+        t_limit = np.broadcast_to(np.asarray(max_distance, dtype=np.float64), (m,)).copy()
+        t_min = np.broadcast_to(np.asarray(min_distance, dtype=np.float64), (m,))
+        if ignore is not None:
+            ignore = np.broadcast_to(np.asarray(ignore, dtype=np.int64), (m,))
+
+        # 与网格包围盒的板块求交
+        with np.errstate(divide="ignore"):
+            inv = 1.0 / directions
+        parallel = directions == 0
+        t_near, t_far = _slab(origins, inv, self.lower, self.upper)
+        t_start = np.maximum(t_near, 0.0)
+        t_end = np.minimum(t_far, t_limit)
+        active = (t_start <= t_end) & (length > 0)
+
+        # 3D-DDA 初始状态
+        step = np.sign(directions).astype(np.int64)
+        cell = self._cell_of(origins + directions * np.where(np.isfinite(t_start), t_start, 0.0)[:, None])
+        boundary = self.lower + (cell + (step > 0)) * self.cell_size
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t_max = np.where(parallel, np.inf, (boundary - origins) * inv)
+            t_delta = np.where(parallel, np.inf, self.cell_size * np.abs(inv))
+
+        ids = np.flatnonzero(active)
+        t_enter = t_start.copy()
+        while ids.size:
+            starts, stops = self._cell_ranges(self._key(cell[ids]))
+            cell_exit = np.minimum(t_max[ids].min(axis=1), t_end[ids]) * (1 + 1e-12) + _EPS
+            best = np.full(len(ids), np.inf)
+            winner = np.full(len(ids), -1, dtype=np.int64)
+
+            crowded = np.flatnonzero(self._crowded(starts, stops))
+            if crowded.size:
+                # 拥挤体素：在 BVH 中求射线位于该体素内的一段上的首个交点
+                rays = ids[crowded]
+                lower = np.maximum(t_min[rays], t_enter[rays] * (1 - 1e-12) - _EPS)
+                local = None
+                if ignore is not None:
+                    local = np.where(ignore[rays] >= 0, self._bvh_local[np.maximum(ignore[rays], 0)], -1)
+                t, hit = self.bvh.ray_cast(origins[rays], directions[rays], lower, cell_exit[crowded], local)
+                best[crowded] = t
+                winner[crowded] = np.where(hit >= 0, self._bvh_triangles[np.maximum(hit, 0)], -1)
+                stops[crowded] = starts[crowded]
+
+            # 其余体素：分批展开 (射线, 三角形) 对，每条射线的三角形在同一批中
+            counts = stops - starts
+            chunk = np.cumsum(counts) // TRIANGLE_BATCH_PAIRS
+            for c in np.unique(chunk[counts > 0]):
+                sel = np.flatnonzero((chunk == c) & (counts > 0))
+                owner, pos = _expand(sel, starts[sel], stops[sel])
+                tris = self.cell_triangles[pos]
+                rays = ids[owner]
+                t = self._intersect(origins[rays], directions[rays], tris)
+                ok = (t >= t_min[rays]) & (t <= cell_exit[owner])
+                if ignore is not None:
+                    ok &= tris != ignore[rays]
+                if ok.any():
+                    np.minimum.at(best, owner[ok], t[ok])
+                    hit = ok & (t == best[owner])
+                    winner[owner[hit]] = tris[hit]
+
+            found = np.isfinite(best)
+            distance[ids[found]] = best[found]
+            triangle[ids[found]] = winner[found]
+
+            # 未命中的射线前进到下一个体素
+            ids = ids[~found]
+            if not ids.size:
+                break
+            axis = np.argmin(t_max[ids], axis=1)
+            t_next = t_max[ids, axis]
+            cell[ids, axis] += step[ids, axis]
+            t_max[ids, axis] += t_delta[ids, axis]
+            t_enter[ids] = t_next
+            in_grid = np.all((cell[ids] >= 0) & (cell[ids] < self.dims), axis=1)
+            ids = ids[in_grid & (t_next <= t_end[ids])]
+
+        return distance, triangle
+
+    def nearest(self, points: np.ndarray, max_distance: float = np.inf) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """批量最近点查询
+
+        Args:
+            points: [m, 3] 查询点
+            max_distance: 搜索半径，超出时视为未找到
+
+        Returns:
+            (distance[m], closest[m, 3], triangle[m])，未找到为 (inf, nan, -1)
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        m = len(points)
+        best = np.full(m, np.inf)
+        closest = np.full((m, 3), np.nan)
+        triangle = np.full(m, -1, dtype=np.int64)
+        if m == 0 or self.num_triangles == 0:
+            return best, closest, triangle
+
+        home = self._cell_of(points)
+        ids = np.arange(m)
+        # 已在 BVH 中查询过的点
+        searched = np.zeros(m, dtype=bool)
+        k = 0
+        while ids.size and k <= int(self.dims.max()):
+            offsets = _shell_offsets(k)
+            batch = max(1, NEAREST_BATCH_PAIRS // len(offsets))
+            for begin in range(0, len(ids), batch):
+                batch_ids = ids[begin : begin + batch]
+                self._search_shell(points, home, batch_ids, offsets, max_distance, best, closest, triangle, searched)
+
+            # 已搜索区域 [home-k, home+k] 之外的三角形距离下界（网格边界外无三角形）
+            lo_cell = home[ids] - k
+            hi_cell = home[ids] + k
+            p = points[ids]
+            gap_lo = np.where(lo_cell > 0, p - (self.lower + lo_cell * self.cell_size), np.inf)
+            gap_hi = np.where(hi_cell < self.dims - 1, self.lower + (hi_cell + 1) * self.cell_size - p, np.inf)
+            bound = np.maximum(np.minimum(gap_lo, gap_hi).min(axis=1), 0.0)
+            done = (best[ids] <= bound) | (bound >= max_distance)
+            ids = ids[~done]
+            k += 1
+
+        missing = best > max_distance
+        best[missing] = np.inf
+        closest[missing] = np.nan
+        triangle[missing] = -1
+        return best, closest, triangle
+
+    def min_distance(
+        self, points: np.ndarray, max_distance: float = np.inf, probes: int = 32
+    ) -> Tuple[float, int, np.ndarray]:
+        """点集到三角形表面的全局最近距离
+
+        只求全局最小值时逐点扩展体素壳层的代价与 (距离/体素边长)³ 成正比。这里在被占用体素
+        按 2 倍合并的层级上由粗到细下降：只保留与点的距离不超过当前最优距离的 (点, 被占用体素)
+        候选对，再拆分为下一级的 8 个子体素；每级精确查询下界最小的 ``probes`` 个点收紧最优距离，
+        最细一级只对剩余候选对中的三角形做精确计算。
+
+        Args:
+            points: [m, 3] 查询点
+            max_distance: 搜索半径，超出时视为未找到
+            probes: 每级精确查询的点数
+
+        Returns:
+            (距离, 点索引, 表面最近点[3])，未找到为 (inf, -1, nan)
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        best = [np.inf, -1, np.full(3, np.nan)]
+        if not len(points) or not self.num_cells:
+            return tuple(best)
+        limit = float(max_distance)
+        probed = np.zeros(len(points), dtype=bool)
+
+        def update(ids: np.ndarray, distance: np.ndarray, closest: np.ndarray) -> float:
+            if len(distance):
+                i = int(np.argmin(distance))
+                if distance[i] < best[0]:
+                    best[:] = [float(distance[i]), int(ids[i]), closest[i]]
+            return min(limit, best[0])
+
+        factor = 1 << int(np.ceil(np.log2(self.dims.max())))
+        owner = np.arange(len(points))
+        cells = np.zeros((len(points), 3), dtype=np.int64)
+        while True:
+            # 被占用且与点的距离不超过当前最优距离的体素
+            dims = (self.dims - 1) // factor + 1
+            size = factor * self.cell_size
+            inside = np.all(cells < dims, axis=1)
+            owner, cells = owner[inside], cells[inside]
+            occupied = self._occupied(factor)
+            keys = _grid_key(cells, dims)
+            found = occupied[np.minimum(np.searchsorted(occupied, keys), len(occupied) - 1)] == keys
+            box_lo = self.lower + cells * size
+            gap = np.maximum(np.maximum(box_lo - points[owner], points[owner] - box_lo - size), 0.0)
+            gap = np.sqrt(np.einsum("ij,ij->i", gap, gap))
+            keep = found & (gap <= limit)
+            owner, cells, gap = owner[keep], cells[keep], gap[keep]
+            if not owner.size:
+                break
+
+            # 精确查询下界最小的点（其候选对随之移除）
+            lower = np.full(len(points), np.inf)
+            np.minimum.at(lower, owner, gap)
+            ids = np.argsort(lower)[:probes]
+            ids = ids[np.isfinite(lower[ids])]
+            probed[ids] = True
+            distance, closest, _ = self.nearest(points[ids], max_distance=limit)
+            limit = update(ids, distance, closest)
+            keep = ~probed[owner] & (gap <= limit)
+            owner, cells = owner[keep], cells[keep]
+            if factor == 1 or not owner.size:
+                break
+            owner = np.repeat(owner, 8)
+            cells = (2 * cells[:, None, :] + _CHILD_OFFSETS).reshape(-1, 3)
+            factor //= 2
+
+        if factor == 1 and owner.size:
+            # 最细一级：分批计算剩余候选对中的三角形
+            starts, stops = self._cell_ranges(self._key(cells))
+            chunk = np.cumsum(stops - starts) // NEAREST_BATCH_PAIRS
+            for c in np.unique(chunk):
+                sel = chunk == c
+                pair_owner, pos = _expand(owner[sel], starts[sel], stops[sel])
+                tris = self.cell_triangles[pos]
+                v0 = self.v0[tris]
+                q = closest_point_on_triangles(points[pair_owner], v0, v0 + self.e1[tris], v0 + self.e2[tris])
+                distance = np.linalg.norm(q - points[pair_owner], axis=1)
+                limit = update(pair_owner, distance, q)
+
+        if best[0] > max_distance:
+            return np.inf, -1, np.full(3, np.nan)
+        return tuple(best)
+
+    def _occupied(self, factor: int) -> np.ndarray:
+        """每 factor³ 个体素合并后被占用的粗体素键（排序）"""
+        if factor not in self._levels:
+            plane = self.dims[1] * self.dims[2]
+            keys = self.cell_keys
+            cells = np.column_stack([keys // plane, (keys // self.dims[2]) % self.dims[1], keys % self.dims[2]])
+            self._levels[factor] = np.unique(_grid_key(cells // factor, (self.dims - 1) // factor + 1))
+        return self._levels[factor]
+
+    def _search_shell(self, points, home, ids, offsets, max_distance, best, closest, triangle, searched):
+        cells = (home[ids][:, None, :] + offsets[None, :, :]).reshape(-1, 3)
+        owner = np.repeat(ids, len(offsets))
+        valid = np.all((cells >= 0) & (cells < self.dims), axis=1)
+        cells, owner = cells[valid], owner[valid]
+        # 体素包围盒到点的距离不小于当前最近距离（或搜索半径）的体素无需检查
+        box_lo = self.lower + cells * self.cell_size
+        gap = np.maximum(np.maximum(box_lo - points[owner], points[owner] - box_lo - self.cell_size), 0.0)
+        limit = np.minimum(best[owner], max_distance)
+        near = np.einsum("ij,ij->i", gap, gap) <= limit * limit
+        cells, owner = cells[near], owner[near]
+        starts, stops = self._cell_ranges(self._key(cells))
+
+        crowded = self._crowded(starts, stops)
+        pending = np.unique(owner[crowded])
+        pending = pending[~searched[pending]]
+        if pending.size:
+            # 拥挤体素中的三角形都在 BVH 中，每个点只需查询一次
+            searched[pending] = True
+            dist, q, tris = self.bvh.nearest(points[pending], np.minimum(best[pending], max_distance))
+            better = dist < best[pending]
+            pending = pending[better]
+            best[pending] = dist[better]
+            closest[pending] = q[better]
+            triangle[pending] = self._bvh_triangles[tris[better]]
+
+        nonempty = (stops > starts) & ~crowded
+        owner, starts, stops = owner[nonempty], starts[nonempty], stops[nonempty]
+        counts = stops - starts
+        chunk = np.cumsum(counts) // TRIANGLE_BATCH_PAIRS
+        for c in np.unique(chunk):
+            sel = chunk == c
+            pair_owner, pos = _expand(owner[sel], starts[sel], stops[sel])
+            tris = self.cell_triangles[pos]
+            v0 = self.v0[tris]
+            q = closest_point_on_triangles(points[pair_owner], v0, v0 + self.e1[tris], v0 + self.e2[tris])
+            dist = np.linalg.norm(q - points[pair_owner], axis=1)
+
+            # 每个点取最小距离
+            first = _first_per_owner(pair_owner, dist)
+            better = dist[first] < best[pair_owner[first]]
+            first = first[better]
+            best[pair_owner[first]] = dist[first]
+            closest[pair_owner[first]] = q[first]
+            triangle[pair_owner[first]] = tris[first]
+
+    def segments_intersect(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """[m] 线段是否与网格相交"""
+        starts = np.asarray(starts, dtype=np.float64).reshape(-1, 3)
+        vectors = np.asarray(ends, dtype=np.float64).reshape(-1, 3) - starts
+        lengths = np.linalg.norm(vectors, axis=1)
+        distance, _ = self.ray_cast(starts, vectors, max_distance=lengths)
+        return np.isfinite(distance)
@@ -0,0 +1,476 @@
+"""
+STEP（ISO-10303-21）流式扫描模块
+
+只做词法级扫描，不构建任何拓扑，也不依赖OpenCascade：
+
+- 按块读取文件，按 ``;`` 切分语句（跳过字符串中的 ``;`` 与注释）
+- HEADER 段：文件描述、文件名、作者、生成系统、Schema
+- DATA 段：实体类型直方图（复合实体按各组成类型计数，组成类型在整块上用正则统计）
+- 只解析少数实体的参数：PRODUCT、PRODUCT_DEFINITION(_FORMATION)、
+  NEXT_ASSEMBLY_USAGE_OCCURRENCE 与单位，得到零件名称、长度/角度单位与装配结构
+
+大型装配体只需要名称、单位和结构时，扫描耗时远小于OCC加载B-rep。
+"""
+
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+# 每次读取的字节数
+DEFAULT_BLOCK_SIZE = 16 * 1024 * 1024
+
+MAGIC = b"ISO-10303-21"
+
+# 实体实例开头 ";#123 = NAME(" 或 ";#123 = ("（复合实体）：只匹配紧跟在语句结尾之后的实例头
+_WS = rb"[ \t\r\n]*"
+_TYPE_RE = re.compile(rb";%s#\d+%s=%s([A-Za-z_][A-Za-z0-9_]*|\()" % (_WS, _WS, _WS))
+_KEYWORD_RE = re.compile(rb"\s*([A-Za-z_][A-Za-z0-9_\-]*)")
+# 注释（保留字符串中的 /*）
+_COMMENT_RE = re.compile(rb"('[^']*(?:''[^']*)*')|/\*.*?\*/", re.S)
+_QUOTE_OR_COMMENT_RE = re.compile(rb"'|/\*")
+_PARTIAL_RE = re.compile(r"([A-Za-z_][A-Za-z0-9_]*)\s*\(")
+
+# 需要解析参数的简单实体
+_PRODUCT_TYPES = frozenset(
+    (
+        "PRODUCT",
+        "PRODUCT_DEFINITION",
+        "PRODUCT_DEFINITION_FORMATION",
+        "PRODUCT_DEFINITION_FORMATION_WITH_SPECIFIED_SOURCE",
+        "NEXT_ASSEMBLY_USAGE_OCCURRENCE",
+        "GLOBAL_UNIT_ASSIGNED_CONTEXT",
+        "CONVERSION_BASED_UNIT",
+        "SI_UNIT",
+    )
+)
+_RECORD_KEYS = frozenset(t.encode("ascii") for t in _PRODUCT_TYPES)
+_RECORD_RE = re.compile(
+    rb";%s#(\d+)%s=%s(%s)%s\("
+    % (_WS, _WS, _WS, b"|".join(sorted((t.encode("ascii") for t in _PRODUCT_TYPES), key=len, reverse=True)), _WS)
+)
+# 复合实体的组成类型：第一个紧跟在 "=(" 之后，其余紧跟在上一个组成部分的 ")" 之后。简单实体的
+# 参数以逗号分隔，")" 后不会直接跟类型名；字符串整体匹配（组为空）以跳过其中的括号
+_FIRST_PART_RE = re.compile(rb";%s#\d+%s=%s\(%s([A-Za-z_][A-Za-z0-9_]*)%s\(" % (_WS, _WS, _WS, _WS, _WS))
+_NEXT_PART_RE = re.compile(rb"\)%s([A-Za-z_][A-Za-z0-9_]*)%s\(|'[^']*(?:''[^']*)*'" % (_WS, _WS))
+_COMPLEX_RE = re.compile(rb";%s#(\d+)%s=%s\(" % (_WS, _WS, _WS))
+_END_RE = re.compile(rb"END-ISO-10303-21%s;?%s$" % (_WS, _WS))
+
+_SI_PREFIXES = {
+    "EXA": "E",
+    "PETA": "P",
+    "TERA": "T",
+    "GIGA": "G",
+    "MEGA": "M",
+    "KILO": "k",
+    "HECTO": "h",
+    "DECA": "da",
+    "DECI": "d",
+    "CENTI": "c",
+    "MILLI": "m",
+    "MICRO": "u",
+    "NANO": "n",
+    "PICO": "p",
+    "FEMTO": "f",
+    "ATTO": "a",
+}
+_SI_NAMES = {"METRE": "m", "RADIAN": "rad", "STERADIAN": "sr", "GRAM": "g", "SECOND": "s"}
+_UNIT_KINDS = {
+    "LENGTH_UNIT": "length",
+    "PLANE_ANGLE_UNIT": "angle",
+    "SOLID_ANGLE_UNIT": "solid_angle",
+    "MASS_UNIT": "mass",
+}
+
+# 需要保留全文解析的复合实体（单位与全局单位上下文）的组成类型
+_COMPLEX_RECORD_TYPES = frozenset(
+    ["GLOBAL_UNIT_ASSIGNED_CONTEXT", "CONVERSION_BASED_UNIT", "SI_UNIT"] + list(_UNIT_KINDS)
+)
+_COMPLEX_RECORD_KEYS = frozenset(t.encode("ascii") for t in _COMPLEX_RECORD_TYPES)
+_COMPLEX_RECORD_TYPE_RE = re.compile(b"|".join(sorted(_COMPLEX_RECORD_KEYS)), re.I)
+
+_HEADER_FIELDS = {
+    "FILE_DESCRIPTION": ("description", "implementation_level"),
+    "FILE_NAME": (
+        "name",
+        "time_stamp",
+        "author",
+        "organization",
+        "preprocessor_version",
+        "originating_system",
+        "authorization",
+    ),
+    "FILE_SCHEMA": ("schema",),
+}
+
+
+class StepFormatError(ValueError):
+    """STEP文件格式错误"""
+
+
+def _statement_end(buf: bytes, start: int = 0, end: Optional[int] = None) -> int:
+    """``buf[start:end]`` 中最后一个位于字符串外的 ``;`` 的位置（无则 -1）"""
+    end = len(buf) if end is None else end
+    while True:
+        pos = buf.rfind(b";", start, end)
+        if pos < 0 or not buf.count(b"'", start, pos) & 1:
+            return pos
+        end = pos
+
+
+def _ends_in_comment(buf: bytes) -> bool:
+    """``buf`` 是否结束在未闭合的注释中（字符串中的 ``/*`` 不是注释）"""
+    pos = 0
+    while True:
+        match = _QUOTE_OR_COMMENT_RE.search(buf, pos)
+        if match is None:
+            return False
+        if match.group() == b"'":
+            # 字符串中的 '' 视为先结束再开始，不影响状态
+            end = buf.find(b"'", match.end())
+            if end < 0:
+                return False
+            pos = end + 1
+        else:
+            end = buf.find(b"*/", match.end())
+            if end < 0:
+                return True
+            pos = end + 2
+
+
+def _statement_at(buf: bytes, start: int) -> bytes:
+    """从 ``start`` 到下一个位于字符串外的 ``;``（不含）"""
+    end = buf.find(b";", start)
+    while end >= 0 and buf.count(b"'", start, end) & 1:
+        end = buf.find(b";", end + 1)
+    return buf[start : end if end >= 0 else len(buf)]
+
+
+def iter_blocks(path: Union[str, Path], block_size: int = DEFAULT_BLOCK_SIZE) -> Iterator[bytes]:
+    """按块返回文件内容，每块截断在语句结尾（字符串外的 ``;``）处，已去除注释"""
+    carry = b""
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(block_size)
+            eof = not block
+            buf = carry + block
+            if not eof and b"/*" in buf and _ends_in_comment(buf):
+                carry = buf  # 注释跨块，继续读取
+                continue
+            if b"/*" in buf:
+                buf = _COMMENT_RE.sub(lambda m: m.group(1) or b" ", buf)
+            if eof:
+                if buf.strip():
+                    yield buf
+                return
+            cut = _statement_end(buf)
+            if cut < 0:
+                carry = buf
+                continue
+            yield buf[: cut + 1]
+            carry = buf[cut + 1 :]
+
+
+def iter_statements(path: Union[str, Path], block_size: int = DEFAULT_BLOCK_SIZE) -> Iterator[bytes]:
+    """逐条返回语句（不含结尾的 ``;``，已去除注释；字符串中的 ``;`` 不切分语句）"""
+    for block in iter_blocks(path, block_size):
+        yield from _split_statements(block)
+
+
+def _split_statements(block: bytes) -> Iterator[bytes]:
+    pending = b""
+    for piece in block.split(b";"):
+        if pending:
+            piece = pending + b";" + piece
+        # 单引号个数为奇数：分号位于字符串中
+        if piece.count(b"'") & 1:
+            pending = piece
+            continue
+        pending = b""
+        if piece.strip():
+            yield piece
+    if pending.strip():
+        yield pending
+
+
+def decode_string(text: str) -> str:
+    """解码STEP字符串：``''`` 转义与 ``\\X2\\...\\X0\\`` / ``\\X\\hh`` / ``\\S\\c`` 编码"""
+    if len(text) >= 2 and text[0] == "'" and text[-1] == "'":
+        text = text[1:-1]
+    text = text.replace("''", "'")
+    if "\\" not in text:
+        return text
+
+    def x2(match):
+        hexdigits = match.group(2)
+        width = 4 if match.group(1) == "2" else 8
+        chars = [chr(int(hexdigits[i : i + width], 16)) for i in range(0, len(hexdigits) - width + 1, width)]
+        return "".join(chars)
+
+    text = re.sub(r"\\X([24])\\([0-9A-Fa-f]*)\\X0\\", x2, text)
+    text = re.sub(r"\\X\\([0-9A-Fa-f]{2})", lambda m: chr(int(m.group(1), 16)), text)
+    text = re.sub(r"\\S\\(.)", lambda m: chr(ord(m.group(1)) + 128), text)
+    return text.replace("\\\\", "\\")
+
+
+def split_parameters(text: str) -> List[str]:
+    """按顶层逗号切分参数列表（``text`` 为括号内的内容），保留嵌套括号与字符串"""
+    params = []
+    depth = 0
+    start = 0
+    in_string = False
+    for i, ch in enumerate(text):
+        if ch == "'":
+            in_string = not in_string
+        elif in_string:
+            continue
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            params.append(text[start:i].strip())
+            start = i + 1
+    tail = text[start:].strip()
+    if tail or params:
+        params.append(tail)
+    return params
+
+
+def _arguments(body: str) -> List[str]:
+    """``NAME(a, b, ...)`` -> [a, b, ...]"""
+    start = body.find("(")
+    end = body.rfind(")")
+    return split_parameters(body[start + 1 : end]) if 0 <= start < end else []
+
+
+def _partials(body: str) -> Dict[str, List[str]]:
+    """复合实体 ``(A(...) B(...))`` -> {A: [...], B: [...]}"""
+    inner = body.strip()[1:-1]
+    parts = {}
+    depth = 0
+    in_string = False
+    start = None
+    name = None
+    for i, ch in enumerate(inner):
+        if ch == "'":
+            in_string = not in_string
+        elif in_string:
+            continue
+        elif ch == "(":
+            if depth == 0:
+                match = _PARTIAL_RE.search(inner, 0 if start is None else start, i + 1)
+                name = match.group(1).upper() if match else ""
+                start = i + 1
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+            if depth == 0:
+                parts[name] = split_parameters(inner[start:i])
+                start = i + 1
+    return parts
+
+
+def _ref(param: str) -> Optional[int]:
+    param = param.strip()
+    return int(param[1:]) if param.startswith("#") and param[1:].isdigit() else None
+
+
+def _si_unit(params: List[str]) -> str:
+    prefix = params[0].strip(".") if params and params[0] not in ("$", "*") else ""
+    name = params[1].strip(".") if len(params) > 1 else ""
+    return _SI_PREFIXES.get(prefix, "") + _SI_NAMES.get(name, name.lower())
+
+
+@dataclass
+class StepMetadata:
+    """STEP扫描结果"""
+
+    header: Dict[str, Any] = field(default_factory=dict)
+    entity_count: int = 0
+    entity_types: Dict[str, int] = field(default_factory=dict)
+    products: List[Dict[str, str]] = field(default_factory=list)
+    units: Dict[str, str] = field(default_factory=dict)
+    assembly: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def schema(self) -> str:
+        schema = self.header.get("schema") or [""]
+        return schema[0] if isinstance(schema, list) else str(schema)
+
+    def summary(self, top: int = 20) -> Dict[str, Any]:
+        """可序列化的摘要（实体直方图只保留数量最多的 ``top`` 种）"""
+        return {
+            "schema": self.schema,
+            "header": self.header,
+            "entities": self.entity_count,
+            "entity_types": dict(list(self.entity_types.items())[:top]),
+            "entity_type_count": len(self.entity_types),
+            "products": self.products,
+            "units": self.units,
+            "assembly": self.assembly,
+        }
+
+
+class StepScanner:
+    """STEP流式扫描器
+
+    Args:
+        block_size: 每次读取的字节数
+    """
+
+    def __init__(self, block_size: int = DEFAULT_BLOCK_SIZE):
+        self.block_size = block_size
+
+    def scan(self, path: Union[str, Path]) -> StepMetadata:
+        """扫描文件，返回元数据与实体直方图"""
+        path = Path(path)
+        with open(path, "rb") as f:
+            head = f.read(256).lstrip()
+        if not head.startswith(MAGIC):
+            raise StepFormatError(f"不是ISO-10303-21文件: {path}")
+
+        counts: Counter = Counter()
+        parts: Counter = Counter()
+        records: Dict[int, Tuple[str, str]] = {}
+        complex_records: Dict[int, str] = {}
+        header: Dict[str, Any] = {}
+        in_header = True
+        tail = b""
+        for block in iter_blocks(path, self.block_size):
+            if in_header:
+                in_header = self._parse_header(block, header)
+            # 块以语句结尾截断，前补 ";" 后每个实例都以 ";#id=" 开头
+            block = b";" + block
+            found = Counter(_TYPE_RE.findall(block))
+            counts.update(found)
+            if _RECORD_KEYS.intersection(found):
+                for match in _RECORD_RE.finditer(block):
+                    body = _statement_at(block, match.start(2)).decode("latin-1")
+                    records[int(match.group(1))] = (match.group(2).upper().decode("ascii"), body)
+            if found[b"("]:
+                found_parts = Counter(_FIRST_PART_RE.findall(block))
+                found_parts.update(_NEXT_PART_RE.findall(block))
+                del found_parts[b""]
+                parts.update(found_parts)
+                # 复合实体中只有单位与全局单位上下文需要参数
+                if _COMPLEX_RECORD_KEYS.intersection(name.upper() for name in found_parts):
+                    for match in _COMPLEX_RE.finditer(block):
+                        body = _statement_at(block, match.end() - 1)
+                        if _COMPLEX_RECORD_TYPE_RE.search(body):
+                            complex_records[int(match.group(1))] = body.decode("latin-1")
+            tail = block[-64:]
+
+        if "schema" not in header or not _END_RE.search(tail):
+            raise StepFormatError(f"STEP文件不完整: {path}")
+
+        histogram: Counter = Counter()
+        for name, n in (counts + parts).items():
+            if name != b"(":
+                histogram[name.upper().decode("ascii")] += n
+        metadata = StepMetadata(
+            header=header, entity_count=sum(counts.values()), entity_types=dict(histogram.most_common())
+        )
+        self._resolve(metadata, records, complex_records)
+        return metadata
+
+    def _parse_header(self, block: bytes, header: Dict[str, Any]) -> bool:
+        """解析块中 DATA 之前的 HEADER 语句，返回 HEADER 是否仍未结束"""
+        for statement in _split_statements(block):
+            keyword = _KEYWORD_RE.match(statement)
+            if keyword is None:
+                continue
+            word = keyword.group(1).upper().decode("ascii", "replace")
+            if word == "DATA":
+                return False
+            if word in _HEADER_FIELDS:
+                params = _arguments(statement.decode("latin-1"))
+                for key, value in zip(_HEADER_FIELDS[word], params):
+                    header[key] = self._header_value(value)
+        return True
+
+    @staticmethod
+    def _header_value(value: str):
+        value = value.strip()
+        if value.startswith("("):
+            return [decode_string(v) for v in split_parameters(value[1:-1]) if v]
+        if value.startswith("'"):
+            return decode_string(value)
+        return None if value == "$" else value
+
+    def _resolve(self, metadata: StepMetadata, records: Dict[int, Tuple[str, str]], complex_records: Dict[int, str]):
+        """由少量记录还原零件、单位与装配结构"""
+        products: Dict[int, Dict[str, str]] = {}
+        formations: Dict[int, Optional[int]] = {}
+        definitions: Dict[int, Optional[int]] = {}
+        usages = []
+        unit_refs: List[int] = []
+        units: Dict[int, Tuple[str, str]] = {}
+
+        for eid, (kind, body) in records.items():
+            args = _arguments(body)
+            if kind == "PRODUCT" and len(args) >= 2:
+                products[eid] = {
+                    "id": decode_string(args[0]),
+                    "name": decode_string(args[1]),
+                    "description": decode_string(args[2]) if len(args) > 2 and args[2] != "$" else "",
+                }
+            elif kind.startswith("PRODUCT_DEFINITION_FORMATION") and len(args) >= 3:
+                formations[eid] = _ref(args[2])
+            elif kind == "PRODUCT_DEFINITION" and len(args) >= 3:
+                definitions[eid] = _ref(args[2])
+            elif kind == "NEXT_ASSEMBLY_USAGE_OCCURRENCE" and len(args) >= 5:
+                usages.append((_ref(args[3]), _ref(args[4]), decode_string(args[1]) or decode_string(args[0])))
+            elif kind == "GLOBAL_UNIT_ASSIGNED_CONTEXT" and args:
+                unit_refs.extend(r for r in (_ref(a) for a in split_parameters(args[0].strip()[1:-1])) if r)
+            elif kind == "CONVERSION_BASED_UNIT" and args:
+                units[eid] = ("", decode_string(args[0]).lower())
+
+        for eid, body in complex_records.items():
+            parts = _partials(body)
+            for name, params in parts.items():
+                if name == "GLOBAL_UNIT_ASSIGNED_CONTEXT" and params:
+                    unit_refs.extend(r for r in (_ref(a) for a in split_parameters(params[0].strip()[1:-1])) if r)
+            kind = next((_UNIT_KINDS[name] for name in parts if name in _UNIT_KINDS), None)
+            if kind is None:
+                continue
+            if "CONVERSION_BASED_UNIT" in parts and parts["CONVERSION_BASED_UNIT"]:
+                units[eid] = (kind, decode_string(parts["CONVERSION_BASED_UNIT"][0]).lower())
+            elif "SI_UNIT" in parts:
+                units[eid] = (kind, _si_unit(parts["SI_UNIT"]))
+
+        # 优先使用全局单位上下文引用的单位，否则取文件中出现的第一个
+        for ref in unit_refs + sorted(units):
+            kind, name = units.get(ref, ("", ""))
+            if kind and name and kind not in metadata.units:
+                metadata.units[kind] = name
+
+        metadata.products = [products[eid] for eid in sorted(products)]
+
+        def product_of(definition: Optional[int]) -> Optional[Dict[str, str]]:
+            return products.get(formations.get(definitions.get(definition)))
+
+        children: Dict[int, List[Tuple[int, str]]] = defaultdict(list)
+        used = set()
+        for relating, related, instance in usages:
+            if relating is not None and related is not None:
+                children[relating].append((related, instance))
+                used.add(related)
+
+        def build(definition: int, instance: Optional[str], path: frozenset) -> Dict[str, Any]:
+            product = product_of(definition) or {}
+            node: Dict[str, Any] = {"product": product.get("name") or product.get("id", ""), "instance": instance}
+            if definition in path:
+                node["children"] = []
+                return node
+            node["children"] = [build(d, name, path | {definition}) for d, name in children.get(definition, [])]
+            return node
+
+        roots = [d for d in definitions if d in children and d not in used]
+        metadata.assembly = [build(d, None, frozenset()) for d in sorted(roots)]
+
+
+def scan_step(path: Union[str, Path], block_size: int = DEFAULT_BLOCK_SIZE) -> StepMetadata:
+    """扫描STEP文件（便捷函数）"""
+    return StepScanner(block_size).scan(path)
@@ -0,0 +1,210 @@
+"""
+STL 文件读取模块
+
+- 二进制STL：按结构化dtype（法向、3个顶点、属性字）直接内存映射，
+  不逐个三角形循环，也不复制数据
+- ASCII STL：按块读取，去掉关键字后整块解析为数值数组
+
+读取结果为三角形片（triangle soup）数组，面积、有向体积等按块以float64累加，
+不依赖OpenCascade或FreeCAD。
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+import numpy as np
+
+# 二进制STL记录：法向(3×float32) + 顶点(3×3×float32) + 属性字(uint16)，共50字节
+STL_RECORD_DTYPE = np.dtype(
+    [("normal", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("attribute", "<u2")],
+)
+
+BINARY_HEADER_SIZE = 84
+
+# ASCII 每次读取的字节数
+DEFAULT_ASCII_BLOCK = 16 * 1024 * 1024
+
+# 面积/体积计算时每块三角形数（块数据保持在CPU缓存内）
+DEFAULT_CHUNK_SIZE = 16384
+
+# ASCII 关键字（需先替换较长的 end* 关键字）
+_ASCII_KEYWORDS = (b"endfacet", b"endloop", b"facet", b"normal", b"outer", b"loop", b"vertex")
+
+
+class StlFormatError(ValueError):
+    """STL文件格式错误"""
+
+
+@dataclass
+class StlMesh:
+    """STL读取结果（三角形片，未合并重复顶点）"""
+
+    triangles: np.ndarray  # [n, 3, 3] float32，三角形顶点坐标（二进制时为内存映射视图）
+    normals: np.ndarray  # [n, 3] float32，文件中记录的法向
+    attributes: Optional[np.ndarray] = None  # [n] uint16，仅二进制STL
+    name: str = ""
+    binary: bool = True
+    _properties: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def num_triangles(self) -> int:
+        return len(self.triangles)
+
+    def bounds(self) -> Tuple[np.ndarray, np.ndarray]:
+        """包围盒 (min[3], max[3])"""
+        props = self._compute()
+        return props["lower"], props["upper"]
+
+    def surface_area(self) -> float:
+        """表面积"""
+        return self._compute()["area"]
+
+    def signed_volume(self) -> float:
+        """有向体积（散度定理；法向朝外的封闭网格为正）"""
+        return self._compute()["volume"]
+
+    def summary(self) -> Dict[str, Any]:
+        lower, upper = self.bounds()
+        volume = self.signed_volume()
+        return {
+            "encoding": "binary" if self.binary else "ascii",
+            "name": self.name,
+            "vertices": 3 * self.num_triangles,
+            "faces": self.num_triangles,
+            "surface_area": self.surface_area(),
+            "volume": abs(volume),
+            "signed_volume": volume,
+            "bounds": {axis: [float(lower[i]), float(upper[i])] for i, axis in enumerate("xyz")},
+        }
+
+    def _compute(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, Any]:
+        """包围盒、面积与有向体积（由 :func:`compute_mass_properties` 一次遍历计算并缓存）"""
+        if self._properties is None:
+            # 延迟导入：mass_properties 依赖本模块的 StlMesh
+            from .mass_properties import compute_mass_properties
+
+            props = compute_mass_properties(self.triangles, chunk_size)
+            self._properties = {
+                "lower": props.lower,
+                "upper": props.upper,
+                "area": props.surface_area,
+                "volume": props.signed_volume,
+            }
+        return self._properties
+
+
+def is_binary_stl(file_path: Union[str, Path]) -> bool:
+    """判断是否为二进制STL
+
+    以文件大小与头部三角形数是否匹配为准：部分CAD导出的二进制STL头部同样以
+    ``solid`` 开头。
+    """
+    path = Path(file_path)
+    size = path.stat().st_size
+    with open(path, "rb") as f:
+        header = f.read(BINARY_HEADER_SIZE)
+    if len(header) == BINARY_HEADER_SIZE:
+        count = int(np.frombuffer(header, dtype="<u4", count=1, offset=80)[0])
+        if size == BINARY_HEADER_SIZE + count * STL_RECORD_DTYPE.itemsize:
+            return True
+    return not header.lstrip().lower().startswith(b"solid")
+
+
+def read_stl(file_path: Union[str, Path], mmap: bool = True, block_size: int = DEFAULT_ASCII_BLOCK) -> StlMesh:
+    """读取STL文件（自动识别二进制/ASCII）
+
+    Args:
+        file_path: 文件路径
+        mmap: 二进制STL是否使用内存映射（False时一次读入内存）
+        block_size: ASCII STL 每次读取的字节数
+
+    Raises:
+        FileNotFoundError: 文件不存在
+        StlFormatError: 格式错误
+    """
+    path = Path(file_path)
+    if not path.exists():
+        raise FileNotFoundError(f"文件不存在: {file_path}")
+    if is_binary_stl(path):
+        return _read_binary(path, mmap)
+    return _read_ascii(path, block_size)
+
+
+def _read_binary(path: Path, mmap: bool) -> StlMesh:
+    size = path.stat().st_size
+    if size < BINARY_HEADER_SIZE:
+        raise StlFormatError(f"二进制STL文件过短: {size} 字节")
+    with open(path, "rb") as f:
+        header = f.read(BINARY_HEADER_SIZE)
+    count = int(np.frombuffer(header, dtype="<u4", count=1, offset=80)[0])
+    available = (size - BINARY_HEADER_SIZE) // STL_RECORD_DTYPE.itemsize
+    if count > available:
+        raise StlFormatError(f"二进制STL文件被截断: 声明 {count} 个三角形，实际仅 {available} 个")
+
+    if count == 0:
+        records = np.zeros(0, dtype=STL_RECORD_DTYPE)
+    elif mmap:
+        records = np.memmap(path, dtype=STL_RECORD_DTYPE, mode="r", offset=BINARY_HEADER_SIZE, shape=(count,))
+    else:
+        records = np.fromfile(path, dtype=STL_RECORD_DTYPE, count=count, offset=BINARY_HEADER_SIZE)
+
+    name = header[:80].split(b"\0", 1)[0].decode("ascii", errors="replace").strip()
+    return StlMesh(
+        triangles=records["vertices"],
+        normals=records["normal"],
+        attributes=records["attribute"],
+        name=name,
+        binary=True,
+    )
+
+
+def _parse_facets(data: bytes) -> np.ndarray:
+    """解析若干完整facet的文本块，返回 [k, 12] float32（法向 + 3个顶点）"""
+    if b"solid" in data:
+        lines = [line for line in data.split(b"\n") if not line.lstrip().startswith((b"solid", b"endsolid"))]
+        data = b"\n".join(lines)
+    for keyword in _ASCII_KEYWORDS:
+        data = data.replace(keyword, b" ")
+    try:
+        values = np.array(data.split(), dtype=np.float32)
+    except ValueError as e:
+        raise StlFormatError(f"无法解析的数值数据: {e}") from e
+    if values.size % 12:
+        raise StlFormatError("ASCII STL facet 数据不完整")
+    return values.reshape(-1, 12)
+
+
+def _read_ascii(path: Path, block_size: int) -> StlMesh:
+    parts = []
+    rest = b""
+    with open(path, "rb") as f:
+        first = f.readline()
+        name = first.strip()[5:].decode("utf-8", errors="replace").strip()
+        while True:
+            block = f.read(block_size)
+            data = rest + block.lower()
+            if not block:
+                break
+            # 只解析到最后一个完整facet，剩余部分与下一块拼接
+            end = data.rfind(b"endfacet")
+            if end < 0:
+                rest = data
+                continue
+            end += len(b"endfacet")
+            parts.append(_parse_facets(data[:end]))
+            rest = data[end:]
+
+    tail = rest.split()
+    if tail and tail[0] != b"endsolid":
+        if b"facet" in rest:
+            raise StlFormatError("ASCII STL 在 facet 中途结束")
+        raise StlFormatError(f"无法识别的ASCII STL内容: {tail[0][:40]!r}")
+
+    facets = np.concatenate(parts) if parts else np.zeros((0, 12), dtype=np.float32)
+    return StlMesh(
+        triangles=facets[:, 3:].reshape(-1, 3, 3),
+        normals=facets[:, :3],
+        name=name,
+        binary=False,
+    )
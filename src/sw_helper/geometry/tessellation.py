@@ -0,0 +1,278 @@
+"""
+STEP 三角化（STL）缓存与多细节层次（LOD）
+
+- :class:`TessellationSettings`：线性/角度弦差（线性弦差可为相对边长的比例）
+- :data:`LOD_PRESETS`：coarse / medium / fine 三级预设
+- :class:`TessellationCache`：以 STEP 内容哈希 + 弦差设置为键缓存二进制 STL
+- :class:`StepTessellator`：STEP 只读取一次，依次生成所需的各级 STL；已缓存的级别
+  直接复制，全部命中时不读取 B-rep
+
+缓存目录默认为 ``~/.cae-cli/tessellation_cache``（可用环境变量
+``CAE_TESSELLATION_CACHE_DIR`` 覆盖），按最近使用时间做 LRU 淘汰。GUI 预览与
+下游网格划分通过 :func:`get_lod_stl` 取得对应级别的 STL 路径。
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+
+from ..utils.hashing import file_digest
+
+# 缓存格式版本，键或文件格式变化时递增（2：丢弃可能以过期内容哈希写入的条目）
+CACHE_FORMAT_VERSION = 2
+
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024
+
+CACHE_DIR_ENV = "CAE_TESSELLATION_CACHE_DIR"
+
+
+@dataclass(frozen=True)
+class TessellationSettings:
+    """三角化弦差设置
+
+    Args:
+        linear_deflection: 线性弦差（relative=True 时为相对边长的比例）
+        angular_deflection: 角度弦差（弧度）
+        relative: 线性弦差是否为相对值
+    """
+
+    linear_deflection: float = 0.01
+    angular_deflection: float = 0.5
+    relative: bool = True
+
+    def key(self) -> str:
+        lin, ang = float(self.linear_deflection), float(self.angular_deflection)
+        return f"lin={lin:.6g};ang={ang:.6g};rel={int(self.relative)}"
+
+
+LOD_PRESETS: Dict[str, TessellationSettings] = {
+    "coarse": TessellationSettings(0.05, 0.8),
+    "medium": TessellationSettings(0.01, 0.5),
+    "fine": TessellationSettings(0.002, 0.2),
+}
+
+LOD_LEVELS = tuple(LOD_PRESETS)
+
+
+def default_cache_dir() -> Path:
+    env = os.environ.get(CACHE_DIR_ENV)
+    return Path(env) if env else Path.home() / ".cae-cli" / "tessellation_cache"
+
+
+class TessellationCache:
+    """STEP 三角化结果磁盘缓存（LRU）
+
+    Args:
+        cache_dir: 缓存目录（None 使用 :func:`default_cache_dir`）
+        max_bytes: 缓存文件总大小上限（字节）
+    """
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def content_hash(self, step_file: Union[str, Path]) -> str:
+        """STEP 文件内容哈希（见 :func:`~sw_helper.utils.hashing.file_digest`，修改时间过近的文件不记忆）"""
+        return file_digest(step_file)
+
+    def key(self, step_file: Union[str, Path], settings: TessellationSettings) -> str:
+        """缓存键：格式版本 + STEP 内容哈希 + 弦差设置"""
+        text = f"v{CACHE_FORMAT_VERSION}|{self.content_hash(step_file)}|{settings.key()}"
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def path_for(self, step_file: Union[str, Path], settings: TessellationSettings) -> Path:
+        return self.cache_dir / f"{self.key(step_file, settings)}.stl"
+
+    def get(self, step_file: Union[str, Path], settings: TessellationSettings) -> Optional[Path]:
+        """命中时返回缓存的 STL 路径并刷新其最近使用时间"""
+        path = self.path_for(step_file, settings)
+        if not path.is_file() or path.stat().st_size == 0:
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return path
+
+    def put(
+        self,
+        step_file: Union[str, Path],
+        settings: TessellationSettings,
+        stl_file: Union[str, Path],
+        move: bool = False,
+    ) -> Path:
+        """将生成的 STL 存入缓存，返回缓存路径；缓存目录不可写时返回原文件
+
+        move=True 时把 stl_file（缓存目录中的临时文件，见 :meth:`temp_file`）直接原子改名为缓存条目，
+        否则先复制到临时文件再改名。
+        """
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self.path_for(step_file, settings)
+            if move:
+                os.replace(stl_file, path)
+            else:
+                tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+                shutil.copyfile(stl_file, tmp)
+                os.replace(tmp, path)
+            self._evict(keep=path)
+            return path
+        except OSError:
+            return Path(stl_file)
+
+    def temp_file(self) -> Path:
+        """缓存目录中的临时文件（不匹配 ``*.stl``，不会被当作缓存条目读取或淘汰）"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, name = tempfile.mkstemp(prefix=".tessellate.", suffix=".tmp", dir=self.cache_dir)
+        os.close(fd)
+        return Path(name)
+
+    def clear(self):
+        """清空缓存"""
+        for path in self.cache_dir.glob("*.stl") if self.cache_dir.exists() else []:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def _evict(self, keep: Path):
+        entries = []
+        for path in self.cache_dir.glob("*.stl"):
+            try:
+                entries.append((path, path.stat()))
+            except OSError:
+                continue
+        total = sum(stat.st_size for _, stat in entries)
+        entries.sort(key=lambda item: item[1].st_mtime_ns)
+        for path, stat in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                path.unlink()
+                total -= stat.st_size
+            except OSError:
+                pass
+
+
+class StepTessellator:
+    """STEP -> 多级 STL（B-rep 只读取一次）
+
+    Args:
+        cache: 三角化缓存（None 不使用缓存）
+        parallel: 是否启用 OCC 的并行三角化
+    """
+
+    def __init__(self, cache: Optional[TessellationCache] = None, parallel: bool = True):
+        self.cache = cache
+        self.parallel = parallel
+
+    def tessellate(
+        self,
+        step_file: Union[str, Path],
+        outputs: Dict[Union[str, Path], TessellationSettings],
+    ) -> Dict[Path, str]:
+        """生成各输出 STL
+
+        Args:
+            step_file: STEP 文件
+            outputs: 输出路径 -> 弦差设置
+
+        Returns:
+            输出路径 -> 来源（"cache" 或 "tessellated"）
+        """
+        step_file = Path(step_file)
+        sources: Dict[Path, str] = {}
+        missing = []
+        for output, settings in outputs.items():
+            output = Path(output)
+            output.parent.mkdir(parents=True, exist_ok=True)
+            cached = self.cache.get(step_file, settings) if self.cache is not None else None
+            if cached is not None:
+                shutil.copyfile(cached, output)
+                sources[output] = "cache"
+            else:
+                missing.append((output, settings))
+        if not missing:
+            return sources
+
+        shape = self._load_shape(step_file)
+        # 从粗到细依次三角化：每级先清除旧三角化，保证弦差设置生效
+        for output, settings in sorted(missing, key=lambda item: -item[1].linear_deflection):
+            self._write_stl(shape, settings, output)
+            if self.cache is not None:
+                self.cache.put(step_file, settings, output)
+            sources[output] = "tessellated"
+        return sources
+
+    def _load_shape(self, step_file: Path):
+        from OCC.Core.IFSelect import IFSelect_RetDone
+        from OCC.Core.STEPControl import STEPControl_Reader
+
+        reader = STEPControl_Reader()
+        if reader.ReadFile(str(step_file)) != IFSelect_RetDone:
+            raise ValueError(f"无法读取STEP文件: {step_file}")
+        reader.TransferRoots()
+        return reader.OneShape()
+
+    def _write_stl(self, shape, settings: TessellationSettings, output: Path):
+        from OCC.Core.BRepMesh import BRepMesh_IncrementalMesh
+        from OCC.Core.BRepTools import breptools
+        from OCC.Core.StlAPI import StlAPI_Writer
+
+        breptools.Clean(shape)
+        mesh = BRepMesh_IncrementalMesh(
+            shape, settings.linear_deflection, settings.relative, settings.angular_deflection, self.parallel
+        )
+        mesh.Perform()
+        writer = StlAPI_Writer()
+        writer.SetASCIIMode(False)
+        if not writer.Write(shape, str(output)):
+            raise ValueError(f"STL写入失败: {output}")
+
+
+def lod_output_paths(output_base: Union[str, Path], levels: Iterable[str] = LOD_LEVELS) -> Dict[str, Path]:
+    """各级 STL 的输出路径：``part.stl`` -> ``part.coarse.stl`` / ``part.medium.stl`` / ``part.fine.stl``"""
+    base = Path(output_base)
+    stem = base.with_suffix("") if base.suffix.lower() == ".stl" else base
+    return {level: stem.with_name(f"{stem.name}.{level}.stl") for level in levels}
+
+
+_default_cache: Optional[TessellationCache] = None
+
+
+def default_tessellation_cache() -> TessellationCache:
+    """进程内共享的默认缓存"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = TessellationCache()
+    return _default_cache
+
+
+def get_lod_stl(step_file: Union[str, Path], level: str = "coarse", cache: Optional[TessellationCache] = None) -> Path:
+    """取得 STEP 指定级别的 STL（缓存路径；未缓存时三角化并写入缓存）
+
+    供 GUI 预览与网格划分复用；缓存命中时不读取 B-rep。
+    """
+    cache = cache or default_tessellation_cache()
+    settings = LOD_PRESETS[level]
+    cached = cache.get(step_file, settings)
+    if cached is not None:
+        return cached
+    # 先写入临时文件再原子移入缓存：写出失败或进程中断不会在缓存键下留下不完整的 STL
+    tmp = cache.temp_file()
+    try:
+        StepTessellator().tessellate(step_file, {tmp: settings})
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return cache.put(step_file, settings, tmp, move=True)
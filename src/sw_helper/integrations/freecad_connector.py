@@ -6,7 +6,9 @@ FreeCAD连接器 - 使用FreeCAD Python API
 import sys
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
+
+import numpy as np
 
 
 @dataclass
@@ -20,6 +22,25 @@ class FCParameter:
     constraint_index: int = -1  # 如果是约束，记录索引
 
 
+def _mass_properties(solids) -> Dict[str, Any]:
+    """实体集合的质心与质心处惯性矩阵（单位密度）
+
+    各实体的 MatrixOfInertia 相对自身质心，按平行轴定理移到整体质心后求和。
+    没有实体（只有曲面）时返回空字典。
+    """
+    volumes = np.array([float(solid.Volume) for solid in solids])
+    if not len(volumes) or volumes.sum() <= 0:
+        return {}
+    centers = np.array([[solid.CenterOfMass.x, solid.CenterOfMass.y, solid.CenterOfMass.z] for solid in solids])
+    center = volumes @ centers / volumes.sum()
+    inertia = np.zeros((3, 3))
+    for solid, volume, offset in zip(solids, volumes, centers - center):
+        m = solid.MatrixOfInertia
+        local = np.array([[m.A11, m.A12, m.A13], [m.A21, m.A22, m.A23], [m.A31, m.A32, m.A33]])
+        inertia += local + volume * (offset @ offset * np.eye(3) - np.outer(offset, offset))
+    return {"center_of_mass": center.tolist(), "inertia": inertia.tolist()}
+
+
 class FreeCADConnector:
     """FreeCAD连接器 - 使用Python API"""
 
@@ -348,6 +369,73 @@ class FreeCADConnector:
             print(f"重建失败: {e}")
             return False
 
+    def _exportable_objects(self) -> list:
+        """导出STEP时包含的Part对象"""
+        return [obj for obj in self.active_doc.Objects if obj.isDerivedFrom("Part::Feature")]
+
+    def _result_shape(self):
+        """文档的最终形状：可见叶子Part对象的复合体（没有可见对象时取全部叶子）
+
+        叶子对象不被其它Part对象引用：草图、Body 内的中间特征（Body 的形状即 Tip）与
+        圆角/布尔运算的基础形状都不计入。形状摘要、三角化与STL导出使用同一形状。
+        """
+        leaves = [
+            obj
+            for obj in self._exportable_objects()
+            if not obj.isDerivedFrom("Part::Part2DObject")
+            and not any(parent.isDerivedFrom("Part::Feature") for parent in obj.InList)
+            and not obj.Shape.isNull()
+        ]
+        visible = [obj for obj in leaves if getattr(obj, "Visibility", True)]
+        shapes = [obj.Shape for obj in visible or leaves]
+        if not shapes:
+            return None
+        return shapes[0] if len(shapes) == 1 else self.part_module.makeCompound(shapes)
+
+    def shape_summary(self) -> Optional[Dict[str, Any]]:
+        """重建后形状的拓扑计数、体积、包围盒与质量特性（直接读取内存中的形状，不导出）"""
+        if not self.active_doc:
+            return None
+        try:
+            shape = self._result_shape()
+            if shape is None:
+                return None
+            box = shape.BoundBox
+            summary = {
+                "solids": len(shape.Solids),
+                "faces": len(shape.Faces),
+                "edges": len(shape.Edges),
+                "vertices": len(shape.Vertexes),
+                "volume": float(shape.Volume),
+                "bounds": {
+                    "x": [box.XMin, box.XMax],
+                    "y": [box.YMin, box.YMax],
+                    "z": [box.ZMin, box.ZMax],
+                },
+            }
+            summary.update(_mass_properties(shape.Solids))
+            return summary
+        except Exception as e:
+            print(f"读取形状失败: {e}")
+            return None
+
+    def tessellate(self, tolerance: float = 0.1) -> Optional[np.ndarray]:
+        """在内存中三角化形状（与STL导出相同的形状），返回 [n, 3, 3] 三角形顶点坐标"""
+        if not self.active_doc:
+            return None
+        try:
+            shape = self._result_shape()
+            if shape is None:
+                return None
+            points, facets = shape.tessellate(tolerance)
+            if not facets:
+                return None
+            vertices = np.array([(p.x, p.y, p.z) for p in points], dtype=np.float64)
+            return vertices[np.asarray(facets, dtype=np.int64)]
+        except Exception as e:
+            print(f"三角化失败: {e}")
+            return None
+
     def export_file(self, output_path: str, format_type: str = "STEP") -> bool:
         """导出文件"""
         if not self.active_doc:
@@ -380,7 +468,7 @@ class FreeCADConnector:
                 import Import
 
                 # 收集所有Part对象
-                objects = [obj for obj in self.active_doc.Objects if obj.isDerivedFrom("Part::Feature")]
+                objects = self._exportable_objects()
                 if objects:
                     Import.export(objects, output_path)
                     print(f"✓ 导出成功: {output_path}")
@@ -391,11 +479,11 @@ class FreeCADConnector:
 
             # 导出STL
             elif format_type.upper() == "STL":
-                for obj in self.active_doc.Objects:
-                    if obj.isDerivedFrom("Part::Feature") and hasattr(obj, "Shape"):
-                        obj.Shape.exportStl(output_path)
-                        print(f"✓ 导出成功: {output_path}")
-                        return True
+                shape = self._result_shape()
+                if shape is not None:
+                    shape.exportStl(output_path)
+                    print(f"✓ 导出成功: {output_path}")
+                    return True
                 print("✗ 没有找到可导出的Shape")
                 return False
 
@@ -491,6 +579,49 @@ class FreeCADConnectorMock:
         print("[模拟模式] 重建模型")
         return True
 
+    def _box(self):
+        """模拟形状：Length×Width×Height 的长方体，圆角只减小体积（其它参数不影响形状）"""
+        length = self.mock_params["Length"]
+        width = self.mock_params["Width"]
+        height = self.mock_params["Height"]
+        radius = min(self.mock_params["Fillet_Radius"], width / 2, height / 2)
+        return length, width, height, radius
+
+    def shape_summary(self) -> Optional[Dict[str, Any]]:
+        length, width, height, radius = self._box()
+        # 截面（y, z）关于形心的面积与二次矩：矩形减去四个圆角处的角块
+        # 角块 = r×r 正方形减去圆心在 (a, b) 的四分之一圆，a, b 为圆心到形心的距离
+        a, b = width / 2 - radius, height / 2 - radius
+        corner = radius**2 - np.pi * radius**2 / 4
+        quarter = [np.pi * radius**2 * c**2 / 4 + 2 * c * radius**3 / 3 + np.pi * radius**4 / 16 for c in (a, b)]
+        syy = width**3 * height / 12 - 4 * (radius * ((a + radius) ** 3 - a**3) / 3 - quarter[0])
+        szz = height**3 * width / 12 - 4 * (radius * ((b + radius) ** 3 - b**3) / 3 - quarter[1])
+        area = width * height - 4 * corner
+        return {
+            "solids": 1,
+            "faces": 10 if radius > 0 else 6,
+            "edges": 20 if radius > 0 else 12,
+            "vertices": 12 if radius > 0 else 8,
+            "volume": area * length,
+            "bounds": {"x": [0.0, length], "y": [0.0, width], "z": [0.0, height]},
+            "center_of_mass": [length / 2, width / 2, height / 2],
+            "inertia": [
+                [length * (syy + szz), 0.0, 0.0],
+                [0.0, area * length**3 / 12 + length * szz, 0.0],
+                [0.0, 0.0, area * length**3 / 12 + length * syy],
+            ],
+        }
+
+    def tessellate(self, tolerance: float = 0.1) -> Optional[np.ndarray]:
+        length, width, height, _ = self._box()
+        corners = np.array([[x, y, z] for x in (0, length) for y in (0, width) for z in (0, height)], dtype=np.float64)
+        # 长方体12个三角形（法向朝外）
+        faces = np.array(
+            [[0, 1, 3], [0, 3, 2], [4, 6, 7], [4, 7, 5], [0, 4, 5], [0, 5, 1]]
+            + [[2, 3, 7], [2, 7, 6], [0, 2, 6], [0, 6, 4], [1, 5, 7], [1, 7, 3]]
+        )
+        return corners[faces]
+
     def export_file(self, output_path: str, format_type: str = "STEP") -> bool:
         print(f"[模拟模式] 导出到: {output_path}")
         # 创建一个空的STEP文件用于测试
@@ -5,10 +5,14 @@ from .physics_formulas import (
     calc_principal_stresses,
     calc_von_mises,
     calculate_buckling_load,
+    calculate_buckling_load_batch,
     calculate_deflection,
+    calculate_deflection_batch,
     calculate_principal_stresses,
+    calculate_principal_stresses_batch,
     calculate_safety_factor,
     calculate_von_mises_stress,
+    calculate_von_mises_stress_batch,
 )
 
 __all__ = [
@@ -17,6 +21,10 @@ __all__ = [
     "calculate_safety_factor",
     "calculate_buckling_load",
     "calculate_deflection",
+    "calculate_von_mises_stress_batch",
+    "calculate_principal_stresses_batch",
+    "calculate_buckling_load_batch",
+    "calculate_deflection_batch",
     "calc_principal_stresses",
     "calc_von_mises",
     "calc_max_shear",
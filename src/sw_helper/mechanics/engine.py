@@ -40,10 +40,14 @@ from .physics_formulas import (
     calc_principal_stresses,
     calc_von_mises,
     calculate_buckling_load,
+    calculate_buckling_load_batch,
     calculate_deflection,
+    calculate_deflection_batch,
     calculate_principal_stresses,
+    calculate_principal_stresses_batch,
     calculate_safety_factor,
     calculate_von_mises_stress,
+    calculate_von_mises_stress_batch,
 )
 
 
@@ -160,6 +164,12 @@ class MechanicsEngine:
 
         raise ValueError(f"不支持的单位转换: {from_unit} -> {to_unit}")
 
+    def unit_factor(self, from_unit: str, to_unit: str) -> float:
+        """线性单位的换算系数，批量计算时只做一次单位转换"""
+        if from_unit == to_unit:
+            return 1.0
+        return self.convert_units(1.0, from_unit, to_unit)
+
     def get_material(self, material_name: str) -> Dict[str, Any]:
         """
         获取材料属性
@@ -265,6 +275,47 @@ class MechanicsEngine:
             "is_safe": safety_factor >= 1.0,
         }
 
+    def calculate_stress_analysis_batch(
+        self,
+        stress_tensors: np.ndarray,
+        material_name: str,
+    ) -> Dict[str, Any]:
+        """
+        批量应力分析（如有限元应力场的全部积分点）
+
+        Args:
+            stress_tensors: (N, 3, 3) 应力张量数组 (Pa)
+            material_name: 材料名称
+
+        Returns:
+            应力分析结果字典，逐点结果为长度 N 的数组；应力为零处安全系数为 inf
+        """
+        material = self.get_material(material_name)
+        yield_strength = material.get("yield_strength", 0)
+        tensile_strength = material.get("tensile_strength", 0)
+        material_type = self.determine_material_type(material_name)
+
+        von_mises = calculate_von_mises_stress_batch(stress_tensors)
+        principal_stresses = calculate_principal_stresses_batch(stress_tensors)
+
+        allowable = yield_strength if material_type == "ductile" else tensile_strength
+        safety_factor = _safety_factors(allowable, von_mises)
+        critical = int(np.argmin(safety_factor)) if safety_factor.size else None
+
+        return {
+            "material": material_name,
+            "material_type": material_type,
+            "von_mises_stress": von_mises,
+            "principal_stresses": principal_stresses,
+            "safety_factor": safety_factor,
+            "yield_strength": yield_strength,
+            "tensile_strength": tensile_strength,
+            "is_safe": safety_factor >= 1.0,
+            "max_von_mises_stress": float(von_mises.max()) if von_mises.size else 0.0,
+            "min_safety_factor": float(safety_factor[critical]) if critical is not None else float("inf"),
+            "critical_index": critical,
+        }
+
     def calculate_buckling_safety(
         self,
         material_name: str,
@@ -328,6 +379,49 @@ class MechanicsEngine:
             "is_stable": buckling_safety >= 1.0,
         }
 
+    def calculate_buckling_safety_batch(
+        self,
+        material_name: str,
+        cross_section_area,
+        moment_of_inertia,
+        length,
+        applied_force,
+        end_condition: str = "pinned-pinned",
+        area_unit: str = "m^2",
+        length_unit: str = "m",
+        force_unit: str = "N",
+    ) -> Dict[str, Any]:
+        """
+        批量屈曲安全分析，参数含义同 calculate_buckling_safety，
+        截面积/惯性矩/长度/力可为数组（按numpy规则广播）
+
+        Returns:
+            屈曲分析结果，逐工况结果为数组
+        """
+        area = np.asarray(cross_section_area, dtype=np.float64) * self.unit_factor(area_unit, "m^2")
+        length_m = np.asarray(length, dtype=np.float64) * self.unit_factor(length_unit, "m")
+        force_n = np.asarray(applied_force, dtype=np.float64) * self.unit_factor(force_unit, "N")
+
+        material = self.get_material(material_name)
+        elastic_modulus = material.get("elastic_modulus", 0)
+
+        critical_load = calculate_buckling_load_batch(elastic_modulus, moment_of_inertia, length_m, end_condition)
+        critical_load, force_n, area = np.broadcast_arrays(critical_load, force_n, area)
+
+        buckling_safety = _safety_factors(critical_load, force_n)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            compressive_stress = np.where(area > 0, force_n / area, 0.0)
+
+        return {
+            "material": material_name,
+            "elastic_modulus": elastic_modulus,
+            "critical_buckling_load": critical_load,
+            "applied_force": force_n,
+            "buckling_safety_factor": buckling_safety,
+            "compressive_stress": compressive_stress,
+            "is_stable": buckling_safety >= 1.0,
+        }
+
     def calculate_deflection_analysis(
         self,
         load: float,
@@ -385,6 +479,41 @@ class MechanicsEngine:
             "is_within_limit": deflection <= allowable_deflection,
         }
 
+    def calculate_deflection_analysis_batch(
+        self,
+        load,
+        length,
+        material_name: str,
+        moment_of_inertia,
+        load_type: str = "point_center",
+        load_unit: str = "N",
+        length_unit: str = "m",
+    ) -> Dict[str, Any]:
+        """
+        批量挠度分析，参数含义同 calculate_deflection_analysis，
+        载荷/长度/惯性矩可为数组（按numpy规则广播）
+
+        Returns:
+            挠度分析结果，逐工况结果为数组
+        """
+        load_n = np.asarray(load, dtype=np.float64) * self.unit_factor(load_unit, "N")
+        length_m = np.asarray(length, dtype=np.float64) * self.unit_factor(length_unit, "m")
+
+        material = self.get_material(material_name)
+        elastic_modulus = material.get("elastic_modulus", 0)
+
+        deflection = calculate_deflection_batch(load_n, length_m, elastic_modulus, moment_of_inertia, load_type)
+        allowable_deflection = np.broadcast_to(length_m / 250, deflection.shape)
+
+        return {
+            "material": material_name,
+            "elastic_modulus": elastic_modulus,
+            "deflection": deflection,
+            "allowable_deflection": allowable_deflection,
+            "deflection_safety_factor": _safety_factors(allowable_deflection, deflection),
+            "is_within_limit": deflection <= allowable_deflection,
+        }
+
     @staticmethod
     def evaluate_material_theory(elongation: float) -> str:
         """
@@ -402,6 +531,30 @@ class MechanicsEngine:
         """
         return "Ductile" if elongation > 5.0 else "Brittle"
 
+    def _strength_theory(self, material_name: str):
+        """
+        按材料伸长率选择强度理论
+
+        Returns:
+            (材料类型 "Ductile"/"Brittle", 强度理论名称, 许用强度)
+        """
+        material = self.get_material(material_name)
+
+        # 获取伸长率（如果不存在，根据材料类型推断）
+        elongation = material.get("elongation")
+        if elongation is None:
+            # 根据材料类型推断：钢类通常为延性，铸铁类为脆性
+            material_type = material.get("type", "").lower()
+            if any(keyword in material_type for keyword in ["铸铁", "陶瓷", "玻璃", "脆性"]):
+                elongation = 3.0  # 脆性材料典型值
+            else:
+                elongation = 20.0  # 延性材料典型值
+
+        material_type = self.evaluate_material_theory(elongation)
+        if material_type == "Ductile":
+            return material_type, "von Mises (第四强度理论)", material.get("yield_strength", 0)
+        return material_type, "Max Shear (第三强度理论)", material.get("tensile_strength", 0)
+
     def solve_safety_factor(
         self,
         force: float,
@@ -447,35 +600,12 @@ class MechanicsEngine:
         s1, s2 = calc_principal_stresses(sigma_x, sigma_y, tau_xy)
         s3 = 0.0
 
-        # 获取材料属性
-        material = self.get_material(material_name)
-
-        # 获取伸长率（如果不存在，根据材料类型推断）
-        elongation = material.get("elongation")
-        if elongation is None:
-            # 根据材料类型推断：钢类通常为延性，铸铁类为脆性
-            material_type = material.get("type", "").lower()
-            if any(keyword in material_type for keyword in ["铸铁", "陶瓷", "玻璃", "脆性"]):
-                elongation = 3.0  # 脆性材料典型值
-            else:
-                elongation = 20.0  # 延性材料典型值
-
-        # 判断材料类型
-        material_type = self.evaluate_material_theory(elongation)
-
-        # 获取材料强度
-        yield_strength = material.get("yield_strength", 0)
-        ultimate_strength = material.get("tensile_strength", 0)
-
-        # 强度理论选择
+        # 根据材料延展性选择强度理论
+        material_type, theory, allowable = self._strength_theory(material_name)
         if material_type == "Ductile":
-            theory = "von Mises (第四强度理论)"
             equivalent_stress = calc_von_mises(s1, s2, s3)
-            allowable = yield_strength
         else:
-            theory = "Max Shear (第三强度理论)"
             equivalent_stress = calc_max_shear(s1, s3)
-            allowable = ultimate_strength
 
         # 计算安全系数
         safety_factor = allowable / equivalent_stress if equivalent_stress > 0 else float("inf")
@@ -517,3 +647,64 @@ class MechanicsEngine:
             console.print(table)
 
         return result
+
+    def solve_safety_factor_batch(
+        self,
+        force,
+        area,
+        material_name: str,
+        force_unit: str = "N",
+        area_unit: str = "m^2",
+    ) -> Dict[str, Any]:
+        """
+        批量强度校核，计算流程同 solve_safety_factor（单向受拉），不输出表格
+
+        参数说明：
+            force: 外载荷数组
+            area: 承载面积数组（与 force 按numpy规则广播）
+            material_name (str): 材料名称
+            force_unit (str): 力的单位
+            area_unit (str): 面积的单位
+
+        返回：
+            Dict[str, Any]: 逐工况的应力与安全系数数组
+        """
+        force_si = np.asarray(force, dtype=np.float64) * self.unit_factor(force_unit, "N")
+        area_si = np.asarray(area, dtype=np.float64) * self.unit_factor(area_unit, "m^2")
+        force_si, area_si = np.broadcast_arrays(force_si, area_si)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sigma = np.where(area_si > 0, force_si / area_si, 0.0)
+
+        # 单向应力状态的主应力 (σ1, σ2, σ3=0)
+        s1 = np.maximum(sigma, 0.0)
+        s2 = np.minimum(sigma, 0.0)
+        principal_stresses = np.stack([s1, s2, np.zeros_like(sigma)], axis=-1)
+
+        material_type, theory, allowable = self._strength_theory(material_name)
+        if material_type == "Ductile":
+            equivalent_stress = np.sqrt(0.5 * ((s1 - s2) ** 2 + s2**2 + s1**2))
+        else:
+            equivalent_stress = 0.5 * np.abs(s1)
+
+        safety_factor = _safety_factors(allowable, equivalent_stress)
+
+        return {
+            "material": material_name,
+            "nominal_stress": sigma,
+            "principal_stresses": principal_stresses,
+            "material_type": material_type,
+            "strength_theory": theory,
+            "equivalent_stress": equivalent_stress,
+            "allowable_strength": allowable,
+            "safety_factor": safety_factor,
+            "is_safe": safety_factor >= 1.0,
+        }
+
+
+def _safety_factors(capacity, demand) -> np.ndarray:
+    """逐元素计算 capacity / demand，demand 不大于0处为 inf"""
+    capacity, demand = np.broadcast_arrays(np.asarray(capacity, dtype=np.float64), np.asarray(demand, dtype=np.float64))
+    result = np.full(demand.shape, np.inf)
+    np.divide(capacity, demand, out=result, where=demand > 0)
+    return result
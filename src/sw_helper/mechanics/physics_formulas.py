@@ -56,6 +56,43 @@ def calculate_principal_stresses(
     return tuple(sorted_eigenvalues)
 
 
+def _as_tensor_stack(stress_tensors: np.ndarray) -> np.ndarray:
+    stress_tensors = np.asarray(stress_tensors, dtype=np.float64)
+    if stress_tensors.ndim < 2 or stress_tensors.shape[-2:] != (3, 3):
+        raise ValueError("应力张量数组形状必须是 (N, 3, 3)")
+    return stress_tensors.reshape(-1, 3, 3)
+
+
+def calculate_von_mises_stress_batch(stress_tensors: np.ndarray) -> np.ndarray:
+    """
+    批量计算Von Mises等效应力
+
+    Args:
+        stress_tensors: (N, 3, 3) 应力张量数组
+
+    Returns:
+        np.ndarray: (N,) Von Mises等效应力
+    """
+    s = _as_tensor_stack(stress_tensors)
+    σ_x, σ_y, σ_z = s[:, 0, 0], s[:, 1, 1], s[:, 2, 2]
+    τ_xy, τ_xz, τ_yz = s[:, 0, 1], s[:, 0, 2], s[:, 1, 2]
+    return np.sqrt(0.5 * ((σ_x - σ_y) ** 2 + (σ_y - σ_z) ** 2 + (σ_z - σ_x) ** 2) + 3 * (τ_xy**2 + τ_xz**2 + τ_yz**2))
+
+
+def calculate_principal_stresses_batch(stress_tensors: np.ndarray) -> np.ndarray:
+    """
+    批量计算主应力
+
+    Args:
+        stress_tensors: (N, 3, 3) 应力张量数组
+
+    Returns:
+        np.ndarray: (N, 3) 主应力，每行从大到小排序
+    """
+    # eigvalsh 对整个堆栈一次求解，特征值按升序返回
+    return np.linalg.eigvalsh(_as_tensor_stack(stress_tensors))[:, ::-1]
+
+
 def calculate_safety_factor(
     applied_stress: float,
     material_yield_strength: float,
@@ -87,6 +124,15 @@ def calculate_safety_factor(
     return safety_factor
 
 
+# 有效长度系数
+EFFECTIVE_LENGTH_FACTORS = {
+    "pinned-pinned": 1.0,
+    "fixed-fixed": 0.5,
+    "fixed-pinned": 0.7,
+    "fixed-free": 2.0,
+}
+
+
 def calculate_buckling_load(
     youngs_modulus: float,
     moment_of_inertia: float,
@@ -105,18 +151,10 @@ def calculate_buckling_load(
     Returns:
         float: 临界屈曲载荷 (N)
     """
-    # 有效长度系数
-    k_factors = {
-        "pinned-pinned": 1.0,
-        "fixed-fixed": 0.5,
-        "fixed-pinned": 0.7,
-        "fixed-free": 2.0,
-    }
-
-    if end_condition not in k_factors:
+    if end_condition not in EFFECTIVE_LENGTH_FACTORS:
         raise ValueError(f"不支持的边界条件: {end_condition}")
 
-    k = k_factors[end_condition]
+    k = EFFECTIVE_LENGTH_FACTORS[end_condition]
     effective_length = k * length
 
     # 欧拉屈曲公式
@@ -125,6 +163,26 @@ def calculate_buckling_load(
     return critical_load
 
 
+def calculate_buckling_load_batch(
+    youngs_modulus,
+    moment_of_inertia,
+    length,
+    end_condition: str = "pinned-pinned",
+) -> np.ndarray:
+    """
+    批量计算欧拉屈曲载荷，参数可为标量或数组（按numpy规则广播）
+
+    Returns:
+        np.ndarray: 临界屈曲载荷 (N)
+    """
+    return calculate_buckling_load(
+        np.asarray(youngs_modulus, dtype=np.float64),
+        np.asarray(moment_of_inertia, dtype=np.float64),
+        np.asarray(length, dtype=np.float64),
+        end_condition,
+    )
+
+
 def calculate_deflection(
     load: float,
     length: float,
@@ -158,6 +216,28 @@ def calculate_deflection(
     return formula(load, length, youngs_modulus, moment_of_inertia)
 
 
+def calculate_deflection_batch(
+    load,
+    length,
+    youngs_modulus,
+    moment_of_inertia,
+    load_type: str = "point_center",
+) -> np.ndarray:
+    """
+    批量计算梁的最大挠度，参数可为标量或数组（按numpy规则广播）
+
+    Returns:
+        np.ndarray: 最大挠度 (m)
+    """
+    return calculate_deflection(
+        np.asarray(load, dtype=np.float64),
+        np.asarray(length, dtype=np.float64),
+        np.asarray(youngs_modulus, dtype=np.float64),
+        np.asarray(moment_of_inertia, dtype=np.float64),
+        load_type,
+    )
+
+
 def calc_principal_stresses(
     sigma_x: float,
     sigma_y: float,
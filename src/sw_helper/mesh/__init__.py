@@ -1,4 +1,14 @@
+from .cache import MeshCache, load_mesh_cached
 from .metrics import MeshMetrics
+from .msh_reader import MshMesh, MshReader, read_msh
 from .quality import MeshQualityAnalyzer
 
-__all__ = ["MeshQualityAnalyzer", "MeshMetrics"]
+__all__ = [
+    "MeshQualityAnalyzer",
+    "MeshMetrics",
+    "MeshCache",
+    "load_mesh_cached",
+    "MshMesh",
+    "MshReader",
+    "read_msh",
+]
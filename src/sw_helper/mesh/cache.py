@@ -0,0 +1,217 @@
+"""
+网格二进制缓存模块
+
+以网格文件内容哈希为键，将解析结果（节点坐标、各单元类型连接、物理组）保存为
+``.npy`` 旁路文件，之后的加载直接内存映射，无需再次解析文本。
+
+缓存默认位于网格文件同目录的 ``.mesh_cache/`` 下::
+
+    .mesh_cache/
+        index.json                 # 文件路径 -> (大小, 修改时间, 内容哈希)，用于跳过重复哈希
+                                   # （修改时间过近的文件不记录，见 :mod:`sw_helper.utils.hashing`）
+        <内容哈希>/
+            meta.json
+            nodes.npy, node_tags.npy
+            elements_<类型>_{tags,conn,physical,entity}.npy
+            extra_<名称>.npy        # 派生数据（如质量指标）
+"""
+
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+
+from ..utils.hashing import file_digest, is_settled
+from .msh_reader import MshElementBlock, MshMesh, read_msh
+
+CACHE_DIR_NAME = ".mesh_cache"
+
+# 缓存格式版本，布局变化时递增以使旧缓存失效（2：索引带版本，不记录修改时间过近的文件）
+CACHE_FORMAT_VERSION = 2
+
+_BLOCK_FIELDS = ("element_tags", "connectivity", "physical_tags", "entity_tags")
+_BLOCK_FILES = ("tags", "conn", "physical", "entity")
+
+
+def _load_array(path: Path) -> np.ndarray:
+    try:
+        return np.load(path, mmap_mode="r")
+    except ValueError:
+        # 空数组无法内存映射
+        return np.load(path)
+
+
+class MeshCache:
+    """内容哈希键控的网格缓存
+
+    Args:
+        cache_dir: 缓存根目录，None表示使用网格文件旁的 ``.mesh_cache/``
+    """
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.hits = 0
+        self.misses = 0
+
+    def root_for(self, mesh_file: Path) -> Path:
+        return self.cache_dir if self.cache_dir else mesh_file.parent / CACHE_DIR_NAME
+
+    def content_key(self, mesh_file: Union[str, Path]) -> str:
+        """网格文件内容哈希；文件大小与修改时间未变时直接使用索引中记录的哈希"""
+        mesh_file = Path(mesh_file).resolve()
+        stat = mesh_file.stat()
+        index_file = self.root_for(mesh_file) / "index.json"
+        index = self._read_json(index_file) or {}
+        if index.get("cache_version") != CACHE_FORMAT_VERSION:
+            index = {"cache_version": CACHE_FORMAT_VERSION, "files": {}}
+
+        record = index["files"].get(str(mesh_file))
+        if record and record.get("size") == stat.st_size and record.get("mtime_ns") == stat.st_mtime_ns:
+            return record["hash"]
+
+        hashed_at = time.time_ns()
+        key = file_digest(mesh_file)
+        # 刚写入的文件可能在同一时间戳粒度内再次改写为相同大小，其哈希不写入索引
+        if is_settled(stat.st_mtime_ns, hashed_at):
+            index["files"][str(mesh_file)] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "hash": key}
+            try:
+                self._write_json(index_file, index)
+            except OSError:
+                pass
+        return key
+
+    def entry_dir(self, mesh_file: Union[str, Path]) -> Path:
+        mesh_file = Path(mesh_file).resolve()
+        return self.root_for(mesh_file) / self.content_key(mesh_file)
+
+    def load(self, mesh_file: Union[str, Path]) -> MshMesh:
+        """加载网格：命中缓存时内存映射 .npy，否则解析文件并写入缓存
+
+        Args:
+            mesh_file: .msh 网格文件
+
+        Returns:
+            MshMesh（命中缓存时数组为只读内存映射）
+        """
+        mesh_file = Path(mesh_file)
+        if not mesh_file.exists():
+            raise FileNotFoundError(f"网格文件不存在: {mesh_file}")
+
+        entry = self.entry_dir(mesh_file)
+        mesh = self._load_entry(entry)
+        if mesh is not None:
+            self.hits += 1
+            return mesh
+
+        self.misses += 1
+        mesh = read_msh(mesh_file)
+        try:
+            self._store_entry(entry, mesh)
+        except OSError:
+            # 缓存目录不可写时仍返回解析结果
+            pass
+        return mesh
+
+    def load_extra(self, mesh_file: Union[str, Path], name: str) -> Optional[np.ndarray]:
+        """读取与网格内容关联的派生数组，不存在时返回None"""
+        path = self.entry_dir(mesh_file) / f"extra_{name}.npy"
+        return _load_array(path) if path.exists() else None
+
+    def store_extra(self, mesh_file: Union[str, Path], name: str, array: np.ndarray) -> bool:
+        """保存与网格内容关联的派生数组（网格本身须已缓存）"""
+        entry = self.entry_dir(mesh_file)
+        if not (entry / "meta.json").exists():
+            return False
+        try:
+            tmp = entry / f".extra_{name}.{os.getpid()}.npy"
+            np.save(tmp, np.asarray(array))
+            os.replace(tmp, entry / f"extra_{name}.npy")
+            return True
+        except OSError:
+            return False
+
+    def clear(self, mesh_file: Optional[Union[str, Path]] = None):
+        """清除缓存（指定网格文件时只清除其缓存根目录）"""
+        root = self.cache_dir if mesh_file is None else self.root_for(Path(mesh_file).resolve())
+        if root and root.exists():
+            shutil.rmtree(root, ignore_errors=True)
+
+    # ------------------------------------------------------------------
+
+    def _load_entry(self, entry: Path) -> Optional[MshMesh]:
+        meta = self._read_json(entry / "meta.json")
+        if not meta or meta.get("cache_version") != CACHE_FORMAT_VERSION:
+            return None
+
+        try:
+            blocks = {}
+            for element_type in meta["element_types"]:
+                arrays = [_load_array(entry / f"elements_{element_type}_{name}.npy") for name in _BLOCK_FILES]
+                blocks[element_type] = MshElementBlock(element_type, *arrays)
+            return MshMesh(
+                version=meta["version"],
+                binary=meta["binary"],
+                node_tags=_load_array(entry / "node_tags.npy"),
+                nodes=_load_array(entry / "nodes.npy"),
+                element_blocks=blocks,
+                physical_names={(dim, tag): name for dim, tag, name in meta["physical_names"]},
+            )
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _store_entry(self, entry: Path, mesh: MshMesh):
+        # 先写入临时目录再整体改名，避免并发进程读到不完整的缓存
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        tmp = entry.parent / f".{entry.name}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir()
+        try:
+            np.save(tmp / "nodes.npy", np.ascontiguousarray(mesh.nodes))
+            np.save(tmp / "node_tags.npy", np.ascontiguousarray(mesh.node_tags))
+            for element_type, block in mesh.element_blocks.items():
+                for field_name, name in zip(_BLOCK_FIELDS, _BLOCK_FILES):
+                    array = np.ascontiguousarray(getattr(block, field_name))
+                    np.save(tmp / f"elements_{element_type}_{name}.npy", array)
+
+            meta = {
+                "cache_version": CACHE_FORMAT_VERSION,
+                "version": mesh.version,
+                "binary": mesh.binary,
+                "element_types": sorted(mesh.element_blocks),
+                "physical_names": [[dim, tag, name] for (dim, tag), name in mesh.physical_names.items()],
+            }
+            self._write_json(tmp / "meta.json", meta)
+
+            if entry.exists():
+                shutil.rmtree(entry, ignore_errors=True)
+            os.replace(tmp, entry)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    @staticmethod
+    def _read_json(path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write_json(path: Path, data: Dict[str, Any]):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+
+_default_cache = MeshCache()
+
+
+def load_mesh_cached(mesh_file: Union[str, Path], cache: Optional[MeshCache] = None) -> MshMesh:
+    """通过缓存加载 .msh 网格，参见 :meth:`MeshCache.load`"""
+    return (cache or _default_cache).load(mesh_file)
@@ -0,0 +1,187 @@
+"""
+CalculiX/Abaqus .inp 网格写出模块
+
+节点与单元块直接由NumPy数组成块格式化（每块一次字符串格式化，写入缓冲区），
+不为每个节点/单元单独调用 write，也不构造逐单元的Python元组列表。
+节点和单元保留原始编号（如Gmsh标签），不重新编号。
+"""
+
+from pathlib import Path
+from typing import BinaryIO, Iterable, Optional, Union
+
+import numpy as np
+
+from .msh_reader import MshMesh
+
+# Gmsh单元类型 -> CalculiX单元类型（体单元）
+CALCULIX_ELEMENT_TYPES = {
+    4: "C3D4",
+    5: "C3D8",
+    6: "C3D6",
+    11: "C3D10",
+    17: "C3D20",
+    18: "C3D15",
+}
+
+# Gmsh -> CalculiX 二次单元节点顺序（边中点编号规则不同）
+GMSH_TO_CALCULIX_NODE_ORDER = {
+    11: (0, 1, 2, 3, 4, 5, 6, 7, 9, 8),
+    17: (0, 1, 2, 3, 4, 5, 6, 7, 8, 11, 13, 9, 16, 18, 19, 17, 10, 12, 14, 15),
+    18: (0, 1, 2, 3, 4, 5, 6, 9, 7, 12, 14, 13, 8, 10, 11),
+}
+
+# 单元数据行最多16个数据项，超出部分使用续行
+MAX_ENTRIES_PER_LINE = 16
+
+# 每次格式化的行数
+DEFAULT_CHUNK_SIZE = 65536
+
+
+def _row_format(n_values: int, value_format: str) -> str:
+    """单条记录的格式串（编号 + n_values个值，必要时折行）"""
+    fields = ["%d"] + [value_format] * n_values
+    lines = [fields[i : i + MAX_ENTRIES_PER_LINE] for i in range(0, len(fields), MAX_ENTRIES_PER_LINE)]
+    return ",\n".join(", ".join(line) for line in lines) + "\n"
+
+
+def _write_rows(
+    f: BinaryIO,
+    ids: np.ndarray,
+    values: np.ndarray,
+    value_format: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+):
+    """将 [编号, 值...] 记录成块格式化后写入"""
+    ids = np.asarray(ids)
+    values = np.asarray(values)
+    if values.ndim == 1:
+        values = values[:, np.newaxis]
+    row = _row_format(values.shape[1], value_format)
+    dtype = np.float64 if value_format != "%d" else np.int64
+
+    for start in range(0, len(ids), chunk_size):
+        stop = min(start + chunk_size, len(ids))
+        block = np.empty((stop - start, values.shape[1] + 1), dtype=dtype)
+        block[:, 0] = ids[start:stop]
+        block[:, 1:] = values[start:stop]
+        f.write(((row * (stop - start)) % tuple(block.ravel().tolist())).encode("ascii"))
+
+
+def write_nodes(
+    f: BinaryIO,
+    node_ids: np.ndarray,
+    coords: np.ndarray,
+    nset: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+):
+    """写出 *NODE 块
+
+    Args:
+        f: 以二进制方式打开的文件或缓冲区
+        node_ids: 节点编号 [n]
+        coords: 节点坐标 [n, 3]
+        nset: 节点集名称（可选）
+    """
+    f.write(b"*NODE" + (f", NSET={nset}".encode("ascii") if nset else b"") + b"\n")
+    _write_rows(f, node_ids, coords, "%.12g", chunk_size)
+
+
+def write_elements(
+    f: BinaryIO,
+    element_type: str,
+    element_ids: np.ndarray,
+    connectivity: np.ndarray,
+    elset: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+):
+    """写出 *ELEMENT 块
+
+    Args:
+        f: 以二进制方式打开的文件或缓冲区
+        element_type: CalculiX单元类型（如 C3D8）
+        element_ids: 单元编号 [n]
+        connectivity: 节点编号 [n, nodes_per_elem]
+        elset: 单元集名称（可选）
+    """
+    header = f"*ELEMENT, TYPE={element_type}" + (f", ELSET={elset}" if elset else "")
+    f.write(header.encode("ascii") + b"\n")
+    _write_rows(f, element_ids, connectivity, "%d", chunk_size)
+
+
+def write_set(f: BinaryIO, keyword: str, name: str, ids: Iterable[int], chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """写出 *NSET / *ELSET 块（每行16个编号）
+
+    Args:
+        f: 以二进制方式打开的文件或缓冲区
+        keyword: NSET 或 ELSET
+        name: 集合名称
+        ids: 编号
+    """
+    ids = np.asarray(ids if isinstance(ids, np.ndarray) else list(ids), dtype=np.int64).ravel()
+    f.write(f"*{keyword}, {keyword}={name}\n".encode("ascii"))
+    per_line = MAX_ENTRIES_PER_LINE
+    row = ", ".join(["%d"] * per_line) + "\n"
+    for start in range(0, len(ids), chunk_size * per_line):
+        block = ids[start : start + chunk_size * per_line]
+        n_full = len(block) // per_line
+        text = (row * n_full) % tuple(block[: n_full * per_line].tolist())
+        if len(block) > n_full * per_line:
+            text += ", ".join(str(i) for i in block[n_full * per_line :].tolist()) + "\n"
+        f.write(text.encode("ascii"))
+
+
+def write_msh_as_inp(
+    mesh: MshMesh,
+    output: Union[str, Path, BinaryIO],
+    elset: str = "PART1",
+    material: str = "DEFAULT_MATERIAL",
+    header: str = "",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """将Gmsh网格写为CalculiX .inp网格文件
+
+    只写出体单元（四面体/六面体/三棱柱及其二次单元），节点与单元保留Gmsh标签。
+
+    Args:
+        mesh: :class:`MshMesh`
+        output: 输出路径或二进制文件对象
+        elset: 体单元所属单元集
+        material: 实体截面引用的材料名
+        header: 文件头注释（不含 ``**`` 前缀的多行文本）
+        chunk_size: 每次格式化的行数
+
+    Returns:
+        写出的单元数
+    """
+    if not isinstance(output, (str, Path)):
+        return _write_msh_as_inp(mesh, output, elset, material, header, chunk_size)
+
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "wb", buffering=1 << 20) as f:
+        return _write_msh_as_inp(mesh, f, elset, material, header, chunk_size)
+
+
+def _write_msh_as_inp(mesh, f, elset, material, header, chunk_size) -> int:
+    for line in header.splitlines():
+        f.write(f"** {line}\n".encode("utf-8"))
+    if header:
+        f.write(b"\n")
+
+    write_nodes(f, mesh.node_tags, mesh.nodes, chunk_size=chunk_size)
+
+    written = 0
+    for gmsh_type, block in mesh.element_blocks.items():
+        calculix_type = CALCULIX_ELEMENT_TYPES.get(gmsh_type)
+        if calculix_type is None or len(block) == 0:
+            continue
+        connectivity = block.connectivity
+        order = GMSH_TO_CALCULIX_NODE_ORDER.get(gmsh_type)
+        if order is not None:
+            connectivity = connectivity[:, order]
+        f.write(b"\n")
+        write_elements(f, calculix_type, block.element_tags, connectivity, elset, chunk_size)
+        written += len(block)
+
+    f.write(f"\n*SOLID SECTION, ELSET={elset}, MATERIAL={material}\n".encode("ascii"))
+    return written
@@ -1,12 +1,314 @@
 """
 网格质量指标计算模块
+
+所有指标均以批量方式计算：输入节点坐标数组 ``nodes [n_nodes, 3]`` 与
+连接关系数组 ``connectivity [n_elems, nodes_per_elem]``，一次向量化计算
+全部单元，不对单元做Python循环（仅遍历单元内部固定的边/面/角点表）。
+
+支持的单元类型（节点顺序与Gmsh/CalculiX一致，高阶单元只使用角点）：
+- tet4: 四面体
+- wedge6: 三棱柱
+- hex8: 六面体
 """
 
+from typing import Dict, Iterable, Optional
+
 import numpy as np
 
+# 单元拓扑表：边、面（外法向顺序）、角点邻接节点（右手系）
+ELEMENT_TOPOLOGY: Dict[str, Dict[str, tuple]] = {
+    "tet4": {
+        "corners": 4,
+        "edges": ((0, 1), (1, 2), (2, 0), (0, 3), (1, 3), (2, 3)),
+        "faces": ((0, 2, 1), (0, 1, 3), (1, 2, 3), (0, 3, 2)),
+        "corner_neighbors": ((1, 2, 3), (2, 0, 3), (0, 1, 3), (0, 2, 1)),
+    },
+    "wedge6": {
+        "corners": 6,
+        "edges": ((0, 1), (1, 2), (2, 0), (3, 4), (4, 5), (5, 3), (0, 3), (1, 4), (2, 5)),
+        "faces": ((0, 2, 1), (3, 4, 5), (0, 1, 4, 3), (1, 2, 5, 4), (2, 0, 3, 5)),
+        "corner_neighbors": ((1, 2, 3), (2, 0, 4), (0, 1, 5), (5, 4, 0), (3, 5, 1), (4, 3, 2)),
+    },
+    "hex8": {
+        "corners": 8,
+        "edges": ((0, 1), (1, 2), (2, 3), (3, 0), (4, 5), (5, 6), (6, 7), (7, 4), (0, 4), (1, 5), (2, 6), (3, 7)),
+        "faces": ((0, 3, 2, 1), (4, 5, 6, 7), (0, 1, 5, 4), (1, 2, 6, 5), (2, 3, 7, 6), (3, 0, 4, 7)),
+        "corner_neighbors": ((1, 3, 4), (2, 0, 5), (3, 1, 6), (0, 2, 7), (7, 5, 0), (4, 6, 1), (5, 7, 2), (6, 4, 3)),
+    },
+}
+
+# 按节点数推断单元类型（二次单元取前几个角点）
+ELEMENT_TYPE_BY_NODES = {4: "tet4", 10: "tet4", 6: "wedge6", 15: "wedge6", 8: "hex8", 20: "hex8"}
+
+# 缩放雅可比归一化系数（使理想单元取值为1）
+_JACOBIAN_SCALE = {"tet4": np.sqrt(2.0), "wedge6": 2.0 / np.sqrt(3.0), "hex8": 1.0}
+
+AVAILABLE_METRICS = (
+    "aspect_ratio",
+    "skewness",
+    "jacobian",
+    "orthogonal_quality",
+    "volume",
+    "element_size",
+)
+
+# 单次处理的单元数，限制临时数组内存（hex8约50MB/块）
+DEFAULT_CHUNK_SIZE = 262144
+
+
+def _hex_quadrature():
+    """六面体2x2x2高斯积分点的形函数导数 [n_qp, 3, 8] 与权重"""
+    g = 1.0 / np.sqrt(3.0)
+    signs = np.array(
+        [[-1, -1, -1], [1, -1, -1], [1, 1, -1], [-1, 1, -1], [-1, -1, 1], [1, -1, 1], [1, 1, 1], [-1, 1, 1]],
+        dtype=float,
+    )
+    points = signs * g
+    derivs = np.empty((len(points), 3, 8))
+    for q, (xi, eta, zeta) in enumerate(points):
+        derivs[q, 0] = signs[:, 0] * (1 + signs[:, 1] * eta) * (1 + signs[:, 2] * zeta) / 8
+        derivs[q, 1] = signs[:, 1] * (1 + signs[:, 0] * xi) * (1 + signs[:, 2] * zeta) / 8
+        derivs[q, 2] = signs[:, 2] * (1 + signs[:, 0] * xi) * (1 + signs[:, 1] * eta) / 8
+    return derivs, np.ones(len(points))
+
+
+def _wedge_quadrature():
+    """三棱柱 3x2 积分点的形函数导数 [n_qp, 3, 6] 与权重"""
+    tri = ((1 / 6, 1 / 6), (2 / 3, 1 / 6), (1 / 6, 2 / 3))
+    g = 1.0 / np.sqrt(3.0)
+    derivs = []
+    for r, s in tri:
+        for zeta in (-g, g):
+            lo, hi = (1 - zeta) / 2, (1 + zeta) / 2
+            tri_n = np.array([1 - r - s, r, s])
+            d = np.zeros((3, 6))
+            d[0, :3], d[0, 3:] = np.array([-1.0, 1.0, 0.0]) * lo, np.array([-1.0, 1.0, 0.0]) * hi
+            d[1, :3], d[1, 3:] = np.array([-1.0, 0.0, 1.0]) * lo, np.array([-1.0, 0.0, 1.0]) * hi
+            d[2, :3], d[2, 3:] = -tri_n / 2, tri_n / 2
+            derivs.append(d)
+    return np.array(derivs), np.full(6, 1 / 6)
+
+
+_QUADRATURE = {"hex8": _hex_quadrature(), "wedge6": _wedge_quadrature()}
+
+
+def _dot(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """分量形式点积，向量形状 [3, ...]"""
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+
+
+def _cross(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """分量形式叉积，向量形状 [3, ...]"""
+    return np.stack((a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2], a[0] * b[1] - a[1] * b[0]))
+
+
+def _det3(a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+    """批量计算 det([a, b, c])"""
+    return _dot(a, _cross(b, c))
+
+
+def _norm(v: np.ndarray) -> np.ndarray:
+    return np.sqrt(_dot(v, v))
+
+
+def gather_components(nodes: np.ndarray, connectivity: np.ndarray) -> np.ndarray:
+    """按连接关系取出单元角点坐标，返回分量布局 [3, n_corners, n_elems]
+
+    分量布局使同一角点的坐标连续存储，后续逐角点/逐面的运算都是连续内存访问。
+    """
+    return np.asarray(nodes, dtype=np.float64).T[:, np.asarray(connectivity).T]
+
+
+def resolve_element_type(nodes_per_elem: int, element_type: Optional[str] = None) -> str:
+    """根据节点数解析单元类型"""
+    if element_type is not None:
+        if element_type not in ELEMENT_TOPOLOGY:
+            raise ValueError(f"不支持的单元类型: {element_type}")
+        return element_type
+    if nodes_per_elem not in ELEMENT_TYPE_BY_NODES:
+        raise ValueError(f"无法识别节点数为 {nodes_per_elem} 的单元")
+    return ELEMENT_TYPE_BY_NODES[nodes_per_elem]
+
+
+def _build_edge_lookup(element_type: str) -> Dict[tuple, tuple]:
+    """(起点, 终点) -> (边序号, 方向符号)"""
+    lookup = {}
+    for idx, (i, j) in enumerate(ELEMENT_TOPOLOGY[element_type]["edges"]):
+        lookup[(i, j)] = (idx, 1.0)
+        lookup[(j, i)] = (idx, -1.0)
+    return lookup
+
+
+_EDGE_LOOKUP = {name: _build_edge_lookup(name) for name in ELEMENT_TOPOLOGY}
+
+
+def edge_vectors(c: np.ndarray, element_type: str):
+    """单元各边长度 [n_edges, n_elems] 与单位方向向量 [3, n_edges, n_elems]"""
+    edges = np.array(ELEMENT_TOPOLOGY[element_type]["edges"])
+    vectors = c[:, edges[:, 1]] - c[:, edges[:, 0]]
+    lengths = _norm(vectors)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        units = np.where(lengths > 0, vectors / lengths, 0.0)
+    return lengths, units
+
+
+def _unit(units: np.ndarray, element_type: str, start: int, end: int) -> np.ndarray:
+    idx, sign = _EDGE_LOOKUP[element_type][(start, end)]
+    return units[:, idx] if sign > 0 else -units[:, idx]
+
+
+def element_volume(c: np.ndarray, element_type: str) -> np.ndarray:
+    """单元体积 [n_elems]，c 为分量布局坐标 [3, n_corners, n_elems]"""
+    if element_type == "tet4":
+        return _det3(c[:, 1] - c[:, 0], c[:, 2] - c[:, 0], c[:, 3] - c[:, 0]) / 6.0
+    derivs, weights = _QUADRATURE[element_type]
+    n_qp, _, n_corners = derivs.shape
+    # 一次矩阵乘得到全部积分点的雅可比列: jac[q*3+i, j, e] = sum_n dN[q, i, n] * x_j[n, e]
+    flat = np.moveaxis(c, 1, 0).reshape(n_corners, -1)
+    jac = (derivs.reshape(n_qp * 3, n_corners) @ flat).reshape(n_qp, 3, 3, -1)
+    volume = np.zeros(c.shape[2])
+    for q, weight in enumerate(weights):
+        volume += weight * _det3(jac[q, 0], jac[q, 1], jac[q, 2])
+    return volume
+
+
+def scaled_jacobian(c: np.ndarray, element_type: str, edges=None) -> np.ndarray:
+    """缩放雅可比（各角点单位棱向量行列式的最小值，理想单元为1，反转单元为负）"""
+    _, units = edges if edges is not None else edge_vectors(c, element_type)
+    result = np.full(c.shape[2], np.inf)
+    for corner, (a, b, d) in enumerate(ELEMENT_TOPOLOGY[element_type]["corner_neighbors"]):
+        value = _det3(
+            _unit(units, element_type, corner, a),
+            _unit(units, element_type, corner, b),
+            _unit(units, element_type, corner, d),
+        )
+        np.minimum(result, value, out=result)
+    return np.clip(result * _JACOBIAN_SCALE[element_type], -1.0, 1.0)
+
+
+def aspect_ratio_from_edges(lengths: np.ndarray) -> np.ndarray:
+    """长宽比（最长边/最短边），lengths 形状 [n_edges, n_elems]"""
+    shortest = lengths.min(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(shortest > 0, lengths.max(axis=0) / shortest, np.inf)
+
+
+def equiangular_skewness(c: np.ndarray, element_type: str, edges=None) -> np.ndarray:
+    """等角偏斜度：max((θmax-θe)/(180-θe), (θe-θmin)/θe)，0为最佳"""
+    _, units = edges if edges is not None else edge_vectors(c, element_type)
+    result = np.zeros(c.shape[2])
+    for face in ELEMENT_TOPOLOGY[element_type]["faces"]:
+        n = len(face)
+        cos_min = np.full(c.shape[2], np.inf)
+        cos_max = np.full(c.shape[2], -np.inf)
+        for k in range(n):
+            cos = _dot(
+                _unit(units, element_type, face[k], face[k - 1]),
+                _unit(units, element_type, face[k], face[(k + 1) % n]),
+            )
+            np.minimum(cos_min, cos, out=cos_min)
+            np.maximum(cos_max, cos, out=cos_max)
+        # arccos单调递减：最大角对应最小余弦
+        theta_max = np.degrees(np.arccos(np.clip(cos_min, -1.0, 1.0)))
+        theta_min = np.degrees(np.arccos(np.clip(cos_max, -1.0, 1.0)))
+        theta_e = 60.0 if n == 3 else 90.0
+        skew = np.maximum((theta_max - theta_e) / (180.0 - theta_e), (theta_e - theta_min) / theta_e)
+        np.maximum(result, skew, out=result)
+    return result
+
+
+def orthogonal_quality(c: np.ndarray, element_type: str) -> np.ndarray:
+    """正交质量：各面面积向量与单元形心→面形心向量夹角余弦的最小值（0-1，1为最佳）
+
+    仅使用单元自身信息（不含相邻单元形心项）。
+    """
+    centroid = c.mean(axis=1)
+    result = np.ones(c.shape[2])
+    for face in ELEMENT_TOPOLOGY[element_type]["faces"]:
+        if len(face) == 3:
+            p0, p1, p2 = (c[:, i] for i in face)
+            area = _cross(p1 - p0, p2 - p0)
+            to_face = (p0 + p1 + p2) / 3.0 - centroid
+        else:
+            p0, p1, p2, p3 = (c[:, i] for i in face)
+            area = _cross(p2 - p0, p3 - p1)
+            to_face = (p0 + p1 + p2 + p3) / 4.0 - centroid
+        denom = _norm(area) * _norm(to_face)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cos = np.where(denom > 0, _dot(area, to_face) / denom, 0.0)
+        np.minimum(result, cos, out=result)
+    return np.clip(result, 0.0, 1.0)
+
+
+def compute_metrics_batch(
+    nodes: np.ndarray,
+    connectivity: np.ndarray,
+    metrics: Optional[Iterable[str]] = None,
+    element_type: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Dict[str, np.ndarray]:
+    """批量计算一组同类型单元的质量指标
+
+    Args:
+        nodes: 节点坐标 [n_nodes, 3]
+        connectivity: 单元连接（0起始的节点索引）[n_elems, nodes_per_elem]
+        metrics: 要计算的指标，None表示全部
+        element_type: 单元类型（tet4/wedge6/hex8），None时按节点数推断
+        chunk_size: 每块处理的单元数
+
+    Returns:
+        {指标名: [n_elems] 数组}
+    """
+    nodes = np.asarray(nodes, dtype=np.float64)
+    connectivity = np.asarray(connectivity)
+    if connectivity.ndim != 2:
+        raise ValueError("连接数组必须是二维 [n_elems, nodes_per_elem]")
+
+    element_type = resolve_element_type(connectivity.shape[1], element_type)
+    n_corners = ELEMENT_TOPOLOGY[element_type]["corners"]
+    requested = list(AVAILABLE_METRICS if metrics is None else metrics)
+    unknown = set(requested) - set(AVAILABLE_METRICS)
+    if unknown:
+        raise ValueError(f"未知的网格指标: {sorted(unknown)}")
+
+    n_elems = len(connectivity)
+    results = {name: np.empty(n_elems) for name in requested}
+
+    for start in range(0, n_elems, max(1, chunk_size)):
+        stop = min(start + chunk_size, n_elems)
+        c = gather_components(nodes, connectivity[start:stop, :n_corners])
+
+        edges = None
+        if results.keys() & {"aspect_ratio", "element_size", "skewness", "jacobian"}:
+            edges = edge_vectors(c, element_type)
+        if "aspect_ratio" in results:
+            results["aspect_ratio"][start:stop] = aspect_ratio_from_edges(edges[0])
+        if "element_size" in results:
+            results["element_size"][start:stop] = edges[0].mean(axis=0)
+        if "skewness" in results:
+            results["skewness"][start:stop] = equiangular_skewness(c, element_type, edges)
+        if "jacobian" in results:
+            results["jacobian"][start:stop] = scaled_jacobian(c, element_type, edges)
+        if "orthogonal_quality" in results:
+            results["orthogonal_quality"][start:stop] = orthogonal_quality(c, element_type)
+        if "volume" in results:
+            results["volume"][start:stop] = element_volume(c, element_type)
+
+    return results
+
 
 class MeshMetrics:
-    """网格质量指标计算"""
+    """网格质量指标计算
+
+    单元级方法接收单个单元的节点坐标 [n_nodes, 3]；
+    整网格计算请使用 :meth:`compute_batch`。
+    """
+
+    @staticmethod
+    def _single(element: np.ndarray, metric: str) -> float:
+        element = np.asarray(element, dtype=np.float64)
+        connectivity = np.arange(len(element))[np.newaxis, :]
+        return float(compute_metrics_batch(element, connectivity, [metric])[metric][0])
 
     @staticmethod
     def aspect_ratio(element: np.ndarray) -> float:
@@ -16,10 +318,9 @@ class MeshMetrics:
             element: 单元节点坐标 [n_nodes, 3]
 
         Returns:
-            长宽比值
+            长宽比值（最长边/最短边，1为最佳）
         """
-        # TODO: 实现长宽比计算
-        return 1.0
+        return MeshMetrics._single(element, "aspect_ratio")
 
     @staticmethod
     def skewness(element: np.ndarray) -> float:
@@ -31,8 +332,7 @@ class MeshMetrics:
         Returns:
             偏斜度值（0-1，0为最佳）
         """
-        # TODO: 实现偏斜度计算
-        return 0.0
+        return MeshMetrics._single(element, "skewness")
 
     @staticmethod
     def jacobian(element: np.ndarray) -> float:
@@ -42,10 +342,9 @@ class MeshMetrics:
             element: 单元节点坐标
 
         Returns:
-            雅可比值
+            缩放雅可比值（-1~1，1为最佳，≤0表示单元反转）
         """
-        # TODO: 实现雅可比计算
-        return 1.0
+        return MeshMetrics._single(element, "jacobian")
 
     @staticmethod
     def orthogonal_quality(element: np.ndarray) -> float:
@@ -57,8 +356,7 @@ class MeshMetrics:
         Returns:
             正交质量值（0-1，1为最佳）
         """
-        # TODO: 实现正交质量计算
-        return 1.0
+        return MeshMetrics._single(element, "orthogonal_quality")
 
     @staticmethod
     def volume(element: np.ndarray) -> float:
@@ -70,16 +368,24 @@ class MeshMetrics:
         Returns:
             体积值
         """
-        # TODO: 实现体积计算
-        return 0.0
+        return MeshMetrics._single(element, "volume")
 
     @classmethod
     def compute_all(cls, element: np.ndarray) -> dict:
         """计算所有指标"""
-        return {
-            "aspect_ratio": cls.aspect_ratio(element),
-            "skewness": cls.skewness(element),
-            "jacobian": cls.jacobian(element),
-            "orthogonal_quality": cls.orthogonal_quality(element),
-            "volume": cls.volume(element),
-        }
+        element = np.asarray(element, dtype=np.float64)
+        connectivity = np.arange(len(element))[np.newaxis, :]
+        batch = compute_metrics_batch(element, connectivity)
+        names = ("aspect_ratio", "skewness", "jacobian", "orthogonal_quality", "volume")
+        return {name: float(batch[name][0]) for name in names}
+
+    @staticmethod
+    def compute_batch(
+        nodes: np.ndarray,
+        connectivity: np.ndarray,
+        metrics: Optional[Iterable[str]] = None,
+        element_type: Optional[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Dict[str, np.ndarray]:
+        """批量计算整网格的质量指标，参见 :func:`compute_metrics_batch`"""
+        return compute_metrics_batch(nodes, connectivity, metrics, element_type, chunk_size)
@@ -0,0 +1,539 @@
+"""
+Gmsh .msh 网格文件读取模块
+
+流式读取 MSH 2.2 / 4.1 格式（ASCII与二进制），节点与单元数据按块直接解析为
+NumPy类型数组，不整体读入文件、不依赖gmsh运行时。内存占用约等于结果数组本身
+加上一个解析块（默认 65536 行/记录）。
+
+节点以Gmsh原始标签保存，单元连接同样保存节点标签；需要0起始索引时使用
+:meth:`MshMesh.node_indices` 转换。
+"""
+
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+# Gmsh单元类型编号 -> (名称, 节点数, 维度)
+GMSH_ELEMENT_TYPES: Dict[int, Tuple[str, int, int]] = {
+    1: ("line2", 2, 1),
+    2: ("tri3", 3, 2),
+    3: ("quad4", 4, 2),
+    4: ("tet4", 4, 3),
+    5: ("hex8", 8, 3),
+    6: ("wedge6", 6, 3),
+    7: ("pyramid5", 5, 3),
+    8: ("line3", 3, 1),
+    9: ("tri6", 6, 2),
+    10: ("quad9", 9, 2),
+    11: ("tet10", 10, 3),
+    12: ("hex27", 27, 3),
+    13: ("wedge18", 18, 3),
+    14: ("pyramid14", 14, 3),
+    15: ("point1", 1, 0),
+    16: ("quad8", 8, 2),
+    17: ("hex20", 20, 3),
+    18: ("wedge15", 15, 3),
+    19: ("pyramid13", 13, 3),
+}
+
+# Gmsh单元类型 -> 质量指标使用的单元类型（高阶单元取角点）
+GMSH_TO_METRIC_TYPE = {4: "tet4", 11: "tet4", 5: "hex8", 17: "hex8", 6: "wedge6", 18: "wedge6"}
+
+SUPPORTED_VERSIONS = ("2.2", "4.1")
+
+# 单次解析的行数/记录数
+DEFAULT_CHUNK_SIZE = 65536
+
+
+class MshFormatError(ValueError):
+    """MSH文件格式错误"""
+
+
+@dataclass
+class MshElementBlock:
+    """同一类型的一组单元"""
+
+    element_type: int
+    element_tags: np.ndarray  # [n_elems] int64
+    connectivity: np.ndarray  # [n_elems, nodes_per_elem] int64，节点标签
+    physical_tags: np.ndarray  # [n_elems] int64，0表示无物理组
+    entity_tags: np.ndarray  # [n_elems] int64，几何实体标签
+
+    @property
+    def name(self) -> str:
+        return GMSH_ELEMENT_TYPES[self.element_type][0]
+
+    @property
+    def dim(self) -> int:
+        return GMSH_ELEMENT_TYPES[self.element_type][2]
+
+    def __len__(self) -> int:
+        return len(self.element_tags)
+
+
+@dataclass
+class MshMesh:
+    """MSH文件读取结果"""
+
+    version: str
+    binary: bool
+    node_tags: np.ndarray  # [n_nodes] int64
+    nodes: np.ndarray  # [n_nodes, 3] float64
+    element_blocks: Dict[int, MshElementBlock] = field(default_factory=dict)
+    physical_names: Dict[Tuple[int, int], str] = field(default_factory=dict)
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.node_tags)
+
+    @property
+    def num_elements(self) -> int:
+        return sum(len(block) for block in self.element_blocks.values())
+
+    def element_counts(self) -> Dict[str, int]:
+        """{单元类型名称: 数量}"""
+        return {block.name: len(block) for block in self.element_blocks.values()}
+
+    def node_indices(self, tags: np.ndarray) -> np.ndarray:
+        """将节点标签数组转换为 nodes 数组中的0起始索引（形状不变）"""
+        tags = np.asarray(tags, dtype=np.int64)
+        node_tags = self.node_tags
+        if len(node_tags) == 0:
+            if tags.size:
+                raise MshFormatError("单元引用了不存在的节点")
+            return tags.copy()
+
+        max_tag = int(node_tags.max())
+        if max_tag <= 4 * len(node_tags) + 1024:
+            # 标签较紧凑时使用直接查找表
+            lookup = np.full(max_tag + 1, -1, dtype=np.int64)
+            lookup[node_tags] = np.arange(len(node_tags), dtype=np.int64)
+            valid = (tags >= 0) & (tags <= max_tag)
+            indices = np.where(valid, lookup[np.where(valid, tags, 0)], -1)
+        else:
+            order = np.argsort(node_tags, kind="stable")
+            pos = np.searchsorted(node_tags, tags, sorter=order)
+            pos = np.minimum(pos, len(order) - 1)
+            indices = np.where(node_tags[order[pos]] == tags, order[pos], -1)
+
+        if indices.size and indices.min() < 0:
+            raise MshFormatError("单元引用了不存在的节点")
+        return indices
+
+    def volume_cells(self) -> Dict[str, np.ndarray]:
+        """体单元连接（0起始索引），按质量指标单元类型分组，高阶单元只保留角点"""
+        corners = {"tet4": 4, "wedge6": 6, "hex8": 8}
+        cells: Dict[str, List[np.ndarray]] = {}
+        for element_type, block in self.element_blocks.items():
+            metric_type = GMSH_TO_METRIC_TYPE.get(element_type)
+            if metric_type is None or len(block) == 0:
+                continue
+            conn = block.connectivity[:, : corners[metric_type]]
+            cells.setdefault(metric_type, []).append(self.node_indices(conn))
+        return {key: np.concatenate(parts) for key, parts in cells.items()}
+
+
+class _BlockBuilder:
+    """按单元类型累积解析块，结束时一次拼接"""
+
+    def __init__(self):
+        self._parts: Dict[int, List[Tuple[np.ndarray, ...]]] = {}
+
+    def add(self, element_type: int, tags, conn, physical, entity):
+        self._parts.setdefault(element_type, []).append((tags, conn, physical, entity))
+
+    def build(self) -> Dict[int, MshElementBlock]:
+        blocks = {}
+        for element_type in sorted(self._parts):
+            parts = self._parts[element_type]
+            columns = [np.concatenate([p[i] for p in parts]) if len(parts) > 1 else parts[0][i] for i in range(4)]
+            blocks[element_type] = MshElementBlock(element_type, *columns)
+        return blocks
+
+
+def _nodes_per_element(element_type: int) -> int:
+    if element_type not in GMSH_ELEMENT_TYPES:
+        raise MshFormatError(f"不支持的Gmsh单元类型: {element_type}")
+    return GMSH_ELEMENT_TYPES[element_type][1]
+
+
+def _parse_ascii(data: bytes, dtype, count: Optional[int] = None) -> np.ndarray:
+    """将空白分隔的ASCII数字块解析为一维数组
+
+    Args:
+        data: ASCII数据块
+        dtype: 数值类型（整数类型遇到小数或非数字时报错）
+        count: 期望的数值个数（None 不检查）
+    """
+    try:
+        values = np.array(data.split(), dtype=dtype)
+    except ValueError as e:
+        raise MshFormatError(f"无法解析的数值数据: {e}") from e
+    if count is not None and values.size != count:
+        raise MshFormatError(f"数值个数 {values.size} 与预期的 {count} 不符")
+    return values
+
+
+class MshReader:
+    """流式 .msh 读取器
+
+    用法::
+
+        mesh = MshReader("part.msh").read()
+        mesh.nodes, mesh.element_blocks[4].connectivity
+    """
+
+    def __init__(self, file_path: Union[str, Path], chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.file_path = Path(file_path)
+        self.chunk_size = max(1, int(chunk_size))
+
+        self.version = ""
+        self.binary = False
+        self._size_t = np.dtype("<u8")
+        self._int = np.dtype("<i4")
+        self._double = np.dtype("<f8")
+
+    def read(self) -> MshMesh:
+        """读取整个文件
+
+        Returns:
+            MshMesh
+
+        Raises:
+            FileNotFoundError: 文件不存在
+            MshFormatError: 格式错误或版本不受支持
+        """
+        if not self.file_path.exists():
+            raise FileNotFoundError(f"网格文件不存在: {self.file_path}")
+
+        node_tags = np.empty(0, dtype=np.int64)
+        nodes = np.empty((0, 3))
+        builder = _BlockBuilder()
+        physical_names: Dict[Tuple[int, int], str] = {}
+        entity_physicals: Dict[Tuple[int, int], int] = {}
+
+        with open(self.file_path, "rb") as f:
+            while True:
+                line = f.readline()
+                if not line:
+                    break
+                section = line.strip()
+                if not section.startswith(b"$") or section.startswith(b"$End"):
+                    continue
+
+                name = section[1:].decode("ascii", errors="replace")
+                if name == "MeshFormat":
+                    self._read_format(f)
+                elif not self.version:
+                    raise MshFormatError("缺少 $MeshFormat 段")
+                elif name == "PhysicalNames":
+                    physical_names = self._read_physical_names(f)
+                elif name == "Entities" and self.version == "4.1":
+                    entity_physicals = self._read_entities(f)
+                elif name == "Nodes":
+                    node_tags, nodes = self._read_nodes(f)
+                elif name == "Elements":
+                    self._read_elements(f, builder, entity_physicals)
+                else:
+                    self._skip_section(f, name)
+                    continue
+                self._expect_end(f, name)
+
+        if not self.version:
+            raise MshFormatError("缺少 $MeshFormat 段")
+
+        return MshMesh(
+            version=self.version,
+            binary=self.binary,
+            node_tags=node_tags,
+            nodes=nodes,
+            element_blocks=builder.build(),
+            physical_names=physical_names,
+        )
+
+    # ------------------------------------------------------------------
+    # 通用段处理
+    # ------------------------------------------------------------------
+
+    def _read_format(self, f: BinaryIO):
+        parts = f.readline().split()
+        if len(parts) < 3:
+            raise MshFormatError("$MeshFormat 段格式错误")
+        version = parts[0].decode("ascii")
+        if version not in SUPPORTED_VERSIONS:
+            raise MshFormatError(f"不支持的MSH版本: {version}（支持 {', '.join(SUPPORTED_VERSIONS)}）")
+        self.version = version
+        self.binary = parts[1] == b"1"
+        data_size = int(parts[2])
+        if data_size not in (4, 8):
+            raise MshFormatError(f"不支持的数据大小: {data_size}")
+
+        if self.binary:
+            one = f.read(4)
+            if len(one) != 4:
+                raise MshFormatError("二进制字节序标记缺失")
+            endian = "<" if np.frombuffer(one, dtype="<i4")[0] == 1 else ">"
+            self._size_t = np.dtype(f"{endian}u{data_size}")
+            self._int = np.dtype(f"{endian}i4")
+            self._double = np.dtype(f"{endian}f8")
+
+    @staticmethod
+    def _expect_end(f: BinaryIO, name: str):
+        end = b"$End" + name.encode("ascii")
+        while True:
+            line = f.readline()
+            if not line:
+                raise MshFormatError(f"缺少 {end.decode()}")
+            stripped = line.strip()
+            if stripped == end:
+                return
+            if stripped:
+                raise MshFormatError(f"{name} 段数据与声明的数量不符")
+
+    @staticmethod
+    def _skip_section(f: BinaryIO, name: str):
+        end = b"$End" + name.encode("ascii", errors="replace")
+        for line in f:
+            if line.strip() == end:
+                return
+
+    @staticmethod
+    def _read_physical_names(f: BinaryIO) -> Dict[Tuple[int, int], str]:
+        count = int(f.readline())
+        names = {}
+        for _ in range(count):
+            dim, tag, name = f.readline().decode("utf-8").strip().split(maxsplit=2)
+            names[(int(dim), int(tag))] = name.strip('"')
+        return names
+
+    # ------------------------------------------------------------------
+    # 数据读取原语
+    # ------------------------------------------------------------------
+
+    def _ascii_numbers(self, f: BinaryIO, n_lines: int, dtype=np.float64, count: Optional[int] = None) -> np.ndarray:
+        data = b"".join(islice(f, n_lines))
+        return _parse_ascii(data, dtype, count)
+
+    def _ascii_header(self, f: BinaryIO) -> List[int]:
+        line = f.readline()
+        while line and not line.strip():
+            line = f.readline()
+        return [int(v) for v in line.split()]
+
+    def _binary(self, f: BinaryIO, dtype: np.dtype, count: int) -> np.ndarray:
+        nbytes = dtype.itemsize * count
+        data = f.read(nbytes)
+        if len(data) != nbytes:
+            raise MshFormatError("二进制数据意外结束")
+        return np.frombuffer(data, dtype=dtype, count=count)
+
+    def _binary_size(self, f: BinaryIO, count: int = 1) -> List[int]:
+        return [int(v) for v in self._binary(f, self._size_t, count)]
+
+    # ------------------------------------------------------------------
+    # $Entities（4.1）：几何实体 -> 物理组
+    # ------------------------------------------------------------------
+
+    def _read_entities(self, f: BinaryIO) -> Dict[Tuple[int, int], int]:
+        """返回 {(维度, 实体标签): 第一个物理组标签}"""
+        mapping = {}
+        if not self.binary:
+            counts = self._ascii_header(f)
+            for dim, count in enumerate(counts):
+                for _ in range(count):
+                    values = f.readline().split()
+                    tag = int(values[0])
+                    offset = 4 if dim == 0 else 7
+                    n_physical = int(values[offset])
+                    if n_physical:
+                        mapping[(dim, tag)] = int(values[offset + 1])
+            return mapping
+
+        counts = self._binary_size(f, 4)
+        for dim, count in enumerate(counts):
+            for _ in range(count):
+                tag = int(self._binary(f, self._int, 1)[0])
+                self._binary(f, self._double, 3 if dim == 0 else 6)
+                n_physical = self._binary_size(f)[0]
+                physical = self._binary(f, self._int, n_physical)
+                if n_physical:
+                    mapping[(dim, tag)] = int(physical[0])
+                if dim > 0:
+                    n_bounding = self._binary_size(f)[0]
+                    self._binary(f, self._int, n_bounding)
+        return mapping
+
+    # ------------------------------------------------------------------
+    # $Nodes
+    # ------------------------------------------------------------------
+
+    def _read_nodes(self, f: BinaryIO) -> Tuple[np.ndarray, np.ndarray]:
+        if self.version == "2.2":
+            return self._read_nodes_v2(f)
+        return self._read_nodes_v4(f)
+
+    def _read_nodes_v2(self, f: BinaryIO):
+        count = self._ascii_header(f)[0]
+        tags = np.empty(count, dtype=np.int64)
+        coords = np.empty((count, 3))
+        record = np.dtype([("tag", self._int), ("xyz", self._double, 3)])
+
+        for start in range(0, count, self.chunk_size):
+            n = min(self.chunk_size, count - start)
+            if self.binary:
+                chunk = self._binary(f, record, n)
+                tags[start : start + n] = chunk["tag"]
+                coords[start : start + n] = chunk["xyz"]
+            else:
+                values = self._ascii_numbers(f, n, count=n * 4).reshape(n, 4)
+                tags[start : start + n] = values[:, 0]
+                coords[start : start + n] = values[:, 1:]
+
+        return tags, coords
+
+    def _read_nodes_v4(self, f: BinaryIO):
+        if self.binary:
+            n_blocks, count, _, _ = self._binary_size(f, 4)
+        else:
+            n_blocks, count = self._ascii_header(f)[:2]
+        tags = np.empty(count, dtype=np.int64)
+        coords = np.empty((count, 3))
+
+        filled = 0
+        for _ in range(n_blocks):
+            if self.binary:
+                dim, _, parametric = (int(v) for v in self._binary(f, self._int, 3))
+                n = self._binary_size(f)[0]
+            else:
+                dim, _, parametric, n = self._ascii_header(f)
+            width = 3 + (dim if parametric else 0)
+            if filled + n > count:
+                raise MshFormatError("$Nodes 块节点数超过声明的总数")
+
+            for start in range(0, n, self.chunk_size):
+                m = min(self.chunk_size, n - start)
+                if self.binary:
+                    block_tags = self._binary(f, self._size_t, m)
+                else:
+                    block_tags = self._ascii_numbers(f, m, np.int64, count=m)
+                tags[filled + start : filled + start + m] = block_tags
+            for start in range(0, n, self.chunk_size):
+                m = min(self.chunk_size, n - start)
+                if self.binary:
+                    values = self._binary(f, self._double, m * width)
+                else:
+                    values = self._ascii_numbers(f, m, count=m * width)
+                coords[filled + start : filled + start + m] = values.reshape(m, width)[:, :3]
+            filled += n
+
+        if filled != count:
+            raise MshFormatError("$Nodes 节点数与声明的总数不符")
+        return tags, coords
+
+    # ------------------------------------------------------------------
+    # $Elements
+    # ------------------------------------------------------------------
+
+    def _read_elements(self, f: BinaryIO, builder: _BlockBuilder, entity_physicals: Dict[Tuple[int, int], int]):
+        if self.version == "4.1":
+            self._read_elements_v4(f, builder, entity_physicals)
+        elif self.binary:
+            self._read_elements_v2_binary(f, builder)
+        else:
+            self._read_elements_v2_ascii(f, builder)
+
+    def _read_elements_v4(self, f: BinaryIO, builder: _BlockBuilder, entity_physicals):
+        if self.binary:
+            n_blocks = self._binary_size(f, 4)[0]
+        else:
+            n_blocks = self._ascii_header(f)[0]
+
+        for _ in range(n_blocks):
+            if self.binary:
+                dim, entity, element_type = (int(v) for v in self._binary(f, self._int, 3))
+                n = self._binary_size(f)[0]
+            else:
+                dim, entity, element_type, n = self._ascii_header(f)
+            width = 1 + _nodes_per_element(element_type)
+            physical = entity_physicals.get((dim, entity), 0)
+
+            for start in range(0, n, self.chunk_size):
+                m = min(self.chunk_size, n - start)
+                if self.binary:
+                    values = self._binary(f, self._size_t, m * width)
+                else:
+                    values = self._ascii_numbers(f, m, np.int64)
+                if values.size != m * width:
+                    raise MshFormatError("$Elements 单元数据长度与单元类型不符")
+                values = values.reshape(m, width).astype(np.int64)
+                builder.add(
+                    element_type,
+                    values[:, 0],
+                    values[:, 1:],
+                    np.full(m, physical, dtype=np.int64),
+                    np.full(m, entity, dtype=np.int64),
+                )
+
+    def _read_elements_v2_binary(self, f: BinaryIO, builder: _BlockBuilder):
+        count = self._ascii_header(f)[0]
+        read = 0
+        while read < count:
+            element_type, n_follow, n_tags = (int(v) for v in self._binary(f, self._int, 3))
+            width = 1 + n_tags + _nodes_per_element(element_type)
+            for start in range(0, n_follow, self.chunk_size):
+                m = min(self.chunk_size, n_follow - start)
+                values = self._binary(f, self._int, m * width).reshape(m, width).astype(np.int64)
+                self._add_v2_records(builder, element_type, n_tags, values)
+            read += n_follow
+
+    def _read_elements_v2_ascii(self, f: BinaryIO, builder: _BlockBuilder):
+        """ASCII 2.2 单元行长度随类型/标签数变化，按块分词后向量化分组"""
+        count = self._ascii_header(f)[0]
+        for start in range(0, count, self.chunk_size):
+            m = min(self.chunk_size, count - start)
+            data = b"".join(islice(f, m))
+            values = _parse_ascii(data, np.int64)
+
+            # 每行的词数：词首 = 非空白且前一字符为空白
+            raw = np.frombuffer(data, dtype=np.uint8)
+            blank = (raw == 32) | (raw == 9) | (raw == 13) | (raw == 10)
+            starts = ~blank & np.concatenate(([True], blank[:-1]))
+            line_of_char = np.cumsum(raw == 10) - (raw == 10)
+            per_line = np.bincount(line_of_char[starts], minlength=m)[:m]
+            if per_line.sum() != values.size:
+                raise MshFormatError("$Elements 段包含无法解析的数据")
+            offsets = np.cumsum(per_line) - per_line
+
+            types = values[offsets + 1]
+            n_tags = values[offsets + 2]
+            for element_type, tag_count in sorted(set(zip(types.tolist(), n_tags.tolist()))):
+                width = 3 + tag_count + _nodes_per_element(element_type)
+                rows = offsets[(types == element_type) & (n_tags == tag_count)]
+                if np.any(per_line[(types == element_type) & (n_tags == tag_count)] != width):
+                    raise MshFormatError("$Elements 单元数据长度与单元类型不符")
+                records = values[rows[:, None] + np.arange(width)]
+                # 去掉类型与标签数两列，统一为 [编号, 标签..., 节点...]
+                self._add_v2_records(builder, element_type, tag_count, np.delete(records, (1, 2), axis=1))
+
+    @staticmethod
+    def _add_v2_records(builder: _BlockBuilder, element_type: int, n_tags: int, values: np.ndarray):
+        m = len(values)
+        physical = values[:, 1] if n_tags >= 1 else np.zeros(m, dtype=np.int64)
+        entity = values[:, 2] if n_tags >= 2 else np.zeros(m, dtype=np.int64)
+        builder.add(element_type, values[:, 0], values[:, 1 + n_tags :], physical, entity)
+
+
+def read_msh(file_path: Union[str, Path], chunk_size: Optional[int] = None) -> MshMesh:
+    """读取Gmsh .msh文件（2.2/4.1，ASCII/二进制）
+
+    Args:
+        file_path: 文件路径
+        chunk_size: 每次解析的行数/记录数
+
+    Returns:
+        MshMesh
+    """
+    return MshReader(file_path, chunk_size or DEFAULT_CHUNK_SIZE).read()
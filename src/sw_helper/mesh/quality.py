@@ -2,63 +2,248 @@
 网格质量评估模块
 """
 
-from typing import Any, Dict, List, Optional
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .cache import MeshCache
+from .metrics import AVAILABLE_METRICS, compute_metrics_batch
+from .msh_reader import read_msh
+
+# meshio单元类型 -> 本模块单元类型（仅体单元参与质量评估）
+MESHIO_CELL_TYPES = {
+    "tetra": "tet4",
+    "tetra10": "tet4",
+    "wedge": "wedge6",
+    "wedge15": "wedge6",
+    "hexahedron": "hex8",
+    "hexahedron20": "hex8",
+}
+
+# 单元角点数（高阶单元只取角点参与质量评估）
+CORNER_NODES = {"tet4": 4, "wedge6": 6, "hex8": 8}
+
+# 质量等级（由好到差）
+QUALITY_LEVELS = ["excellent", "good", "fair", "poor", "unacceptable"]
 
 
 class MeshQualityAnalyzer:
-    """网格质量分析器"""
+    """网格质量分析器
+
+    网格数据以数组形式保存：
+    - nodes: 节点坐标 [n_nodes, 3]
+    - cells: {单元类型: 连接数组 [n_elems, nodes_per_elem]}（0起始节点索引）
+
+    .msh 文件经 :class:`MeshCache` 加载，逐单元指标也随网格缓存保存，
+    未修改的网格再次分析时无需重新解析和计算。
+
+    Args:
+        cache: 网格缓存，None表示使用默认的旁路缓存
+        use_cache: 是否使用缓存
+    """
 
-    def __init__(self):
+    def __init__(self, cache: Optional[MeshCache] = None, use_cache: bool = True):
         self.mesh_data = None
         self.quality_metrics = {}
+        self.cache = cache if cache is not None else MeshCache()
+        self.use_cache = use_cache
+        self._cached_file: Optional[Path] = None
 
-    def analyze(self, file_path: str, metrics: Optional[List[str]] = None) -> Dict[str, Any]:
-        """分析网格质量
+    def load_mesh(self, file_path: str) -> Dict[str, Any]:
+        """加载网格文件
+
+        .msh 文件使用内置流式读取器（经缓存），其余格式（.inp, .vtk等）通过meshio读取。
 
         Args:
             file_path: 网格文件路径
+
+        Returns:
+            网格数据字典 {"nodes": ..., "cells": ...}
+        """
+        path = Path(file_path)
+        if not path.exists():
+            raise FileNotFoundError(f"网格文件不存在: {file_path}")
+
+        if path.suffix.lower() == ".msh":
+            msh = self.cache.load(path) if self.use_cache else read_msh(path)
+            self.set_mesh(msh.nodes, msh.volume_cells())
+            self._cached_file = path if self.use_cache else None
+            return self.mesh_data
+
+        try:
+            import meshio
+        except ImportError:
+            raise ImportError("读取网格文件需要 meshio，请运行: pip install meshio")
+
+        mesh = meshio.read(str(path))
+        blocks = [(block.type, block.data) for block in mesh.cells if block.type in MESHIO_CELL_TYPES]
+        return self.set_mesh(mesh.points, _group_cells(blocks))
+
+    def set_mesh(self, nodes: np.ndarray, cells: Dict[str, np.ndarray]) -> Dict[str, Any]:
+        """直接设置网格数组
+
+        Args:
+            nodes: 节点坐标 [n_nodes, 2或3]
+            cells: {单元类型: 连接数组}，单元类型为 tet4/wedge6/hex8 或对应的
+                   meshio 类型名（tetra, tetra10, hexahedron 等），高阶单元只保留角点
+
+        Returns:
+            网格数据字典
+        """
+        nodes = np.asarray(nodes, dtype=np.float64)
+        if nodes.ndim != 2:
+            raise ValueError("节点数组必须是二维 [n_nodes, 3]")
+        if nodes.shape[1] == 2:
+            nodes = np.hstack([nodes, np.zeros((len(nodes), 1))])
+
+        self.mesh_data = {"nodes": nodes, "cells": _group_cells(cells.items())}
+        self.quality_metrics = {}
+        self._cached_file = None
+        return self.mesh_data
+
+    def analyze(self, file_path: Optional[str], metrics: Optional[List[str]] = None) -> Dict[str, Any]:
+        """分析网格质量
+
+        Args:
+            file_path: 网格文件路径（None表示使用已通过set_mesh设置的网格）
             metrics: 要计算的指标列表，None表示计算所有
 
         Returns:
             质量评估结果
         """
-        # TODO: 实现网格加载（支持.msh, .inp, .bdf等）
-
-        available_metrics = [
-            "aspect_ratio",
-            "skewness",
-            "volume",
-            "orthogonal_quality",
-            "element_size",
-            "jacobian",
-        ]
+        if file_path is not None:
+            self.load_mesh(file_path)
+        if self.mesh_data is None:
+            raise ValueError("未加载网格数据")
+
+        available_metrics = list(AVAILABLE_METRICS)
 
         if metrics is None:
             metrics = available_metrics
+        metrics = [m for m in metrics if m in available_metrics]
+
+        self.quality_metrics = self._compute_element_metrics(metrics)
 
         results = {}
         for metric in metrics:
-            if metric in available_metrics:
-                results[metric] = self._calculate_metric(metric)
+            results[metric] = self._calculate_metric(metric)
 
         results["overall_quality"] = self._assess_overall_quality(results)
+        results["mesh_info"] = {
+            "nodes": len(self.mesh_data["nodes"]),
+            "elements": sum(len(conn) for conn in self.mesh_data["cells"].values()),
+            "element_types": {key: len(conn) for key, conn in self.mesh_data["cells"].items()},
+        }
 
         return results
 
+    def _compute_element_metrics(self, metrics: List[str]) -> Dict[str, np.ndarray]:
+        """按单元类型分块批量计算，并拼接为整网格的逐单元指标数组
+
+        网格来自缓存时，先读取已缓存的指标，只计算缺失部分并写回缓存。
+        """
+        if self._cached_file is None:
+            return self._compute_uncached(metrics)
+
+        results = {}
+        for metric in metrics:
+            cached = self.cache.load_extra(self._cached_file, f"metric_{metric}")
+            if cached is not None:
+                results[metric] = cached
+
+        missing = [m for m in metrics if m not in results]
+        if missing:
+            computed = self._compute_uncached(missing)
+            for metric, values in computed.items():
+                self.cache.store_extra(self._cached_file, f"metric_{metric}", values)
+            results.update(computed)
+        return results
+
+    def _compute_uncached(self, metrics: List[str]) -> Dict[str, np.ndarray]:
+        nodes = self.mesh_data["nodes"]
+        per_type = []
+        for element_type, conn in self.mesh_data["cells"].items():
+            per_type.append(compute_metrics_batch(nodes, conn, metrics, element_type))
+
+        return {
+            metric: (np.concatenate([block[metric] for block in per_type]) if per_type else np.empty(0))
+            for metric in metrics
+        }
+
     def _calculate_metric(self, metric_name: str) -> Dict[str, float]:
         """计算单个指标"""
-        # TODO: 实现具体计算
-        return {"min": 0.0, "max": 1.0, "mean": 0.5, "std": 0.1}
+        values = self.quality_metrics.get(metric_name)
+        if values is None or len(values) == 0:
+            return {"min": 0.0, "max": 0.0, "mean": 0.0, "std": 0.0}
+
+        finite = values[np.isfinite(values)]
+        if len(finite) == 0:
+            finite = np.zeros(1)
+        return {
+            "min": float(finite.min()),
+            "max": float(finite.max()),
+            "mean": float(finite.mean()),
+            "std": float(finite.std()),
+        }
 
     def _assess_overall_quality(self, metrics: Dict[str, Any]) -> str:
-        """评估整体质量"""
-        # TODO: 实现质量评估逻辑
-        return "good"
+        """评估整体质量
+
+        取各指标对应等级中最差的一个：
+        - skewness最大值: <0.25 excellent, <0.5 good, <0.8 fair, <0.95 poor
+        - orthogonal_quality最小值: >0.7 excellent, >0.2 good, >0.15 fair, >0.01 poor
+        - jacobian最小值: ≤0 表示存在反转单元，直接判为 unacceptable
+        """
+        levels = []
+
+        skewness = metrics.get("skewness")
+        if skewness:
+            levels.append(self._grade(skewness["max"], [0.25, 0.5, 0.8, 0.95], higher_is_better=False))
+
+        ortho = metrics.get("orthogonal_quality")
+        if ortho:
+            levels.append(self._grade(ortho["min"], [0.7, 0.2, 0.15, 0.01], higher_is_better=True))
+
+        jacobian = metrics.get("jacobian")
+        if jacobian:
+            levels.append("unacceptable" if jacobian["min"] <= 0 else "excellent")
+
+        if not levels:
+            return "good"
+        return max(levels, key=QUALITY_LEVELS.index)
+
+    @staticmethod
+    def _grade(value: float, limits: List[float], higher_is_better: bool) -> str:
+        for level, limit in zip(QUALITY_LEVELS, limits):
+            if (value > limit) if higher_is_better else (value < limit):
+                return level
+        return QUALITY_LEVELS[-1]
 
     def detect_problematic_elements(self, threshold: float = 0.1) -> List[int]:
-        """检测问题单元"""
-        # TODO: 实现问题单元检测
-        return []
+        """检测问题单元
+
+        满足任一条件即视为问题单元：缩放雅可比 < threshold、
+        正交质量 < threshold、偏斜度 > 1 - threshold。
+
+        Args:
+            threshold: 质量阈值（0-1）
+
+        Returns:
+            问题单元序号列表（按cells中单元类型顺序拼接后的0起始序号）
+        """
+        if self.mesh_data is None:
+            return []
+
+        needed = [m for m in ("jacobian", "orthogonal_quality", "skewness") if m not in self.quality_metrics]
+        if needed:
+            self.quality_metrics.update(self._compute_element_metrics(needed))
+
+        bad = np.zeros(len(self.quality_metrics["jacobian"]), dtype=bool)
+        bad |= self.quality_metrics["jacobian"] < threshold
+        bad |= self.quality_metrics["orthogonal_quality"] < threshold
+        bad |= self.quality_metrics["skewness"] > 1.0 - threshold
+        return np.flatnonzero(bad).tolist()
 
     def generate_remesh_suggestions(self) -> List[str]:
         """生成重网格建议"""
@@ -67,3 +252,16 @@ class MeshQualityAnalyzer:
             "检查长宽比过大的单元",
             "确保边界层网格质量",
         ]
+
+
+def _group_cells(blocks: Iterable[Tuple[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    """按质量指标单元类型合并连接数组，每块先截取到角点再一次拼接"""
+    parts: Dict[str, List[np.ndarray]] = {}
+    for key, conn in blocks:
+        element_type = key if key in CORNER_NODES else MESHIO_CELL_TYPES.get(key)
+        if element_type is None:
+            raise ValueError(f"不支持的单元类型: {key}（支持 {', '.join(CORNER_NODES)}）")
+        conn = np.asarray(conn)
+        if len(conn):
+            parts.setdefault(element_type, []).append(conn[:, : CORNER_NODES[element_type]])
+    return {key: np.concatenate(blocks) for key, blocks in parts.items()}
@@ -2,6 +2,7 @@
 参数优化模块
 """
 
+from .doe import DesignOfExperiments, DesignParameter, DOEResults
 from .optimizer import FreeCADOptimizer
 from .optimizer import OptimizationResult as FCOptimizationResult
 from .parametric import (
@@ -10,6 +11,7 @@ from .parametric import (
     OptimizationResult,
     ParametricOptimizer,
 )
+from .surrogate import GaussianProcess, SurrogateOptimizer
 
 __all__ = [
     "ParametricOptimizer",
@@ -18,4 +20,9 @@ __all__ = [
     "OptimizationConfig",
     "FreeCADOptimizer",
     "FCOptimizationResult",
+    "DesignOfExperiments",
+    "DesignParameter",
+    "DOEResults",
+    "GaussianProcess",
+    "SurrogateOptimizer",
 ]
@@ -0,0 +1,361 @@
+"""
+试验设计（DOE）- 多参数空间填充采样与列式结果表
+
+对 N 个命名参数生成拉丁超立方（LHS）、Sobol 序列或全因子采样，逐个样本
+（向量化模型可一次全部）评估后把参数与响应写成列式结果表（CSV / NumPy .npz /
+Parquet）。5–10 个参数时，空间填充采样用远少于嵌套网格的评估次数得到灵敏度与响应面数据。
+"""
+
+import csv
+import itertools
+import math
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+DOE_METHODS = ("lhs", "sobol", "factorial")
+
+# Sobol 方向数（Joe & Kuo, new-joe-kuo-6.21201）：第 2 维起每维的 (度数 s, 系数 a, 初始 m_1..m_s)
+_SOBOL_DIRECTIONS = (
+    (1, 0, (1,)),
+    (2, 1, (1, 3)),
+    (3, 1, (1, 3, 1)),
+    (3, 2, (1, 1, 1)),
+    (4, 1, (1, 1, 3, 3)),
+    (4, 4, (1, 3, 5, 13)),
+    (5, 2, (1, 1, 5, 5, 17)),
+    (5, 4, (1, 1, 5, 5, 5)),
+    (5, 7, (1, 1, 7, 11, 19)),
+    (5, 11, (1, 1, 5, 1, 1)),
+    (5, 13, (1, 1, 1, 3, 11)),
+    (5, 14, (1, 3, 5, 5, 31)),
+    (6, 1, (1, 3, 3, 9, 7, 49)),
+    (6, 13, (1, 1, 1, 15, 21, 21)),
+    (6, 16, (1, 3, 1, 13, 27, 49)),
+)
+
+SOBOL_MAX_DIMENSIONS = len(_SOBOL_DIRECTIONS) + 1
+
+_SOBOL_BITS = 32
+
+
+@dataclass
+class DesignParameter:
+    """试验设计参数
+
+    Attributes:
+        name: 参数名
+        low: 下限
+        high: 上限
+        levels: 全因子设计的水平数
+        log_scale: 是否按对数尺度采样
+    """
+
+    name: str
+    low: float
+    high: float
+    levels: int = 3
+    log_scale: bool = False
+
+    def __post_init__(self):
+        if not self.high > self.low:
+            raise ValueError(f"参数 {self.name} 的范围无效: {self.low} ~ {self.high}")
+        if self.log_scale and self.low <= 0:
+            raise ValueError(f"参数 {self.name} 按对数尺度采样时范围必须为正")
+        if self.levels < 2:
+            raise ValueError(f"参数 {self.name} 的水平数至少为 2")
+
+    def scale(self, unit: np.ndarray) -> np.ndarray:
+        """把 [0, 1] 上的采样映射到参数范围"""
+        if self.log_scale:
+            return np.exp(math.log(self.low) + unit * (math.log(self.high) - math.log(self.low)))
+        return self.low + unit * (self.high - self.low)
+
+
+def latin_hypercube(samples: int, dimensions: int, seed: Optional[int] = None, iterations: int = 20) -> np.ndarray:
+    """拉丁超立方采样
+
+    每一维的 [0, 1] 等分为 ``samples`` 层，每层恰好一个样本。样本数不超过 500 时
+    在 ``iterations`` 个随机设计中取最小样本间距最大者（maximin）。
+
+    Returns:
+        形状 (samples, dimensions) 的 [0, 1) 采样
+    """
+    rng = np.random.default_rng(seed)
+
+    def draw() -> np.ndarray:
+        strata = np.argsort(rng.random((dimensions, samples)), axis=1).T
+        return (strata + rng.random((samples, dimensions))) / samples
+
+    best = draw()
+    if samples < 2 or samples > 500:
+        return best
+
+    def min_distance(points: np.ndarray) -> float:
+        diff = points[:, None, :] - points[None, :, :]
+        dist = (diff**2).sum(axis=-1)
+        np.fill_diagonal(dist, np.inf)
+        return float(dist.min())
+
+    best_distance = min_distance(best)
+    for _ in range(iterations - 1):
+        candidate = draw()
+        distance = min_distance(candidate)
+        if distance > best_distance:
+            best, best_distance = candidate, distance
+    return best
+
+
+def _sobol_direction_numbers(dimensions: int) -> np.ndarray:
+    directions = np.zeros((dimensions, _SOBOL_BITS), dtype=np.uint64)
+    directions[0] = [1 << (_SOBOL_BITS - 1 - k) for k in range(_SOBOL_BITS)]
+    for j in range(1, dimensions):
+        s, a, m = _SOBOL_DIRECTIONS[j - 1]
+        v = [0] * _SOBOL_BITS
+        for k in range(s):
+            v[k] = m[k] << (_SOBOL_BITS - 1 - k)
+        for k in range(s, _SOBOL_BITS):
+            value = v[k - s] ^ (v[k - s] >> s)
+            for i in range(1, s):
+                if (a >> (s - 1 - i)) & 1:
+                    value ^= v[k - i]
+            v[k] = value
+        directions[j] = v
+    return directions
+
+
+def sobol_sequence(samples: int, dimensions: int, seed: Optional[int] = None) -> np.ndarray:
+    """Sobol 低差异序列（Gray 码构造）
+
+    样本数取 2 的幂时各维分层均匀。给定 ``seed`` 时施加随机数字移位（按位异或），
+    保持分层性质的同时去掉固定的原点样本。
+
+    Returns:
+        形状 (samples, dimensions) 的 [0, 1) 采样
+
+    Raises:
+        ValueError: 维数超过方向数表时
+    """
+    if dimensions > SOBOL_MAX_DIMENSIONS:
+        raise ValueError(f"Sobol 序列最多支持 {SOBOL_MAX_DIMENSIONS} 个参数，请改用 LHS")
+
+    directions = _sobol_direction_numbers(dimensions)
+    points = np.zeros((samples, dimensions), dtype=np.uint64)
+    current = np.zeros(dimensions, dtype=np.uint64)
+    for i in range(1, samples):
+        # 上一个序号二进制最低位的 0 所在位置
+        c = ((i - 1) ^ i).bit_length() - 1
+        current ^= directions[:, c]
+        points[i] = current
+
+    if seed is not None:
+        shift = np.random.default_rng(seed).integers(0, 1 << _SOBOL_BITS, size=dimensions, dtype=np.uint64)
+        points ^= shift
+    return points.astype(np.float64) / float(1 << _SOBOL_BITS)
+
+
+def full_factorial(levels: Sequence[int]) -> np.ndarray:
+    """全因子设计，每维在 [0, 1] 上均布 ``levels[i]`` 个水平"""
+    axes = [np.linspace(0.0, 1.0, n) for n in levels]
+    return np.array(list(itertools.product(*axes)), dtype=np.float64).reshape(-1, len(levels))
+
+
+class DOEResults:
+    """列式试验设计结果
+
+    Args:
+        parameters: 设计参数
+        samples: 形状 (n, d) 的参数取值
+        responses: 响应名 -> 长度 n 的数组（评估失败为 NaN）
+        method: 采样方法
+    """
+
+    def __init__(
+        self,
+        parameters: Sequence[DesignParameter],
+        samples: np.ndarray,
+        responses: Dict[str, np.ndarray],
+        method: str = "",
+    ):
+        self.parameters = list(parameters)
+        self.samples = samples
+        self.responses = responses
+        self.method = method
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    @property
+    def parameter_names(self) -> List[str]:
+        return [p.name for p in self.parameters]
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """样本序号、各参数与各响应的列"""
+        data: Dict[str, np.ndarray] = {"sample": np.arange(1, len(self.samples) + 1)}
+        for j, name in enumerate(self.parameter_names):
+            data[name] = self.samples[:, j]
+        data.update(self.responses)
+        return data
+
+    def sensitivity(self, response: str) -> Dict[str, float]:
+        """标准化回归系数（SRC）作为一阶灵敏度
+
+        对有效样本做线性最小二乘，系数乘以参数标准差、除以响应标准差，
+        绝对值越大表示该参数对响应影响越大。
+        """
+        y = self.responses[response]
+        valid = np.isfinite(y)
+        x, y = self.samples[valid], y[valid]
+        if len(y) <= x.shape[1] or not y.std():
+            return {name: 0.0 for name in self.parameter_names}
+        design = np.column_stack([np.ones(len(y)), x])
+        coef, *_ = np.linalg.lstsq(design, y, rcond=None)
+        src = coef[1:] * x.std(axis=0) / y.std()
+        return {name: float(value) for name, value in zip(self.parameter_names, src)}
+
+    def to_csv(self, path: Union[str, Path]):
+        columns = self.columns()
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(columns.keys())
+            for row in zip(*columns.values()):
+                writer.writerow([format(v, ".12g") for v in row])
+
+    def to_npz(self, path: Union[str, Path]):
+        np.savez(path, method=np.array(self.method), **self.columns())
+
+    def to_parquet(self, path: Union[str, Path]):
+        """写 Parquet（需要 pyarrow 或 pandas）"""
+        columns = self.columns()
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            pq.write_table(pa.table(columns), str(path))
+            return
+        except ImportError:
+            pass
+        try:
+            import pandas as pd
+        except ImportError as e:
+            raise ImportError("写 Parquet 需要 pyarrow 或 pandas，请改用 .csv/.npz 或运行 'pip install pyarrow'") from e
+        pd.DataFrame(columns).to_parquet(path)
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """按扩展名（.csv / .npz / .parquet）写结果表"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        writers = {".csv": self.to_csv, ".npz": self.to_npz, ".parquet": self.to_parquet}
+        suffix = path.suffix.lower()
+        if suffix not in writers:
+            raise ValueError(f"不支持的结果格式: {path.suffix}（支持 .csv/.npz/.parquet）")
+        writers[suffix](path)
+        return path
+
+
+class DesignOfExperiments:
+    """多参数试验设计
+
+    Args:
+        parameters: 设计参数
+        method: 采样方法 (lhs/sobol/factorial)
+        samples: 样本数（全因子设计由各参数水平数决定，忽略此值）
+        seed: 随机种子（LHS 随机化 / Sobol 数字移位）
+    """
+
+    def __init__(
+        self,
+        parameters: Sequence[DesignParameter],
+        method: str = "lhs",
+        samples: int = 16,
+        seed: Optional[int] = None,
+    ):
+        if not parameters:
+            raise ValueError("试验设计至少需要一个参数")
+        names = [p.name for p in parameters]
+        if len(set(names)) != len(names):
+            raise ValueError(f"参数名重复: {names}")
+        if method not in DOE_METHODS:
+            raise ValueError(f"不支持的采样方法: {method}（支持 {'/'.join(DOE_METHODS)}）")
+        if method != "factorial" and samples < 1:
+            raise ValueError("样本数至少为 1")
+        self.parameters = list(parameters)
+        self.method = method
+        self.samples = samples
+        self.seed = seed
+
+    def unit_design(self) -> np.ndarray:
+        """[0, 1] 超立方上的采样"""
+        d = len(self.parameters)
+        if self.method == "lhs":
+            return latin_hypercube(self.samples, d, self.seed)
+        if self.method == "sobol":
+            return sobol_sequence(self.samples, d, self.seed)
+        return full_factorial([p.levels for p in self.parameters])
+
+    def design(self) -> np.ndarray:
+        """参数取值，形状 (样本数, 参数数)"""
+        unit = self.unit_design()
+        return np.column_stack([p.scale(unit[:, j]) for j, p in enumerate(self.parameters)])
+
+    def run(
+        self,
+        evaluate: Callable[[int, Dict[str, float]], Optional[Dict[str, float]]],
+        design: Optional[np.ndarray] = None,
+    ) -> DOEResults:
+        """逐个样本评估
+
+        Args:
+            evaluate: ``evaluate(样本序号, {参数名: 值})`` 返回响应字典，失败时返回 None
+            design: 预先生成的参数取值（默认调用 :meth:`design`）
+
+        Returns:
+            列式结果，失败样本的响应为 NaN
+        """
+        samples = self.design() if design is None else design
+        names = [p.name for p in self.parameters]
+        rows: List[Optional[Dict[str, float]]] = []
+        for i, row in enumerate(samples, 1):
+            rows.append(evaluate(i, {name: float(v) for name, v in zip(names, row)}))
+        return self.collect(samples, rows)
+
+    def run_batch(
+        self,
+        evaluate: Callable[[Dict[str, np.ndarray]], Dict[str, np.ndarray]],
+        design: Optional[np.ndarray] = None,
+    ) -> DOEResults:
+        """一次评估全部样本（向量化模型，如解析梁公式）
+
+        Args:
+            evaluate: ``evaluate({参数名: 各样本取值数组})`` 返回响应名 -> 长度为样本数的数组（失败样本为 NaN）
+            design: 预先生成的参数取值（默认调用 :meth:`design`）
+
+        Returns:
+            列式结果
+
+        Raises:
+            ValueError: 响应数组长度与样本数不符时
+        """
+        samples = self.design() if design is None else design
+        values = {p.name: samples[:, j] for j, p in enumerate(self.parameters)}
+        responses = {}
+        for key, value in evaluate(values).items():
+            value = np.asarray(value, dtype=np.float64).ravel()
+            if value.size != len(samples):
+                raise ValueError(f"响应 {key} 的长度 {value.size} 与样本数 {len(samples)} 不符")
+            responses[key] = value
+        return DOEResults(self.parameters, samples, responses, self.method)
+
+    def collect(self, samples: np.ndarray, rows: Sequence[Optional[Dict[str, float]]]) -> DOEResults:
+        """由逐样本的响应字典（失败为 None）组装列式结果"""
+        keys: List[str] = []
+        for response in rows:
+            for key in response or {}:
+                if key not in keys:
+                    keys.append(key)
+        responses = {
+            key: np.array([float(r.get(key, np.nan)) if r else np.nan for r in rows], dtype=np.float64) for key in keys
+        }
+        return DOEResults(self.parameters, samples, responses, self.method)
@@ -2,12 +2,37 @@
 参数优化引擎 - 使用FreeCAD实现参数优化闭环
 """
 
+import hashlib
 import json
+import math
 import time
 from dataclasses import asdict, dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .doe import DesignOfExperiments, DesignParameter, DOEResults
+from .parallel import EvaluationTask
+from .units import MM3_TO_M3
+
+
+def shape_fingerprint(summary: Dict[str, Any]) -> str:
+    """形状指纹：拓扑计数 + 体积 + 包围盒 + 质心与惯性矩阵
+
+    质心与惯性矩阵区分拓扑、体积和包围盒都相同但材料分布不同的形状（如孔位移动）。
+    浮点值按包围盒尺寸的相应幂次乘以 1e-9 量化，消除重建带来的数值噪声。
+    """
+    bounds = summary.get("bounds") or {}
+    coords = [float(v) for axis in "xyz" for v in bounds.get(axis, (0.0, 0.0))]
+    size = max(math.dist(coords[0::2], coords[1::2]), 1e-12)
+    key = [int(summary.get(k, 0)) for k in ("solids", "faces", "edges", "vertices")]
+    key.append(round(float(summary.get("volume", 0.0)) / (size**3 * 1e-9)))
+    key.extend(round(c / (size * 1e-9)) for c in coords)
+    key.extend(round(float(c) / (size * 1e-9)) for c in summary.get("center_of_mass") or ())
+    key.extend(round(float(v) / (size**5 * 1e-9)) for row in summary.get("inertia") or () for v in row)
+    return hashlib.sha1(json.dumps(key).encode()).hexdigest()
 
 
 @dataclass
@@ -27,12 +52,25 @@ class OptimizationResult:
 
 
 class FreeCADOptimizer:
-    """FreeCAD参数优化器"""
+    """FreeCAD参数优化器
+
+    Args:
+        use_mock: 使用模拟连接器
+        workers: 并行工作进程数；大于 1 时网格扫描与DOE样本分派给独立的
+            FreeCAD 工作进程（各自打开文档副本），自适应搜索仍按顺序进行
+        timeout: 并行时单次评估的超时秒数（None 不限时）
+    """
 
-    def __init__(self, use_mock: bool = False):
+    def __init__(self, use_mock: bool = False, workers: int = 1, timeout: Optional[float] = None):
         self.connector = None
         self.use_mock = use_mock
+        self.workers = max(1, workers)
+        self.timeout = timeout
         self.results: List[OptimizationResult] = []
+        self.doe_results: Optional[DOEResults] = None
+        # 形状指纹 -> {index, export_path, geo_data}，用于跳过相同形状的导出与分析
+        self._shape_cache: Dict[str, Dict[str, Any]] = {}
+        self.reused_shapes = 0
         self.progress_callback: Optional[Callable[[str], None]] = None
 
     def set_progress_callback(self, callback: Callable[[str], None]):
@@ -74,6 +112,7 @@ class FreeCADOptimizer:
         step_mode: str = "linear",
         output_dir: str = "./optimization_output",
         analyze_geometry: bool = True,
+        tolerance: float = 1e-3,
     ) -> List[OptimizationResult]:
         """
         优化指定参数
@@ -82,16 +121,86 @@ class FreeCADOptimizer:
             file_path: CAD文件路径(.FCStd)
             param_name: 参数名(如"Fillet_Radius")
             param_range: (最小值, 最大值)
-            steps: 迭代步数
-            step_mode: 步进模式 (linear/geometric)
+            steps: 迭代步数（adaptive 模式下为最大评估次数）
+            step_mode: 步进模式 (linear/geometric/adaptive)，adaptive 使用
+                高斯过程代理模型按期望改进选择下一个参数值
             output_dir: 输出目录
             analyze_geometry: 是否分析几何质量
+            tolerance: adaptive 模式的相对收敛容差
 
         Returns:
             优化结果列表
         """
         self.results = []
+        self._reset_shape_cache()
+
+        self._open_model(file_path, [param_name])
 
+        # 创建输出目录
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+
+        try:
+            # 生成参数序列
+            min_val, max_val = param_range
+            if step_mode == "adaptive":
+                self.log(f"\nStarting optimization for parameter: {param_name}")
+                self.log(f"   Range: {min_val} ~ {max_val} mm")
+                self.log(f"   Step mode: adaptive (surrogate model, max {steps} evaluations)")
+                self.log("-" * 60)
+                self._optimize_adaptive(param_name, param_range, steps, tolerance, output_path, analyze_geometry)
+            else:
+                if steps == 1:
+                    values = [min_val]
+                elif step_mode == "linear":
+                    # 线性步进
+                    step_size = (max_val - min_val) / (steps - 1)
+                    values = [min_val + i * step_size for i in range(steps)]
+                else:  # geometric
+                    # 等比步进
+                    ratio = math.exp(math.log(max_val / min_val) / (steps - 1))
+                    values = [min_val * (ratio**i) for i in range(steps)]
+
+                self.log(f"\nStarting optimization for parameter: {param_name}")
+                self.log(f"   Range: {min_val} ~ {max_val} mm")
+                self.log(f"   Steps: {steps}")
+                self.log(f"   Step mode: {step_mode}")
+                self.log(f"   Value sequence: {[round(v, 2) for v in values]}")
+                self.log("-" * 60)
+
+                if self.workers > 1 and len(values) > 1:
+                    tasks = [
+                        EvaluationTask(
+                            i, {param_name: value}, {param_name: param_range}, str(output_path), analyze_geometry
+                        )
+                        for i, value in enumerate(values, 1)
+                    ]
+                    self.results = [r for r in self._run_parallel(file_path, tasks) if r is not None]
+                else:
+                    # 优化循环
+                    for i, value in enumerate(values, 1):
+                        self.log(f"\n[Iteration {i}/{steps}] {param_name} = {value:.2f} mm")
+                        result = self._evaluate(i, param_name, value, param_range, output_path, analyze_geometry)
+                        if result is not None:
+                            self.results.append(result)
+        finally:
+            # 关闭文档
+            self.log("\nClosing document...")
+            self.connector.close_document(save=False)
+            self.connector.disconnect()
+
+        # 生成最终报告
+        if self.results:
+            self._generate_summary()
+
+        return self.results
+
+    def _reset_shape_cache(self):
+        self._shape_cache = {}
+        self.reused_shapes = 0
+
+    def _open_model(self, file_path: str, param_names: List[str]):
+        """连接FreeCAD、打开文件并检查参数是否存在"""
         # 连接FreeCAD
         self.log("Connecting to FreeCAD...")
         if not self.connect():
@@ -109,8 +218,9 @@ class FreeCADOptimizer:
             self.log(f"  - {p.name} = {p.value} {p.unit}")
 
         # 检查目标参数是否存在
-        target_param = self.connector.find_parameter(param_name)
-        if not target_param:
+        for param_name in param_names:
+            if self.connector.find_parameter(param_name):
+                continue
             if params:
                 self.log(f"[Warning] Parameter '{param_name}' not found, available parameters:")
                 for p in params[:10]:  # 显示前10个参数
@@ -121,139 +231,362 @@ class FreeCADOptimizer:
             else:
                 raise ValueError(f"Parameter '{param_name}' not found, and no parameters were found in the model.")
 
-        # 创建输出目录
-        output_path = Path(output_dir)
-        output_path.mkdir(parents=True, exist_ok=True)
+    def _optimize_adaptive(
+        self,
+        param_name: str,
+        param_range: tuple,
+        max_evaluations: int,
+        tolerance: float,
+        output_path: Path,
+        analyze_geometry: bool,
+    ):
+        """代理模型自适应搜索：按期望改进依次选择参数值，收敛或达到评估上限时停止"""
+        from .surrogate import SurrogateOptimizer
+
+        surrogate = SurrogateOptimizer(param_range, initial_points=min(3, max_evaluations), tolerance=tolerance)
+        failed: List[float] = []
+
+        for i in range(1, max_evaluations + 1):
+            value = surrogate.suggest(
+                [r.parameter_value for r in self.results], [r.quality_score for r in self.results], failed
+            )
+            if value is None:
+                if self.results:
+                    self.log(
+                        f"\nConverged after {len(self.results)} evaluations "
+                        f"(max expected improvement {surrogate.last_expected_improvement:.3g})"
+                    )
+                else:
+                    self.log("\nAll initial evaluations failed, stopping")
+                break
+
+            self.log(f"\n[Iteration {i}/{max_evaluations}] {param_name} = {value:.2f} mm")
+            if surrogate.last_expected_improvement is not None:
+                self.log(f"   Expected improvement: {surrogate.last_expected_improvement:.3g}")
+            result = self._evaluate(i, param_name, value, param_range, output_path, analyze_geometry)
+            if result is None:
+                failed.append(value)
+            else:
+                self.results.append(result)
 
-        # 生成参数序列
-        min_val, max_val = param_range
-        if steps == 1:
-            values = [min_val]
-        elif step_mode == "linear":
-            # 线性步进
-            step_size = (max_val - min_val) / (steps - 1)
-            values = [min_val + i * step_size for i in range(steps)]
-        else:  # geometric
-            # 等比步进
-            import math
-
-            ratio = math.exp(math.log(max_val / min_val) / (steps - 1))
-            values = [min_val * (ratio**i) for i in range(steps)]
-
-        self.log(f"\nStarting optimization for parameter: {param_name}")
-        self.log(f"   Range: {min_val} ~ {max_val} mm")
-        self.log(f"   Steps: {steps}")
-        self.log(f"   Step mode: {step_mode}")
-        self.log(f"   Value sequence: {[round(v, 2) for v in values]}")
-        self.log("-" * 60)
+    def _evaluate(
+        self,
+        i: int,
+        param_name: str,
+        value: float,
+        param_range: tuple,
+        output_path: Path,
+        analyze_geometry: bool,
+    ) -> Optional[OptimizationResult]:
+        """评估一个参数值：设置参数→重建→导出→分析，失败时返回 None"""
+        iteration_start = time.time()
 
-        # 优化循环
-        for i, value in enumerate(values, 1):
-            iteration_start = time.time()
+        try:
+            # 1. 设置参数
+            self.log("   Modifying parameter...")
+            if not self.connector.set_parameter(param_name, value):
+                self.log("   Parameter setting failed, skipping")
+                return None
+
+            # 2. 重建模型
+            self.log("   Rebuilding model...")
+            if not self.connector.rebuild():
+                self.log("   Warning: Rebuild may have issues")
+
+            # 3. 导出文件（形状与之前的迭代相同时复用其导出与分析结果）
+            export_file, shape = self._export_shape(output_path / f"iter_{i:02d}_{param_name}_{value:.1f}.step", i)
+            if export_file is None:
+                return None
+
+            # 4. 分析质量（如果启用）
+            quality_score = 50.0  # 基础分
+            allowable_stress = 0.0
+            safety_factor = 0.0
+            notes = "Not analyzed"
+
+            if analyze_geometry and export_file.exists():
+                self.log("   Analyzing geometry quality...")
+                try:
+                    geo_data = self._shape_analysis(export_file, shape)
+
+                    # 计算质量分数
+                    quality_score = self._calculate_quality_score(geo_data, value)
+
+                    # 计算力学性能
+                    allowable_stress, safety_factor = self._calculate_mechanical_properties(geo_data, value)
+
+                    notes = f"Volume: {geo_data.get('volume', 0) * MM3_TO_M3:.2e} m³"
+                    if shape is not None and shape["index"] != i:
+                        notes += f" (same shape as #{shape['index']})"
+                except Exception as e:
+                    self.log(f"   Analysis failed: {e}")
+                    notes = f"Analysis failed: {e}"
+            else:
+                notes = "Not analyzed"
+                # 模拟质量分数和力学性能（用于测试）
+                quality_score = self._simulated_score(param_name, value, param_range)
+
+                # 模拟力学性能
+                allowable_stress, safety_factor = self._calculate_mechanical_properties({}, value)
+
+            analysis_time = time.time() - iteration_start
+
+            # 记录结果
+            result = OptimizationResult(
+                iteration=i,
+                parameter_name=param_name,
+                parameter_value=value,
+                quality_score=quality_score,
+                allowable_stress=allowable_stress,
+                safety_factor=safety_factor,
+                analysis_time=analysis_time,
+                timestamp=datetime.now().isoformat(),
+                notes=notes,
+                export_path=str(export_file),
+            )
 
-            self.log(f"\n[Iteration {i}/{steps}] {param_name} = {value:.2f} mm")
+            self.log(f"   Quality score: {quality_score:.1f}/100")
+            self.log(f"   Time elapsed: {analysis_time:.2f}s")
+            return result
 
-            try:
-                # 1. 设置参数
-                self.log("   Modifying parameter...")
-                if not self.connector.set_parameter(param_name, value):
-                    self.log("   Parameter setting failed, skipping")
-                    continue
-
-                # 2. 重建模型
-                self.log("   Rebuilding model...")
-                if not self.connector.rebuild():
-                    self.log("   Warning: Rebuild may have issues")
-
-                # 3. 导出文件
-                export_file = output_path / f"iter_{i:02d}_{param_name}_{value:.1f}.step"
-                self.log(f"   Exporting: {export_file.name}")
-
-                if not self.connector.export_file(str(export_file), "STEP"):
-                    self.log("   Export failed")
-                    continue
-
-                # 4. 分析质量（如果启用）
-                quality_score = 50.0  # 基础分
-                allowable_stress = 0.0
-                safety_factor = 0.0
-                notes = "Not analyzed"
+        except Exception as e:
+            self.log(f"   ✗ 错误: {e}")
+            import traceback
 
-                if analyze_geometry and export_file.exists():
-                    self.log("   Analyzing geometry quality...")
-                    try:
-                        from sw_helper.geometry.parser import GeometryParser
+            traceback.print_exc()
+            return None
 
-                        parser = GeometryParser()
-                        geo_data = parser.parse(str(export_file))
+    def run_doe(
+        self,
+        file_path: str,
+        parameters: List[DesignParameter],
+        method: str = "lhs",
+        samples: int = 16,
+        seed: Optional[int] = None,
+        output_dir: str = "./optimization_output",
+        analyze_geometry: bool = True,
+    ) -> DOEResults:
+        """
+        多参数试验设计
 
-                        # 计算质量分数
-                        quality_score = self._calculate_quality_score(geo_data, value)
+        Args:
+            file_path: CAD文件路径(.FCStd)
+            parameters: 设计参数（名称、范围、全因子水平数）
+            method: 采样方法 (lhs/sobol/factorial)
+            samples: 样本数（factorial 时由水平数决定）
+            seed: 随机种子
+            output_dir: 输出目录
+            analyze_geometry: 是否分析几何质量
 
-                        # 计算力学性能
-                        allowable_stress, safety_factor = self._calculate_mechanical_properties(geo_data, value)
+        Returns:
+            列式结果（质量分数、许用应力、安全系数、耗时及几何数据）
+        """
+        doe = DesignOfExperiments(parameters, method, samples, seed)
+        design = doe.design()
+        self._reset_shape_cache()
 
-                        notes = f"Volume: {geo_data.get('volume', 0):.2e} m³"
-                    except Exception as e:
-                        self.log(f"   Analysis failed: {e}")
-                        notes = f"Analysis failed: {e}"
-                else:
-                    notes = "Not analyzed"
-                    # 模拟质量分数和力学性能（用于测试）
-                    quality_score = 50 + (value - min_val) / (max_val - min_val) * 40
-                    if param_name.lower() in ["fillet", "radius", "r"]:
-                        # 圆角半径在适中范围得分高
-                        optimal = (min_val + max_val) / 2
-                        quality_score = 100 - abs(value - optimal) / (max_val - min_val) * 50
-
-                    # 模拟力学性能
-                    allowable_stress, safety_factor = self._calculate_mechanical_properties({}, value)
-
-                analysis_time = time.time() - iteration_start
-
-                # 记录结果
-                result = OptimizationResult(
-                    iteration=i,
-                    parameter_name=param_name,
-                    parameter_value=value,
-                    quality_score=quality_score,
-                    allowable_stress=allowable_stress,
-                    safety_factor=safety_factor,
-                    analysis_time=analysis_time,
-                    timestamp=datetime.now().isoformat(),
-                    notes=notes,
-                    export_path=str(export_file),
+        self._open_model(file_path, [p.name for p in parameters])
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+
+        self.log(f"\nStarting design of experiments: {len(parameters)} parameters, {len(design)} samples ({method})")
+        for p in parameters:
+            self.log(f"   {p.name}: {p.low} ~ {p.high}")
+        self.log("-" * 60)
+
+        ranges = {p.name: (p.low, p.high) for p in parameters}
+
+        def evaluate(i: int, values: Dict[str, float]) -> Optional[Dict[str, float]]:
+            self.log(f"\n[Sample {i}/{len(design)}] " + ", ".join(f"{k} = {v:.2f}" for k, v in values.items()))
+            return self._evaluate_sample(i, values, ranges, output_path, analyze_geometry)
+
+        try:
+            if self.workers > 1 and len(design) > 1:
+                tasks = [
+                    EvaluationTask(
+                        i,
+                        {p.name: float(v) for p, v in zip(parameters, row)},
+                        ranges,
+                        str(output_path),
+                        analyze_geometry,
+                        kind="sample",
+                    )
+                    for i, row in enumerate(design, 1)
+                ]
+                self.doe_results = doe.collect(design, self._run_parallel(file_path, tasks))
+            else:
+                self.doe_results = doe.run(evaluate, design)
+        finally:
+            self.log("\nClosing document...")
+            self.connector.close_document(save=False)
+            self.connector.disconnect()
+
+        scores = self.doe_results.responses.get("quality_score")
+        if scores is not None and np.isfinite(scores).any():
+            best = int(np.nanargmax(scores))
+            self.log("\n" + "=" * 60)
+            self.log(f"Valid samples: {int(np.isfinite(scores).sum())}/{len(design)}")
+            self.log(
+                f"Best sample: #{best + 1} "
+                + ", ".join(f"{p.name} = {design[best, j]:.2f}" for j, p in enumerate(parameters))
+                + f" (score {scores[best]:.1f})"
+            )
+            self.log("=" * 60)
+        return self.doe_results
+
+    def _run_parallel(self, file_path: str, tasks: List[EvaluationTask]) -> list:
+        """在工作进程池中评估，按任务顺序返回结果（失败为 None）"""
+        from .parallel import OptimizerPool
+
+        self.log(f"\nDispatching {len(tasks)} evaluations to {min(self.workers, len(tasks))} FreeCAD workers")
+        results = {}
+        with OptimizerPool(file_path, self.workers, self.use_mock, self.timeout) as pool:
+            for done, reply in enumerate(pool.run(tasks), 1):
+                label = ", ".join(f"{name} = {value:.2f}" for name, value in reply.task.values.items())
+                self.log(f"\n[{done}/{len(tasks)}] #{reply.task.index} {label} (worker {reply.worker})")
+                for message in reply.messages:
+                    self.log(message)
+                if reply.error:
+                    self.log(f"   ✗ 错误: {reply.error}")
+                results[reply.task.index] = reply.result
+        return [results.get(task.index) for task in tasks]
+
+    def _evaluate_sample(
+        self,
+        i: int,
+        values: Dict[str, float],
+        ranges: Dict[str, tuple],
+        output_path: Path,
+        analyze_geometry: bool,
+    ) -> Optional[Dict[str, float]]:
+        """评估一个DOE样本：设置全部参数→重建→导出→分析，失败时返回 None"""
+        iteration_start = time.time()
+        try:
+            for name, value in values.items():
+                if not self.connector.set_parameter(name, value):
+                    self.log(f"   Setting {name} failed, skipping")
+                    return None
+
+            if not self.connector.rebuild():
+                self.log("   Warning: Rebuild may have issues")
+
+            export_file, shape = self._export_shape(output_path / f"doe_{i:03d}.step", i)
+            if export_file is None:
+                return None
+
+            responses: Dict[str, float] = {}
+            if analyze_geometry and export_file.exists():
+                try:
+                    geo_data = self._shape_analysis(export_file, shape)
+                except Exception as e:
+                    self.log(f"   Analysis failed: {e}")
+                    return None
+                # 几何只评分一次；参数项取各参数的平均，力学性能取最保守值
+                quality_score = self._calculate_quality_score(geo_data, list(values.values()))
+                mechanical = [self._calculate_mechanical_properties(geo_data, v) for v in values.values()]
+                for key in ("volume", "faces", "vertices"):
+                    responses[key] = float(geo_data.get(key, 0))
+            else:
+                quality_score = float(
+                    np.mean([self._simulated_score(name, v, ranges[name]) for name, v in values.items()])
                 )
+                mechanical = [self._calculate_mechanical_properties({}, v) for v in values.values()]
 
-                self.results.append(result)
+            responses["quality_score"] = quality_score
+            responses["allowable_stress"] = min(m[0] for m in mechanical)
+            responses["safety_factor"] = min(m[1] for m in mechanical)
+            responses["analysis_time"] = time.time() - iteration_start
+            self.log(f"   Quality score: {quality_score:.1f}/100")
+            return responses
 
-                self.log(f"   Quality score: {quality_score:.1f}/100")
-                self.log(f"   Time elapsed: {analysis_time:.2f}s")
+        except Exception as e:
+            self.log(f"   ✗ 错误: {e}")
+            return None
 
-            except Exception as e:
-                self.log(f"   ✗ 错误: {e}")
-                import traceback
+    def _export_shape(self, export_file: Path, index: int) -> Tuple[Optional[Path], Optional[Dict[str, Any]]]:
+        """导出重建后的形状
 
-                traceback.print_exc()
-                continue
+        导出前先计算形状指纹；与之前某次评估的形状相同（参数被截断或未被特征树使用）
+        时不再导出，直接返回那次的导出文件与缓存记录。
 
-        # 关闭文档
-        self.log("\nClosing document...")
-        self.connector.close_document(save=False)
-        self.connector.disconnect()
+        Returns:
+            (导出文件, 形状缓存记录)；导出失败时导出文件为 None，连接器不支持指纹时记录为 None
+        """
+        fingerprint = self._shape_fingerprint()
+        shape = self._shape_cache.get(fingerprint) if fingerprint else None
+        if shape is not None and Path(shape["export_path"]).exists():
+            self.log(f"   Shape unchanged (same as #{shape['index']}), reusing {Path(shape['export_path']).name}")
+            self.reused_shapes += 1
+            return Path(shape["export_path"]), shape
+
+        self.log(f"   Exporting: {export_file.name}")
+        if not self.connector.export_file(str(export_file), "STEP"):
+            self.log("   Export failed")
+            return None, None
+        if fingerprint is None:
+            return export_file, None
+        shape = {"index": index, "export_path": str(export_file), "geo_data": None}
+        self._shape_cache[fingerprint] = shape
+        return export_file, shape
+
+    def _shape_fingerprint(self) -> Optional[str]:
+        summary = getattr(self.connector, "shape_summary", None)
+        data = summary() if summary is not None else None
+        return shape_fingerprint(data) if data else None
+
+    def _shape_analysis(self, export_file: Path, shape: Optional[Dict[str, Any]]) -> Dict:
+        """分析几何；相同形状只分析一次"""
+        if shape is not None and shape["geo_data"] is not None:
+            return shape["geo_data"]
+        geo_data = self._analyze_geometry(export_file)
+        if shape is not None:
+            shape["geo_data"] = geo_data
+        return geo_data
+
+    @staticmethod
+    def _simulated_score(param_name: str, value: float, param_range: tuple) -> float:
+        """未分析几何时的模拟质量分数（用于测试）"""
+        min_val, max_val = param_range
+        if param_name.lower() in ["fillet", "radius", "r"]:
+            # 圆角半径在适中范围得分高
+            optimal = (min_val + max_val) / 2
+            return 100 - abs(value - optimal) / (max_val - min_val) * 50
+        return 50 + (value - min_val) / (max_val - min_val) * 40
 
-        # 生成最终报告
-        if self.results:
-            self._generate_summary()
+    def _analyze_geometry(self, export_file: Path) -> Dict:
+        """解析导出的几何
 
-        return self.results
+        连接器支持时直接三角化内存中的形状，否则同时导出STL，基于三角网格计算
+        体积/面数/顶点数（焊接后的唯一顶点）；无法导出或解析STL时退回通过OCC读取STEP文件。
+        """
+        from sw_helper.geometry.parser import GeometryParser
+        from sw_helper.geometry.stl_reader import StlFormatError
 
-    def _calculate_quality_score(self, geo_data: Dict, param_value: float) -> float:
-        """计算质量分数 - 包含许用应力和安全系数分析（改进版）"""
+        tessellate = getattr(self.connector, "tessellate", None)
+        triangles = tessellate() if tessellate is not None else None
+        if triangles is not None and len(triangles):
+            return GeometryParser(weld=True).parse_mesh(triangles, name=export_file.stem)
+
+        stl_file = export_file.with_suffix(".stl")
+        if self.connector.export_file(str(stl_file), "STL") and stl_file.exists() and stl_file.stat().st_size:
+            try:
+                return GeometryParser(weld=True).parse(str(stl_file))
+            except StlFormatError as e:
+                self.log(f"   STL analysis failed, using STEP: {e}")
+        # 流式扫描不含体积/面数/顶点数，需要OCC加载B-rep（不可用时报错，而不是按默认值评分）
+        return GeometryParser(geometry=True).parse(str(export_file))
+
+    def _calculate_quality_score(self, geo_data: Dict, param_value: Union[float, Sequence[float]]) -> float:
+        """计算质量分数 - 包含许用应力和安全系数分析（改进版）
+
+        多参数（DOE 样本）时几何项只计一次，参数项取各参数加分的平均值，
+        力学性能项取各参数中最保守的许用应力与安全系数；单参数时与原评分一致。
+        """
+        param_values = [param_value] if isinstance(param_value, (int, float)) else list(param_value)
         score = 50.0  # 基础分
 
         # 体积合理性
-        volume = geo_data.get("volume", 0)
+        volume = geo_data.get("volume", 0) * MM3_TO_M3
         if 0.0001 < volume < 0.01:  # 合理的体积范围
             score += 15
         elif volume < 0.0001:
@@ -282,17 +615,12 @@ class FreeCADOptimizer:
             score += 7  # 过于复杂
 
         # 参数优化加分（假设适中的参数值更好）
-        min_param = 5
-        max_param = 15
-        if min_param < param_value < max_param:
-            score += 20
-        elif param_value <= min_param:
-            score += 10
-        else:
-            score += 15
+        score += float(np.mean([self._parameter_bonus(value) for value in param_values]))
 
         # 力学性能加分
-        allowable_stress, safety_factor = self._calculate_mechanical_properties(geo_data, param_value)
+        mechanical = [self._calculate_mechanical_properties(geo_data, value) for value in param_values]
+        allowable_stress = min(m[0] for m in mechanical)
+        safety_factor = min(m[1] for m in mechanical)
         if allowable_stress > 140:
             score += 10
         elif allowable_stress > 120:
@@ -309,13 +637,25 @@ class FreeCADOptimizer:
 
         return min(100, max(0, score))
 
+    @staticmethod
+    def _parameter_bonus(param_value: float) -> float:
+        """参数值加分（假设适中的参数值更好）"""
+        min_param = 5
+        max_param = 15
+        if min_param < param_value < max_param:
+            return 20
+        elif param_value <= min_param:
+            return 10
+        else:
+            return 15
+
     def _calculate_mechanical_properties(self, geo_data: Dict, param_value: float) -> tuple:
         """计算力学性能 - 许用应力和安全系数（改进版）"""
         # 假设材料为Q235钢
         yield_strength = 235  # MPa
 
         # 根据几何信息调整计算
-        volume = geo_data.get("volume", 0)
+        volume = geo_data.get("volume", 0) * MM3_TO_M3
         vertices = geo_data.get("vertices", 0)
         faces = geo_data.get("faces", 0)
 
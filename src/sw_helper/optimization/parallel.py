@@ -0,0 +1,185 @@
+"""
+并行优化 - 独立 FreeCAD 工作进程池
+
+FreeCAD 是单线程的，但独立进程互不影响。每个工作进程以 spawn 启动、
+以无界面方式加载 FreeCAD，并打开自己的一份文档副本；主进程把参数值
+分派给空闲的工作进程，按完成顺序收集结果（进程生命周期见
+:mod:`sw_helper.utils.worker_pool`）：
+
+- 每个工作进程只连接/打开文档一次，之后复用
+- 单次评估超时或工作进程异常退出时终止并重新启动该进程，其余评估不受影响
+- 工作进程的输出被收集后随结果返回，由主进程统一记录
+
+用法::
+
+    tasks = [EvaluationTask(i, {"Length": v}, {"Length": (80, 120)}, "out/") for i, v in enumerate(values, 1)]
+    with OptimizerPool("bracket.FCStd", max_workers=8) as pool:
+        for reply in pool.run(tasks):
+            print(reply.task.index, reply.status, reply.result)
+"""
+
+import contextlib
+import io
+import shutil
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..utils.worker_pool import WorkerPool
+
+
+@dataclass
+class EvaluationTask:
+    """一次参数评估
+
+    Attributes:
+        index: 迭代/样本序号
+        values: 参数名 -> 参数值
+        ranges: 参数名 -> (最小值, 最大值)，用于未分析几何时的模拟评分
+        output_dir: 导出目录
+        analyze_geometry: 是否分析几何质量
+        kind: iteration（单参数迭代，返回 OptimizationResult）/ sample（DOE样本，返回响应字典）
+    """
+
+    index: int
+    values: Dict[str, float]
+    ranges: Dict[str, Tuple[float, float]]
+    output_dir: str
+    analyze_geometry: bool = True
+    kind: str = "iteration"
+
+
+@dataclass
+class EvaluationReply:
+    """工作进程的评估结果"""
+
+    task: EvaluationTask
+    status: str  # completed / failed / timeout / error
+    result: Any = None
+    elapsed: float = 0.0
+    error: str = ""
+    worker: int = 0
+    messages: List[str] = field(default_factory=list)
+
+
+def _evaluate(optimizer, task: EvaluationTask):
+    """在工作进程中评估"""
+    output_path = Path(task.output_dir)
+    if task.kind == "iteration":
+        ((name, value),) = task.values.items()
+        return optimizer._evaluate(task.index, name, value, task.ranges[name], output_path, task.analyze_geometry)
+    return optimizer._evaluate_sample(task.index, task.values, task.ranges, output_path, task.analyze_geometry)
+
+
+def _worker_main(conn, file_path: str, use_mock: bool, work_dir: str):
+    """工作进程：打开文档副本，循环接收评估任务，直到收到 None"""
+    from .optimizer import FreeCADOptimizer
+
+    messages: List[str] = []
+    optimizer = FreeCADOptimizer(use_mock=use_mock)
+    optimizer.set_progress_callback(messages.append)
+
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output):
+            document = Path(work_dir) / Path(file_path).name
+            shutil.copy2(file_path, document)
+            ok = optimizer.connect() and optimizer.connector.open_document(str(document))
+        error = "" if ok else f"工作进程无法打开文档: {file_path}"
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    conn.send({"ready": not error, "error": error, "messages": messages + output.getvalue().splitlines()})
+    if error:
+        return
+
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+        messages.clear()
+        output = io.StringIO()
+        start = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(output):
+                result = _evaluate(optimizer, task)
+            reply = {"status": "completed" if result is not None else "failed", "result": result, "error": ""}
+        except Exception as e:  # 单次评估失败不影响其它评估
+            reply = {"status": "error", "result": None, "error": f"{type(e).__name__}: {e}"}
+        reply["elapsed"] = time.perf_counter() - start
+        reply["messages"] = messages + output.getvalue().splitlines()
+        conn.send(reply)
+
+    with contextlib.suppress(Exception), contextlib.redirect_stdout(io.StringIO()):
+        optimizer.connector.close_document(save=False)
+        optimizer.connector.disconnect()
+
+
+class OptimizerPool:
+    """FreeCAD 工作进程池
+
+    Args:
+        file_path: CAD文件路径（每个工作进程打开自己的副本）
+        max_workers: 工作进程数（None 为CPU核数）
+        use_mock: 使用模拟连接器
+        timeout: 单次评估超时秒数（None 不限时）
+        startup_timeout: 工作进程加载 FreeCAD 并打开文档的超时秒数
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        max_workers: Optional[int] = None,
+        use_mock: bool = False,
+        timeout: Optional[float] = None,
+        startup_timeout: float = 300.0,
+    ):
+        self.file_path = str(file_path)
+        self.use_mock = use_mock
+        self._pool = WorkerPool(
+            _worker_main,
+            args=(self.file_path, use_mock),
+            max_workers=max_workers,
+            timeout=timeout,
+            handshake=True,
+            startup_timeout=startup_timeout,
+            work_prefix="cae_optimize_",
+        )
+        self.max_workers = self._pool.max_workers
+        self.timeout = timeout
+        self.startup_timeout = startup_timeout
+
+    def __enter__(self) -> "OptimizerPool":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """停止全部工作进程并删除文档副本"""
+        self._pool.close()
+
+    def run(self, tasks: Iterable[EvaluationTask]) -> Iterator[EvaluationReply]:
+        """执行评估，按完成顺序逐个返回结果
+
+        Raises:
+            RuntimeError: 没有工作进程能打开文档时
+        """
+        for outcome in self._pool.run(tasks):
+            if outcome.status != "done":
+                status = "timeout" if outcome.status == "timeout" else "error"
+                yield EvaluationReply(outcome.task, status, elapsed=outcome.elapsed, error=outcome.error)
+                continue
+            reply = outcome.reply
+            yield EvaluationReply(
+                outcome.task,
+                reply["status"],
+                result=reply["result"],
+                elapsed=reply["elapsed"],
+                error=reply["error"],
+                worker=outcome.worker,
+                messages=reply["messages"],
+            )
@@ -9,6 +9,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Callable, Dict, List, Optional
 
+from .units import MM3_TO_M3
+
 
 @dataclass
 class OptimizationResult:
@@ -53,6 +55,7 @@ class ParametricOptimizer:
         radius_range: tuple = (2, 15),
         steps: int = 5,
         cad_type: str = "solidworks",
+        analyze_geometry: bool = True,
     ) -> List[OptimizationResult]:
         """
         优化圆角半径
@@ -69,11 +72,11 @@ class ParametricOptimizer:
             radius_range: 圆角半径范围 (min, max) mm
             steps: 迭代次数
             cad_type: CAD软件类型
+            analyze_geometry: 是否分析几何质量（关闭时不额外导出STL）
 
         Returns:
             优化结果列表
         """
-        from sw_helper.geometry.parser import GeometryParser
         from sw_helper.integrations.cad_connector import CADManager
 
         self.results = []
@@ -148,9 +151,10 @@ class ParametricOptimizer:
                     continue
 
                 # 4. 分析几何质量
-                console_print("  ⏳ 分析几何质量...")
-                parser = GeometryParser()
-                geo_data = parser.parse(str(export_path))
+                geo_data = {}
+                if analyze_geometry:
+                    console_print("  ⏳ 分析几何质量...")
+                    geo_data = self._analyze_geometry(export_path)
 
                 # 计算质量分数（模拟）
                 quality_score = self._calculate_quality_score(geo_data, radius)
@@ -164,7 +168,7 @@ class ParametricOptimizer:
                     quality_score=quality_score,
                     analysis_time=analysis_time,
                     timestamp=datetime.now().isoformat(),
-                    notes=f"体积: {geo_data.get('volume', 0):.2e} m³",
+                    notes=f"体积: {geo_data.get('volume', 0) * MM3_TO_M3:.2e} m³",
                 )
 
                 self.results.append(result)
@@ -184,6 +188,20 @@ class ParametricOptimizer:
 
         return self.results
 
+    def _analyze_geometry(self, export_path: Path) -> Dict:
+        """解析导出的几何（能导出STL时基于三角网格计算体积/面数/顶点数）"""
+        from sw_helper.geometry.parser import GeometryParser
+        from sw_helper.geometry.stl_reader import StlFormatError
+
+        stl_path = export_path.with_suffix(".stl")
+        if self.cad.export_file(str(stl_path), "STL") and stl_path.exists() and stl_path.stat().st_size:
+            try:
+                return GeometryParser(weld=True).parse(str(stl_path))
+            except StlFormatError:
+                pass
+        # 流式扫描不含体积/面数/顶点数，需要OCC加载B-rep（不可用时报错，而不是按默认值评分）
+        return GeometryParser(geometry=True).parse(str(export_path))
+
     def _calculate_quality_score(self, geo_data: Dict, radius: float) -> float:
         """计算质量分数"""
         # 这是一个简化的质量评分函数
@@ -200,7 +218,7 @@ class ParametricOptimizer:
             score += 5
 
         # 体积合理加分（不过大）
-        volume = geo_data.get("volume", 0)
+        volume = geo_data.get("volume", 0) * MM3_TO_M3
         if volume < 0.001:  # 小于1升
             score += 15
 
@@ -0,0 +1,204 @@
+"""
+代理模型优化 - 高斯过程（Kriging）+ 期望改进
+
+每次参数评估需要 修改参数→重建→导出STEP→分析 的完整循环（数十秒），
+固定网格扫描浪费大量评估。这里对已完成的评估拟合一维高斯过程代理模型，
+以期望改进（Expected Improvement）选择下一个参数值，期望改进低于收敛
+容差时停止。
+"""
+
+import math
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from scipy.special import erf as _erf
+except ImportError:  # SciPy 为可选依赖，未安装时逐元素计算
+    _erf = np.vectorize(math.erf)
+
+# 默认候选长度尺度（归一化到 [0, 1] 的参数空间）
+DEFAULT_LENGTH_SCALES = (0.05, 0.1, 0.2, 0.35, 0.5, 1.0)
+
+
+class GaussianProcess:
+    """一维高斯过程回归（RBF核）
+
+    输入为归一化到 [0, 1] 的参数值，输出在内部标准化。长度尺度在候选值中
+    按对数边际似然选取。
+
+    Args:
+        length_scales: 候选长度尺度
+        noise: 观测噪声方差（相对标准化输出），同时作为数值稳定项
+    """
+
+    def __init__(self, length_scales: Sequence[float] = DEFAULT_LENGTH_SCALES, noise: float = 1e-6):
+        self.length_scales = tuple(length_scales)
+        self.noise = noise
+        self.length_scale = self.length_scales[0]
+        self._x = np.zeros(0)
+        self._alpha = np.zeros(0)
+        self._chol = np.zeros((0, 0))
+        self._y_mean = 0.0
+        self._y_std = 1.0
+
+    def _kernel(self, a: np.ndarray, b: np.ndarray, length_scale: float) -> np.ndarray:
+        d = a[:, None] - b[None, :]
+        return np.exp(-0.5 * (d / length_scale) ** 2)
+
+    def fit(self, x: Sequence[float], y: Sequence[float]) -> "GaussianProcess":
+        """拟合观测数据"""
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if x.size == 0:
+            raise ValueError("高斯过程至少需要一个观测点")
+
+        self._y_mean = float(y.mean())
+        self._y_std = float(y.std()) or 1.0
+        y_norm = (y - self._y_mean) / self._y_std
+
+        best = None
+        for length_scale in self.length_scales:
+            K = self._kernel(x, x, length_scale) + self.noise * np.eye(x.size)
+            try:
+                L = np.linalg.cholesky(K)
+            except np.linalg.LinAlgError:
+                continue
+            alpha = np.linalg.solve(L.T, np.linalg.solve(L, y_norm))
+            # 对数边际似然（省略常数项）
+            log_likelihood = -0.5 * float(y_norm @ alpha) - float(np.log(np.diag(L)).sum())
+            if best is None or log_likelihood > best[0]:
+                best = (log_likelihood, length_scale, L, alpha)
+
+        if best is None:
+            raise ValueError("高斯过程协方差矩阵不正定")
+
+        _, self.length_scale, self._chol, self._alpha = best
+        self._x = x
+        return self
+
+    def predict(self, x: Sequence[float]) -> Tuple[np.ndarray, np.ndarray]:
+        """预测均值与标准差"""
+        x = np.asarray(x, dtype=float)
+        k = self._kernel(x, self._x, self.length_scale)
+        mean = k @ self._alpha
+        v = np.linalg.solve(self._chol, k.T)
+        var = np.clip(1.0 - (v**2).sum(axis=0), 0.0, None)
+        return mean * self._y_std + self._y_mean, np.sqrt(var) * self._y_std
+
+
+def expected_improvement(mean: np.ndarray, std: np.ndarray, best: float, xi: float = 0.0) -> np.ndarray:
+    """最大化问题的期望改进"""
+    mean = np.asarray(mean, dtype=float)
+    std = np.maximum(np.asarray(std, dtype=float), 1e-12)
+    improvement = mean - best - xi
+    z = improvement / std
+    cdf = 0.5 * (1.0 + _erf(z / math.sqrt(2.0)))
+    pdf = np.exp(-0.5 * z**2) / math.sqrt(2.0 * math.pi)
+    return np.maximum(improvement * cdf + std * pdf, 0.0)
+
+
+class SurrogateOptimizer:
+    """基于代理模型的一维自适应搜索（最大化目标）
+
+    先评估 ``initial_points`` 个均布点（含两端），之后每次对全部已完成评估
+    拟合高斯过程，在候选网格上取期望改进最大的参数值。最大期望改进小于
+    ``tolerance × 目标值尺度``，或建议点与已评估点距离小于 ``tolerance × 区间``
+    时视为收敛。
+
+    Args:
+        bounds: 参数范围 (最小值, 最大值)
+        initial_points: 初始均布采样点数
+        tolerance: 相对收敛容差
+        log_scale: 是否在对数空间搜索（对应等比步进）
+        candidates: 候选网格点数
+        xi: 期望改进的探索系数（相对目标值尺度）
+    """
+
+    def __init__(
+        self,
+        bounds: Tuple[float, float],
+        initial_points: int = 3,
+        tolerance: float = 1e-3,
+        log_scale: bool = False,
+        candidates: int = 512,
+        xi: float = 0.01,
+    ):
+        low, high = float(bounds[0]), float(bounds[1])
+        if not high > low:
+            raise ValueError(f"参数范围无效: {bounds}")
+        if log_scale and low <= 0:
+            raise ValueError("对数空间搜索要求参数范围为正")
+        self.bounds = (low, high)
+        self.initial_points = max(2, initial_points)
+        self.tolerance = tolerance
+        self.log_scale = log_scale
+        self.candidates = candidates
+        self.xi = xi
+        self.last_expected_improvement: Optional[float] = None
+
+    def _to_unit(self, values: Iterable[float]) -> np.ndarray:
+        values = np.asarray(list(values), dtype=float)
+        low, high = self.bounds
+        if self.log_scale:
+            return (np.log(values) - math.log(low)) / (math.log(high) - math.log(low))
+        return (values - low) / (high - low)
+
+    def _from_unit(self, u: float) -> float:
+        low, high = self.bounds
+        if self.log_scale:
+            return float(math.exp(math.log(low) + u * (math.log(high) - math.log(low))))
+        return float(low + u * (high - low))
+
+    def initial_values(self) -> List[float]:
+        """初始均布采样点"""
+        n = self.initial_points
+        return [self._from_unit(i / (n - 1)) for i in range(n)]
+
+    def suggest(
+        self, values: Sequence[float], scores: Sequence[float], exclude: Sequence[float] = ()
+    ) -> Optional[float]:
+        """建议下一个评估的参数值
+
+        Args:
+            values: 已完成评估的参数值
+            scores: 对应目标值（越大越好）
+            exclude: 需避开的参数值（如评估失败的点）
+
+        Returns:
+            下一个参数值；已收敛或初始点均评估失败时为 None
+        """
+        evaluated = self._to_unit(values)
+        tried = np.concatenate([evaluated, self._to_unit(exclude)])
+
+        pending = [
+            v for v in self.initial_values() if self._min_distance(self._to_unit([v])[0], tried) > self.tolerance
+        ]
+        if pending:
+            self.last_expected_improvement = None
+            return pending[0]
+        if not evaluated.size:
+            # 没有成功的评估，无法建立代理模型
+            self.last_expected_improvement = None
+            return None
+
+        scores = np.asarray(scores, dtype=float)
+        scale = float(scores.max() - scores.min()) or max(abs(float(scores.max())), 1.0)
+        gp = GaussianProcess().fit(evaluated, scores)
+
+        grid = np.linspace(0.0, 1.0, self.candidates)
+        mean, std = gp.predict(grid)
+        ei = expected_improvement(mean, std, float(scores.max()), self.xi * scale)
+        # 避开已尝试的点
+        distance = np.abs(grid[:, None] - tried[None, :]).min(axis=1)
+        ei[distance <= self.tolerance] = 0.0
+
+        index = int(np.argmax(ei))
+        self.last_expected_improvement = float(ei[index])
+        if self.last_expected_improvement < self.tolerance * scale:
+            return None
+        return self._from_unit(float(grid[index]))
+
+    @staticmethod
+    def _min_distance(u: float, points: np.ndarray) -> float:
+        return float(np.abs(points - u).min()) if points.size else math.inf
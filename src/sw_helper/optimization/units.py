@@ -0,0 +1,6 @@
+"""
+优化模块共用的单位换算常量
+"""
+
+# 几何数据的体积为模型单位 mm³，质量评分的体积阈值按 m³
+MM3_TO_M3 = 1e-9
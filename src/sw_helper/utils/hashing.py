@@ -0,0 +1,50 @@
+"""
+文件内容哈希
+
+网格缓存、三角化缓存、批量转换记录与 integrations 中的求解结果缓存、工作流步骤缓存共用
+（integrations 按需导入，不在导入连接器时加载 sw_helper）。
+
+按 (路径, 大小, 修改时间) 在进程内记忆文件的 SHA-256，文件未变时不重复读取。
+修改时间距哈希时刻不足 :data:`RACY_WINDOW_NS` 的文件可能在同一时间戳粒度内被再次改写
+而大小与修改时间不变，这类哈希不做记忆；持久化哈希的调用方应使用 :func:`is_settled` 做相同判断。
+"""
+
+import hashlib
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Tuple, Union
+
+# 修改时间距哈希时刻不足该值的文件可能在同一时间戳粒度内被再次改写，其哈希不做记忆
+RACY_WINDOW_NS = 2_000_000_000
+
+# (路径, 大小, 修改时间) -> 内容哈希
+_digests: Dict[Tuple[str, int, int], str] = {}
+_digests_lock = threading.Lock()
+
+
+def is_settled(mtime_ns: int, hashed_at: int) -> bool:
+    """修改时间早于哈希时刻至少 RACY_WINDOW_NS，按大小与修改时间记忆的哈希可信"""
+    return mtime_ns < hashed_at - RACY_WINDOW_NS
+
+
+def file_digest(file_path: Union[str, Path], block_size: int = 1 << 20) -> str:
+    """文件内容的SHA-256；按 (路径, 大小, 修改时间) 在进程内记忆，文件未变时不重复读取"""
+    path = Path(file_path).resolve()
+    stat = path.stat()
+    memo = (str(path), stat.st_size, stat.st_mtime_ns)
+    with _digests_lock:
+        digest = _digests.get(memo)
+    if digest is not None:
+        return digest
+
+    hashed_at = time.time_ns()
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            sha.update(block)
+    digest = sha.hexdigest()
+    if is_settled(stat.st_mtime_ns, hashed_at):
+        with _digests_lock:
+            _digests[memo] = digest
+    return digest
@@ -0,0 +1,222 @@
+"""
+spawn 工作进程池
+
+OCC 与 FreeCAD 都不保证 fork 安全，批量转换与并行优化都在 spawn 启动的独立工作进程中进行。
+本模块负责工作进程的生命周期，任务的具体执行由各模块的工作函数完成：
+
+- 工作进程执行 ``target(conn, *args)``：循环 ``conn.recv()`` 接收任务、``conn.send()`` 回复，
+  收到 None 或连接关闭时退出
+- 任务分派给空闲的工作进程，按完成顺序返回结果；工作进程在多次 :meth:`WorkerPool.run` 之间复用
+- 单个任务超时或工作进程异常退出时终止并重新启动该进程，其余任务不受影响
+- 可选的启动握手：工作进程初始化（如打开文档）后先回复 ``{"ready": bool, "error": str}``
+- 可选的工作目录：每个工作进程一个临时目录，作为最后一个参数传入，进程停止时删除
+
+用法::
+
+    with WorkerPool(_worker_main, args=(convert,), max_workers=8, timeout=300) as pool:
+        for outcome in pool.run(tasks):
+            print(outcome.task, outcome.status, outcome.reply)
+"""
+
+import contextlib
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from collections import deque
+from dataclasses import dataclass
+from multiprocessing.connection import wait
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+# 监控循环的最长等待时间（秒），用于检查超时与异常退出的工作进程
+_POLL_INTERVAL = 0.5
+
+
+@dataclass
+class TaskOutcome:
+    """一个任务的结果
+
+    Attributes:
+        task: 分派的任务
+        status: done（工作进程已回复）/ timeout / crashed（工作进程异常退出）
+        reply: 工作进程的回复（仅 done）
+        elapsed: 自分派起的秒数
+        error: timeout / crashed 的说明
+        worker: 工作进程编号（重启的进程使用新编号）
+    """
+
+    task: Any
+    status: str
+    reply: Any = None
+    elapsed: float = 0.0
+    error: str = ""
+    worker: int = 0
+
+
+class _Worker:
+    def __init__(self, context, number: int, target: Callable, args: tuple, work_dir: Optional[str], ready: bool):
+        self.number = number
+        self.work_dir = work_dir
+        self.conn, child = context.Pipe()
+        extra = (work_dir,) if work_dir else ()
+        self.process = context.Process(target=target, args=(child, *args, *extra), daemon=True)
+        self.process.start()
+        child.close()
+        self.ready = ready
+        self.task: Any = None
+        self.started = time.perf_counter()
+
+    def submit(self, task: Any):
+        self.task = task
+        self.started = time.perf_counter()
+        self.conn.send(task)
+
+    def stop(self, force: bool = False):
+        if not force:
+            with contextlib.suppress(OSError):
+                self.conn.send(None)
+            self.process.join(timeout=10)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout=5)
+            if self.process.is_alive():
+                self.process.kill()
+                self.process.join()
+        self.conn.close()
+        if self.work_dir:
+            shutil.rmtree(self.work_dir, ignore_errors=True)
+
+
+class WorkerPool:
+    """spawn 工作进程池
+
+    Args:
+        target: 工作函数 ``target(conn, *args)``，必须可被 pickle（模块级函数）
+        args: 工作函数的参数（同样必须可被 pickle）
+        max_workers: 工作进程数（None 为CPU核数）
+        timeout: 单个任务超时秒数（None 不限时）
+        handshake: 工作进程启动后先回复就绪消息；未就绪的进程不分派任务
+        startup_timeout: 等待就绪消息的超时秒数（仅 handshake 时生效）
+        work_prefix: 不为 None 时为每个工作进程创建临时工作目录（根目录以此为前缀）
+    """
+
+    def __init__(
+        self,
+        target: Callable,
+        args: tuple = (),
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        handshake: bool = False,
+        startup_timeout: float = 300.0,
+        work_prefix: Optional[str] = None,
+    ):
+        self.target = target
+        self.args = tuple(args)
+        self.max_workers = max(1, max_workers or os.cpu_count() or 1)
+        self.timeout = timeout
+        self.handshake = handshake
+        self.startup_timeout = startup_timeout
+        self.work_prefix = work_prefix
+        self._context = multiprocessing.get_context("spawn")
+        self._work_root: Optional[str] = None
+        self._workers: List[_Worker] = []
+        self._count = 0
+
+    def __enter__(self) -> "WorkerPool":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """停止全部工作进程并删除工作目录（执行中的任务被终止）"""
+        for worker in self._workers:
+            worker.stop(force=worker.task is not None)
+        self._workers = []
+        if self._work_root:
+            shutil.rmtree(self._work_root, ignore_errors=True)
+            self._work_root = None
+
+    def run(self, tasks: Iterable[Any]) -> Iterator[TaskOutcome]:
+        """执行任务，按完成顺序逐个返回结果
+
+        Raises:
+            RuntimeError: 工作进程启动失败、未就绪或启动超时（重启也无济于事）
+        """
+        pending = deque(tasks)
+        if not pending:
+            return
+        if self.work_prefix is not None and self._work_root is None:
+            self._work_root = tempfile.mkdtemp(prefix=self.work_prefix)
+        while len(self._workers) < min(self.max_workers, len(pending)):
+            self._workers.append(self._spawn())
+
+        while pending or any(w.task is not None for w in self._workers):
+            for worker in self._workers:
+                if worker.ready and worker.task is None and pending:
+                    worker.submit(pending.popleft())
+            alive = list(self._workers)
+            ready = wait([w.conn for w in alive] + [w.process.sentinel for w in alive], self._wait_time(alive))
+
+            for worker in alive:
+                if worker.conn in ready:
+                    try:
+                        reply = worker.conn.recv()
+                    except EOFError:
+                        reply = None
+                    if reply is not None and not worker.ready:
+                        if reply["ready"]:
+                            worker.ready = True
+                            continue
+                        self._retire(worker)
+                        raise RuntimeError(reply["error"])
+                    if reply is not None:
+                        task, worker.task = worker.task, None
+                        elapsed = time.perf_counter() - worker.started
+                        yield TaskOutcome(task, "done", reply, elapsed=elapsed, worker=worker.number)
+                        continue
+
+                elapsed = time.perf_counter() - worker.started
+                if worker.process.sentinel in ready or not worker.process.is_alive():
+                    worker.process.join(timeout=1)
+                    code = worker.process.exitcode
+                    if not worker.ready:
+                        self._retire(worker)
+                        raise RuntimeError(f"工作进程启动失败 (exit code {code})")
+                    task = worker.task
+                    self._replace(worker)
+                    if task is not None:
+                        error = f"工作进程异常退出 (exit code {code})"
+                        yield TaskOutcome(task, "crashed", elapsed=elapsed, error=error, worker=worker.number)
+                elif not worker.ready and elapsed > self.startup_timeout:
+                    self._retire(worker)
+                    raise RuntimeError(f"工作进程启动超过 {self.startup_timeout:g} 秒")
+                elif worker.task is not None and self.timeout is not None and elapsed > self.timeout:
+                    task = worker.task
+                    self._replace(worker)
+                    error = f"超过 {self.timeout:g} 秒"
+                    yield TaskOutcome(task, "timeout", elapsed=elapsed, error=error, worker=worker.number)
+
+    def _spawn(self) -> _Worker:
+        self._count += 1
+        work_dir = tempfile.mkdtemp(prefix=f"worker{self._count}_", dir=self._work_root) if self._work_root else None
+        return _Worker(self._context, self._count, self.target, self.args, work_dir, ready=not self.handshake)
+
+    def _retire(self, worker: _Worker):
+        worker.stop(force=True)
+        self._workers.remove(worker)
+
+    def _replace(self, worker: _Worker):
+        worker.stop(force=True)
+        self._workers[self._workers.index(worker)] = self._spawn()
+
+    def _wait_time(self, workers: List[_Worker]) -> float:
+        limits = [
+            w.started + (self.startup_timeout if not w.ready else self.timeout)
+            for w in workers
+            if not w.ready or (w.task is not None and self.timeout is not None)
+        ]
+        if not limits:
+            return _POLL_INTERVAL
+        return max(0.0, min(_POLL_INTERVAL, min(limits) - time.perf_counter() + 0.01))
@@ -0,0 +1,31 @@
+"""
+单元测试共享夹具
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+
+@pytest.fixture
+def cad_file(tmp_path):
+    """模拟模式下使用的CAD文件（内容不被读取）"""
+    path = tmp_path / "model.FCStd"
+    path.write_text("mock")
+    return path
+
+
+@pytest.fixture
+def make_optimizer():
+    """创建模拟模式、不输出进度的 FreeCADOptimizer：``make_optimizer(workers=1)``"""
+    from sw_helper.optimization.optimizer import FreeCADOptimizer
+
+    def factory(workers: int = 1) -> FreeCADOptimizer:
+        optimizer = FreeCADOptimizer(use_mock=True, workers=workers)
+        optimizer.set_progress_callback(lambda msg: None)
+        return optimizer
+
+    return factory
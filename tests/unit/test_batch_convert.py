@@ -0,0 +1,172 @@
+"""
+批量几何转换测试
+"""
+
+import json
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from sw_helper.geometry.batch_convert import (
+    MANIFEST_NAME,
+    BatchConverter,
+    collect_inputs,
+    plan_conversions,
+    summarize,
+)
+from sw_helper.utils.hashing import RACY_WINDOW_NS
+
+
+def copy_convert(input_file, output_file, target_format):
+    shutil.copy(input_file, output_file)
+    return True
+
+
+def slow_or_failing_convert(input_file, output_file, target_format):
+    name = Path(input_file).stem
+    if name.startswith("slow"):
+        time.sleep(30)
+    if name.startswith("bad"):
+        raise RuntimeError("无法读取")
+    if name.startswith("crash"):
+        os._exit(3)
+    return copy_convert(input_file, output_file, target_format)
+
+
+def rewriting_convert(input_file, output_file, target_format):
+    """转换后供应商改写了输入（大小不变），模拟转换期间的改写"""
+    copy_convert(input_file, output_file, target_format)
+    Path(input_file).write_text(Path(input_file).read_text().upper())
+    return True
+
+
+@pytest.fixture
+def supplier_dir(tmp_path):
+    root = tmp_path / "supplier"
+    (root / "sub").mkdir(parents=True)
+    for name in ("a.step", "b.STP", "sub/c.step"):
+        (root / name).write_text(f"ISO-10303-21; {name}")
+    (root / "notes.txt").write_text("not geometry")
+    return root
+
+
+class TestBatchPlanning:
+    """输入展开与任务规划"""
+
+    def test_collect_and_plan(self, supplier_dir, tmp_path):
+        """目录按扩展名筛选，通配符展开；输出目录保留子目录结构"""
+        inputs = collect_inputs([supplier_dir])
+        assert [p.name for p in inputs] == ["a.step", "b.STP", "c.step"]
+        assert collect_inputs([supplier_dir], recursive=False) == inputs[:2]
+        assert collect_inputs([str(supplier_dir / "**" / "*.step")]) == [inputs[0], inputs[2]]
+
+        tasks = plan_conversions(inputs, "stl", output_dir=tmp_path / "out", base_dir=supplier_dir)
+        assert [t.output_file for t in tasks] == [
+            tmp_path / "out" / "a.stl",
+            tmp_path / "out" / "b.stl",
+            tmp_path / "out" / "sub" / "c.stl",
+        ]
+        assert plan_conversions([inputs[0]])[0].output_file == inputs[0].with_suffix(".stl")
+
+    def test_glob_filters_extensions(self, supplier_dir):
+        assert [p.name for p in collect_inputs([str(supplier_dir / "*")])] == ["a.step", "b.STP"]
+
+    def test_outputs_never_overwrite_inputs(self, supplier_dir):
+        """未登记的上一次输出被丢弃；输出与输入重合时拒绝"""
+        (supplier_dir / "a.stl").write_text("solid a")
+        tasks = plan_conversions(collect_inputs([supplier_dir]), "stl")
+        assert [t.input_file.name for t in tasks] == ["a.step", "b.STP", "c.step"]
+
+        # STEP 与 STL 互为输出，无法判断哪个是源文件
+        with pytest.raises(ValueError, match="覆盖"):
+            plan_conversions(collect_inputs([supplier_dir]))
+
+
+class TestBatchConverter:
+    """进程池转换、跳过、超时与错误隔离"""
+
+    def test_convert_then_skip_up_to_date(self, supplier_dir, tmp_path):
+        """第二次运行跳过未变化的文件；仅修改时间变化也跳过，内容变化则重新转换"""
+        tasks = plan_conversions(collect_inputs([supplier_dir]), "stl", output_dir=tmp_path / "out")
+        converter = BatchConverter(max_workers=2, convert=copy_convert)
+
+        first = list(converter.run(tasks))
+        assert sorted(r.status for r in first) == ["converted"] * 3
+        assert (tmp_path / "out" / "sub" / "c.stl").read_text().endswith("sub/c.step")
+        manifest = json.loads((tmp_path / "out" / MANIFEST_NAME).read_text())
+        assert set(manifest) == {"a.stl", "b.stl"}
+
+        a, b = tasks[0].input_file, tasks[1].input_file
+        future = time.time() + 100
+        os.utime(a, (future, future))
+        b.write_text("ISO-10303-21; changed")
+
+        second = {r.task.input_file.name: r.status for r in converter.run(tasks)}
+        assert second == {"a.step": "skipped", "b.STP": "converted", "c.step": "skipped"}
+        assert [r.status for r in BatchConverter(convert=copy_convert, force=True).run(tasks[:1])] == ["converted"]
+
+    def test_same_tick_and_mid_conversion_rewrites(self, tmp_path):
+        """同一时间戳内的等长改写与转换期间的改写都不会被当作已是最新"""
+        source = tmp_path / "a.step"
+        source.write_text("ISO-10303-21; a")
+        stamp = source.stat().st_mtime_ns
+        tasks = plan_conversions([source], "stl", output_dir=tmp_path / "out")
+        converter = BatchConverter(max_workers=1, convert=copy_convert)
+        assert [r.status for r in converter.run(tasks)] == ["converted"]
+        assert json.loads((tmp_path / "out" / MANIFEST_NAME).read_text())["a.stl"]["mtime_ns"] is None
+
+        source.write_text("ISO-10303-21; b")
+        os.utime(source, ns=(stamp, stamp))
+        assert [r.status for r in converter.run(tasks)] == ["converted"]
+
+        rewriting = BatchConverter(max_workers=1, force=True, convert=rewriting_convert)
+        assert [r.status for r in rewriting.run(tasks)] == ["converted"]
+        assert (tmp_path / "out" / "a.stl").read_text() == "ISO-10303-21; b"
+        assert [r.status for r in converter.run(tasks)] == ["converted"]
+        assert (tmp_path / "out" / "a.stl").read_text() == "ISO-10303-21; B"
+
+        # 内容未变且修改时间稳定后记录修改时间，之后按大小与修改时间跳过
+        old = time.time_ns() - 10 * RACY_WINDOW_NS
+        os.utime(source, ns=(old, old))
+        assert [r.status for r in converter.run(tasks)] == ["skipped"]
+        assert json.loads((tmp_path / "out" / MANIFEST_NAME).read_text())["a.stl"]["mtime_ns"] == old
+        assert [r.status for r in converter.run(tasks)] == ["skipped"]
+
+    def test_convert_in_place_twice(self, supplier_dir):
+        """输出写在输入旁时，再次运行不把上一次的 STL 当作输入，源文件保持不变"""
+        originals = {p: p.read_text() for p in collect_inputs([supplier_dir])}
+        converter = BatchConverter(max_workers=2, convert=copy_convert)
+
+        first = list(converter.run(plan_conversions(collect_inputs([supplier_dir]))))
+        assert sorted(r.status for r in first) == ["converted"] * 3
+        assert (supplier_dir / "a.stl").exists()
+
+        inputs = collect_inputs([supplier_dir])
+        assert inputs == sorted(originals)
+        second = list(converter.run(plan_conversions(inputs)))
+        assert [r.status for r in second] == ["skipped"] * 3
+        assert {p: p.read_text() for p in originals} == originals
+
+    def test_timeout_failure_and_crash_are_isolated(self, tmp_path):
+        """超时、异常与进程崩溃只影响对应文件，其余文件照常转换"""
+        for name in ("slow.step", "bad.step", "crash.step", "ok1.step", "ok2.step"):
+            (tmp_path / name).write_text(name)
+        tasks = plan_conversions(collect_inputs([tmp_path]), "stl", output_dir=tmp_path / "out")
+        converter = BatchConverter(max_workers=2, timeout=3, convert=slow_or_failing_convert)
+
+        start = time.perf_counter()
+        results = list(converter.run(tasks))
+        summary = summarize(results, elapsed=time.perf_counter() - start)
+
+        status = {r.task.input_file.stem: r.status for r in results}
+        assert status == {"slow": "timeout", "bad": "error", "crash": "error", "ok1": "converted", "ok2": "converted"}
+        assert "无法读取" in next(r.error for r in results if r.status == "error" and "bad" in str(r.task.input_file))
+        assert summary["total"] == 5 and summary["converted"] == 2 and summary["timeout"] == 1
+        assert summary["elapsed"] < 20
+        json.dumps(summary)
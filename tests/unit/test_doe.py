@@ -0,0 +1,179 @@
+"""
+试验设计（DOE）测试
+"""
+
+import csv
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from integrations.cae.solvers import SimpleFEMSolver, SolverConfig
+from sw_helper.optimization.doe import (
+    SOBOL_MAX_DIMENSIONS,
+    DesignOfExperiments,
+    DesignParameter,
+    full_factorial,
+    latin_hypercube,
+    sobol_sequence,
+)
+from sw_helper.optimization.optimizer import FreeCADOptimizer
+
+
+def assert_stratified(points: np.ndarray, strata: int):
+    """每一维的每个分层恰好包含一个样本"""
+    for column in points.T:
+        assert sorted((column * strata).astype(int)) == list(range(strata))
+
+
+class TestSampling:
+    """采样方法测试"""
+
+    def test_latin_hypercube_strata(self):
+        points = latin_hypercube(12, 5, seed=0)
+        assert points.shape == (12, 5)
+        assert_stratified(points, 12)
+
+    def test_latin_hypercube_reproducible(self):
+        assert np.array_equal(latin_hypercube(8, 3, seed=7), latin_hypercube(8, 3, seed=7))
+
+    def test_sobol_known_values(self):
+        """前几个点与标准 Sobol 序列一致"""
+        points = sobol_sequence(4, 3)
+        expected = [[0.0, 0.0, 0.0], [0.5, 0.5, 0.5], [0.75, 0.25, 0.25], [0.25, 0.75, 0.75]]
+        assert points == pytest.approx(np.array(expected))
+
+    @pytest.mark.parametrize("seed", [None, 3])
+    def test_sobol_strata(self, seed):
+        """2 的幂个样本时各维分层均匀（数字移位后保持）"""
+        assert_stratified(sobol_sequence(64, SOBOL_MAX_DIMENSIONS, seed=seed), 64)
+
+    def test_sobol_first_pair_is_net(self):
+        """前两维构成 (0, m, 2)-网：16 个点在每种 16 格划分中各占一格"""
+        points = sobol_sequence(16, 2)
+        for nx, ny in [(1, 16), (2, 8), (4, 4), (8, 2), (16, 1)]:
+            cells = {(int(a * nx), int(b * ny)) for a, b in points}
+            assert len(cells) == 16
+
+    def test_sobol_too_many_dimensions(self):
+        with pytest.raises(ValueError, match="LHS"):
+            sobol_sequence(8, SOBOL_MAX_DIMENSIONS + 1)
+
+    def test_full_factorial(self):
+        points = full_factorial([2, 3])
+        assert points.shape == (6, 2)
+        assert {tuple(p) for p in points} == {(a, b) for a in (0.0, 1.0) for b in (0.0, 0.5, 1.0)}
+
+
+class TestDesignOfExperiments:
+    """试验设计与结果表测试"""
+
+    def test_design_scaled_to_ranges(self):
+        parameters = [DesignParameter("Length", 80, 120), DesignParameter("Radius", 1, 100, log_scale=True)]
+        design = DesignOfExperiments(parameters, "factorial").design()
+        assert sorted(set(design[:, 0])) == pytest.approx([80, 100, 120])
+        assert sorted(set(design[:, 1])) == pytest.approx([1, 10, 100])
+
+    def test_invalid_configuration(self):
+        with pytest.raises(ValueError):
+            DesignParameter("Length", 10, 5)
+        with pytest.raises(ValueError):
+            DesignOfExperiments([DesignParameter("A", 0, 1)], "grid")
+        with pytest.raises(ValueError):
+            DesignOfExperiments([DesignParameter("A", 0, 1), DesignParameter("A", 0, 2)])
+
+    def test_run_sensitivity_and_save(self, tmp_path):
+        """评估失败的样本为 NaN；灵敏度识别主导参数；结果表按扩展名写出"""
+        parameters = [DesignParameter(name, 0, 1) for name in ("a", "b", "c")]
+        doe = DesignOfExperiments(parameters, "lhs", samples=40, seed=1)
+
+        def evaluate(i, values):
+            if i == 5:
+                return None
+            return {"response": 10 * values["a"] + values["b"]}
+
+        results = doe.run(evaluate)
+        assert len(results) == 40
+        assert np.isnan(results.responses["response"][4])
+
+        sensitivity = results.sensitivity("response")
+        assert sensitivity["a"] > 0.9
+        assert abs(sensitivity["c"]) < 0.05
+
+        csv_path = results.save(tmp_path / "doe.csv")
+        with open(csv_path, encoding="utf-8") as f:
+            rows = list(csv.reader(f))
+        assert rows[0] == ["sample", "a", "b", "c", "response"]
+        assert len(rows) == 41
+
+        data = np.load(results.save(tmp_path / "doe.npz"))
+        assert data["a"] == pytest.approx(results.samples[:, 0])
+
+        with pytest.raises(ValueError):
+            results.save(tmp_path / "doe.xlsx")
+
+    def test_run_batch_with_beam_solver(self):
+        """向量化评估：一次调用批量梁求解，结果与逐个求解一致"""
+        doe = DesignOfExperiments(
+            [DesignParameter("length", 500, 3000), DesignParameter("height", 60, 160)], "sobol", 64, seed=3
+        )
+        solver = SimpleFEMSolver()
+        calls = []
+
+        def evaluate(values):
+            calls.append(values)
+            batch = solver.solve_batch(1000.0, values["length"], 50, values["height"])
+            return {"max_stress": batch.max_stress, "safety_factor": batch.safety_factor}
+
+        results = doe.run_batch(evaluate)
+
+        assert len(calls) == 1 and len(results) == 64
+        length, height = results.samples[10]
+        single = solver.solve(SolverConfig(load=1000.0, geometry={"length": length, "width": 50, "height": height}))
+        assert results.responses["max_stress"][10] == pytest.approx(single.max_stress)
+        assert results.sensitivity("safety_factor")["height"] > 0
+
+        with pytest.raises(ValueError, match="样本数"):
+            doe.run_batch(lambda values: {"max_stress": np.zeros(3)})
+
+    def test_optimizer_run_doe(self, tmp_path):
+        """FreeCADOptimizer 对每个样本设置全部参数并记录响应"""
+        cad_file = tmp_path / "model.FCStd"
+        cad_file.write_text("mock")
+        optimizer = FreeCADOptimizer(use_mock=True)
+        optimizer.set_progress_callback(lambda msg: None)
+
+        results = optimizer.run_doe(
+            str(cad_file),
+            [DesignParameter("Length", 80, 120), DesignParameter("Width", 40, 60)],
+            method="sobol",
+            samples=8,
+            output_dir=str(tmp_path / "out"),
+            analyze_geometry=False,
+        )
+
+        assert len(results) == 8
+        assert np.isfinite(results.responses["quality_score"]).all()
+        assert set(results.responses) >= {"quality_score", "allowable_stress", "safety_factor"}
+        assert optimizer.connector.mock_params["Width"] == pytest.approx(results.samples[-1, 1])
+
+        with pytest.raises(ValueError, match="not found"):
+            optimizer.run_doe(str(cad_file), [DesignParameter("Missing", 0, 1)], output_dir=str(tmp_path))
+
+    def test_multi_parameter_quality_score(self):
+        """多参数评分只计一次几何项：参数项取平均，力学性能取最保守值"""
+        optimizer = FreeCADOptimizer(use_mock=True)
+        geo_data = {"volume": 1.0, "faces": 10, "vertices": 10}
+
+        single = optimizer._calculate_quality_score(geo_data, 10.0)
+        assert optimizer._calculate_quality_score(geo_data, [10.0, 10.0]) == pytest.approx(single)
+        assert optimizer._calculate_quality_score(geo_data, [10.0]) == pytest.approx(single)
+
+        # 参数加分取 20 与 10 的平均值 15（比单独 2.0 多 5）；
+        # 安全系数取两者中较小的 1.5（加 2 分，单独 2.0 时为 1.8，加 5 分）
+        mixed = optimizer._calculate_quality_score(geo_data, [10.0, 2.0])
+        low = optimizer._calculate_quality_score(geo_data, 2.0)
+        assert mixed == pytest.approx(low + 5 - 3)
@@ -0,0 +1,162 @@
+"""
+CalculiX .frd 结果读取器测试
+"""
+
+import struct
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from integrations.cae.frd_reader import FrdFormatError, FrdReader, summarize_frd, von_mises
+
+NODE_IDS = np.array([1, 2, 3, 4, 5, 6, 7, 8, 12])
+COORDS = np.random.default_rng(0).random((len(NODE_IDS), 3)) * 100
+# 两个增量步的位移/应力，第二步为第一步的两倍；含负值以检验首尾相接的定长字段
+DISP = np.random.default_rng(1).normal(size=(len(NODE_IDS), 3))
+STRESS = np.random.default_rng(2).normal(size=(len(NODE_IDS), 6)) * 100
+TEMP = np.linspace(20, 300, len(NODE_IDS))[:, None]
+
+COMPONENTS = {
+    "DISP": ["D1", "D2", "D3", "ALL"],
+    "STRESS": ["SXX", "SYY", "SZZ", "SXY", "SYZ", "SZX"],
+    "NDTEMP": ["T"],
+}
+
+
+def _ascii_rows(ids, values, width):
+    rows = []
+    for node, row in zip(ids, values):
+        for start in range(0, len(row), 6):
+            key = " -1" if start == 0 else " -2"
+            label = f"{node:{width}d}" if start == 0 else " " * width
+            rows.append(key + label + "".join(f"{v:12.5E}" for v in row[start : start + 6]))
+    return "\n".join(rows) + "\n"
+
+
+def _write_frd(path: Path, fmt: int):
+    """fmt: 0 短格式ASCII, 1 长格式ASCII, 2 二进制"""
+    width = 10 if fmt == 1 else 5
+    with open(path, "wb") as f:
+        f.write(b"    1C\n    1UUSER\n")
+        node_fmt = 3 if fmt == 2 else fmt
+        f.write(f"    2C{len(NODE_IDS):24d}{node_fmt:37d}\n".encode())
+        if fmt == 2:
+            for node, xyz in zip(NODE_IDS, COORDS):
+                f.write(struct.pack("<i3d", node, *xyz))
+        else:
+            f.write(_ascii_rows(NODE_IDS, COORDS, width).encode() + b" -3\n")
+
+        f.write(f"    3C{1:24d}{fmt:37d}\n".encode())
+        if fmt == 2:
+            f.write(struct.pack("<4i8i", 1, 1, 0, 1, *NODE_IDS[:8]))
+        else:
+            f.write(f" -1{1:{width}d}{1:5d}{0:5d}{1:5d}\n".encode())
+            f.write((" -2" + "".join(f"{n:{width}d}" for n in NODE_IDS[:8]) + "\n").encode())
+            f.write(b" -3\n")
+
+        for inc, scale in ((1, 1.0), (2, 2.0)):
+            f.write(f"    1PSTEP{inc:26d}{inc:12d}{1:12d}\n".encode())
+            for name, values in (("DISP", DISP * scale), ("STRESS", STRESS * scale), ("NDTEMP", TEMP * scale)):
+                header = f"  100CL  10{inc}{scale:12.5E}{len(NODE_IDS):12d}{'':20s}{0:2d}{inc:5d}{'':10s}{fmt:2d}"
+                f.write(header.encode() + b"\n")
+                comps = COMPONENTS[name]
+                f.write(f" -4  {name:8s}{len(comps):5d}{1:5d}\n".encode())
+                for i, comp in enumerate(comps):
+                    exist = "    1ALL" if comp == "ALL" else ""
+                    f.write(f" -5  {comp:8s}{1:5d}{2:5d}{i + 1:5d}{0:5d}{exist}\n".encode())
+                if fmt == 2:
+                    for node, row in zip(NODE_IDS, values):
+                        f.write(struct.pack(f"<i{len(row)}f", node, *row))
+                else:
+                    f.write(_ascii_rows(NODE_IDS, values, width).encode() + b" -3\n")
+        f.write(b" 9999\n")
+
+
+class TestFrdReader:
+    """FRD读取器测试"""
+
+    @pytest.mark.parametrize("fmt", [0, 1, 2])
+    @pytest.mark.parametrize("chunk_size", [2, 65536])
+    def test_read_blocks(self, tmp_path, fmt, chunk_size):
+        """ASCII短/长格式与二进制格式读取结果一致"""
+        path = tmp_path / "model.frd"
+        _write_frd(path, fmt)
+
+        results = FrdReader(path, chunk_size=chunk_size).read()
+
+        atol = 1e-6 if fmt == 2 else 1e-4
+        np.testing.assert_array_equal(results.node_ids, NODE_IDS)
+        np.testing.assert_allclose(results.nodes, COORDS, rtol=1e-5, atol=1e-3)
+        assert results.element_counts == {"he8": 1}
+        assert [b.name for b in results.blocks] == ["DISP", "STRESS", "NDTEMP"] * 2
+
+        disp = results.last("DISP")
+        assert (disp.step, disp.increment) == (1, 2)
+        assert disp.components == ["D1", "D2", "D3"]
+        np.testing.assert_allclose(disp.values, DISP * 2, rtol=1e-5, atol=atol)
+        np.testing.assert_allclose(results.get("STRESS", increment=1)[0].values, STRESS, rtol=1e-5, atol=atol)
+        np.testing.assert_allclose(disp.at(12), DISP[-1] * 2, rtol=1e-5, atol=atol)
+        assert set(disp.to_dict()) == set(NODE_IDS.tolist())
+
+    def test_field_filter_skips_blocks(self, tmp_path):
+        """未请求的物理量被跳过"""
+        path = tmp_path / "model.frd"
+        _write_frd(path, 1)
+
+        blocks = list(FrdReader(path, fields=["NDTEMP"]).iter_blocks())
+
+        assert [b.name for b in blocks] == ["NDTEMP", "NDTEMP"]
+        np.testing.assert_allclose(blocks[-1].values, TEMP * 2, rtol=1e-5)
+
+    def test_summary_maxima(self, tmp_path):
+        """汇总给出精确的最大位移与最大等效应力及节点"""
+        path = tmp_path / "model.frd"
+        _write_frd(path, 0)
+
+        summary = summarize_frd(path)
+
+        magnitude = np.linalg.norm(DISP * 2, axis=1)
+        mises = von_mises(STRESS * 2)
+        assert summary["nodes"] == len(NODE_IDS)
+        assert summary["elements"] == 1
+        assert summary["steps"] == [(1, 1), (1, 2)]
+        assert summary["max_displacement"] == pytest.approx(magnitude.max(), rel=1e-4)
+        assert summary["max_displacement_node"] == NODE_IDS[np.argmax(magnitude)]
+        assert summary["max_von_mises"] == pytest.approx(mises.max(), rel=1e-4)
+        assert summary["max_von_mises_node"] == NODE_IDS[np.argmax(mises)]
+        assert summary["max_temperature"] == pytest.approx(600.0)
+
+    def test_truncated_file(self, tmp_path):
+        """结果块数据不完整时报错"""
+        path = tmp_path / "model.frd"
+        _write_frd(path, 1)
+        text = path.read_bytes()
+        path.write_bytes(text[: text.index(b"NDTEMP")])
+
+        with pytest.raises(FrdFormatError):
+            list(FrdReader(path).iter_blocks())
+
+    def test_solver_and_connector_use_reader(self, tmp_path):
+        """CalculiXSolver 与 CalculiXConnector 基于读取器给出极值"""
+        from integrations.cae.calculix import CalculiXConnector
+        from integrations.cae.solvers.base import SolverConfig
+        from integrations.cae.solvers.calculix_solver import CalculiXSolver
+
+        path = tmp_path / "model.frd"
+        _write_frd(path, 1)
+
+        config = SolverConfig(material={"yield_strength": 235e6})
+        result = CalculiXSolver()._parse_frd(str(path), config)
+        mises = von_mises(STRESS * 2)
+        assert result.max_stress == pytest.approx(mises.max() * 1e6, rel=1e-4)
+        assert result.max_displacement == pytest.approx(np.linalg.norm(DISP * 2, axis=1).max() / 1000, rel=1e-4)
+        assert f"node_{NODE_IDS[np.argmax(mises)]}" in result.stress
+
+        info = CalculiXConnector()._parse_frd_file(path)
+        assert info["nodes"] == len(NODE_IDS)
+        assert info["has_stresses"] and info["has_displacements"]
+        assert info["max_stress"] == pytest.approx(mises.max(), rel=1e-4)
@@ -0,0 +1,53 @@
+"""
+几何解析页面测试（STEP 预览网格）
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("PySide6")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from PySide6.QtWidgets import QApplication
+from test_step_reader import write_step
+
+from gui.pages.geometry_page import GeometryPage
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+class TestStepPreview:
+    """STEP 解析后在后台生成预览网格"""
+
+    @pytest.mark.parametrize("name", ["asm.step", "asm.stp"])
+    def test_step_parse_starts_preview(self, app, tmp_path, monkeypatch, name):
+        path = write_step(tmp_path / name)
+        page = GeometryPage()
+        started = []
+        monkeypatch.setattr(page, "_start_preview", started.append)
+        page.file_path_label.setText(str(path))
+
+        page._on_parse()
+
+        assert started == [str(path)]
+        assert "【解析成功】" in page.result_text.toPlainText()
+
+    def test_preview_slots(self, app):
+        """预览完成或失败时追加信息并恢复解析按钮"""
+        page = GeometryPage()
+        page.parse_btn.setEnabled(False)
+
+        page._on_preview_finished({"faces": 12, "file": "box.stl"})
+        assert page.parse_btn.isEnabled()
+        assert "三角形: 12" in page.result_text.toPlainText()
+
+        page._on_preview_error("OCC 不可用")
+        assert "预览网格不可用: OCC 不可用" in page.result_text.toPlainText()
@@ -0,0 +1,154 @@
+"""
+索引网格与拓扑查询测试
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from sw_helper.geometry import GeometryAnalyzer, GeometryParser, IndexedMesh, weld_vertices
+from sw_helper.geometry.stl_reader import STL_RECORD_DTYPE
+
+_CUBE_QUADS = np.array(
+    [
+        [(0, 0, 0), (0, 1, 0), (1, 1, 0), (1, 0, 0)],
+        [(0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1)],
+        [(0, 0, 0), (1, 0, 0), (1, 0, 1), (0, 0, 1)],
+        [(0, 1, 0), (0, 1, 1), (1, 1, 1), (1, 1, 0)],
+        [(0, 0, 0), (0, 0, 1), (0, 1, 1), (0, 1, 0)],
+        [(1, 0, 0), (1, 1, 0), (1, 1, 1), (1, 0, 1)],
+    ],
+    dtype=np.float64,
+)
+
+
+def cube_triangles(offset=(0.0, 0.0, 0.0), quads=slice(None)):
+    q = _CUBE_QUADS[quads] + offset
+    return np.concatenate([q[:, [0, 1, 2]], q[:, [0, 2, 3]]])
+
+
+def torus_triangles(nu=12, nv=8, R=3.0, r=1.0):
+    u = np.linspace(0, 2 * np.pi, nu, endpoint=False)
+    v = np.linspace(0, 2 * np.pi, nv, endpoint=False)
+    U, V = np.meshgrid(u, v, indexing="ij")
+    points = np.stack([(R + r * np.cos(V)) * np.cos(U), (R + r * np.cos(V)) * np.sin(U), r * np.sin(V)], -1)
+    points = points.reshape(-1, 3)
+    i, j = np.meshgrid(np.arange(nu), np.arange(nv), indexing="ij")
+    a, b = i * nv + j, ((i + 1) % nu) * nv + j
+    c, d = ((i + 1) % nu) * nv + (j + 1) % nv, i * nv + (j + 1) % nv
+    faces = np.concatenate([np.stack([a, b, c], -1).reshape(-1, 3), np.stack([a, c, d], -1).reshape(-1, 3)])
+    return points[faces]
+
+
+class TestIndexedMesh:
+    """焊接与拓扑测试"""
+
+    def test_weld_closed_cube(self):
+        """立方体焊接为8个顶点，水密、亏格0"""
+        triangles = cube_triangles().astype(np.float32)
+        triangles[0, 0] += 1e-9  # 容差内的微小偏差
+
+        mesh = IndexedMesh.from_triangles(triangles)
+
+        assert (mesh.num_vertices, mesh.num_faces, mesh.num_edges) == (8, 12, 18)
+        assert mesh.faces.dtype == np.int32
+        np.testing.assert_allclose(mesh.triangles, triangles, atol=1e-6)
+        assert mesh.is_watertight() and mesh.genus() == 0
+        assert mesh.euler_characteristic() == 2
+        assert mesh.boundary_loops() == [] and len(mesh.non_manifold_edges()) == 0
+        assert np.all(mesh.face_neighbors >= 0)
+        for face, neighbors in enumerate(mesh.face_neighbors):
+            for k, other in enumerate(neighbors):
+                assert face in mesh.face_neighbors[other]
+                assert set(mesh.edge_faces(mesh.face_edges[face, k])) == {face, other}
+
+    def test_exact_weld(self):
+        """容差为0时只合并完全相同的坐标"""
+        triangles = cube_triangles()
+        vertices, _ = weld_vertices(triangles, tolerance=0)
+        assert len(vertices) == 8
+        triangles[0, 0] += 1e-9
+        vertices, _ = weld_vertices(triangles, tolerance=0)
+        assert len(vertices) == 9
+
+    def test_open_box_hole(self):
+        """去掉顶面：一个周长为4的边界环"""
+        mesh = IndexedMesh.from_triangles(cube_triangles(quads=[0, 2, 3, 4, 5]))
+
+        assert not mesh.is_watertight() and mesh.genus() is None
+        assert len(mesh.boundary_edges()) == 4
+        (hole,) = mesh.holes()
+        assert hole["vertices"] == 4
+        assert hole["perimeter"] == pytest.approx(4.0)
+        np.testing.assert_allclose(hole["center"], [0.5, 0.5, 1.0])
+
+    def test_hole_count_matches_loops(self):
+        """孔洞数按边界边的连通分量统计，与逐环遍历的结果一致"""
+        open_box = cube_triangles(quads=[0, 2, 3, 4, 5])
+        tube = cube_triangles((3.0, 0.0, 0.0), quads=[2, 3, 4, 5])
+        mesh = IndexedMesh.from_triangles(np.concatenate([open_box, tube, cube_triangles((6.0, 0.0, 0.0))]))
+
+        assert mesh.num_holes == len(mesh.holes()) == 3
+        assert mesh.topology_summary()["holes"] == 3
+        assert IndexedMesh.from_triangles(cube_triangles()).num_holes == 0
+
+    def test_non_manifold_flipped_and_components(self):
+        """共边的两个立方体产生非流形边；翻转面产生法向不一致边"""
+        mesh = IndexedMesh.from_triangles(np.concatenate([cube_triangles(), cube_triangles((1.0, 1.0, 0.0))]))
+        summary = mesh.topology_summary()
+        assert summary["non_manifold_edges"] == 1 and not summary["watertight"]
+        assert summary["components"] == 2
+
+        flipped = cube_triangles()
+        flipped[0] = flipped[0, ::-1]
+        summary = IndexedMesh.from_triangles(flipped).topology_summary()
+        assert summary["watertight"] and summary["inconsistent_edges"] == 3
+        assert summary["genus"] is None
+
+    def test_torus_genus(self):
+        """圆环亏格为1"""
+        mesh = IndexedMesh.from_triangles(torus_triangles())
+        assert mesh.num_vertices == 12 * 8
+        assert mesh.genus() == 1 and mesh.num_components == 1
+
+
+class TestMeshTopologyIntegration:
+    """解析器与分析器使用索引网格"""
+
+    @pytest.fixture
+    def open_box_stl(self, tmp_path):
+        triangles = cube_triangles(quads=[0, 2, 3, 4, 5])
+        records = np.zeros(len(triangles), dtype=STL_RECORD_DTYPE)
+        records["vertices"] = triangles
+        path = tmp_path / "box.stl"
+        with open(path, "wb") as f:
+            f.write(b"open box".ljust(80, b" "))
+            f.write(np.uint32(len(triangles)).tobytes())
+            records.tofile(f)
+        return path
+
+    def test_parser_weld(self, open_box_stl):
+        """weld=True 时返回唯一顶点数与拓扑信息"""
+        result = GeometryParser(weld=True).parse(str(open_box_stl))
+        assert result["vertices"] == 8 and result["faces"] == 10
+        assert result["topology"]["holes"] == 1
+        assert isinstance(GeometryParser().parse(str(open_box_stl))["vertices"], int)
+
+    def test_analyzer_holes_and_manufacturability(self, open_box_stl):
+        """分析器从STL文件检测开口，判定不可3D打印"""
+        analyzer = GeometryAnalyzer({"file": str(open_box_stl)})
+
+        holes = analyzer.detect_holes()
+        report = analyzer.check_manufacturability()
+
+        assert len(holes) == 1 and holes[0]["perimeter"] == pytest.approx(4.0)
+        assert report["3d_printable"] is False
+        assert report["topology"]["boundary_edges"] == 4 and report["issues"]
+
+        closed = GeometryAnalyzer({"mesh": IndexedMesh.from_triangles(cube_triangles())})
+        assert closed.detect_holes() == [] and closed.check_manufacturability()["3d_printable"]
+        assert GeometryAnalyzer({}).detect_holes() == []
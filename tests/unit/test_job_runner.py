@@ -0,0 +1,211 @@
+"""
+CalculiX 并行作业运行器测试（使用模拟的 ccx 脚本）
+"""
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from integrations.cae.job_runner import CcxJob, CcxJobRunner
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="模拟 ccx 使用 shebang 脚本")
+
+# 模拟 ccx：按输入文件中的指令输出、休眠、退出；写出 OMP 线程数、工作目录，
+# 以及按 *CLOAD 载荷生成的单节点 .frd 结果
+FAKE_CCX = """#!{python}
+import os, sys, time
+if "-v" in sys.argv:
+    print("This is Version 2.21")
+    sys.exit(0)
+stem = sys.argv[sys.argv.index("-i") + 1]
+text = open(stem + ".inp").read()
+if "IGNORE_TERM" in text:
+    import signal
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+with open(stem + ".env", "w") as f:
+    f.write(os.environ["OMP_NUM_THREADS"] + "\\n" + os.getcwd())
+sleep = float(text.split("SLEEP=")[1].split()[0]) if "SLEEP=" in text else 0.0
+for i in range(3):
+    print("STEP", i, flush=True)
+    time.sleep(sleep / 3)
+if "EXIT=" in text:
+    sys.exit(int(text.split("EXIT=")[1].split()[0]))
+load = 0.0
+lines = text.splitlines()
+for i, line in enumerate(lines):
+    if line.startswith("*CLOAD"):
+        load += abs(float(lines[i + 1].split(",")[2]))
+with open(stem + ".frd", "w") as f:
+    f.write("    2C                       1                                     1\\n")
+    f.write(" -1         1 0.00000E+00 0.00000E+00 0.00000E+00\\n -3\\n")
+    f.write("    1PSTEP                         1           1           1\\n")
+    f.write("  100CL  101 1.00000E+00           1                     0    1           1\\n")
+    f.write(" -4  DISP        3    1\\n")
+    for c in ("D1", "D2", "D3"):
+        f.write(" -5  " + c.ljust(8) + "    1    2    1    0\\n")
+    f.write(" -1         1%12.5E%12.5E%12.5E\\n -3\\n" % (0.0, -load * 1e-6, 0.0))
+    f.write(" 9999\\n")
+"""
+
+
+@pytest.fixture
+def fake_ccx(tmp_path):
+    path = tmp_path / "bin" / "ccx"
+    path.parent.mkdir()
+    path.write_text(FAKE_CCX.format(python=sys.executable))
+    path.chmod(0o755)
+    return path
+
+
+def _job(tmp_path, name, body=""):
+    work_dir = tmp_path / name
+    work_dir.mkdir()
+    input_file = work_dir / "model.inp"
+    input_file.write_text(body + "\n")
+    return CcxJob(input_file, name=name)
+
+
+class TestCcxJobRunner:
+    """并行作业运行器测试"""
+
+    def test_results_as_completed_with_thread_budget(self, tmp_path, fake_ccx):
+        """结果按完成顺序返回，线程数在并发作业间平均分配，在各自目录中运行"""
+        jobs = [_job(tmp_path, "slow", "SLEEP=1.0"), _job(tmp_path, "fast", "SLEEP=0.0")]
+        lines = []
+        runner = CcxJobRunner(fake_ccx, max_workers=2, total_threads=8, on_output=lambda job, line: lines.append(line))
+
+        results = list(runner.run(jobs))
+
+        assert [r.name for r in results] == ["fast", "slow"]
+        assert all(r.success and r.threads == 4 for r in results)
+        for result in results:
+            threads, cwd = (result.job.work_dir / "model.env").read_text().splitlines()
+            assert threads == "4"
+            assert Path(cwd).resolve() == result.job.work_dir.resolve()
+            assert result.frd_file is not None
+            assert result.output == ["STEP 0", "STEP 1", "STEP 2"]
+        assert lines.count("STEP 2") == 2
+        assert Path.cwd() != tmp_path
+
+    def test_failure_and_timeout(self, tmp_path, fake_ccx):
+        """非零退出码与超时分别报告"""
+        runner = CcxJobRunner(fake_ccx, timeout=0.5)
+
+        failed = runner.run_one(_job(tmp_path, "bad", "EXIT=3"))
+        timed_out = runner.run_one(_job(tmp_path, "hang", "SLEEP=30"))
+
+        assert (failed.status, failed.returncode) == ("failed", 3)
+        assert timed_out.status == "timeout" and timed_out.elapsed < 10
+
+    def test_cancel(self, tmp_path, fake_ccx):
+        """取消后正在运行的进程被终止，未开始的作业不再运行"""
+        jobs = [_job(tmp_path, f"job{i}", "SLEEP=30") for i in range(3)]
+        runner = CcxJobRunner(fake_ccx, max_workers=1)
+        threading.Timer(0.5, runner.cancel).start()
+
+        start = time.perf_counter()
+        results = list(runner.run(jobs))
+
+        assert time.perf_counter() - start < 10
+        assert sorted(r.status for r in results) == ["cancelled"] * 3
+        assert not (tmp_path / "job2" / "model.env").exists()
+
+    def test_cancel_before_iterating(self, tmp_path, fake_ccx):
+        """run() 之后、开始迭代之前的取消不会丢失，作业都不运行"""
+        jobs = [_job(tmp_path, f"job{i}", "SLEEP=30") for i in range(2)]
+        runner = CcxJobRunner(fake_ccx, max_workers=1)
+
+        results = runner.run(jobs)
+        runner.cancel()
+
+        assert sorted(r.status for r in results) == ["cancelled"] * 2
+        assert not any((tmp_path / f"job{i}" / "model.env").exists() for i in range(2))
+
+    def test_cancel_waits_on_all_processes_together(self, tmp_path, fake_ccx, monkeypatch):
+        """取消时先向所有进程发送 terminate，再在同一期限内等待（而不是逐个等待）"""
+        from integrations.cae import job_runner
+
+        monkeypatch.setattr(job_runner, "TERMINATE_GRACE", 1.0)
+        jobs = [_job(tmp_path, f"job{i}", "IGNORE_TERM SLEEP=30") for i in range(3)]
+        started = threading.Semaphore(0)
+        runner = CcxJobRunner(
+            fake_ccx, max_workers=3, on_output=lambda job, line: line == "STEP 0" and started.release()
+        )
+
+        results = runner.run(jobs)
+        waiter = threading.Thread(target=lambda: [started.acquire() for _ in jobs] and runner.cancel())
+        waiter.start()
+        first = next(results)
+        start = time.perf_counter()
+        waiter.join()
+        rest = list(results)
+
+        assert time.perf_counter() - start < 2.5
+        assert sorted(r.status for r in [first, *rest]) == ["cancelled"] * 3
+
+    def test_cancel_between_start_and_registration(self, tmp_path, fake_ccx, monkeypatch):
+        """进程启动后、登记前发生的取消同样终止该进程"""
+        from integrations.cae import job_runner
+
+        runner = CcxJobRunner(fake_ccx)
+        popen = job_runner.subprocess.Popen
+
+        def start_then_cancel(*args, **kwargs):
+            process = popen(*args, **kwargs)
+            runner.cancel()
+            return process
+
+        monkeypatch.setattr(job_runner.subprocess, "Popen", start_then_cancel)
+        start = time.perf_counter()
+        result = runner.run_one(_job(tmp_path, "job", "SLEEP=30"))
+
+        assert result.status == "cancelled"
+        assert time.perf_counter() - start < 10
+
+    def test_solver_solve_many(self, tmp_path, fake_ccx):
+        """CalculiXSolver.solve_many 并行求解多个载荷工况"""
+        from integrations.cae.solvers import CalculiXSolver, SolverConfig
+
+        solver = CalculiXSolver()
+        solver._ccx_path = str(fake_ccx)
+        configs = [SolverConfig(load=load) for load in (1000.0, 2000.0, 3000.0)]
+
+        results = dict(solver.solve_many(configs, max_workers=3))
+
+        assert sorted(results) == [0, 1, 2]
+        displacements = [results[i].max_displacement for i in range(3)]
+        assert displacements[1] == pytest.approx(2 * displacements[0])
+        assert displacements[2] == pytest.approx(3 * displacements[0])
+        assert "CalculiX 分析完成" in results[0].messages
+
+    def test_ccx_version_in_cache_key(self, tmp_path, fake_ccx):
+        """结果缓存键包含实际 ccx 版本"""
+        from integrations.cae.job_runner import ccx_version
+        from integrations.cae.solvers import CalculiXSolver
+
+        solver = CalculiXSolver()
+        solver._ccx_path = str(fake_ccx)
+        assert ccx_version(str(fake_ccx)) == "2.21"
+        assert solver.cache_version().endswith("ccx-2.21")
+
+    def test_failed_run_not_cached(self, tmp_path):
+        """ccx 运行失败时返回的解析估算结果不写入缓存"""
+        from integrations.cae.solvers import CalculiXSolver, SolverConfig, SolverResultCache
+
+        failing = tmp_path / "ccx"
+        failing.write_text(f"#!{sys.executable}\nimport sys\nsys.exit(3)\n")
+        failing.chmod(0o755)
+        solver = CalculiXSolver()
+        solver._ccx_path = str(failing)
+        cache = SolverResultCache(tmp_path / "cache")
+
+        result = solver.solve_cached(SolverConfig(load=1000.0), cache=cache)
+
+        assert result.estimated and result.max_stress > 0
+        assert cache.stats()["entries"] == 0
@@ -0,0 +1,184 @@
+"""
+几何质量特性与分析器测试
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from sw_helper.geometry import GeometryAnalyzer, IndexedMesh
+from sw_helper.geometry.mass_properties import compute_mass_properties, oriented_bounding_box
+from sw_helper.geometry.stl_reader import STL_RECORD_DTYPE
+
+_CUBE_QUADS = np.array(
+    [
+        [(0, 0, 0), (0, 1, 0), (1, 1, 0), (1, 0, 0)],
+        [(0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1)],
+        [(0, 0, 0), (1, 0, 0), (1, 0, 1), (0, 0, 1)],
+        [(0, 1, 0), (0, 1, 1), (1, 1, 1), (1, 1, 0)],
+        [(0, 0, 0), (0, 0, 1), (0, 1, 1), (0, 1, 0)],
+        [(1, 0, 0), (1, 1, 0), (1, 1, 1), (1, 0, 1)],
+    ],
+    dtype=np.float64,
+)
+
+
+def box_triangles(size=(1.0, 1.0, 1.0)):
+    quads = _CUBE_QUADS * size
+    return np.concatenate([quads[:, [0, 1, 2]], quads[:, [0, 2, 3]]])
+
+
+def rotation_z(angle):
+    c, s = np.cos(angle), np.sin(angle)
+    return np.array([[c, -s, 0.0], [s, c, 0.0], [0.0, 0.0, 1.0]])
+
+
+def write_binary_stl(path, triangles):
+    records = np.zeros(len(triangles), dtype=STL_RECORD_DTYPE)
+    records["vertices"] = triangles
+    with open(path, "wb") as f:
+        f.write(b"box".ljust(80, b" "))
+        f.write(np.uint32(len(triangles)).tobytes())
+        records.tofile(f)
+
+
+class TestMassProperties:
+    """质量特性测试"""
+
+    def test_box_analytic(self):
+        """长方体的体积、面积、质心与惯性张量与解析解一致（与位置、朝向无关）"""
+        a, b, c = 4.0, 2.0, 1.0
+        offset = np.array([1000.0, -500.0, 20.0])
+        triangles = box_triangles((a, b, c)) + offset
+
+        props = compute_mass_properties(triangles, chunk_size=5)
+        inverted = compute_mass_properties(triangles[:, ::-1])
+
+        V = a * b * c
+        assert props.volume == pytest.approx(V)
+        assert props.surface_area == pytest.approx(2 * (a * b + b * c + c * a))
+        np.testing.assert_allclose(props.centroid, offset + [a / 2, b / 2, c / 2])
+        expected = V / 12 * np.diag([b * b + c * c, a * a + c * c, a * a + b * b])
+        np.testing.assert_allclose(props.inertia, expected, atol=1e-9)
+        np.testing.assert_allclose(props.lower, offset)
+        np.testing.assert_allclose(inverted.inertia, props.inertia, atol=1e-9)
+        assert inverted.volume == pytest.approx(V)
+
+    def test_indexed_mesh_and_empty(self):
+        """索引网格与三角形片结果一致；空网格为零"""
+        triangles = box_triangles((3.0, 2.0, 1.0)) @ rotation_z(0.3).T
+        soup = compute_mass_properties(triangles)
+        indexed = compute_mass_properties(IndexedMesh.from_triangles(triangles), chunk_size=4)
+        assert indexed.volume == pytest.approx(soup.volume)
+        np.testing.assert_allclose(indexed.inertia, soup.inertia, atol=1e-9)
+
+        empty = compute_mass_properties(np.zeros((0, 3, 3)))
+        assert empty.volume == 0.0 and empty.num_triangles == 0
+
+    def test_oriented_bounding_box(self):
+        """旋转长方体的有向包围盒与原尺寸一致，且不大于轴对齐包围盒"""
+        rotation = rotation_z(0.5)
+        triangles = box_triangles((4.0, 2.0, 1.0)) @ rotation.T
+        props = compute_mass_properties(triangles)
+        axes = np.linalg.eigh(props.covariance)[1].T[::-1]
+
+        obb = oriented_bounding_box(triangles, axes)
+
+        np.testing.assert_allclose(obb["extents"], [4.0, 2.0, 1.0], atol=1e-9)
+        np.testing.assert_allclose(obb["center"], props.centroid, atol=1e-9)
+        assert abs(np.dot(obb["axes"][0], rotation[:, 0])) == pytest.approx(1.0)
+        assert oriented_bounding_box(box_triangles())["volume"] == pytest.approx(1.0)
+
+
+class TestGeometryAnalyzerProperties:
+    """分析器质量特性测试"""
+
+    def test_features_from_stl(self, tmp_path):
+        """从STL文件提取体积、质心、惯性张量与包围盒"""
+        path = tmp_path / "box.stl"
+        write_binary_stl(path, box_triangles((2.0, 2.0, 2.0)) + 1.0)
+
+        features = GeometryAnalyzer({"file": str(path)}).extract_features()
+
+        assert features["volume"] == pytest.approx(8.0)
+        assert features["surface_area"] == pytest.approx(24.0)
+        assert features["centroid"] == pytest.approx((2.0, 2.0, 2.0))
+        np.testing.assert_allclose(features["inertia_tensor"], np.eye(3) * 8 * 8 / 12, atol=1e-6)
+        assert features["bounding_box"] == {"x": (1.0, 3.0), "y": (1.0, 3.0), "z": (1.0, 3.0)}
+        assert features["oriented_bounding_box"]["volume"] == pytest.approx(8.0)
+        assert features["holes"] == []
+
+    def test_without_mesh(self):
+        """无网格数据时返回零值"""
+        analyzer = GeometryAnalyzer({"file": "part.step"})
+        assert analyzer.calculate_volume() == 0.0
+        assert analyzer.calculate_centroid() == (0.0, 0.0, 0.0)
+        assert analyzer.calculate_bounding_box()["x"] == (0.0, 0.0)
+
+    def test_optimizer_uses_stl_export(self, tmp_path):
+        """优化器分析导出的STL，得到真实的体积/面数/顶点数"""
+        from sw_helper.optimization.optimizer import FreeCADOptimizer
+
+        class Connector:
+            def export_file(self, output_path, format_type="STEP"):
+                if format_type == "STL":
+                    write_binary_stl(output_path, box_triangles((10.0, 10.0, 10.0)))
+                else:
+                    Path(output_path).touch()
+                return True
+
+        optimizer = FreeCADOptimizer(use_mock=True)
+        optimizer.connector = Connector()
+
+        geo_data = optimizer._analyze_geometry(tmp_path / "iter_01.step")
+
+        assert geo_data["volume"] == pytest.approx(1000.0)
+        assert (geo_data["faces"], geo_data["vertices"]) == (12, 8)
+
+    def test_quality_score_volume_in_mm3(self):
+        """几何体积以 mm³ 给出，评分换算为 m³ 后判定是否合理"""
+        from sw_helper.optimization.optimizer import FreeCADOptimizer
+
+        optimizer = FreeCADOptimizer(use_mock=True)
+        score = {v: optimizer._calculate_quality_score({"volume": v}, 10.0) for v in (1.0, 1.25e5, 1e9)}
+
+        # 50 mm 立方体（1.25e-4 m³）在合理范围内，1 mm³ 与 1 m³ 均不在
+        assert score[1.25e5] > score[1.0] and score[1.25e5] > score[1e9]
+
+    def test_parametric_skips_stl_without_analysis(self, tmp_path, monkeypatch):
+        """不分析几何时优化循环只导出STEP"""
+        from sw_helper.optimization.parametric import ParametricOptimizer
+
+        monkeypatch.chdir(tmp_path)
+        formats = []
+
+        class Connector:
+            def open_document(self, file_path):
+                return True
+
+            def set_parameter(self, name, value):
+                return True
+
+            def rebuild(self):
+                return True
+
+            def export_file(self, output_path, format_type="STEP"):
+                formats.append(format_type)
+                Path(output_path).touch()
+                return True
+
+            def close_document(self, save=False):
+                pass
+
+        optimizer = ParametricOptimizer(Connector())
+        optimizer.set_callback(lambda msg: None)
+        results = optimizer.optimize_fillet_radius(
+            "model.FCStd", (2, 10), steps=2, cad_type="freecad", analyze_geometry=False
+        )
+
+        assert len(results) == 2
+        assert formats == ["STEP", "STEP"]
@@ -20,7 +20,12 @@ from sw_helper.mechanics.physics_formulas import (
     calc_von_mises,
     calc_principal_stresses,
     calc_max_shear,
+    calculate_von_mises_stress_batch,
+    calculate_principal_stresses_batch,
+    calculate_buckling_load_batch,
+    calculate_deflection_batch,
 )
+from sw_helper.mechanics.engine import MechanicsEngine
 
 
 class TestVonMisesStress:
@@ -192,5 +197,88 @@ class TestBucklingLoad:
         assert load < pinned_load
 
 
+def random_stress_tensors(n, seed=0):
+    rng = np.random.default_rng(seed)
+    a = rng.normal(scale=100e6, size=(n, 3, 3))
+    return 0.5 * (a + a.transpose(0, 2, 1))
+
+
+class TestBatchFormulas:
+    """批量公式测试"""
+
+    def test_matches_scalar(self):
+        """批量结果与逐个计算一致"""
+        tensors = random_stress_tensors(20)
+        von_mises = calculate_von_mises_stress_batch(tensors)
+        principal = calculate_principal_stresses_batch(tensors)
+        for i, tensor in enumerate(tensors):
+            assert np.isclose(von_mises[i], calculate_von_mises_stress(tensor))
+            assert np.allclose(principal[i], calculate_principal_stresses(tensor))
+
+    def test_invalid_shape(self):
+        with pytest.raises(ValueError):
+            calculate_von_mises_stress_batch(np.zeros((4, 2, 2)))
+
+    def test_broadcast_buckling_and_deflection(self):
+        """参数数组按numpy规则广播"""
+        lengths = np.array([1.0, 2.0, 4.0])
+        loads = calculate_buckling_load_batch(210e9, 8.33e-6, lengths, "fixed-free")
+        assert loads.shape == (3,)
+        assert np.isclose(loads[1], calculate_buckling_load(210e9, 8.33e-6, 2.0, "fixed-free"))
+        deflection = calculate_deflection_batch(1000.0, lengths, 210e9, 8.33e-6, "uniform")
+        assert np.isclose(deflection[2], calculate_deflection(1000.0, 4.0, 210e9, 8.33e-6, "uniform"))
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return MechanicsEngine()
+
+
+class TestMechanicsEngineBatch:
+    """力学引擎批量接口测试"""
+
+    def test_stress_analysis_batch(self, engine):
+        """批量应力分析与逐个分析一致，并给出最危险点"""
+        tensors = random_stress_tensors(10)
+        batch = engine.calculate_stress_analysis_batch(tensors, "Q235")
+        for i in (0, 9):
+            single = engine.calculate_stress_analysis(tensors[i], "Q235")
+            assert np.isclose(batch["safety_factor"][i], single["safety_factor"])
+            assert np.allclose(batch["principal_stresses"][i], single["principal_stresses"])
+        assert batch["critical_index"] == int(np.argmax(batch["von_mises_stress"]))
+        assert batch["min_safety_factor"] == batch["safety_factor"].min()
+
+    def test_zero_stress_is_safe(self, engine):
+        batch = engine.calculate_stress_analysis_batch(np.zeros((2, 3, 3)), "Q235")
+        assert np.all(np.isinf(batch["safety_factor"]))
+        assert batch["is_safe"].all()
+
+    def test_buckling_batch(self, engine):
+        """数组参数与单位转换"""
+        forces = np.array([10.0, 50.0, 0.0])
+        batch = engine.calculate_buckling_safety_batch(
+            "Q235", 1e-3, 8.33e-6, 2000.0, forces, length_unit="mm", force_unit="kN"
+        )
+        single = engine.calculate_buckling_safety("Q235", 1e-3, 8.33e-6, 2.0, 50e3)
+        assert np.isclose(batch["buckling_safety_factor"][1], single["buckling_safety_factor"])
+        assert np.isclose(batch["compressive_stress"][1], single["compressive_stress"])
+        assert np.isinf(batch["buckling_safety_factor"][2])
+
+    def test_deflection_batch(self, engine):
+        batch = engine.calculate_deflection_analysis_batch([1000.0, 5000.0], 2.0, "Q235", 8.33e-6)
+        single = engine.calculate_deflection_analysis(5000.0, 2.0, "Q235", 8.33e-6)
+        assert np.isclose(batch["deflection"][1], single["deflection"])
+        assert batch["is_within_limit"][1] == single["is_within_limit"]
+
+    def test_safety_factor_batch(self, engine):
+        """批量强度校核与逐个校核一致"""
+        forces = np.array([1e4, 5e4, 1e5])
+        batch = engine.solve_safety_factor_batch(forces, 1e-4, "Q235")
+        for i, force in enumerate(forces):
+            single = engine.solve_safety_factor(float(force), 1e-4, "Q235")
+            assert np.isclose(batch["safety_factor"][i], single["safety_factor"])
+            assert batch["strength_theory"] == single["strength_theory"]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
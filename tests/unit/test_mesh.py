@@ -9,6 +9,7 @@ from pathlib import Path
 # 添加项目根目录到路径
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
 
+import numpy as np
 import pytest
 from sw_helper.mesh.quality import MeshQualityAnalyzer
 from sw_helper.mesh.metrics import MeshMetrics
@@ -42,6 +43,136 @@ class TestMeshMetrics:
         assert hasattr(metrics, 'data') or True
 
 
+def _unit_hex_grid(n: int):
+    """生成 n x n x n 个单位立方体六面体网格"""
+    ticks = np.arange(n + 1, dtype=float)
+    x, y, z = np.meshgrid(ticks, ticks, ticks, indexing="ij")
+    nodes = np.column_stack([x.ravel(), y.ravel(), z.ravel()])
+    idx = np.arange((n + 1) ** 3).reshape(n + 1, n + 1, n + 1)
+    base = idx[:-1, :-1, :-1].ravel()
+    dx, dy, dz = (n + 1) ** 2, n + 1, 1
+    conn = np.column_stack(
+        [
+            base,
+            base + dx,
+            base + dx + dy,
+            base + dy,
+            base + dz,
+            base + dx + dz,
+            base + dx + dy + dz,
+            base + dy + dz,
+        ]
+    )
+    return nodes, conn
+
+
+class TestMeshMetricsBatch:
+    """批量网格指标测试"""
+
+    def test_unit_hex_grid(self):
+        """单位立方体网格的所有指标均为理想值"""
+        nodes, conn = _unit_hex_grid(4)
+        result = MeshMetrics.compute_batch(nodes, conn)
+
+        assert len(result["volume"]) == 64
+        np.testing.assert_allclose(result["volume"], 1.0)
+        np.testing.assert_allclose(result["aspect_ratio"], 1.0)
+        np.testing.assert_allclose(result["jacobian"], 1.0)
+        np.testing.assert_allclose(result["orthogonal_quality"], 1.0)
+        np.testing.assert_allclose(result["skewness"], 0.0, atol=1e-12)
+
+    def test_regular_tetrahedron(self):
+        """正四面体"""
+        tet = np.array([[1, 1, 1], [-1, 1, -1], [1, -1, -1], [-1, -1, 1]], dtype=float)
+        metrics = MeshMetrics.compute_all(tet)
+
+        assert metrics["volume"] == pytest.approx(8 / 3)
+        assert metrics["jacobian"] == pytest.approx(1.0)
+        assert metrics["aspect_ratio"] == pytest.approx(1.0)
+        assert metrics["skewness"] == pytest.approx(0.0, abs=1e-12)
+
+    def test_inverted_element(self):
+        """节点顺序反转的单元雅可比为负"""
+        tet = np.array([[0, 0, 0], [0, 1, 0], [1, 0, 0], [0, 0, 1]], dtype=float)
+        assert MeshMetrics.jacobian(tet) < 0
+        assert MeshMetrics.volume(tet) == pytest.approx(-1 / 6)
+
+    def test_sheared_hex(self):
+        """剪切六面体体积不变但质量下降"""
+        nodes, conn = _unit_hex_grid(1)
+        sheared = nodes[conn[0]]
+        sheared[4:, 0] += 1.0  # 顶面沿x平移
+
+        metrics = MeshMetrics.compute_all(sheared)
+        assert metrics["volume"] == pytest.approx(1.0)
+        assert metrics["skewness"] == pytest.approx(0.5)
+        assert metrics["jacobian"] == pytest.approx(np.sqrt(0.5))
+
+    def test_wedge_volume(self):
+        """三棱柱体积"""
+        wedge = np.array([[0, 0, 0], [2, 0, 0], [0, 2, 0], [0, 0, 3], [2, 0, 3], [0, 2, 3]], dtype=float)
+        assert MeshMetrics.volume(wedge) == pytest.approx(6.0)
+
+    def test_chunking_matches_single_pass(self):
+        """分块计算与整体计算一致"""
+        nodes, conn = _unit_hex_grid(3)
+        nodes = nodes + np.random.default_rng(0).normal(scale=0.05, size=nodes.shape)
+        full = MeshMetrics.compute_batch(nodes, conn)
+        chunked = MeshMetrics.compute_batch(nodes, conn, chunk_size=5)
+        for name, values in full.items():
+            np.testing.assert_allclose(chunked[name], values)
+
+    def test_unknown_metric(self):
+        """未知指标报错"""
+        nodes, conn = _unit_hex_grid(1)
+        with pytest.raises(ValueError):
+            MeshMetrics.compute_batch(nodes, conn, metrics=["warpage"])
+
+
+class TestMeshQualityAnalysis:
+    """基于数组的网格质量分析测试"""
+
+    def test_analyze_arrays(self):
+        """分析内存中的网格"""
+        nodes, conn = _unit_hex_grid(2)
+        analyzer = MeshQualityAnalyzer()
+        analyzer.set_mesh(nodes, {"hex8": conn})
+        result = analyzer.analyze(None)
+
+        assert result["overall_quality"] == "excellent"
+        assert result["mesh_info"]["elements"] == 8
+        assert result["volume"]["mean"] == pytest.approx(1.0)
+        assert analyzer.detect_problematic_elements() == []
+
+    def test_detect_inverted_elements(self):
+        """检测反转单元"""
+        nodes, conn = _unit_hex_grid(2)
+        conn[3] = conn[3][[4, 5, 6, 7, 0, 1, 2, 3]]
+        analyzer = MeshQualityAnalyzer()
+        analyzer.set_mesh(nodes, {"hex8": conn})
+        result = analyzer.analyze(None, metrics=["jacobian"])
+
+        assert result["overall_quality"] == "unacceptable"
+        assert analyzer.detect_problematic_elements() == [3]
+
+    def test_mixed_linear_and_quadratic_blocks(self):
+        """tetra10 与 tetra 块合并为 tet4，高阶单元只保留角点"""
+        nodes = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1], [1, 1, 1]], dtype=float)
+        tet10 = np.array([[0, 1, 2, 3, 0, 0, 0, 0, 0, 0]])
+        tet4 = np.array([[1, 2, 3, 4]])
+        analyzer = MeshQualityAnalyzer()
+        mesh = analyzer.set_mesh(nodes, {"tetra10": tet10, "tetra": tet4})
+
+        assert mesh["cells"]["tet4"].tolist() == [[0, 1, 2, 3], [1, 2, 3, 4]]
+        assert analyzer.analyze(None)["mesh_info"]["elements"] == 2
+
+    def test_unknown_element_type(self):
+        """不按节点数猜测单元类型（4节点四边形不会被当作四面体）"""
+        nodes, _ = _unit_hex_grid(1)
+        with pytest.raises(ValueError, match="quad"):
+            MeshQualityAnalyzer().set_mesh(nodes, {"quad": np.array([[0, 1, 3, 2]])})
+
+
 class TestMeshImport:
     """网格模块导入测试"""
 
@@ -0,0 +1,388 @@
+"""
+Gmsh .msh 读取器测试
+"""
+
+import json
+import os
+import struct
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from sw_helper.mesh.cache import MeshCache
+from sw_helper.mesh.msh_reader import MshFormatError, read_msh
+from sw_helper.utils.hashing import RACY_WINDOW_NS
+
+# 两个相连的六面体（节点标签不连续），以及一个带物理组的边界三角形
+NODE_TAGS = np.array([1, 2, 3, 4, 5, 6, 7, 8, 20, 21, 22, 23])
+NODES = np.array(
+    [
+        [0, 0, 0],
+        [1, 0, 0],
+        [1, 1, 0],
+        [0, 1, 0],
+        [0, 0, 1],
+        [1, 0, 1],
+        [1, 1, 1],
+        [0, 1, 1],
+        [2, 0, 0],
+        [2, 1, 0],
+        [2, 0, 1],
+        [2, 1, 1],
+    ],
+    dtype=float,
+)
+HEXES = np.array([[1, 2, 3, 4, 5, 6, 7, 8], [2, 20, 21, 3, 6, 22, 23, 7]])
+TRI = np.array([[1, 2, 3]])
+
+
+def _write_v2(path: Path, binary: bool):
+    with open(path, "wb") as f:
+        f.write(b"$MeshFormat\n")
+        if binary:
+            f.write(b"2.2 1 8\n" + struct.pack("<i", 1) + b"\n")
+        else:
+            f.write(b"2.2 0 8\n")
+        f.write(b'$EndMeshFormat\n$PhysicalNames\n2\n2 7 "fixed face"\n3 9 "body"\n$EndPhysicalNames\n')
+        f.write(b"$Nodes\n%d\n" % len(NODE_TAGS))
+        for tag, xyz in zip(NODE_TAGS, NODES):
+            if binary:
+                f.write(struct.pack("<i3d", tag, *xyz))
+            else:
+                f.write(b"%d %.17g %.17g %.17g\n" % (tag, *xyz))
+        f.write(b"\n$EndNodes\n" if binary else b"$EndNodes\n")
+        f.write(b"$Elements\n3\n")
+        if binary:
+            f.write(struct.pack("<3i", 2, 1, 2) + struct.pack("<6i", 1, 7, 1, *TRI[0]))
+            f.write(struct.pack("<3i", 5, 2, 2))
+            for i, hexa in enumerate(HEXES):
+                f.write(struct.pack("<11i", 10 + i, 9, 1, *hexa))
+            f.write(b"\n")
+        else:
+            f.write(b"1 2 2 7 1 %d %d %d\n" % tuple(TRI[0]))
+            for i, hexa in enumerate(HEXES):
+                f.write(b"%d 5 2 9 1 " % (10 + i) + b" ".join(b"%d" % n for n in hexa) + b"\n")
+        f.write(b"$EndElements\n")
+
+
+def _write_v4(path: Path, binary: bool):
+    def sizes(*values):
+        return struct.pack(f"<{len(values)}Q", *values)
+
+    with open(path, "wb") as f:
+        f.write(b"$MeshFormat\n")
+        if binary:
+            f.write(b"4.1 1 8\n" + struct.pack("<i", 1) + b"\n")
+        else:
+            f.write(b"4.1 0 8\n")
+        f.write(b'$EndMeshFormat\n$PhysicalNames\n2\n2 7 "fixed face"\n3 9 "body"\n$EndPhysicalNames\n')
+
+        # 实体：1个面（物理组7），1个体（物理组9）
+        f.write(b"$Entities\n")
+        if binary:
+            f.write(sizes(0, 0, 1, 1))
+            f.write(struct.pack("<i6d", 1, 0, 0, 0, 1, 1, 0) + sizes(1) + struct.pack("<i", 7))
+            f.write(sizes(0))
+            f.write(struct.pack("<i6d", 1, 0, 0, 0, 2, 1, 1) + sizes(1) + struct.pack("<i", 9))
+            f.write(sizes(1) + struct.pack("<i", 1) + b"\n")
+        else:
+            f.write(b"0 0 1 1\n1 0 0 0 1 1 0 1 7 0\n1 0 0 0 2 1 1 1 9 1 1\n")
+        f.write(b"$EndEntities\n")
+
+        # 节点分两块
+        blocks = [(2, 1, NODE_TAGS[:4], NODES[:4]), (3, 1, NODE_TAGS[4:], NODES[4:])]
+        f.write(b"$Nodes\n")
+        if binary:
+            f.write(sizes(2, len(NODE_TAGS), 1, 23))
+        else:
+            f.write(b"2 %d 1 23\n" % len(NODE_TAGS))
+        for dim, entity, tags, xyz in blocks:
+            if binary:
+                f.write(struct.pack("<3i", dim, entity, 0) + sizes(len(tags)))
+                f.write(sizes(*tags) + xyz.astype("<f8").tobytes())
+            else:
+                f.write(b"%d %d 0 %d\n" % (dim, entity, len(tags)))
+                f.write(b"".join(b"%d\n" % t for t in tags))
+                f.write(b"".join(b"%.17g %.17g %.17g\n" % tuple(p) for p in xyz))
+        f.write(b"\n$EndNodes\n" if binary else b"$EndNodes\n")
+
+        f.write(b"$Elements\n")
+        if binary:
+            f.write(sizes(2, 3, 1, 11))
+            f.write(struct.pack("<3i", 2, 1, 2) + sizes(1) + sizes(1, *TRI[0]))
+            f.write(struct.pack("<3i", 3, 1, 5) + sizes(2))
+            for i, hexa in enumerate(HEXES):
+                f.write(sizes(10 + i, *hexa))
+            f.write(b"\n")
+        else:
+            f.write(b"2 3 1 11\n2 1 2 1\n1 %d %d %d\n3 1 5 2\n" % tuple(TRI[0]))
+            for i, hexa in enumerate(HEXES):
+                f.write(b"%d " % (10 + i) + b" ".join(b"%d" % n for n in hexa) + b"\n")
+        f.write(b"$EndElements\n")
+
+
+WRITERS = {
+    "v2-ascii": lambda p: _write_v2(p, False),
+    "v2-binary": lambda p: _write_v2(p, True),
+    "v4-ascii": lambda p: _write_v4(p, False),
+    "v4-binary": lambda p: _write_v4(p, True),
+}
+
+
+class TestMshReader:
+    """MSH读取器测试"""
+
+    @pytest.mark.parametrize("variant", sorted(WRITERS))
+    @pytest.mark.parametrize("chunk_size", [1, 65536])
+    def test_read_variants(self, tmp_path, variant, chunk_size):
+        """各版本/编码读取结果一致"""
+        path = tmp_path / f"{variant}.msh"
+        WRITERS[variant](path)
+
+        mesh = read_msh(path, chunk_size=chunk_size)
+
+        assert mesh.version == ("2.2" if variant.startswith("v2") else "4.1")
+        assert mesh.binary == variant.endswith("binary")
+        np.testing.assert_array_equal(mesh.node_tags, NODE_TAGS)
+        np.testing.assert_allclose(mesh.nodes, NODES)
+        assert mesh.element_counts() == {"tri3": 1, "hex8": 2}
+        np.testing.assert_array_equal(mesh.element_blocks[5].connectivity, HEXES)
+        np.testing.assert_array_equal(mesh.element_blocks[5].element_tags, [10, 11])
+        np.testing.assert_array_equal(mesh.element_blocks[5].physical_tags, [9, 9])
+        np.testing.assert_array_equal(mesh.element_blocks[2].physical_tags, [7])
+        assert mesh.physical_names == {(2, 7): "fixed face", (3, 9): "body"}
+
+    def test_volume_cells_use_node_indices(self, tmp_path):
+        """体单元连接转换为0起始节点索引"""
+        path = tmp_path / "mesh.msh"
+        _write_v4(path, binary=False)
+        cells = read_msh(path).volume_cells()
+
+        assert list(cells) == ["hex8"]
+        np.testing.assert_allclose(read_msh(path).nodes[cells["hex8"][1]][1], [2, 0, 0])
+
+    def test_unsupported_version(self, tmp_path):
+        """不支持的版本抛出格式错误"""
+        path = tmp_path / "old.msh"
+        path.write_text("$MeshFormat\n4.0 0 8\n$EndMeshFormat\n")
+        with pytest.raises(MshFormatError):
+            read_msh(path)
+
+    def test_truncated_nodes(self, tmp_path):
+        """节点数量与声明不符时报错"""
+        path = tmp_path / "bad.msh"
+        path.write_text("$MeshFormat\n2.2 0 8\n$EndMeshFormat\n$Nodes\n3\n1 0 0 0\n2 1 0 0\n$EndNodes\n")
+        with pytest.raises(MshFormatError):
+            read_msh(path)
+
+    @pytest.mark.parametrize(
+        "nodes",
+        [
+            "2\n1 0 0 0\n2 1 x 0\n",  # 非数字
+            "2\n1 0 0 0\n2 1 0\n",  # 缺少坐标
+            "2\n1 0 0 0 5\n2 1 0 0\n",  # 多余数值
+        ],
+    )
+    def test_malformed_ascii_nodes(self, tmp_path, nodes):
+        """ASCII 数值无法解析或个数不符时直接报格式错误（不产生弃用警告或形状错误）"""
+        import warnings
+
+        path = tmp_path / "bad.msh"
+        path.write_text(f"$MeshFormat\n2.2 0 8\n$EndMeshFormat\n$Nodes\n{nodes}$EndNodes\n")
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            with pytest.raises(MshFormatError, match="数值"):
+                read_msh(path)
+
+    def test_malformed_v4_node_block(self, tmp_path):
+        """4.1 节点块坐标个数不符时报格式错误"""
+        path = tmp_path / "bad.msh"
+        path.write_text("$MeshFormat\n4.1 0 8\n$EndMeshFormat\n$Nodes\n1 2 1 2\n3 1 0 2\n1\n2\n0 0 0\n1 0\n$EndNodes\n")
+        with pytest.raises(MshFormatError, match="数值个数"):
+            read_msh(path)
+
+    def test_quality_analyzer_reads_msh_natively(self, tmp_path):
+        """质量分析器直接读取.msh（无需meshio）"""
+        from sw_helper.mesh.quality import MeshQualityAnalyzer
+
+        path = tmp_path / "mesh.msh"
+        _write_v2(path, binary=True)
+        results = MeshQualityAnalyzer().analyze(str(path), ["jacobian", "volume"])
+
+        assert results["mesh_info"]["elements"] == 2
+        assert results["jacobian"]["min"] == pytest.approx(1.0)
+        assert results["volume"]["mean"] == pytest.approx(1.0)
+
+
+class TestMeshCache:
+    """网格二进制缓存测试"""
+
+    def test_second_load_is_memory_mapped(self, tmp_path):
+        """第二次加载命中缓存并返回内存映射数组"""
+        path = tmp_path / "mesh.msh"
+        _write_v4(path, binary=True)
+        cache = MeshCache()
+
+        first = cache.load(path)
+        second = cache.load(path)
+
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert isinstance(second.nodes, np.memmap)
+        np.testing.assert_array_equal(second.nodes, first.nodes)
+        np.testing.assert_array_equal(second.element_blocks[5].connectivity, HEXES)
+        assert second.physical_names == first.physical_names
+        assert (tmp_path / ".mesh_cache").is_dir()
+
+    def test_changed_content_invalidates(self, tmp_path):
+        """文件内容变化后重新解析"""
+        path = tmp_path / "mesh.msh"
+        cache = MeshCache(tmp_path / "cache")
+        _write_v2(path, binary=False)
+        cache.load(path)
+
+        _write_v4(path, binary=False)
+        mesh = cache.load(path)
+
+        assert cache.misses == 2
+        assert mesh.version == "4.1"
+
+    def test_same_tick_rewrite_is_not_trusted(self, tmp_path):
+        """同一时间戳内改写为相同大小的文件不命中旧缓存；修改时间稳定后索引才记录哈希"""
+        path = tmp_path / "mesh.msh"
+        _write_v2(path, binary=False)
+        stamp = path.stat().st_mtime_ns
+        MeshCache().load(path)
+
+        text = path.read_text()
+        first = text.split("$Nodes\n")[1].split("\n")[1]
+        path.write_text(text.replace(first, first[:-1] + "9", 1))
+        os.utime(path, ns=(stamp, stamp))
+        assert MeshCache().load(path).nodes[0, 2] == pytest.approx(9.0)
+
+        old = time.time_ns() - 10 * RACY_WINDOW_NS
+        os.utime(path, ns=(old, old))
+        cache = MeshCache()
+        key = cache.content_key(path)
+        index = json.loads((tmp_path / ".mesh_cache" / "index.json").read_text())
+        assert index["files"][str(path.resolve())]["hash"] == key
+
+    def test_quality_metrics_are_cached(self, tmp_path):
+        """再次分析未修改的网格时直接读取缓存的指标"""
+        from sw_helper.mesh.quality import MeshQualityAnalyzer
+
+        path = tmp_path / "mesh.msh"
+        _write_v2(path, binary=False)
+        cache = MeshCache()
+        first = MeshQualityAnalyzer(cache=cache).analyze(str(path))
+
+        analyzer = MeshQualityAnalyzer(cache=cache)
+        analyzer._compute_uncached = None  # 不允许重新计算
+        second = analyzer.analyze(str(path))
+
+        assert second["jacobian"] == first["jacobian"]
+        assert cache.hits == 1
+
+
+class TestInpWriter:
+    """CalculiX .inp 批量写出测试"""
+
+    def test_msh_to_inp_keeps_gmsh_tags(self, tmp_path):
+        """节点/单元保留Gmsh编号，只写出体单元"""
+        from sw_helper.mesh.inp_writer import write_msh_as_inp
+
+        path = tmp_path / "mesh.msh"
+        _write_v4(path, binary=True)
+        out = tmp_path / "mesh.inp"
+
+        written = write_msh_as_inp(read_msh(path), out, elset="SOLID", chunk_size=5)
+
+        lines = out.read_text().splitlines()
+        assert written == 2
+        node_lines = lines[lines.index("*NODE") + 1 : lines.index("*NODE") + 1 + len(NODE_TAGS)]
+        assert [int(line.split(",")[0]) for line in node_lines] == NODE_TAGS.tolist()
+        assert np.allclose([float(v) for v in node_lines[-1].split(",")[1:]], NODES[-1])
+        start = lines.index("*ELEMENT, TYPE=C3D8, ELSET=SOLID")
+        assert lines[start + 2] == "11, 2, 20, 21, 3, 6, 22, 23, 7"
+        assert "*SOLID SECTION, ELSET=SOLID, MATERIAL=DEFAULT_MATERIAL" in lines
+        assert not any("TYPE=C3D4" in line or line.startswith("*ELEMENT, TYPE=S") for line in lines)
+
+    def test_long_element_rows_are_continued(self):
+        """超过16项的单元行使用续行，二次单元节点按CalculiX顺序重排"""
+        import io
+
+        from sw_helper.mesh.inp_writer import GMSH_TO_CALCULIX_NODE_ORDER, write_elements, write_set
+
+        buffer = io.BytesIO()
+        conn = np.arange(1, 21)[np.newaxis, :][:, list(GMSH_TO_CALCULIX_NODE_ORDER[17])]
+        write_elements(buffer, "C3D20", np.array([7]), conn)
+        write_set(buffer, "NSET", "ALL", range(1, 20))
+
+        lines = buffer.getvalue().decode().splitlines()
+        assert lines[1].endswith(",") and len(lines[1].split(",")) == 17
+        assert lines[1] == "7, 1, 2, 3, 4, 5, 6, 7, 8, 9, 12, 14, 10, 17, 19, 20,"
+        assert lines[2] == "18, 11, 13, 15, 16"
+        assert lines[3] == "*NSET, NSET=ALL"
+        assert len(lines[4].split(",")) == 16 and lines[5] == "17, 18, 19"
+
+    def test_connectors_do_not_import_sw_helper(self):
+        """导入连接器不会加载 sw_helper 网格模块（只在读写 .msh 时按需导入）"""
+        import subprocess
+
+        code = (
+            "import sys; sys.path.insert(0, sys.argv[1]); "
+            "import integrations.cae.calculix, integrations.mesher.gmsh, integrations.cae.solvers; "
+            "print(sorted(m for m in sys.modules if m.startswith('sw_helper')))"
+        )
+        src = str(Path(__file__).parent.parent.parent / "src")
+        output = subprocess.run([sys.executable, "-c", code, src], capture_output=True, text=True, check=True)
+        assert output.stdout.strip() == "[]"
+
+    def test_calculix_solver_input_uses_bulk_writer(self, tmp_path):
+        """CalculiXSolver.generate_input 生成完整的梁模型"""
+        from integrations.cae.solvers.base import SolverConfig
+        from integrations.cae.solvers.calculix_solver import CalculiXSolver
+
+        out = tmp_path / "model.inp"
+        config = SolverConfig(material={"elastic_modulus": 210e9, "poisson_ratio": 0.3}, load=1600)
+        assert CalculiXSolver().generate_input(config, str(out))
+
+        text = out.read_text()
+        lines = text.splitlines()
+        node_block = lines[lines.index("*NODE") + 1 : lines.index("*NODE") + 1 + 176]
+        assert node_block[-1].startswith("176, 1000,")
+        assert "*SOLID SECTION,ELSET=BEAM,MATERIAL=STEEL" in lines
+        assert text.index("*CLOAD") > text.index("*STEP")
+        assert "LOAD,2,   100.00000" in lines
+
+    @pytest.mark.parametrize(
+        "analysis_type, config, expected",
+        [
+            ("static", {}, "STEEL"),
+            ("static", {"material": {"name": "AL6061", "E": 69000.0}}, "AL6061"),
+            ("modal", {}, "STEEL"),
+            ("thermal", {}, "STEEL"),
+        ],
+    )
+    def test_staged_msh_section_matches_deck_material(self, tmp_path, analysis_type, config, expected):
+        """暂存的 .msh 网格截面引用输入文件 *MATERIAL 定义的材料"""
+        from integrations.cae.calculix import CalculiXConnector
+
+        mesh = tmp_path / "part.msh"
+        _write_v4(mesh, binary=False)
+        connector = CalculiXConnector()
+        connector.is_connected = True
+
+        deck = connector.setup_simulation(
+            mesh, {**config, "analysis_type": analysis_type, "work_dir": tmp_path / "run"}
+        )
+
+        deck_lines = deck.read_text().splitlines()
+        include = deck.parent / next(line.split("=", 1)[1] for line in deck_lines if line.startswith("*INCLUDE"))
+        material = next(line.split("NAME=", 1)[1] for line in deck_lines if line.startswith("*MATERIAL"))
+        assert material == expected
+        assert f"*SOLID SECTION, ELSET=PART1, MATERIAL={expected}" in include.read_text().splitlines()
@@ -0,0 +1,60 @@
+"""
+并行优化工作进程池测试
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from sw_helper.optimization.doe import DesignParameter
+from sw_helper.optimization.parallel import EvaluationTask, OptimizerPool
+
+
+class TestOptimizerPool:
+    """工作进程池测试"""
+
+    def test_results_match_sequential(self, cad_file, make_optimizer, tmp_path):
+        """并行扫描与顺序扫描结果一致，按迭代顺序返回"""
+        kwargs = dict(steps=6, output_dir=str(tmp_path / "out"), analyze_geometry=False)
+        sequential = make_optimizer(1).optimize_parameter(str(cad_file), "Radius", (2.0, 15.0), **kwargs)
+        parallel = make_optimizer(3).optimize_parameter(str(cad_file), "Radius", (2.0, 15.0), **kwargs)
+
+        assert [r.iteration for r in parallel] == [1, 2, 3, 4, 5, 6]
+        assert [r.parameter_value for r in parallel] == [r.parameter_value for r in sequential]
+        assert [r.quality_score for r in parallel] == [r.quality_score for r in sequential]
+        assert all(Path(r.export_path).exists() for r in parallel)
+
+    def test_parallel_doe(self, cad_file, make_optimizer, tmp_path):
+        """DOE样本分派到工作进程，响应与顺序评估一致"""
+        parameters = [DesignParameter("Length", 80, 120), DesignParameter("Width", 40, 60)]
+        kwargs = dict(method="lhs", samples=5, seed=2, output_dir=str(tmp_path / "out"), analyze_geometry=False)
+        sequential = make_optimizer(1).run_doe(str(cad_file), parameters, **kwargs)
+        parallel = make_optimizer(2).run_doe(str(cad_file), parameters, **kwargs)
+
+        assert np.array_equal(parallel.samples, sequential.samples)
+        assert parallel.responses["quality_score"] == pytest.approx(sequential.responses["quality_score"])
+
+    def test_workers_report_each_task(self, cad_file, tmp_path):
+        """每个任务返回一次结果，记录执行的工作进程与其输出"""
+        tasks = [
+            EvaluationTask(i, {"Length": v}, {"Length": (80.0, 120.0)}, str(tmp_path), analyze_geometry=False)
+            for i, v in enumerate([80.0, 100.0, 120.0], 1)
+        ]
+        with OptimizerPool(str(cad_file), max_workers=2, use_mock=True) as pool:
+            replies = list(pool.run(tasks))
+
+        assert sorted(r.task.index for r in replies) == [1, 2, 3]
+        assert all(r.status == "completed" for r in replies)
+        assert {r.worker for r in replies} <= {1, 2}
+        assert all(any("Length" in m for m in r.messages) for r in replies)
+
+    def test_missing_document(self, tmp_path):
+        """工作进程无法打开文档时报错而不是挂起"""
+        task = EvaluationTask(1, {"Length": 1.0}, {"Length": (0.0, 2.0)}, str(tmp_path))
+        with OptimizerPool(str(tmp_path / "missing.FCStd"), max_workers=1, use_mock=True) as pool:
+            with pytest.raises(RuntimeError, match="missing.FCStd"):
+                list(pool.run([task]))
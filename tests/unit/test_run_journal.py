@@ -0,0 +1,110 @@
+"""
+工作流运行日志与恢复测试
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from integrations._base.journal import RunJournal, load_connector
+from integrations._base.workflow import WorkflowEngine
+from test_workflow_graph import RecordingCAD, RecordingCAE
+
+
+class TestRunJournal:
+    """运行日志与恢复测试"""
+
+    def test_resume_after_solver_failure(self, tmp_path):
+        """求解失败后恢复：日志记录各步骤状态，网格等已完成步骤不重复执行"""
+        cad_file = tmp_path / "bracket.FCStd"
+        cad_file.write_text("bracket")
+        out = tmp_path / "run"
+        config = {"cad_file": str(cad_file), "output_dir": str(out), "loads": [{"type": "force", "value": 500}]}
+        cad, cae = RecordingCAD(), RecordingCAE(fail_solve=True)
+
+        with pytest.raises(RuntimeError, match="仿真求解失败"):
+            WorkflowEngine(cad, cae).run_workflow("stress_analysis", config)
+
+        journal = RunJournal.load(out)
+        assert journal.status == "failed"
+        assert journal.step_status("mesher.generate_mesh") == "completed"
+        assert journal.step_status("cae.solve") == "failed"
+        assert journal.step_status("postprocess.extract_stress") == "pending"
+        assert journal.first_incomplete() == "cae.solve"
+        assert journal.data["steps"]["mesher.generate_mesh"]["artifacts"] == {"mesh": str(out / "mesh.msh")}
+        assert journal.data["steps"]["mesher.generate_mesh"]["duration"] >= 0
+        assert journal.connectors["cae"].endswith(":RecordingCAE")
+
+        # 修复求解器后恢复：连接器按日志记录的类型创建，不使用增量模式也复用已完成步骤
+        engine = WorkflowEngine.from_journal(out)
+        assert isinstance(engine.cae_connector, RecordingCAE)
+        engine.cad_connector, engine.cae_connector, engine.incremental = cad, RecordingCAE(), False
+        result = engine.resume(out)
+
+        assert result["executed"] == ["cae.solve", "postprocess.extract_stress"]
+        assert engine.cae_connector.calls == ["run_simulation", "read_results"]
+        assert engine.results == {"max_stress": 50.0}
+        journal = RunJournal.load(out)
+        assert journal.status == "completed" and journal.data["attempt"] == 2
+        assert journal.first_incomplete() is None
+
+    def test_resume_branched_run(self, tmp_path):
+        """分支工作流的图结构与分支配置随日志恢复"""
+        cad_file = tmp_path / "bracket.FCStd"
+        cad_file.write_text("bracket")
+        out = tmp_path / "run"
+        config = {"cad_file": str(cad_file), "output_dir": str(out)}
+        cases = {
+            "lc1": {"loads": [{"type": "force", "value": 100}]},
+            "lc2": {"loads": [{"type": "force", "value": 200}]},
+        }
+        cad, cae = RecordingCAD(), RecordingCAE(fail_solve=True)
+
+        with pytest.raises(RuntimeError):
+            WorkflowEngine(cad, cae).run_branches(config, cases, max_workers=2)
+
+        result = WorkflowEngine(cad, RecordingCAE()).resume(out)
+
+        assert "mesher.generate_mesh" in result["skipped"]
+        assert result["results"] == {"lc1": {"max_stress": 10.0}, "lc2": {"max_stress": 20.0}}
+
+    def test_other_workflow_restarts_attempts(self, tmp_path):
+        """输出目录中的旧日志属于其它工作流时不沿用尝试次数"""
+        cad_file = tmp_path / "bracket.FCStd"
+        cad_file.write_text("bracket")
+        out = tmp_path / "run"
+        config = {"cad_file": str(cad_file), "output_dir": str(out), "loads": [{"type": "force", "value": 500}]}
+
+        WorkflowEngine(RecordingCAD(), RecordingCAE()).run_workflow("stress_analysis", dict(config))
+        WorkflowEngine(RecordingCAD(), RecordingCAE()).run_workflow("stress_analysis", dict(config))
+        assert RunJournal.load(out).data["attempt"] == 2
+
+        WorkflowEngine(RecordingCAD(), RecordingCAE()).run_workflow("modal_analysis", dict(config))
+        journal = RunJournal.load(out)
+        assert journal.workflow == "modal_analysis" and journal.data["attempt"] == 1
+
+    @pytest.mark.parametrize("path", ["subprocess:Popen", "collections:OrderedDict", "os:sep", "no.such.module:X"])
+    def test_load_connector_rejects_non_connectors(self, path):
+        """日志中的导入路径只能指向连接器类"""
+        with pytest.raises(ValueError, match="连接器|CADConnector"):
+            load_connector(path)
+
+        assert isinstance(load_connector("test_workflow_graph:RecordingCAD"), RecordingCAD)
+        assert load_connector(None) is None
+
+    def test_load_connector_does_not_import_unknown_modules(self, tmp_path, monkeypatch):
+        """日志指向未导入的非连接器包模块时拒绝加载，模块顶层代码不会执行"""
+        marker = tmp_path / "imported"
+        (tmp_path / "evil_connector.py").write_text(f"open({str(marker)!r}, 'w').close()\n")
+        monkeypatch.syspath_prepend(str(tmp_path))
+
+        with pytest.raises(ValueError, match="不在允许导入"):
+            load_connector("evil_connector:Connector")
+        assert not marker.exists()
+        assert "evil_connector" not in sys.modules
+
+        connector = load_connector("integrations.cae.calculix:CalculiXConnectorMock")
+        assert type(connector).__name__ == "CalculiXConnectorMock"
@@ -0,0 +1,188 @@
+"""
+形状指纹与导出复用测试
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from sw_helper.geometry.parser import GeometryParser
+from sw_helper.geometry.stl_reader import STL_RECORD_DTYPE
+from sw_helper.integrations.freecad_connector import FreeCADConnector, FreeCADConnectorMock, _mass_properties
+from sw_helper.optimization.optimizer import shape_fingerprint
+
+
+class TestShapeFingerprint:
+    """形状指纹测试"""
+
+    def test_ignores_numerical_noise(self):
+        """重建带来的微小数值差异不改变指纹，尺寸变化则改变"""
+        summary = FreeCADConnectorMock().shape_summary()
+        noisy = dict(summary, volume=summary["volume"] * (1 + 1e-13))
+        moved = dict(summary, bounds={"x": [0.0, 101.0], "y": [0.0, 50.0], "z": [0.0, 30.0]})
+        assert shape_fingerprint(noisy) == shape_fingerprint(summary)
+        assert shape_fingerprint(moved) != shape_fingerprint(summary)
+
+    def test_mass_distribution_changes_fingerprint(self):
+        """拓扑、体积与包围盒相同但质心或惯性矩阵不同的形状指纹不同"""
+        summary = FreeCADConnectorMock().shape_summary()
+        shifted = dict(summary, center_of_mass=[50.0, 25.0, 14.0])
+        inertia = np.array(summary["inertia"])
+        inertia[0, 1] = inertia[1, 0] = 1e-3 * inertia[0, 0]
+        skewed = dict(summary, inertia=inertia.tolist())
+        assert shape_fingerprint(shifted) != shape_fingerprint(summary)
+        assert shape_fingerprint(skewed) != shape_fingerprint(summary)
+
+    def test_mass_properties_combine_solids(self):
+        """两个实体的质心与惯性矩阵按平行轴定理合成，与整体长方体一致"""
+
+        def box_solid(x0, length, width, height):
+            vector = type("Vector", (), {"x": x0 + length / 2, "y": width / 2, "z": height / 2})
+            volume = length * width * height
+            diagonal = [width**2 + height**2, length**2 + height**2, length**2 + width**2]
+            matrix = {
+                f"A{i + 1}{j + 1}": (volume * diagonal[i] / 12 if i == j else 0.0) for i in range(3) for j in range(3)
+            }
+            return type(
+                "Solid", (), {"Volume": volume, "CenterOfMass": vector, "MatrixOfInertia": type("M", (), matrix)}
+            )
+
+        whole = _mass_properties([box_solid(0.0, 100.0, 50.0, 30.0)])
+        halves = _mass_properties([box_solid(0.0, 40.0, 50.0, 30.0), box_solid(40.0, 60.0, 50.0, 30.0)])
+        assert halves["center_of_mass"] == pytest.approx(whole["center_of_mass"])
+        assert np.array(halves["inertia"]) == pytest.approx(np.array(whole["inertia"]))
+        assert _mass_properties([]) == {}
+
+    def test_clamped_parameter_keeps_fingerprint(self):
+        """圆角超过截面一半时被截断，形状不变"""
+        connector = FreeCADConnectorMock()
+        connector.set_parameter("Fillet_Radius", 20.0)
+        before = shape_fingerprint(connector.shape_summary())
+        connector.set_parameter("Fillet_Radius", 25.0)
+        assert shape_fingerprint(connector.shape_summary()) == before
+
+
+class TestExportReuse:
+    """优化循环中的导出复用测试"""
+
+    def test_unchanged_shape_skips_export(self, cad_file, make_optimizer, tmp_path):
+        """参数不影响形状时只导出一次，后续迭代复用导出文件"""
+        optimizer = make_optimizer()
+        results = optimizer.optimize_parameter(
+            str(cad_file), "Radius", (2.0, 15.0), steps=4, output_dir=str(tmp_path / "out"), analyze_geometry=False
+        )
+
+        assert len(results) == 4
+        assert {r.export_path for r in results} == {results[0].export_path}
+        assert len(list((tmp_path / "out").glob("*.step"))) == 1
+        assert optimizer.reused_shapes == 3
+        # 质量分数仍按各自的参数值计算
+        assert len({r.quality_score for r in results}) > 1
+
+    def test_changed_shape_exports_each_iteration(self, cad_file, make_optimizer, tmp_path):
+        optimizer = make_optimizer()
+        results = optimizer.optimize_parameter(
+            str(cad_file), "Length", (80.0, 120.0), steps=3, output_dir=str(tmp_path / "out"), analyze_geometry=False
+        )
+        assert len({r.export_path for r in results}) == 3
+        assert optimizer.reused_shapes == 0
+
+    def test_analysis_reused_for_same_shape(self, cad_file, make_optimizer, tmp_path):
+        """相同形状只分析一次，备注中标明复用来源"""
+        optimizer = make_optimizer()
+        calls = []
+        analyze = optimizer._analyze_geometry
+        optimizer._analyze_geometry = lambda path: calls.append(path) or analyze(path)
+
+        results = optimizer.optimize_parameter(
+            str(cad_file), "Fillet_Radius", (20.0, 25.0), steps=3, output_dir=str(tmp_path / "out")
+        )
+
+        assert len(calls) == 1
+        assert "same shape as #1" in results[-1].notes
+
+
+class TestInMemoryAnalysis:
+    """内存三角化分析测试"""
+
+    def test_analyze_without_export(self, make_optimizer, tmp_path):
+        """连接器支持三角化时不读取导出文件"""
+        optimizer = make_optimizer()
+        optimizer.connector = FreeCADConnectorMock()
+        geo_data = optimizer._analyze_geometry(tmp_path / "missing.step")
+        assert geo_data["format"] == "memory"
+        assert geo_data["volume"] == pytest.approx(100.0 * 50.0 * 30.0)
+        assert geo_data["vertices"] == 8
+
+    def test_parse_mesh_matches_stl(self, tmp_path):
+        """内存网格的解析结果与解析同一网格的STL一致"""
+        triangles = FreeCADConnectorMock().tessellate()
+        stl_path = tmp_path / "box.stl"
+        records = np.zeros(len(triangles), dtype=STL_RECORD_DTYPE)
+        records["vertices"] = triangles
+        with open(stl_path, "wb") as f:
+            f.write(b"box".ljust(80, b" "))
+            f.write(np.uint32(len(triangles)).tobytes())
+            records.tofile(f)
+
+        from_stl = GeometryParser(weld=True).parse(stl_path)
+        from_memory = GeometryParser(weld=True).parse_mesh(triangles, name="box")
+        for key in ("faces", "vertices", "volume", "surface_area", "topology"):
+            assert from_memory[key] == pytest.approx(from_stl[key])
+
+
+class FakeShape:
+    """只记录名称的形状，三角化返回一个三角形"""
+
+    def __init__(self, name):
+        self.name = name
+
+    def isNull(self):
+        return False
+
+    def tessellate(self, tolerance):
+        point = type("Point", (), {"x": 0.0, "y": 0.0, "z": 0.0})
+        return [point, point, point], [(0, 1, 2)]
+
+
+class FakeObject:
+    def __init__(self, name, types, in_list=(), visible=True):
+        self.Name = name
+        self.types = set(types) | {"Part::Feature"}
+        self.InList = list(in_list)
+        self.Visibility = visible
+        self.Shape = FakeShape(name)
+
+    def isDerivedFrom(self, type_id):
+        return type_id in self.types
+
+
+class TestFreeCADResultShape:
+    """FreeCAD文档的最终形状选择测试"""
+
+    def make_connector(self, objects):
+        connector = FreeCADConnector()
+        connector.active_doc = type("Document", (), {"Objects": objects})()
+        connector.part_module = type("Part", (), {"makeCompound": staticmethod(lambda shapes: shapes)})
+        return connector
+
+    def test_body_tip_and_visible_leaves(self):
+        """草图、Body 内的中间特征与被圆角使用的基础形状不计入；隐藏的叶子对象被忽略"""
+        body = FakeObject("Body", ["PartDesign::Body"])
+        sketch = FakeObject("Sketch", ["Part::Part2DObject"], in_list=[body])
+        pad = FakeObject("Pad", ["PartDesign::Feature"], in_list=[body])
+        box = FakeObject("Box", [])
+        fillet = FakeObject("Fillet", [])
+        box.InList = [fillet]
+        hidden = FakeObject("Hidden", [], visible=False)
+        connector = self.make_connector([sketch, pad, body, box, fillet, hidden])
+
+        assert [shape.name for shape in connector._result_shape()] == ["Body", "Fillet"]
+
+        single = self.make_connector([sketch, pad, body])
+        assert single._result_shape().name == "Body"
+        assert single.tessellate().shape == (1, 3, 3)
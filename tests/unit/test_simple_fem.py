@@ -0,0 +1,59 @@
+"""
+简易求解器批量接口测试
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from integrations.cae.solvers import SimpleFEMSolver, SolverConfig
+
+
+class TestSimpleFEMBatch:
+    """SimpleFEMSolver.solve_batch 测试"""
+
+    def test_matches_scalar_solve(self):
+        """批量结果与逐个求解一致"""
+        solver = SimpleFEMSolver()
+        rng = np.random.default_rng(0)
+        load = rng.uniform(100, 5000, 20)
+        length = rng.uniform(500, 3000, 20)
+        width = rng.uniform(20, 100, 20)
+        height = rng.uniform(50, 200, 20)
+        E = rng.uniform(70e9, 210e9, 20)
+        yield_strength = rng.uniform(200e6, 400e6, 20)
+
+        batch = solver.solve_batch(load, length, width, height, E, yield_strength)
+
+        assert len(batch) == 20
+        for i in range(20):
+            config = SolverConfig(
+                material={"elastic_modulus": E[i], "yield_strength": yield_strength[i]},
+                load=load[i],
+                geometry={"length": length[i], "width": width[i], "height": height[i]},
+            )
+            single = solver.solve(config)
+            assert batch[i].max_displacement == pytest.approx(single.max_displacement, rel=1e-12)
+            assert batch[i].max_stress == pytest.approx(single.max_stress, rel=1e-12)
+            assert batch[i].safety_factor == pytest.approx(single.safety_factor, rel=1e-12)
+
+    def test_broadcast_grid(self):
+        """标量与数组广播组合为参数网格，零载荷安全系数为无穷大"""
+        lengths = np.array([500.0, 1000.0, 2000.0])
+        heights = np.array([50.0, 100.0])
+
+        batch = SimpleFEMSolver().solve_batch(1000.0, lengths[:, None], 50, heights[None, :])
+
+        assert batch.shape == batch.max_stress.shape == batch.safety_factor.shape == (3, 2)
+        assert len(batch) == 6
+        grid = batch.max_displacement
+        np.testing.assert_allclose(grid[1] / grid[0], 8.0)  # δ ∝ L³
+        np.testing.assert_allclose(grid[:, 0] / grid[:, 1], 8.0)  # δ ∝ 1/h³
+        assert batch[2, 1].max_displacement == batch[5].max_displacement == batch[-1].max_displacement == grid[2, 1]
+
+        zero = SimpleFEMSolver().solve_batch(np.array([0.0, 1000.0]))
+        assert np.isinf(zero.safety_factor[0]) and np.isfinite(zero.safety_factor[1])
@@ -0,0 +1,165 @@
+"""
+求解结果缓存测试
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from integrations.cae.solvers import (
+    SimpleFEMSolver,
+    SolverConfig,
+    SolverResult,
+    SolverResultCache,
+    config_fingerprint,
+)
+
+
+class CountingSolver(SimpleFEMSolver):
+    """记录求解次数的简易求解器"""
+
+    def __init__(self, fail=False):
+        self.calls = 0
+        self.fail = fail
+
+    def solve(self, config):
+        self.calls += 1
+        if self.fail:
+            return SolverResult(0, 0, 0, messages="求解失败")
+        return super().solve(config)
+
+
+class _EstimatingSolver(SimpleFEMSolver):
+    """返回解析估算结果的求解器"""
+
+    def solve(self, config):
+        return SolverResult(1e-3, 1e8, 2.0, estimated=True)
+
+
+def _config(**kwargs):
+    values = dict(material={"elastic_modulus": 210e9, "yield_strength": 235e6}, load=1000, geometry={"length": 1000})
+    values.update(kwargs)
+    return SolverConfig(**values)
+
+
+class TestSolverResultCache:
+    """结果缓存测试"""
+
+    def test_fingerprint_is_canonical(self, tmp_path):
+        """配置哈希与字典键顺序、整数/浮点写法无关，网格按内容参与"""
+        a = _config(material={"yield_strength": 235e6, "elastic_modulus": 210e9}, load=1000.0)
+        assert config_fingerprint(a) == config_fingerprint(_config())
+        assert config_fingerprint(_config(load=1001)) != config_fingerprint(_config())
+
+        mesh_a, mesh_b = tmp_path / "a.msh", tmp_path / "b.msh"
+        mesh_a.write_text("mesh")
+        mesh_b.write_text("mesh")
+        with_a = _config(geometry={"mesh_file": str(mesh_a)})
+        with_b = _config(geometry={"mesh_file": str(mesh_b)})
+        assert config_fingerprint(with_a) == config_fingerprint(with_b)
+        mesh_b.write_text("changed")
+        assert config_fingerprint(with_a) != config_fingerprint(with_b)
+
+    def test_hits_and_invalidation(self, tmp_path):
+        """相同配置命中缓存；求解器版本或网格内容变化时重新求解"""
+        cache = SolverResultCache(tmp_path / "cache")
+        solver = CountingSolver()
+        mesh = tmp_path / "model.msh"
+        mesh.write_text("v1")
+
+        first = solver.solve_cached(_config(), cache=cache, mesh_file=mesh)
+        second = solver.solve_cached(_config(), cache=SolverResultCache(tmp_path / "cache"), mesh_file=mesh)
+
+        assert solver.calls == 1
+        assert second == first
+        assert (cache.hits, cache.misses) == (0, 1)
+
+        solver.version = "9.9"
+        solver.solve_cached(_config(), cache=cache, mesh_file=mesh)
+        mesh.write_text("v2")
+        solver.solve_cached(_config(), cache=cache, mesh_file=mesh)
+        assert solver.calls == 3
+
+        stats = cache.stats()
+        assert stats["entries"] == 3 and stats["misses"] == 3 and stats["bytes"] > 0
+
+    def test_node_arrays_round_trip(self, tmp_path):
+        """逐节点结果以数组缓存，读回后数值与形状不变"""
+        cache = SolverResultCache(tmp_path)
+        result = SolverResult(1e-3, 2e8, 1.2, node_displacement=np.linspace(0, 1e-3, 7), node_stress=np.ones(7))
+        cache.put("k", result)
+
+        loaded = cache.get("k")
+        np.testing.assert_array_equal(loaded.node_displacement, result.node_displacement)
+        np.testing.assert_array_equal(loaded.node_stress, result.node_stress)
+        assert loaded.max_stress == result.max_stress
+
+    def test_failed_results_not_cached(self, tmp_path):
+        """求解失败（全零结果）不写入缓存"""
+        cache = SolverResultCache(tmp_path)
+        solver = CountingSolver(fail=True)
+        solver.solve_cached(_config(), cache=cache)
+        solver.solve_cached(_config(), cache=cache)
+        assert solver.calls == 2 and cache.stats()["entries"] == 0
+
+    def test_estimated_results_not_cached(self, tmp_path):
+        """解析估算结果（真实求解未完成）不写入缓存"""
+        cache = SolverResultCache(tmp_path)
+        cache.get_or_solve(_EstimatingSolver(), _config())
+        assert cache.stats()["entries"] == 0
+
+    def test_lru_eviction(self, tmp_path):
+        """超过条目上限时淘汰最久未使用的条目"""
+        cache = SolverResultCache(tmp_path, max_entries=2)
+        solver = CountingSolver()
+        configs = [_config(load=load) for load in (100, 200, 300)]
+        keys = [cache.key(solver, config) for config in configs]
+
+        for i in range(2):
+            cache.get_or_solve(solver, configs[i])
+            os.utime(cache._path(keys[i]), ns=(i + 1, i + 1))
+        # 访问第一个条目使其成为最近使用，第二个条目应被淘汰
+        assert cache.get(keys[0]) is not None
+        cache.get_or_solve(solver, configs[2])
+
+        assert cache.stats()["entries"] == 2
+        assert cache.get(keys[0]) is not None
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[2]) is not None
+
+    def test_mesh_digest_is_memoized(self, tmp_path):
+        """网格大小与修改时间未变时不重新读取文件计算哈希"""
+        cache = SolverResultCache(tmp_path / "cache")
+        solver = CountingSolver()
+        mesh = tmp_path / "model.msh"
+        mesh.write_text("v1")
+        os.utime(mesh, ns=(10**18, 10**18))
+        key = cache.key(solver, _config(), mesh)
+
+        # 内容变化但大小与修改时间不变：使用记忆的哈希
+        mesh.write_text("v2")
+        os.utime(mesh, ns=(10**18, 10**18))
+        assert cache.key(solver, _config(), mesh) == key
+        os.utime(mesh, ns=(2 * 10**18, 2 * 10**18))
+        assert cache.key(solver, _config(), mesh) != key
+
+    def test_put_scans_directory_only_when_over_limit(self, tmp_path, monkeypatch):
+        """写入时增量统计占用，只在首次写入和超限时扫描缓存目录"""
+        cache = SolverResultCache(tmp_path, max_entries=3)
+        scans = []
+        entries = cache._entries
+        monkeypatch.setattr(cache, "_entries", lambda: scans.append(1) or entries())
+        result = SolverResult(1e-3, 1e8, 2.0)
+
+        for i in range(3):
+            cache.put(f"k{i}", result)
+        cache.put("k0", result)
+        assert len(scans) == 1
+
+        cache.put("k3", result)
+        assert len(scans) == 2
+        assert cache.stats()["entries"] == 3
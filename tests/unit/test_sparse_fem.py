@@ -0,0 +1,284 @@
+"""
+稀疏矩阵有限元求解测试
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+pytest.importorskip("scipy")
+
+from integrations.cae.solvers import SolverConfig, get_solver
+from integrations.cae.solvers import linear, sparse_fem
+
+E = 210e9
+NU = 0.3
+
+
+def _model(element_type):
+    if element_type in ("Q4", "CST"):
+        return sparse_fem.rectangle_mesh(2.0, 1.0, 4, 2, element_type)
+    return sparse_fem.box_mesh(2.0, 1.0, 1.0, 4, 2, 2, element_type)
+
+
+class TestSparseFEM:
+    """单元刚度与组装测试"""
+
+    @pytest.mark.parametrize("element_type", ["CST", "Q4", "C3D4", "C3D8"])
+    def test_stiffness_symmetric_with_rigid_modes(self, element_type):
+        """总刚度矩阵对称，刚体平移不产生内力"""
+        model = _model(element_type)
+        D = sparse_fem.elasticity_matrix(E, NU, model.dim)
+        K = sparse_fem.assemble_stiffness(model, D, chunk_size=3)
+
+        assert K.shape == (model.n_dofs, model.n_dofs)
+        assert abs(K - K.T).max() < 1e-6 * abs(K).max()
+        for axis in range(model.dim):
+            translation = np.zeros((len(model.nodes), model.dim))
+            translation[:, axis] = 1.0
+            assert np.abs(K @ translation.ravel()).max() < 1e-6 * abs(K).max()
+
+    @pytest.mark.parametrize("element_type", ["CST", "Q4", "C3D4", "C3D8"])
+    def test_uniaxial_patch(self, element_type):
+        """单向拉伸分片试验：位移线性分布、应力均匀"""
+        model = _model(element_type)
+        dim = model.dim
+        D = sparse_fem.elasticity_matrix(E, NU, dim)
+        K = sparse_fem.assemble_stiffness(model, D)
+
+        # 按精确解施加全部边界节点位移，内部节点自由
+        strain = 1e-4
+        exact = np.zeros((len(model.nodes), dim))
+        exact[:, 0] = strain * model.nodes[:, 0]
+        for axis in range(1, dim):
+            exact[:, axis] = -NU * strain * model.nodes[:, axis]
+        lo, hi = model.nodes.min(axis=0), model.nodes.max(axis=0)
+        boundary = np.flatnonzero(np.any(np.isclose(model.nodes, lo) | np.isclose(model.nodes, hi), axis=1))
+        fixed = (boundary[:, np.newaxis] * dim + np.arange(dim)).ravel()
+
+        u, info = sparse_fem.solve_static(K, np.zeros(model.n_dofs), fixed, exact.ravel()[fixed])
+        stress = sparse_fem.nodal_stress(model, D, u)
+
+        np.testing.assert_allclose(u, exact.ravel(), atol=1e-12)
+        np.testing.assert_allclose(stress[:, 0], E * strain, rtol=1e-8)
+        assert np.abs(stress[:, 1:]).max() < 1e-6 * E * strain
+
+    def test_degenerate_element(self):
+        """退化单元报错"""
+        nodes = np.array([[0.0, 0.0], [1.0, 0.0], [2.0, 0.0]])
+        model = sparse_fem.FEMModel(nodes, np.array([[0, 1, 2]]), "CST")
+        with pytest.raises(ValueError):
+            sparse_fem.assemble_stiffness(model, sparse_fem.elasticity_matrix(E, NU, 2))
+
+
+class TestLinearSolvers:
+    """线性求解策略测试"""
+
+    @staticmethod
+    def _cantilever(element_type="C3D8"):
+        model = sparse_fem.box_mesh(1.0, 0.1, 0.1, 20, 2, 2, element_type)
+        K = sparse_fem.assemble_stiffness(model, sparse_fem.elasticity_matrix(E, NU, 3))
+        left = np.flatnonzero(model.nodes[:, 0] == 0)
+        fixed = (left[:, np.newaxis] * 3 + np.arange(3)).ravel()
+        f = np.zeros(model.n_dofs)
+        f[3 * np.flatnonzero(model.nodes[:, 0] == 1.0) + 2] = -100.0
+        return model, K, f, fixed
+
+    @pytest.mark.parametrize(
+        "method,preconditioner",
+        [("cg", "none"), ("cg", "jacobi"), ("cg", "ic"), ("minres", "ic"), ("cg", "amg"), ("minres", "amg")],
+    )
+    def test_iterative_matches_direct(self, method, preconditioner):
+        """迭代法结果与直接法一致，并报告迭代次数与残差"""
+        model, K, f, fixed = self._cantilever()
+        reference, _ = sparse_fem.solve_static(K, f, fixed, method="direct")
+
+        u, info = sparse_fem.solve_static(
+            K, f, fixed, nodes=model.nodes, method=method, preconditioner=preconditioner, tol=1e-10, maxiter=20000
+        )
+
+        assert info.converged and info.iterations > 0
+        assert info.residual < 1e-6
+        np.testing.assert_allclose(u, reference, atol=1e-6 * np.abs(reference).max())
+        assert f"迭代 {info.iterations} 次" in info.summary()
+
+    def test_incomplete_factorization_is_symmetric(self):
+        """ic 预条件对称正定，CG/MINRES 收敛且迭代次数明显少于无预条件与 Jacobi"""
+        model = sparse_fem.box_mesh(1.0, 0.05, 0.1, 40, 3, 5, "C3D8")
+        K = sparse_fem.assemble_stiffness(model, sparse_fem.elasticity_matrix(E, NU, 3))
+        left = np.flatnonzero(model.nodes[:, 0] == 0)
+        fixed = (left[:, np.newaxis] * 3 + np.arange(3)).ravel()
+        A, _, _ = sparse_fem.apply_dirichlet(K, np.zeros(model.n_dofs), fixed)
+
+        M = linear.IncompleteCholesky(A)
+        rng = np.random.default_rng(0)
+        x, y = rng.random(A.shape[0]), rng.random(A.shape[0])
+        assert x @ M.apply(y) == pytest.approx(y @ M.apply(x), rel=1e-10)
+        assert x @ M.apply(x) > 0
+
+        b = A @ rng.random(A.shape[0])
+        _, plain = linear.solve_linear(A, b, "cg", "none", tol=1e-8, maxiter=5000)
+        _, jacobi = linear.solve_linear(A, b, "cg", "jacobi", tol=1e-8, maxiter=5000)
+        _, ic = linear.solve_linear(A, b, "cg", "ic", tol=1e-8, maxiter=5000)
+        assert ic.converged and ic.residual <= 1e-7
+        assert 2 * ic.iterations < min(plain.iterations, jacobi.iterations)
+
+        _, minres_ic = linear.solve_linear(A, b, "minres", "ic", tol=1e-8, maxiter=5000)
+        assert minres_ic.converged and minres_ic.residual <= 1e-7
+        assert minres_ic.iterations < jacobi.iterations
+
+    def test_level_scheduled_factorization_matches_column_order(self):
+        """逐消去层分解与逐列 IC(0) 结果一致，层内各列互不依赖"""
+        from scipy import sparse
+
+        model, K, _, fixed = self._cantilever()
+        A, _, _ = sparse_fem.apply_dirichlet(K, np.zeros(model.n_dofs), fixed)
+        scale = 1.0 / np.sqrt(A.diagonal())
+        lower = sparse.tril(sparse.diags(scale) @ A @ sparse.diags(scale), format="csc")
+        lower.sort_indices()
+
+        levels = linear.elimination_levels(lower)
+        level_of = np.empty(A.shape[0], dtype=int)
+        for depth, columns in enumerate(levels):
+            level_of[columns] = depth
+        rows, cols = lower.nonzero()
+        assert len(levels) < A.shape[0] and np.all(level_of[rows[rows > cols]] > level_of[cols[rows > cols]])
+
+        # 逐列参考实现（稠密存储，模式外填充丢弃）
+        pattern = lower.toarray() != 0
+        L = np.tril(lower.toarray())
+        for k in range(A.shape[0]):
+            L[k, k] = np.sqrt(L[k, k])
+            L[k + 1 :, k] /= L[k, k]
+            L[k + 1 :, k + 1 :] -= np.tril(np.outer(L[k + 1 :, k], L[k + 1 :, k])) * pattern[k + 1 :, k + 1 :]
+        np.testing.assert_allclose(linear._incomplete_cholesky(lower, 0.0, levels).toarray(), L, atol=1e-12)
+
+    def test_incomplete_cholesky_shift_grows_gently(self):
+        """IC(0) 出现非正主元时对角平移从小值逐次加倍，而不是跳到大平移"""
+        from scipy import sparse
+
+        # 对称正定，但 IC(0) 在零平移下出现负主元
+        A = sparse.csr_matrix(np.array([[3.0, -2, 0, 2], [-2, 3, -2, 0], [0, -2, 3, -2], [2, 0, -2, 3]]))
+        A.eliminate_zeros()
+        assert linear._incomplete_cholesky(sparse.tril(A / 3.0, format="csc"), 0.0) is None
+
+        M = linear.IncompleteCholesky(A)
+        assert 0 < M.shift < 0.5
+        x = np.random.default_rng(0).random(4)
+        assert x @ M.apply(x) > 0
+
+    def test_converged_uses_true_residual(self, monkeypatch):
+        """收敛判定基于真实残差而非 Krylov 退出码"""
+        model, K, f, fixed = self._cantilever()
+        _, info = sparse_fem.solve_static(K, f, fixed, method="minres", preconditioner="jacobi", tol=1e-8)
+        assert info.converged == (info.residual <= 1e-8 * linear.RESIDUAL_SLACK)
+
+        monkeypatch.setattr(linear, "RESIDUAL_SLACK", 1e-6)
+        _, info = sparse_fem.solve_static(K, f, fixed, method="cg", preconditioner="jacobi", tol=1e-8)
+        assert not info.converged and "未收敛" in info.summary()
+
+    def test_amg_reduces_iterations(self):
+        """AMG 预条件的迭代次数远少于 Jacobi"""
+        model, K, f, fixed = self._cantilever()
+        _, jacobi = sparse_fem.solve_static(K, f, fixed, method="cg", preconditioner="jacobi")
+        _, amg = sparse_fem.solve_static(K, f, fixed, nodes=model.nodes, method="cg", preconditioner="amg")
+        assert amg.iterations * 5 < jacobi.iterations
+
+    def test_iteration_cap_and_auto(self, monkeypatch):
+        """迭代上限生效；auto 按规模在直接法与 CG + AMG 之间切换"""
+        model, K, f, fixed = self._cantilever()
+        _, info = sparse_fem.solve_static(K, f, fixed, method="cg", preconditioner="none", maxiter=3)
+        assert not info.converged and info.iterations == 3
+
+        _, info = sparse_fem.solve_static(K, f, fixed, nodes=model.nodes, method="auto")
+        assert info.method == "direct"
+        monkeypatch.setattr(linear, "DIRECT_SOLVER_MAX_DOFS_3D", 10)
+        _, info = sparse_fem.solve_static(K, f, fixed, nodes=model.nodes, method="auto")
+        assert (info.method, info.preconditioner) == ("cg", "amg")
+        # 显式指定的预条件不被替换
+        _, info = sparse_fem.solve_static(K, f, fixed, nodes=model.nodes, method="auto", preconditioner="jacobi")
+        assert (info.method, info.preconditioner) == ("cg", "jacobi")
+
+        with pytest.raises(ValueError):
+            sparse_fem.solve_static(K, f, fixed, method="gmres")
+
+    def test_direct_limit_depends_on_dimension(self):
+        """三维实体模型的直接法阈值低于平面模型；无分量编号时按每行非零元数判断"""
+        _, K3, _, _ = self._cantilever()
+        plane = sparse_fem.rectangle_mesh(1.0, 0.1, 20, 2, "Q4")
+        K2 = sparse_fem.assemble_stiffness(plane, sparse_fem.elasticity_matrix(E, NU, 2))
+
+        assert linear.direct_solver_max_dofs(K3, np.arange(K3.shape[0]) % 3) == linear.DIRECT_SOLVER_MAX_DOFS_3D
+        assert linear.direct_solver_max_dofs(K3) == linear.DIRECT_SOLVER_MAX_DOFS_3D
+        assert linear.direct_solver_max_dofs(K2, np.arange(K2.shape[0]) % 2) == linear.DIRECT_SOLVER_MAX_DOFS
+        assert linear.direct_solver_max_dofs(K2) == linear.DIRECT_SOLVER_MAX_DOFS
+        assert linear.DIRECT_SOLVER_MAX_DOFS_3D < linear.DIRECT_SOLVER_MAX_DOFS
+
+
+class TestSciPySolver:
+    """SciPy求解器梁分析测试"""
+
+    # 截面 50x100mm，长 1000mm
+    I = 0.05 * 0.1**3 / 12
+    W = 0.05 * 0.1**2 / 6
+
+    @pytest.mark.parametrize("element_type", ["Q4", "C3D8"])
+    @pytest.mark.parametrize("support", ["simply_supported", "cantilever"])
+    def test_beam_against_theory(self, element_type, support):
+        """梁的位移与应力与梁理论一致（含剪切变形，误差<5%/10%）"""
+        load = 1000.0
+        config = SolverConfig(
+            material={"elastic_modulus": E, "poisson_ratio": NU, "yield_strength": 235e6},
+            load=load,
+            mesh_size=10.0,
+            geometry={"length": 1000, "width": 50, "height": 100},
+            boundary_conditions={"type": support},
+            element_type=element_type,
+        )
+
+        result = get_solver("scipy").solve(config)
+
+        if support == "simply_supported":
+            delta, sigma, key = load / (48 * E * self.I), load / (4 * self.W), "mid_span"
+        else:
+            delta, sigma, key = load / (3 * E * self.I), load / self.W, "tip"
+        assert result.displacement[key] == pytest.approx(delta, rel=0.05)
+        assert result.max_stress == pytest.approx(sigma, rel=0.10)
+        assert result.safety_factor == pytest.approx(235e6 / result.max_stress)
+        assert result.node_displacement.shape == result.node_stress.shape
+        assert result.node_displacement.max() == pytest.approx(result.max_displacement)
+        assert result.node_stress.max() == pytest.approx(result.max_stress)
+        assert element_type in result.messages
+
+    def test_linear_solver_config(self):
+        """SolverConfig 中的线性求解策略传递给求解器并报告迭代信息"""
+        base = dict(load=1000.0, mesh_size=20.0, element_type="C3D8")
+        direct = get_solver("scipy").solve(SolverConfig(linear_solver="direct", **base))
+        iterative = get_solver("scipy").solve(
+            SolverConfig(linear_solver="cg", preconditioner="amg", tolerance=1e-10, **base)
+        )
+
+        assert iterative.max_displacement == pytest.approx(direct.max_displacement, rel=1e-6)
+        assert "cg + amg" in iterative.messages and "迭代" in iterative.messages
+
+        capped = get_solver("scipy").solve(
+            SolverConfig(linear_solver="cg", preconditioner="none", max_iterations=2, **base)
+        )
+        assert "未收敛" in capped.messages
+
+    def test_element_aliases(self):
+        """网格配置中的单元名称可直接使用；未知的单元、边界条件与求解方法返回错误结果"""
+        config = SolverConfig(load=1000.0, mesh_size=25.0, element_type="tetrahedron")
+        assert "C3D4" in get_solver("scipy").solve(config).messages
+
+        for config in (
+            SolverConfig(element_type="C3D20"),
+            SolverConfig(boundary_conditions={"type": "fixed_fixed"}),
+            SolverConfig(linear_solver="gmres"),
+        ):
+            result = get_solver("scipy").solve(config)
+            assert result.messages.startswith("错误: 未知") and result.max_stress == 0
@@ -0,0 +1,267 @@
+"""
+空间索引与壁厚/对称性/间隙检查测试
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from sw_helper.geometry import GeometryAnalyzer, TriangleBVH, TriangleGrid
+from sw_helper.geometry.spatial import closest_point_on_triangles
+
+_CUBE_QUADS = np.array(
+    [
+        [(0, 0, 0), (0, 1, 0), (1, 1, 0), (1, 0, 0)],
+        [(0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1)],
+        [(0, 0, 0), (1, 0, 0), (1, 0, 1), (0, 0, 1)],
+        [(0, 1, 0), (0, 1, 1), (1, 1, 1), (1, 1, 0)],
+        [(0, 0, 0), (0, 0, 1), (0, 1, 1), (0, 1, 0)],
+        [(1, 0, 0), (1, 1, 0), (1, 1, 1), (1, 0, 1)],
+    ],
+    dtype=np.float64,
+)
+
+
+def box_triangles(size=(1.0, 1.0, 1.0), offset=(0.0, 0.0, 0.0), divisions=1):
+    quads = _CUBE_QUADS * size + offset
+    if divisions > 1:
+        # 每个面细分为 divisions × divisions 个小四边形
+        t = np.linspace(0.0, 1.0, divisions + 1)
+        u, v = np.meshgrid(t, t, indexing="ij")
+        grid = (
+            quads[:, None, None, 0]
+            + u[..., None] * (quads[:, 1] - quads[:, 0])[:, None, None]
+            + v[..., None] * (quads[:, 3] - quads[:, 0])[:, None, None]
+        )
+        quads = np.stack([grid[:, :-1, :-1], grid[:, 1:, :-1], grid[:, 1:, 1:], grid[:, :-1, 1:]], -2).reshape(-1, 4, 3)
+    return np.concatenate([quads[:, [0, 1, 2]], quads[:, [0, 2, 3]]])
+
+
+def torus_triangles(nu=48, nv=24, R=3.0, r=1.0):
+    u = np.linspace(0, 2 * np.pi, nu, endpoint=False)
+    v = np.linspace(0, 2 * np.pi, nv, endpoint=False)
+    U, V = np.meshgrid(u, v, indexing="ij")
+    points = np.stack([(R + r * np.cos(V)) * np.cos(U), (R + r * np.cos(V)) * np.sin(U), r * np.sin(V)], -1)
+    points = points.reshape(-1, 3)
+    i, j = np.meshgrid(np.arange(nu), np.arange(nv), indexing="ij")
+    a, b = i * nv + j, ((i + 1) % nu) * nv + j
+    c, d = ((i + 1) % nu) * nv + (j + 1) % nv, i * nv + (j + 1) % nv
+    faces = np.concatenate([np.stack([a, b, c], -1).reshape(-1, 3), np.stack([a, c, d], -1).reshape(-1, 3)])
+    return points[faces]
+
+
+def sliver_cylinder_triangles(n=4000, R=1.0, H=10.0):
+    """侧面为贯通全高的细长三角形、端面为扇形的圆柱"""
+    a = np.linspace(0, 2 * np.pi, n, endpoint=False)
+    b = np.roll(a, -1)
+
+    def ring(angle, z):
+        return np.stack([R * np.cos(angle), R * np.sin(angle), np.full_like(angle, z)], -1)
+
+    bottom, top = np.zeros((n, 3)), np.tile([0.0, 0.0, H], (n, 1))
+    sides = [np.stack([ring(a, 0), ring(b, 0), ring(b, H)], 1), np.stack([ring(a, 0), ring(b, H), ring(a, H)], 1)]
+    caps = [np.stack([bottom, ring(b, 0), ring(a, 0)], 1), np.stack([top, ring(a, H), ring(b, H)], 1)]
+    return np.concatenate(sides + caps)
+
+
+def brute_force_nearest(triangles, points):
+    return np.array(
+        [
+            np.linalg.norm(
+                closest_point_on_triangles(
+                    np.repeat(p[None], len(triangles), 0), triangles[:, 0], triangles[:, 1], triangles[:, 2]
+                )
+                - p,
+                axis=1,
+            ).min()
+            for p in points
+        ]
+    )
+
+
+class TestTriangleGrid:
+    """体素网格查询与暴力计算一致"""
+
+    @pytest.fixture
+    def torus(self):
+        return torus_triangles()
+
+    def test_ray_cast_matches_brute_force(self, torus):
+        """批量射线的首个交点与逐三角形求交结果一致"""
+        grid = TriangleGrid(torus, cell_size=0.3)
+        rng = np.random.default_rng(1)
+        origins = rng.uniform(-5, 5, (200, 3))
+        directions = rng.normal(size=(200, 3))
+
+        distance, triangle = grid.ray_cast(origins, directions)
+
+        unit = directions / np.linalg.norm(directions, axis=1)[:, None]
+        all_tris = np.arange(len(torus))
+        for i in range(len(origins)):
+            t = grid._intersect(
+                np.repeat(origins[i : i + 1], len(torus), 0), np.repeat(unit[i : i + 1], len(torus), 0), all_tris
+            )
+            t[t < 0] = np.inf
+            assert distance[i] == pytest.approx(t.min())
+            if np.isfinite(t.min()):
+                assert t[triangle[i]] == pytest.approx(t.min())
+        assert np.isfinite(distance).any()
+
+        limited, _ = grid.ray_cast(origins, directions, max_distance=1.0)
+        np.testing.assert_array_equal(limited, np.where(distance <= 1.0, distance, np.inf))
+
+    def test_nearest_matches_brute_force(self, torus):
+        """最近点距离与暴力计算一致；超出搜索半径时为 inf"""
+        grid = TriangleGrid(torus)
+        points = np.random.default_rng(2).uniform(-6, 6, (200, 3))
+
+        distance, closest, _ = grid.nearest(points)
+        limited, _, triangle = grid.nearest(points, max_distance=0.5)
+
+        expected = brute_force_nearest(torus, points)
+        np.testing.assert_allclose(distance, expected)
+        np.testing.assert_allclose(np.linalg.norm(closest - points, axis=1), expected)
+        np.testing.assert_allclose(limited, np.where(expected <= 0.5, expected, np.inf))
+        assert np.all((triangle >= 0) == np.isfinite(limited))
+
+    def test_min_distance_matches_nearest(self, torus):
+        """点集的全局最近距离与逐点最近点查询的最小值一致"""
+        grid = TriangleGrid(torus)
+        rng = np.random.default_rng(3)
+        for points in (rng.uniform(-6, 6, (500, 3)), rng.uniform(4.2, 6, (50, 3))):
+            distance, _, _ = grid.nearest(points)
+            found, index, closest = grid.min_distance(points, probes=4)
+            assert found == pytest.approx(distance.min()) and distance[index] == pytest.approx(found)
+            assert np.linalg.norm(closest - points[index]) == pytest.approx(found)
+
+            limited = grid.min_distance(points, max_distance=0.5 * distance.min())
+            assert limited[0] == np.inf and limited[1] == -1
+
+    def test_crowded_cells_match_brute_force(self):
+        """细长三角形使体素拥挤时改由 BVH 查询，结果与暴力计算一致"""
+        sliver = sliver_cylinder_triangles()
+        grid = TriangleGrid(sliver)
+        assert grid.bvh is not None and grid.bvh.num_triangles > len(sliver) // 2
+
+        rng = np.random.default_rng(4)
+        points = rng.uniform((-1.5, -1.5, -1.0), (1.5, 1.5, 11.0), (100, 3))
+        distance, closest, triangle = grid.nearest(points)
+        np.testing.assert_allclose(distance, brute_force_nearest(sliver, points), atol=1e-12)
+        np.testing.assert_allclose(np.linalg.norm(closest - points, axis=1), distance, atol=1e-12)
+        nearest_triangles = sliver[triangle]
+        np.testing.assert_allclose(
+            closest_point_on_triangles(closest, *nearest_triangles.transpose(1, 0, 2)), closest, atol=1e-9
+        )
+
+        directions = rng.normal(size=(100, 3))
+        hit, hit_triangle = grid.ray_cast(points, directions, ignore=np.full(100, -1))
+        unit = directions / np.linalg.norm(directions, axis=1)[:, None]
+        for i in range(len(points)):
+            t = grid._intersect(
+                np.repeat(points[i : i + 1], len(sliver), 0),
+                np.repeat(unit[i : i + 1], len(sliver), 0),
+                np.arange(len(sliver)),
+            )
+            t[t < 0] = np.inf
+            assert hit[i] == pytest.approx(t.min())
+            if np.isfinite(t.min()):
+                assert t[hit_triangle[i]] == pytest.approx(t.min())
+
+    def test_bvh_nearest_and_ray_cast(self, torus):
+        """BVH 的最近点与射线求交与暴力计算一致，并遵守距离区间"""
+        bvh = TriangleBVH(torus)
+        rng = np.random.default_rng(5)
+        points = rng.uniform(-5, 5, (100, 3))
+
+        distance, _, triangle = bvh.nearest(points, np.full(100, 0.5))
+        expected = brute_force_nearest(torus, points)
+        np.testing.assert_allclose(distance, np.where(expected <= 0.5, expected, np.inf))
+        assert np.all((triangle >= 0) == np.isfinite(distance))
+
+        directions = rng.normal(size=(100, 3))
+        directions /= np.linalg.norm(directions, axis=1)[:, None]
+        hit, _ = bvh.ray_cast(points, directions, np.full(100, 0.5), np.full(100, 4.0))
+        grid_hit, _ = TriangleGrid(torus).ray_cast(points, directions, max_distance=4.0, min_distance=0.5)
+        np.testing.assert_allclose(hit, grid_hit)
+
+    def test_segments_intersect(self):
+        """线段与立方体相交判定"""
+        grid = TriangleGrid(box_triangles())
+        starts = np.array([[-1.0, 0.5, 0.5], [0.2, 0.2, 0.2], [2.0, 2.0, 2.0]])
+        ends = np.array([[0.5, 0.5, 0.5], [0.8, 0.8, 0.8], [3.0, 3.0, 3.0]])
+        assert grid.segments_intersect(starts, ends).tolist() == [True, False, False]
+
+
+class TestAnalyzerSpatialChecks:
+    """分析器的壁厚、对称性与间隙检查"""
+
+    def test_thin_walls(self):
+        """0.5厚的平板上下表面为一个薄壁区域"""
+        analyzer = GeometryAnalyzer({"triangles": box_triangles((10.0, 10.0, 0.5))})
+
+        (region,) = analyzer.detect_thin_walls(min_thickness=1.0)
+
+        assert region["min_thickness"] == pytest.approx(0.5)
+        assert region["area"] == pytest.approx(200.0)
+        assert analyzer.detect_thin_walls(min_thickness=0.4) == []
+        assert analyzer.spatial_index is analyzer.spatial_index
+
+    def test_symmetry(self):
+        """长方体三向镜像对称；圆环轴对称；四面体不对称"""
+        box = GeometryAnalyzer({"triangles": box_triangles((3.0, 2.0, 1.0), offset=(5.0, 0.0, 0.0))}).detect_symmetry()
+        assert box["x_plane"] and box["y_plane"] and box["z_plane"] and not box["axisymmetric"]
+
+        torus = GeometryAnalyzer({"triangles": torus_triangles()}).detect_symmetry(tolerance=0.05)
+        assert torus["axisymmetric"] and abs(torus["axis"]["direction"][2]) == pytest.approx(1.0)
+
+        corners = np.array([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]])
+        tetra = corners[[[0, 2, 1], [0, 1, 3], [0, 3, 2], [1, 2, 3]]]
+        result = GeometryAnalyzer({"triangles": tetra}).detect_symmetry()
+        assert not any(result[key] for key in ("x_plane", "y_plane", "z_plane", "axisymmetric"))
+
+    def test_clearance(self):
+        """间隙、干涉与包含"""
+        analyzer = GeometryAnalyzer({"triangles": box_triangles()})
+
+        gap = analyzer.check_clearance({"triangles": box_triangles(offset=(1.2, 0.3, 0.0))}, min_clearance=0.1)
+        assert not gap["interference"] and gap["clearance_ok"]
+        assert gap["min_distance"] == pytest.approx(0.2)
+
+        tight = analyzer.check_clearance({"triangles": box_triangles(offset=(1.05, 0.3, 0.0))}, min_clearance=0.1)
+        assert tight["min_distance"] == pytest.approx(0.05) and not tight["clearance_ok"]
+
+        overlap = analyzer.check_clearance({"triangles": box_triangles(offset=(0.5, 0.2, 0.1))})
+        inside = analyzer.check_clearance({"triangles": box_triangles((0.2, 0.2, 0.2), offset=(0.4, 0.4, 0.4))})
+        assert overlap["interference"] and inside["interference"] and not inside["clearance_ok"]
+
+        far = analyzer.check_clearance({"triangles": box_triangles(offset=(5.0, 0.0, 0.0))}, search_distance=1.0)
+        assert far["min_distance"] is None and far["clearance_ok"]
+
+    def test_thin_walls_with_locally_refined_mesh(self):
+        """粗网格平板上的细网格薄筋：拥挤体素由 BVH 处理，壁厚仍正确"""
+        plate = box_triangles((100.0, 100.0, 2.0))
+        rib = box_triangles((0.8, 10.0, 10.0), offset=(50.0, 45.0, 2.0), divisions=40)
+        analyzer = GeometryAnalyzer({"triangles": np.concatenate([plate, rib])})
+        assert analyzer.spatial_index.bvh is not None
+
+        regions = analyzer.detect_thin_walls(min_thickness=1.0)
+
+        assert regions[0]["min_thickness"] == pytest.approx(0.8)
+
+    def test_clearance_scales_to_large_meshes(self):
+        """两个大网格圆环沿整圈等距相对：间隙检查在数秒内完成"""
+        lower = GeometryAnalyzer({"triangles": torus_triangles(400, 200)})
+        upper = GeometryAnalyzer({"triangles": torus_triangles(400, 200) + (0.0, 0.0, 2.5)})
+        # 空间索引预先建立，只计间隙检查耗时
+        assert lower.spatial_index.num_cells and upper.spatial_index.num_cells
+
+        start = time.perf_counter()
+        result = lower.check_clearance(upper, search_distance=2.0)
+
+        assert time.perf_counter() - start < 10
+        assert result["min_distance"] == pytest.approx(0.5) and not result["interference"]
@@ -0,0 +1,177 @@
+"""
+STEP 流式扫描模块测试
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from sw_helper.geometry import STEPParser
+from sw_helper.geometry.step_reader import (
+    StepFormatError,
+    decode_string,
+    iter_blocks,
+    iter_statements,
+    scan_step,
+    split_parameters,
+)
+
+ASSEMBLY_STEP = r"""ISO-10303-21;
+HEADER;
+/* exported; with comments */
+FILE_DESCRIPTION(('demo assembly'),'2;1');
+FILE_NAME('asm.step','2024-01-01T00:00:00',('\X2\5F204E09\X0\'),('ACME'),'pp','SolidWorks 2023','');
+FILE_SCHEMA(('AUTOMOTIVE_DESIGN { 1 0 10303 214 1 1 1 1 }'));
+ENDSEC;
+DATA;
+#1=PRODUCT('ASM','Assembly; top','',(#90));
+#2=PRODUCT_DEFINITION_FORMATION('','',#1);
+#3=PRODUCT_DEFINITION('design','',#2,#91);
+#4=PRODUCT('P1','Bolt','',(#90));
+#5=PRODUCT_DEFINITION_FORMATION_WITH_SPECIFIED_SOURCE('','',#4,.NOT_KNOWN.);
+#6=PRODUCT_DEFINITION('design','',#5,#91);
+#7=NEXT_ASSEMBLY_USAGE_OCCURRENCE('1','Bolt:1','',#3,#6,$);
+#8=NEXT_ASSEMBLY_USAGE_OCCURRENCE('2','Bolt:2','',#3,#6,$);
+#10=( LENGTH_UNIT() NAMED_UNIT(*) SI_UNIT(.MILLI.,.METRE.) );
+#11=( NAMED_UNIT(*) PLANE_ANGLE_UNIT() SI_UNIT($,.RADIAN.) );
+#12=( GEOMETRIC_REPRESENTATION_CONTEXT(3) GLOBAL_UNIT_ASSIGNED_CONTEXT((#10,#11)) REPRESENTATION_CONTEXT('',''));
+#20=CARTESIAN_POINT('',(0.,0.,0.));
+#21=CARTESIAN_POINT('',(1.,0.,0.));
+#22 = DIRECTION('',(0.,0.,1.));
+ENDSEC;
+END-ISO-10303-21;
+"""
+
+
+def write_step(path, text=ASSEMBLY_STEP):
+    Path(path).write_bytes(text.encode("latin-1"))
+    return path
+
+
+class TestStepTokenizer:
+    """词法工具测试"""
+
+    def test_statements_skip_strings_and_comments(self, tmp_path):
+        """字符串中的分号不切分语句，注释被去除"""
+        path = write_step(tmp_path / "asm.step")
+        statements = [s.strip() for s in iter_statements(path, block_size=23)]
+
+        assert statements[0] == b"ISO-10303-21"
+        assert b"#1=PRODUCT('ASM','Assembly; top','',(#90))" in statements
+        assert not any(b"/*" in s for s in statements)
+
+    def test_comment_marker_in_string(self, tmp_path):
+        """字符串中的 /* 不是注释开头，之后的块照常切分"""
+        text = ASSEMBLY_STEP.replace("'Assembly; top'", "'Assembly /* top'")
+        path = write_step(tmp_path / "asm.step", text)
+        blocks = list(iter_blocks(path, block_size=64))
+
+        assert max(len(b) for b in blocks) < 256
+        statements = [s.strip() for s in iter_statements(path, block_size=64)]
+        assert b"#1=PRODUCT('ASM','Assembly /* top','',(#90))" in statements
+        assert statements[-1] == b"END-ISO-10303-21"
+
+    def test_decode_and_split(self):
+        """字符串解码与顶层参数切分"""
+        assert decode_string("'It''s'") == "It's"
+        assert decode_string(r"'\X2\5F204E09\X0\'") == "张三"
+        assert decode_string(r"'\X\E9t\S\e'") == "étå"
+        assert split_parameters("'a,b',(1,2),#3,$") == ["'a,b'", "(1,2)", "#3", "$"]
+
+
+class TestStepScanner:
+    """STEP扫描测试"""
+
+    @pytest.mark.parametrize("block_size", [16, 61, 1 << 20])
+    def test_metadata(self, tmp_path, block_size):
+        """任意块大小下得到相同的头部、直方图、单位与装配结构"""
+        metadata = scan_step(write_step(tmp_path / "asm.step"), block_size=block_size)
+
+        assert metadata.schema.startswith("AUTOMOTIVE_DESIGN")
+        assert metadata.header["author"] == ["张三"]
+        assert metadata.header["originating_system"] == "SolidWorks 2023"
+        assert metadata.entity_count == 14
+        assert metadata.entity_types["CARTESIAN_POINT"] == 2
+        assert metadata.entity_types["SI_UNIT"] == 2
+        assert metadata.entity_types["DIRECTION"] == 1
+        assert [p["name"] for p in metadata.products] == ["Assembly; top", "Bolt"]
+        assert metadata.units == {"length": "mm", "angle": "rad"}
+        assert metadata.assembly == [
+            {
+                "product": "Assembly; top",
+                "instance": None,
+                "children": [
+                    {"product": "Bolt", "instance": "Bolt:1", "children": []},
+                    {"product": "Bolt", "instance": "Bolt:2", "children": []},
+                ],
+            }
+        ]
+
+    @pytest.mark.parametrize("block_size", [37, 1 << 20])
+    def test_complex_entity_histogram(self, tmp_path, block_size):
+        """复合实体按组成类型计数；字符串与类型化参数中的括号不算组成类型"""
+        extra = (
+            "#30=( BOUNDED_SURFACE() B_SPLINE_SURFACE(1,1,((#20,#21),(#20,#21)),.UNSPECIFIED.,.F.,.F.,.F.)\n"
+            "  RATIONAL_B_SPLINE_SURFACE(((1.,1.),(1.,1.))) REPRESENTATION_ITEM('a) FAKE_TYPE(b') SURFACE() );\n"
+            "#31=( MEASURE_REPRESENTATION_ITEM() MEASURE_WITH_UNIT(LENGTH_MEASURE(0.1),#10) "
+            "REPRESENTATION_ITEM('tol') );\n"
+            "#20=CARTESIAN_POINT"
+        )
+        text = ASSEMBLY_STEP.replace("#20=CARTESIAN_POINT", extra, 1)
+        metadata = scan_step(write_step(tmp_path / "asm.step", text), block_size=block_size)
+
+        assert metadata.entity_count == 16
+        assert metadata.entity_types["REPRESENTATION_ITEM"] == 2
+        assert metadata.entity_types["RATIONAL_B_SPLINE_SURFACE"] == 1
+        assert metadata.entity_types["MEASURE_WITH_UNIT"] == 1
+        assert "FAKE_TYPE" not in metadata.entity_types and "LENGTH_MEASURE" not in metadata.entity_types
+        assert metadata.units == {"length": "mm", "angle": "rad"}
+
+    def test_format_errors(self, tmp_path):
+        """非STEP文件与截断文件报格式错误"""
+        path = tmp_path / "bad.step"
+        path.write_text("solid cube\nendsolid cube\n")
+        with pytest.raises(StepFormatError):
+            scan_step(path)
+
+        write_step(path, ASSEMBLY_STEP.rsplit("ENDSEC;", 1)[0])
+        with pytest.raises(StepFormatError):
+            scan_step(path)
+
+    def test_parser_without_occ(self, tmp_path):
+        """STEPParser 默认只扫描元数据，不加载B-rep"""
+        path = write_step(tmp_path / "asm.stp")
+
+        result = STEPParser().parse(str(path))
+
+        assert result["type"] == "brep" and result["format"] == ".step"
+        assert result["entities"] == 14
+        assert result["units"]["length"] == "mm"
+        assert result["assembly"][0]["product"] == "Assembly; top"
+        assert "volume" not in result
+
+    def test_optimizer_fallback_keeps_geometry(self, tmp_path, monkeypatch):
+        """优化器无法使用STL时通过OCC读取STEP，评分所需的体积/面数/顶点数不缺失"""
+        from sw_helper.geometry.parser import GeometryParser
+        from sw_helper.integrations.freecad_connector import FreeCADConnectorMock
+        from sw_helper.optimization.optimizer import FreeCADOptimizer
+
+        class NoMeshConnector(FreeCADConnectorMock):
+            def tessellate(self, tolerance=0.1):
+                return None
+
+            def export_file(self, output_path, format_type="STEP"):
+                return False
+
+        geometry = {"volume": 1.5e-4, "faces": 6, "vertices": 8}
+        monkeypatch.setattr(GeometryParser, "_step_geometry", staticmethod(lambda path: dict(geometry)))
+        optimizer = FreeCADOptimizer(use_mock=True)
+        optimizer.connector = NoMeshConnector()
+
+        geo_data = optimizer._analyze_geometry(write_step(tmp_path / "part.step"))
+
+        assert {key: geo_data[key] for key in geometry} == geometry
+        assert geo_data["units"]["length"] == "mm"
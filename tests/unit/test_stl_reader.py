@@ -0,0 +1,121 @@
+"""
+STL 读取模块测试
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from sw_helper.geometry import STLParser
+from sw_helper.geometry.stl_reader import STL_RECORD_DTYPE, StlFormatError, read_stl
+
+# 单位立方体的12个三角形（法向朝外）
+_CUBE_QUADS = [
+    [(0, 0, 0), (0, 1, 0), (1, 1, 0), (1, 0, 0)],
+    [(0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1)],
+    [(0, 0, 0), (1, 0, 0), (1, 0, 1), (0, 0, 1)],
+    [(0, 1, 0), (0, 1, 1), (1, 1, 1), (1, 1, 0)],
+    [(0, 0, 0), (0, 0, 1), (0, 1, 1), (0, 1, 0)],
+    [(1, 0, 0), (1, 1, 0), (1, 1, 1), (1, 0, 1)],
+]
+
+
+def cube_triangles(size=(1.0, 1.0, 1.0), offset=(0.0, 0.0, 0.0)):
+    quads = np.array(_CUBE_QUADS, dtype=np.float64) * size + offset
+    return np.concatenate([quads[:, [0, 1, 2]], quads[:, [0, 2, 3]]])
+
+
+def write_binary_stl(path, triangles, header=b"binary cube"):
+    records = np.zeros(len(triangles), dtype=STL_RECORD_DTYPE)
+    records["vertices"] = triangles
+    with open(path, "wb") as f:
+        f.write(header.ljust(80, b" "))
+        f.write(np.uint32(len(triangles)).tobytes())
+        records.tofile(f)
+
+
+def write_ascii_stl(path, triangles, name="cube", upper=False):
+    lines = [f"solid {name}"]
+    for tri in triangles:
+        lines.append("  facet normal 0 0 0\n    outer loop")
+        lines += [f"      vertex {x:.6e} {y:.6e} {z:.6e}" for x, y, z in tri]
+        lines.append("    endloop\n  endfacet")
+    lines.append(f"endsolid {name}")
+    text = "\n".join(lines) + "\n"
+    Path(path).write_text(text.upper() if upper else text)
+
+
+class TestStlReader:
+    """STL读取测试"""
+
+    def test_binary(self, tmp_path):
+        """二进制STL：内存映射读取，头部以solid开头也按二进制识别"""
+        path = tmp_path / "cube.stl"
+        write_binary_stl(path, cube_triangles((2.0, 3.0, 4.0), (10.0, 0.0, -5.0)), header=b"solid exported")
+
+        mesh = read_stl(path)
+
+        assert mesh.binary and mesh.num_triangles == 12
+        assert isinstance(mesh.triangles, np.memmap)
+        lower, upper = mesh.bounds()
+        np.testing.assert_allclose(lower, [10, 0, -5])
+        np.testing.assert_allclose(upper, [12, 3, -1])
+        assert mesh.surface_area() == pytest.approx(2 * (6 + 8 + 12))
+        assert mesh.signed_volume() == pytest.approx(24.0)
+
+    def test_ascii_streamed_in_blocks(self, tmp_path):
+        """ASCII STL：跨块边界、大写关键字、多个solid"""
+        path = tmp_path / "cubes.stl"
+        first, second = cube_triangles(), cube_triangles(offset=(5.0, 0.0, 0.0))
+        write_ascii_stl(path, first, upper=True)
+        write_ascii_stl(tmp_path / "second.stl", second, name="second")
+        with open(path, "a") as f:
+            f.write((tmp_path / "second.stl").read_text())
+
+        mesh = read_stl(path, block_size=97)
+
+        assert not mesh.binary and mesh.name == "CUBE"
+        assert mesh.num_triangles == 24
+        np.testing.assert_allclose(mesh.triangles[:12], first)
+        np.testing.assert_allclose(mesh.triangles[12:], second)
+        assert mesh.signed_volume() == pytest.approx(2.0)
+        assert mesh.surface_area() == pytest.approx(12.0)
+
+    def test_inverted_and_format_errors(self, tmp_path):
+        """翻转法向时有向体积为负；截断文件报格式错误"""
+        path = tmp_path / "inverted.stl"
+        write_binary_stl(path, cube_triangles()[:, ::-1])
+        assert read_stl(path).signed_volume() == pytest.approx(-1.0)
+
+        data = path.read_bytes()
+        path.write_bytes(data[:-60])
+        with pytest.raises(StlFormatError):
+            read_stl(path)
+
+        write_ascii_stl(path, cube_triangles())
+        path.write_text(path.read_text().rsplit("endloop", 1)[0])
+        with pytest.raises(StlFormatError):
+            read_stl(path)
+
+        # 非数字的坐标同样报格式错误（而不是截断后静默返回）
+        write_ascii_stl(path, cube_triangles())
+        path.write_text(path.read_text().replace("vertex", "vertex nan-ish", 1))
+        with pytest.raises(StlFormatError, match="无法解析"):
+            read_stl(path)
+
+    def test_parser_summary(self, tmp_path):
+        """STLParser 返回真实的顶点/面数、包围盒与体积"""
+        path = tmp_path / "part.stl"
+        write_binary_stl(path, cube_triangles((2.0, 2.0, 2.0)))
+
+        result = STLParser().parse(str(path))
+
+        assert result["type"] == "triangular_mesh"
+        assert (result["faces"], result["vertices"]) == (12, 36)
+        assert result["volume"] == pytest.approx(8.0)
+        assert result["surface_area"] == pytest.approx(24.0)
+        assert result["bounds"] == {"x": [0.0, 2.0], "y": [0.0, 2.0], "z": [0.0, 2.0]}
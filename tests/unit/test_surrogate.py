@@ -0,0 +1,147 @@
+"""
+代理模型优化测试
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from sw_helper.optimization.optimizer import FreeCADOptimizer
+from sw_helper.optimization.surrogate import (
+    GaussianProcess,
+    SurrogateOptimizer,
+    expected_improvement,
+)
+
+
+def run_search(objective, bounds, max_evaluations=30, **kwargs):
+    """按代理模型建议依次评估，直到收敛或达到评估上限"""
+    surrogate = SurrogateOptimizer(bounds, **kwargs)
+    values, scores = [], []
+    for _ in range(max_evaluations):
+        value = surrogate.suggest(values, scores)
+        if value is None:
+            break
+        values.append(value)
+        scores.append(objective(value))
+    return values, scores
+
+
+class TestGaussianProcess:
+    """高斯过程回归测试"""
+
+    def test_interpolates_observations(self):
+        """预测在观测点处通过观测值，且不确定度接近零"""
+        x = np.array([0.0, 0.3, 0.6, 1.0])
+        y = np.sin(4 * x) * 10 + 50
+        mean, std = GaussianProcess().fit(x, y).predict(x)
+        assert mean == pytest.approx(y, abs=1e-2)
+        assert np.all(std < 1e-2)
+
+    def test_uncertainty_grows_between_samples(self):
+        """远离观测点处不确定度更大"""
+        gp = GaussianProcess().fit([0.0, 1.0], [1.0, 2.0])
+        _, std = gp.predict([0.0, 0.5])
+        assert std[1] > std[0]
+
+    def test_expected_improvement(self):
+        """期望改进非负，预测均值更高或不确定度更大时更大"""
+        ei = expected_improvement(np.array([1.0, 2.0, 1.0]), np.array([0.1, 0.1, 1.0]), best=1.5)
+        assert np.all(ei >= 0)
+        assert ei[1] > ei[0] and ei[2] > ei[0]
+
+
+class TestSurrogateOptimizer:
+    """自适应搜索测试"""
+
+    def test_initial_design(self):
+        """先评估包含两端的均布点"""
+        surrogate = SurrogateOptimizer((2.0, 10.0), initial_points=3)
+        assert surrogate.initial_values() == [2.0, 6.0, 10.0]
+        assert surrogate.suggest([], []) == 2.0
+        assert surrogate.suggest([2.0], [1.0]) == 6.0
+
+    def test_finds_optimum_with_few_evaluations(self):
+        """光滑目标在远少于网格扫描的评估次数内收敛到最优值附近"""
+        values, scores = run_search(lambda x: -((x - 11.3) ** 2), (2.0, 15.0))
+        best = values[int(np.argmax(scores))]
+        assert len(values) < 15
+        assert best == pytest.approx(11.3, abs=0.5)
+
+    def test_log_scale(self):
+        """对数空间搜索时初始点按等比分布"""
+        surrogate = SurrogateOptimizer((1.0, 100.0), log_scale=True)
+        assert surrogate.initial_values() == pytest.approx([1.0, 10.0, 100.0])
+
+    def test_excluded_values_not_suggested(self):
+        """评估失败的值不会再次被建议"""
+        surrogate = SurrogateOptimizer((0.0, 1.0))
+        assert surrogate.suggest([], [], exclude=[0.0]) == 0.5
+
+    def test_all_initial_points_failed(self):
+        """初始点均评估失败时不建立代理模型，返回 None"""
+        surrogate = SurrogateOptimizer((1.0, 10.0))
+        assert surrogate.suggest([], [], surrogate.initial_values()) is None
+        assert surrogate.last_expected_improvement is None
+
+    def test_invalid_bounds(self):
+        with pytest.raises(ValueError):
+            SurrogateOptimizer((5.0, 5.0))
+        with pytest.raises(ValueError):
+            SurrogateOptimizer((0.0, 5.0), log_scale=True)
+
+
+class TestAdaptiveOptimization:
+    """FreeCADOptimizer 自适应模式测试"""
+
+    def test_adaptive_mode_respects_budget(self, tmp_path):
+        """adaptive 模式评估次数不超过 steps，并找到圆角的最佳值"""
+        cad_file = tmp_path / "model.FCStd"
+        cad_file.write_text("mock")
+        optimizer = FreeCADOptimizer(use_mock=True)
+        optimizer.set_progress_callback(lambda msg: None)
+
+        results = optimizer.optimize_parameter(
+            str(cad_file),
+            "Radius",
+            (2.0, 15.0),
+            steps=8,
+            step_mode="adaptive",
+            output_dir=str(tmp_path / "out"),
+            analyze_geometry=False,
+        )
+
+        assert 3 <= len(results) <= 8
+        best = max(results, key=lambda r: r.quality_score)
+        assert best.parameter_value == pytest.approx(8.5, abs=0.5)
+        assert [r.iteration for r in results] == list(range(1, len(results) + 1))
+
+    def test_adaptive_mode_all_evaluations_fail(self, cad_file, make_optimizer, tmp_path, monkeypatch):
+        """参数设置总是失败时正常结束，并关闭文档、断开连接"""
+        from sw_helper.integrations import freecad_connector
+
+        calls = []
+
+        class FailingConnector(freecad_connector.FreeCADConnectorMock):
+            def set_parameter(self, name, value):
+                return False
+
+            def close_document(self, save=False):
+                calls.append("close")
+                return super().close_document(save)
+
+            def disconnect(self):
+                calls.append("disconnect")
+                super().disconnect()
+
+        monkeypatch.setattr(freecad_connector, "FreeCADConnectorMock", FailingConnector)
+        results = make_optimizer().optimize_parameter(
+            str(cad_file), "Radius", (2.0, 15.0), steps=8, step_mode="adaptive", output_dir=str(tmp_path / "out")
+        )
+
+        assert results == []
+        assert calls == ["close", "disconnect"]
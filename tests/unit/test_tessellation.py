@@ -0,0 +1,143 @@
+"""
+STEP 三角化缓存与多细节层次测试
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from sw_helper.geometry.tessellation import (
+    LOD_LEVELS,
+    LOD_PRESETS,
+    StepTessellator,
+    TessellationCache,
+    TessellationSettings,
+    get_lod_stl,
+    lod_output_paths,
+)
+
+
+class FakeTessellator(StepTessellator):
+    """不依赖 OCC：记录读取次数，STL 内容为弦差设置"""
+
+    def __init__(self, cache=None):
+        super().__init__(cache)
+        self.loads = 0
+        self.written = []
+
+    def _load_shape(self, step_file):
+        self.loads += 1
+        return step_file.read_text()
+
+    def _write_stl(self, shape, settings, output):
+        self.written.append(settings)
+        output.write_text(f"{shape}|{settings.key()}")
+
+
+@pytest.fixture
+def step_file(tmp_path):
+    path = tmp_path / "part.step"
+    path.write_text("ISO-10303-21; part")
+    return path
+
+
+class TestTessellationCache:
+    """缓存键与 LRU 淘汰"""
+
+    def test_key_depends_on_content_and_deflection(self, step_file, tmp_path):
+        """键随内容与弦差变化，与文件名无关"""
+        cache = TessellationCache(tmp_path / "cache")
+        coarse, fine = LOD_PRESETS["coarse"], LOD_PRESETS["fine"]
+        copy = tmp_path / "copy.stp"
+        copy.write_text(step_file.read_text())
+
+        assert cache.key(step_file, coarse) == cache.key(copy, coarse)
+        assert cache.key(step_file, coarse) != cache.key(step_file, fine)
+        assert cache.key(step_file, coarse) != cache.key(step_file, TessellationSettings(0.05, 0.8, relative=False))
+
+        before = cache.key(step_file, coarse)
+        step_file.write_text("ISO-10303-21; changed part")
+        assert cache.key(step_file, coarse) != before
+
+    def test_same_tick_rewrite_changes_key(self, step_file, tmp_path):
+        """同一时间戳内改写为相同大小的 STEP 不沿用旧内容哈希"""
+        cache = TessellationCache(tmp_path / "cache")
+        stamp = step_file.stat().st_mtime_ns
+        before = cache.key(step_file, LOD_PRESETS["coarse"])
+        step_file.write_text("ISO-10303-21; PART")
+        os.utime(step_file, ns=(stamp, stamp))
+        assert cache.key(step_file, LOD_PRESETS["coarse"]) != before
+
+    def test_get_put_and_evict(self, step_file, tmp_path):
+        """命中计数；超出容量时淘汰最久未使用的条目"""
+        cache = TessellationCache(tmp_path / "cache", max_bytes=100)
+        stl = tmp_path / "out.stl"
+        stl.write_bytes(b"x" * 60)
+
+        assert cache.get(step_file, LOD_PRESETS["coarse"]) is None
+        cached = cache.put(step_file, LOD_PRESETS["coarse"], stl)
+        assert cache.get(step_file, LOD_PRESETS["coarse"]) == cached
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        cache.put(step_file, LOD_PRESETS["fine"], stl)
+        assert cache.get(step_file, LOD_PRESETS["coarse"]) is None
+        assert cache.get(step_file, LOD_PRESETS["fine"]) is not None
+
+
+class TestStepTessellator:
+    """一次读取生成多级 STL"""
+
+    def test_lod_single_load_then_cached(self, step_file, tmp_path):
+        """三级只读取一次 B-rep（由粗到细）；再次请求全部来自缓存，不读取"""
+        cache = TessellationCache(tmp_path / "cache")
+        outputs = lod_output_paths(tmp_path / "out" / "part.stl")
+        assert [p.name for p in outputs.values()] == ["part.coarse.stl", "part.medium.stl", "part.fine.stl"]
+        requested = {path: LOD_PRESETS[level] for level, path in outputs.items()}
+
+        first = FakeTessellator(cache)
+        assert set(first.tessellate(step_file, requested).values()) == {"tessellated"}
+        assert first.loads == 1
+        assert first.written == [LOD_PRESETS[level] for level in LOD_LEVELS]
+
+        for path in outputs.values():
+            path.unlink()
+        second = FakeTessellator(cache)
+        assert set(second.tessellate(step_file, requested).values()) == {"cache"}
+        assert second.loads == 0
+        assert outputs["fine"].read_text().endswith(LOD_PRESETS["fine"].key())
+
+    def test_get_lod_stl_reuses_cache(self, step_file, tmp_path, monkeypatch):
+        """已缓存的级别直接返回缓存路径"""
+        cache = TessellationCache(tmp_path / "cache")
+        FakeTessellator(cache).tessellate(step_file, {tmp_path / "p.stl": LOD_PRESETS["coarse"]})
+
+        monkeypatch.setattr(StepTessellator, "_load_shape", lambda self, path: pytest.fail("不应读取B-rep"))
+        path = get_lod_stl(step_file, "coarse", cache=cache)
+        assert path.parent == cache.cache_dir and path.read_text().endswith(LOD_PRESETS["coarse"].key())
+
+    def test_get_lod_stl_writes_cache_atomically(self, step_file, tmp_path, monkeypatch):
+        """未缓存时三角化到临时文件再移入缓存；写出失败时不留下缓存条目或临时文件"""
+        cache = TessellationCache(tmp_path / "cache")
+        monkeypatch.setattr(StepTessellator, "_load_shape", lambda self, path: path.read_text())
+
+        def failing_write(self, shape, settings, output):
+            output.write_text("trunc")
+            raise ValueError(f"STL写入失败: {output}")
+
+        monkeypatch.setattr(StepTessellator, "_write_stl", failing_write)
+        with pytest.raises(ValueError):
+            get_lod_stl(step_file, "medium", cache=cache)
+        assert list(cache.cache_dir.iterdir()) == []
+        assert cache.get(step_file, LOD_PRESETS["medium"]) is None
+
+        monkeypatch.setattr(
+            StepTessellator, "_write_stl", lambda self, shape, settings, output: output.write_text(settings.key())
+        )
+        path = get_lod_stl(step_file, "medium", cache=cache)
+        assert path == cache.path_for(step_file, LOD_PRESETS["medium"])
+        assert path.read_text().endswith(LOD_PRESETS["medium"].key())
+        assert list(cache.cache_dir.iterdir()) == [path]
@@ -0,0 +1,64 @@
+"""
+spawn 工作进程池测试
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from sw_helper.utils.worker_pool import WorkerPool
+
+
+def echo_worker(conn, *args):
+    """回复 (任务, 进程号, 参数)；任务为 "crash" 时退出，"sleep" 时挂起"""
+    if args and args[0] == "handshake":
+        conn.send({"ready": args[1] == "ok", "error": "初始化失败"})
+    while True:
+        task = conn.recv()
+        if task is None:
+            return
+        if task == "crash":
+            os._exit(3)
+        if task == "sleep":
+            time.sleep(30)
+        conn.send((task, os.getpid(), args))
+
+
+class TestWorkerPool:
+    """工作进程生命周期测试"""
+
+    def test_workers_reused_across_runs(self):
+        """多次 run 复用同一批工作进程，工作目录作为最后一个参数传入并在关闭时删除"""
+        with WorkerPool(echo_worker, args=("x",), max_workers=2, work_prefix="pool_test_") as pool:
+            first = list(pool.run(range(4)))
+            second = list(pool.run(range(4, 8)))
+            work_dir = Path(first[0].reply[2][-1])
+            assert work_dir.is_dir()
+
+        assert sorted(o.reply[0] for o in first + second) == list(range(8))
+        assert {o.status for o in first + second} == {"done"}
+        assert {o.reply[1] for o in first} == {o.reply[1] for o in second}
+        assert len({o.reply[1] for o in first}) <= 2
+        assert not work_dir.exists()
+
+    def test_crash_and_timeout_restart_worker(self):
+        """崩溃与超时只影响对应任务，工作进程以新编号重启"""
+        with WorkerPool(echo_worker, max_workers=2, timeout=2) as pool:
+            outcomes = {o.task: o for o in pool.run(["crash", "sleep", "a", "b"])}
+
+        assert outcomes["crash"].status == "crashed" and "exit code 3" in outcomes["crash"].error
+        assert outcomes["sleep"].status == "timeout"
+        assert outcomes["a"].status == outcomes["b"].status == "done"
+        assert max(o.worker for o in outcomes.values()) > 2
+
+    def test_handshake_failure(self):
+        with WorkerPool(echo_worker, args=("handshake", "ok"), max_workers=1, handshake=True) as pool:
+            assert [o.reply[0] for o in pool.run(["a"])] == ["a"]
+        with WorkerPool(echo_worker, args=("handshake", "bad"), max_workers=1, handshake=True) as pool:
+            with pytest.raises(RuntimeError, match="初始化失败"):
+                list(pool.run(["a"]))
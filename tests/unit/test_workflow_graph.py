@@ -0,0 +1,352 @@
+"""
+工作流DAG与步骤级缓存测试
+"""
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from integrations._base.connectors import CADConnector, CAEConnector, FileFormat
+from integrations._base.workflow import WorkflowEngine, WorkflowStatus
+from sw_helper.utils.hashing import RACY_WINDOW_NS
+from integrations._base.workflow_graph import CACHE_FILE_NAME, StepCache, WorkflowGraph
+
+
+class RecordingCAD(CADConnector):
+    """记录调用的CAD连接器：导出内容取决于已加载的模型与参数"""
+
+    def __init__(self):
+        self.calls: List[str] = []
+        self.model = None
+        self.parameters: Dict[str, float] = {}
+
+    def connect(self) -> bool:
+        return True
+
+    def load_model(self, file_path: Path) -> bool:
+        self.calls.append("load_model")
+        self.model = file_path
+        self.parameters = {}
+        return True
+
+    def get_parameter(self, name: str) -> Optional[float]:
+        return self.parameters.get(name)
+
+    def set_parameter(self, name: str, value: float) -> bool:
+        self.calls.append("set_parameter")
+        self.parameters[name] = value
+        return True
+
+    def rebuild(self) -> bool:
+        self.calls.append("rebuild")
+        return True
+
+    def export_step(self, output_path: Path) -> bool:
+        assert self.model is not None, "导出前必须加载模型"
+        self.calls.append("export_step")
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(f"STEP {self.model} {sorted(self.parameters.items())}")
+        return True
+
+    def get_supported_formats(self) -> List[FileFormat]:
+        return [FileFormat.STEP]
+
+
+class RecordingCAE(CAEConnector):
+    """记录调用的CAE连接器：结果中的应力取决于载荷，记录同时运行的求解数"""
+
+    def __init__(self, solve_time: float = 0.0, fail_solve: bool = False):
+        self.calls: List[str] = []
+        self.solve_time = solve_time
+        self.fail_solve = fail_solve
+        self.running = 0
+        self.peak = 0
+        self.version = "2.21"
+        self.version_queries = 0
+        self._lock = threading.Lock()
+
+    def get_version(self) -> Optional[str]:
+        self.version_queries += 1
+        return self.version
+
+    def connect(self) -> bool:
+        return True
+
+    def generate_mesh(self, geometry_file: Path, mesh_file: Path, element_size: float = 2.0) -> bool:
+        self.calls.append("generate_mesh")
+        mesh_file.write_text(f"MESH {element_size} {geometry_file.read_text()}")
+        return True
+
+    def setup_simulation(self, mesh_file: Path, config: Dict[str, Any]) -> Path:
+        self.calls.append("setup_simulation")
+        input_file = Path(config.get("work_dir") or mesh_file.parent) / "job.inp"
+        load = sum(item["value"] for item in config["loads"])
+        input_file.write_text(f"LOAD {load}")
+        return input_file
+
+    def run_simulation(self, input_file: Path, output_dir: Optional[Path] = None) -> bool:
+        self.calls.append("run_simulation")
+        if self.fail_solve:
+            return False
+        with self._lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(self.solve_time)
+        (output_dir / f"{input_file.stem}.frd").write_text(input_file.read_text())
+        with self._lock:
+            self.running -= 1
+        return True
+
+    def read_results(self, result_file: Path) -> Dict[str, Any]:
+        self.calls.append("read_results")
+        return {"max_stress": float(result_file.read_text().split()[1]) / 10}
+
+    def get_supported_analysis_types(self) -> List[str]:
+        return ["static", "modal"]
+
+
+@pytest.fixture
+def workflow(tmp_path):
+    cad_file = tmp_path / "bracket.FCStd"
+    cad_file.write_text("bracket")
+    config = {
+        "cad_file": str(cad_file),
+        "parameters": {"thickness": 10.0},
+        "mesh_element_size": 2.0,
+        "output_dir": str(tmp_path / "out"),
+        "loads": [{"type": "force", "value": 1000}],
+    }
+    cad, cae = RecordingCAD(), RecordingCAE()
+
+    def run(force=False, **changes):
+        config.update(changes)
+        cad.calls.clear()
+        cae.calls.clear()
+        engine = WorkflowEngine(cad, cae)
+        return engine, engine.run_workflow("stress_analysis", dict(config), force=force)
+
+    return run, cad, cae, cad_file
+
+
+class TestWorkflowGraph:
+    """图构建测试"""
+
+    def test_from_steps_binds_declared_slots(self):
+        """线性步骤按声明的槽位连接到最近的上游"""
+        graph = WorkflowGraph.from_steps(WorkflowEngine.PREDEFINED_WORKFLOWS["stress_analysis"])
+
+        assert graph.steps["mesher.generate_mesh"].inputs == {"geometry": "cad.export_step"}
+        assert graph.steps["cae.setup_static_analysis"].inputs == {"mesh": "mesher.generate_mesh"}
+        assert graph.steps["postprocess.extract_stress"].inputs == {"results": "cae.solve"}
+        assert graph.topological_order()[:2] == ["cad.load_model", "cad.set_parameters"]
+
+    def test_invalid_graphs(self):
+        """引用未知步骤、槽位不匹配与循环依赖均报错"""
+        graph = WorkflowGraph()
+        graph.add_step("mesh", "mesher", "generate_mesh", {"geometry": "export"})
+        with pytest.raises(ValueError, match="未知步骤"):
+            graph.topological_order()
+
+        graph.add_step("export", "cae", "solve", {"input_file": "mesh"})
+        with pytest.raises(ValueError, match="不提供"):
+            graph.topological_order()
+
+        with pytest.raises(ValueError, match="重复"):
+            graph.add_step("mesh", "mesher", "generate_mesh")
+
+        cycle = WorkflowGraph()
+        cycle.add_step("a", "cad", "rebuild", {"model": "b"})
+        cycle.add_step("b", "cad", "rebuild", {"model": "a"})
+        with pytest.raises(ValueError, match="循环依赖"):
+            cycle.topological_order()
+
+
+class TestIncrementalWorkflow:
+    """增量执行测试"""
+
+    def test_rerun_skips_unchanged_steps(self, workflow):
+        """未修改任何输入时，第二次运行跳过全部步骤并复用结果"""
+        run, cad, cae, _ = workflow
+        engine, first = run()
+        assert first["skipped"] == []
+        assert engine.results == {"max_stress": 100.0}
+
+        engine, second = run()
+        assert second["executed"] == []
+        assert cad.calls == [] and cae.calls == []
+        assert all(step.status == WorkflowStatus.SKIPPED for step in second["steps"])
+        assert engine.results == {"max_stress": 100.0}
+        assert second["intermediate_files"]["mesher.generate_mesh"].name == "mesh.msh"
+
+    def test_load_change_resolves_without_remeshing(self, workflow):
+        """只修改载荷时，重新设置/求解/后处理，不重新导出STEP或划分网格"""
+        run, cad, cae, _ = workflow
+        run()
+
+        engine, result = run(loads=[{"type": "force", "value": 2500}])
+
+        assert result["executed"] == ["cae.setup_static_analysis", "cae.solve", "postprocess.extract_stress"]
+        assert cad.calls == []
+        assert "generate_mesh" not in cae.calls
+        assert engine.results == {"max_stress": 250.0}
+
+    def test_parameter_change_reloads_session_state(self, workflow):
+        """修改CAD参数时，先重新执行跳过的加载步骤以恢复会话状态，再导出"""
+        run, cad, cae, cad_file = workflow
+        run()
+        cad.model = None
+
+        _, result = run(parameters={"thickness": 12.0})
+
+        assert cad.calls == ["load_model", "set_parameter", "rebuild", "export_step"]
+        assert "cad.load_model" in result["executed"]
+        assert "generate_mesh" in cae.calls
+
+        # 内容相同的CAD文件重新写入：网格等下游步骤按内容哈希判断，仍然跳过
+        cad_file.write_text("bracket")
+        _, result = run()
+        assert result["executed"] == []
+
+    def test_modified_output_and_force(self, workflow):
+        """输出文件被修改时重新生成；force 忽略缓存"""
+        run, _, cae, _ = workflow
+        _, first = run()
+        mesh_file = first["intermediate_files"]["mesher.generate_mesh"]
+        mesh_file.write_text("edited by hand")
+
+        _, result = run()
+        assert "mesher.generate_mesh" in result["executed"]
+        assert "cae.setup_static_analysis" not in result["executed"]
+
+        _, result = run(force=True)
+        assert result["skipped"] == []
+        assert "generate_mesh" in cae.calls
+
+    def test_tool_version_change_reruns_steps(self, workflow):
+        """求解器版本变化时重新执行使用该连接器的步骤；每次运行只查询一次版本"""
+        run, cad, cae, _ = workflow
+        run()
+        assert cae.version_queries == 1
+
+        cae.version = "2.22"
+        _, result = run()
+
+        assert cad.calls == []
+        assert result["executed"] == [
+            "mesher.generate_mesh",
+            "cae.setup_static_analysis",
+            "cae.solve",
+            "postprocess.extract_stress",
+        ]
+        assert cae.version_queries == 2
+
+
+class TestStepCache:
+    """文件哈希缓存测试"""
+
+    def test_recent_files_not_persisted(self, tmp_path):
+        """刚写入的文件在同一时间戳内改写为同样大小时仍得到新哈希；稳定的文件哈希写入缓存文件"""
+        cache = StepCache(tmp_path / CACHE_FILE_NAME)
+        recent = tmp_path / "recent.inp"
+        recent.write_text("aaaa")
+        stamp = recent.stat().st_mtime_ns
+        first = cache.file_hash(recent)
+        recent.write_text("bbbb")
+        os.utime(recent, ns=(stamp, stamp))
+        assert cache.file_hash(recent) != first
+        assert str(recent.resolve()) not in cache.hashes
+
+        settled = tmp_path / "settled.inp"
+        settled.write_text("cccc")
+        old = time.time_ns() - 10 * RACY_WINDOW_NS
+        os.utime(settled, ns=(old, old))
+        digest = cache.file_hash(settled)
+        cache.save()
+        assert StepCache(tmp_path / CACHE_FILE_NAME).hashes[str(settled.resolve())] == [4, old, digest]
+
+
+class TestBranchedWorkflow:
+    """分支并发执行测试"""
+
+    @pytest.fixture
+    def config(self, tmp_path):
+        cad_file = tmp_path / "bracket.FCStd"
+        cad_file.write_text("bracket")
+        return {
+            "cad_file": str(cad_file),
+            "parameters": {"thickness": 10.0},
+            "output_dir": str(tmp_path / "out"),
+            "loads": [{"type": "force", "value": 1000}],
+        }
+
+    def test_load_cases_share_mesh_and_solve_concurrently(self, config):
+        """10个载荷工况：一次导出和网格划分，10个求解并发执行，结果按分支分组"""
+        cad, cae = RecordingCAD(), RecordingCAE(solve_time=0.05)
+        cases = {f"lc{i}": {"loads": [{"type": "force", "value": 100 * i}]} for i in range(1, 11)}
+
+        result = WorkflowEngine(cad, cae).run_branches(config, cases, max_workers=4)
+
+        assert cad.calls.count("export_step") == 1
+        assert cae.calls.count("generate_mesh") == 1
+        assert cae.calls.count("run_simulation") == 10
+        assert 1 < cae.peak <= 4
+        assert result["branches"] == list(cases)
+        assert result["results"] == {f"lc{i}": {"max_stress": 10.0 * i} for i in range(1, 11)}
+        assert (Path(config["output_dir"]) / "lc3" / "job.frd").read_text() == "LOAD 300"
+
+        # 只修改一个工况：只有该分支重新设置与求解
+        cad.calls.clear()
+        cae.calls.clear()
+        cases["lc3"] = {"loads": [{"type": "force", "value": 450}]}
+        result = WorkflowEngine(cad, cae).run_branches(config, cases, max_workers=4)
+        assert result["executed"] == [
+            "lc3/cae.setup_static_analysis",
+            "lc3/cae.solve",
+            "lc3/postprocess.extract_stress",
+        ]
+        assert cad.calls == []
+        assert result["results"]["lc3"] == {"max_stress": 45.0}
+
+    def test_engine_reuse_resets_results(self, config):
+        """同一引擎再次运行时结果与步骤只包含本次运行"""
+        engine = WorkflowEngine(RecordingCAD(), RecordingCAE())
+        engine.run_branches(config, {"lc1": {}, "lc2": {}})
+
+        result = engine.run_branches(config, {"lc3": {"loads": [{"type": "force", "value": 300}]}})
+        assert result["results"] == {"lc3": {"max_stress": 30.0}}
+        assert len(result["steps"]) == len(result["executed"]) + len(result["skipped"])
+
+        result = engine.run_workflow("stress_analysis", config)
+        assert result["results"] == {"max_stress": 100.0}
+
+    def test_analyses_share_geometry(self, config):
+        """静力与模态分析共享CAD导出与网格"""
+        cad, cae = RecordingCAD(), RecordingCAE()
+
+        result = WorkflowEngine(cad, cae).run_branches(config, analyses=("stress_analysis", "modal_analysis"))
+
+        assert cad.calls.count("export_step") == 1
+        assert cae.calls.count("generate_mesh") == 1
+        assert cae.calls.count("setup_simulation") == 2
+        assert result["results"]["stress_analysis"] == {"max_stress": 100.0}
+        assert "natural_frequencies" in result["results"]["modal_analysis"]
+
+    def test_parameter_variants_replay_cad_session(self, config):
+        """CAD参数方案：各分支重放加载/设参/重建后再导出，导出结果不互相污染"""
+        cad, cae = RecordingCAD(), RecordingCAE()
+        variants = {"t8": {"parameters": {"thickness": 8.0}}, "t12": {"parameters": {"thickness": 12.0}}}
+
+        WorkflowEngine(cad, cae).run_branches(config, variants, max_workers=4)
+
+        out = Path(config["output_dir"])
+        assert "8.0" in (out / "t8" / "model.step").read_text()
+        assert "12.0" in (out / "t12" / "model.step").read_text()
+        assert cad.calls.count("load_model") == 2
+        assert cae.calls.count("generate_mesh") == 2